@@ -0,0 +1,74 @@
+"""add tabela canonical_items
+
+Revision ID: c41e7a9d2f06
+Revises: 3b4d9f552a78
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9d2f06'
+down_revision: Union[str, None] = '3b4d9f552a78'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+#Código MLB extraído da URL com a mesma regra de ``utils.ml_url.extract_mlb_id``
+MLB_ID_SQL = "'MLB' || substring(upper({table}.product_url) from 'MLB[-_]?([0-9]+)')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('canonical_items',
+    sa.Column('mlb_id', sa.String(length=32), nullable=False),
+    sa.Column('canonical_url', sa.Text(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('current_price', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('old_price', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('free_shipping', sa.Boolean(), nullable=True),
+    sa.Column('seller', sa.String(), nullable=True),
+    sa.Column('thumbnail', sa.Text(), nullable=True),
+    sa.Column('etag', sa.String(), nullable=True),
+    sa.Column('last_modified', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_checked', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('mlb_id')
+    )
+    op.create_index(op.f('ix_canonical_items_last_checked'), 'canonical_items', ['last_checked'], unique=False)
+    op.add_column('monitored_products', sa.Column('canonical_item_id', sa.String(length=32), nullable=True))
+    op.create_index(op.f('ix_monitored_products_canonical_item_id'), 'monitored_products', ['canonical_item_id'], unique=False)
+    op.create_foreign_key('fk_monitored_products_canonical_item', 'monitored_products', 'canonical_items', ['canonical_item_id'], ['mlb_id'])
+    op.add_column('competitor_products', sa.Column('canonical_item_id', sa.String(length=32), nullable=True))
+    op.create_index(op.f('ix_competitor_products_canonical_item_id'), 'competitor_products', ['canonical_item_id'], unique=False)
+    op.create_foreign_key('fk_competitor_products_canonical_item', 'competitor_products', 'canonical_items', ['canonical_item_id'], ['mlb_id'])
+
+    #Preenche o catálogo a partir das URLs já cadastradas e vincula os assinantes
+    for table in ('monitored_products', 'competitor_products'):
+        mlb_id = MLB_ID_SQL.format(table=table)
+        op.execute(
+            f"INSERT INTO canonical_items (mlb_id, canonical_url, created_at, updated_at) "
+            f"SELECT DISTINCT {mlb_id}, 'https://produto.mercadolivre.com.br/MLB-' || substring({mlb_id} from 4), now(), now() "
+            f"FROM {table} WHERE {table}.product_url ILIKE '%mercadolivre.com.br%' AND {mlb_id} IS NOT NULL "
+            f"ON CONFLICT (mlb_id) DO NOTHING"
+        )
+        op.execute(
+            f"UPDATE {table} SET canonical_item_id = {mlb_id} "
+            f"WHERE {table}.product_url ILIKE '%mercadolivre.com.br%' AND {mlb_id} IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_competitor_products_canonical_item', 'competitor_products', type_='foreignkey')
+    op.drop_index(op.f('ix_competitor_products_canonical_item_id'), table_name='competitor_products')
+    op.drop_column('competitor_products', 'canonical_item_id')
+    op.drop_constraint('fk_monitored_products_canonical_item', 'monitored_products', type_='foreignkey')
+    op.drop_index(op.f('ix_monitored_products_canonical_item_id'), table_name='monitored_products')
+    op.drop_column('monitored_products', 'canonical_item_id')
+    op.drop_index(op.f('ix_canonical_items_last_checked'), table_name='canonical_items')
+    op.drop_table('canonical_items')
@@ -6,7 +6,7 @@ import os
 
 from kombu import Exchange, Queue
 from celery import Celery
-from celery.signals import task_success, task_failure, worker_ready
+from celery.signals import task_success, task_failure, worker_ready, worker_process_init, worker_process_shutdown
 from celery.schedules import crontab
 from prometheus_client import start_http_server
 
@@ -16,6 +16,7 @@ except Exception:
     CeleryInstrumentor = None
 
 from alert_app.core.config import settings
+from utils.worker_loop import worker_loop
 
 
 #Cria a aplicação Celery
@@ -43,6 +44,16 @@ def _start_prometheus_server(**kwargs):
     #Servidor de métricas Prometheus
     start_http_server(port=8002, addr="0.0.0.0")
 
+@worker_process_init.connect
+def _start_worker_loop(**kwargs):
+    """ Inicia o event loop persistente em cada processo filho do worker """
+    worker_loop.start()
+
+@worker_process_shutdown.connect
+def _stop_worker_loop(**kwargs):
+    """ Encerra o event loop persistente junto com o processo filho """
+    worker_loop.stop()
+
 @task_success.connect
 def handle_task_success(sender=None, **kwargs):
     """ Métricas de contagem de sucesso """
@@ -103,6 +114,23 @@ celery_app.conf.task_routes = {
     },
     "alert_app.tasks.monitor_tasks.recheck_competitor_products": {
         "queue": "monitor", "routing_key": "monitor"
+    },
+    "alert_app.tasks.monitor_tasks.recheck_canonical_items": {
+        "queue": "monitor", "routing_key": "monitor"
+    },
+    "alert_app.tasks.monitor_tasks.finish_recheck": {
+        "queue": "monitor", "routing_key": "monitor"
+    },
+
+    #Blocos das rechecagens acionam o scraper e vão para a fila "scraping"
+    "alert_app.tasks.monitor_tasks.recheck_monitored_chunk": {
+        "queue": "scraping", "routing_key": "scraping"
+    },
+    "alert_app.tasks.monitor_tasks.recheck_competitor_chunk": {
+        "queue": "scraping", "routing_key": "scraping"
+    },
+    "alert_app.tasks.monitor_tasks.recheck_canonical_chunk": {
+        "queue": "scraping", "routing_key": "scraping"
     }
 }
 
@@ -127,13 +155,19 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(minute="*/1"),
         "options": {"queue": "monitor", "routing_key": "monitor"}
     },
-    #Rechecagem de todos os produtos scraping: a cada 5 minutos
+    #Rechecagem por item canônico (monitorados e concorrentes): a cada 5 minutos
+    "recheck-canonical-items-every-5min": {
+        "task": "alert_app.tasks.monitor_tasks.recheck_canonical_items",
+        "schedule": crontab(minute="*/5"),
+        "options": {"queue": "monitor", "routing_key": "monitor"}
+    },
+    #Rechecagem dos produtos monitorados sem item canônico (URLs sem código MLB): a cada 5 minutos
     "recheck-scraping-every-5min": {
         "task": "alert_app.tasks.monitor_tasks.recheck_monitored_products",
         "schedule": crontab(minute="*/5"),
         "options": {"queue": "monitor", "routing_key": "monitor"}
     },
-    #Rechecagem de todos os produtos concorrentes scraping: a cada 8 minutos
+    #Rechecagem dos concorrentes sem item canônico: a cada 8 minutos
     "recheck-all-competitors-every-8min": {
         "task": "alert_app.tasks.monitor_tasks.recheck_competitor_products",
         "schedule": crontab(minute="*/8"),
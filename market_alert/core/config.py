@@ -51,10 +51,33 @@ class Settings(ConfigBase):
         os.getenv("ADAPTIVE_RECHECK_BASE_INTERVAL", "7200")
     )
 
+    #Reserva (segundos) dos itens reivindicados do índice de vencimentos; falhas voltam a vencer ao fim dela
+    RECHECK_CLAIM_LEASE: int = int(os.getenv("RECHECK_CLAIM_LEASE", "900"))
+
+    #Linhas do catálogo varridas por ciclo (paginação por chave) e tamanho dos blocos lidos do banco
+    RECHECK_SWEEP_SIZE: int = int(os.getenv("RECHECK_SWEEP_SIZE", "2000"))
+    RECHECK_SWEEP_CHUNK: int = int(os.getenv("RECHECK_SWEEP_CHUNK", "500"))
+
+    #Itens por task de coleta das rechecagens e máximo dessas tasks em andamento por tipo
+    RECHECK_CHUNK_SIZE: int = int(os.getenv("RECHECK_CHUNK_SIZE", "5"))
+    RECHECK_MAX_IN_FLIGHT: int = int(os.getenv("RECHECK_MAX_IN_FLIGHT", "8"))
+
+    #Agrupamento das comparações de preços: silêncio após a última atualização e espera máxima (segundos)
+    COMPARE_DEBOUNCE_WINDOW: float = float(os.getenv("COMPARE_DEBOUNCE_WINDOW", "30"))
+    COMPARE_DEBOUNCE_MAX_WAIT: float = float(os.getenv("COMPARE_DEBOUNCE_MAX_WAIT", "300"))
+
     #URL base do serviço externo de scraping
     SCRAPER_SERVICE_URL: str = os.getenv(
         "SCRAPER_SERVICE_URL", "http://market_scraper:8000"
     )
 
+    #Pool de conexões e prazos do cliente do market_scraper
+    SCRAPER_CLIENT_TIMEOUT: float = float(os.getenv("SCRAPER_CLIENT_TIMEOUT", "30"))
+    SCRAPER_CLIENT_MIN_TIMEOUT: float = float(os.getenv("SCRAPER_CLIENT_MIN_TIMEOUT", "1"))
+    SCRAPER_CLIENT_MAX_CONNECTIONS: int = int(os.getenv("SCRAPER_CLIENT_MAX_CONNECTIONS", "20"))
+    SCRAPER_CLIENT_MAX_KEEPALIVE: int = int(os.getenv("SCRAPER_CLIENT_MAX_KEEPALIVE", "10"))
+    SCRAPER_CLIENT_KEEPALIVE_EXPIRY: float = float(os.getenv("SCRAPER_CLIENT_KEEPALIVE_EXPIRY", "30"))
+    SCRAPER_CLIENT_BATCH_SIZE: int = int(os.getenv("SCRAPER_CLIENT_BATCH_SIZE", "100"))
+
 #Instância única de settings para a aplicação
 settings = Settings()
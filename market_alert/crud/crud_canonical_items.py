@@ -0,0 +1,149 @@
+""" Operações CRUD do catálogo de itens canônicos do Mercado Livre
+
+Cada anúncio é coletado uma única vez por ciclo e o resultado é replicado a
+todos os produtos monitorados e concorrentes que apontam para ele.
+"""
+
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import exists, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from alert_app.models.models_products import CanonicalItem, MonitoredProduct, CompetitorProduct
+from alert_app.enums.enums_products import MonitoringType, MonitoredStatus, ProductStatus
+from alert_app.schemas.schemas_products import CanonicalScrapedInfo
+from utils.ml_url import canonicalize_ml_url, extract_mlb_id
+
+
+def ensure_canonical_item(db: Session, product_url: str) -> Optional[str]:
+    """ Garante o item canônico da URL e retorna seu ``mlb_id``
+
+    URLs sem código MLB retornam ``None``. A inserção roda num ``SAVEPOINT``:
+    se dois assinantes cadastram o mesmo anúncio ao mesmo tempo, o
+    ``IntegrityError`` do segundo desfaz só a inserção, sem afetar a
+    transação do chamador.
+    """
+    mlb_id = extract_mlb_id(product_url)
+    if not mlb_id:
+        return None
+    if get_canonical_item(db, mlb_id) is None:
+        try:
+            with db.begin_nested():
+                db.add(CanonicalItem(mlb_id=mlb_id, canonical_url=canonicalize_ml_url(product_url)))
+        except IntegrityError:
+            #Item criado por outro assinante entre a consulta e a inserção
+            pass
+    return mlb_id
+
+def get_canonical_item(db: Session, mlb_id: str) -> Optional[CanonicalItem]:
+    """ Obtém um item canônico pelo código MLB """
+    return db.query(CanonicalItem).filter(CanonicalItem.mlb_id == mlb_id).first()
+
+def _has_subscribers():
+    """ Condição: o item tem produto monitorado por scraping ou concorrente apontando para ele """
+    has_monitored = exists().where(
+        MonitoredProduct.canonical_item_id == CanonicalItem.mlb_id,
+        MonitoredProduct.monitoring_type == MonitoringType.scraping,
+    )
+    has_competitor = exists().where(CompetitorProduct.canonical_item_id == CanonicalItem.mlb_id)
+    return or_(has_monitored, has_competitor)
+
+def iter_canonical_check_times(db: Session, after: Optional[str] = None, limit: int = 2000, chunk_size: int = 500) -> Iterator[Tuple[str, Optional[datetime]]]:
+    """ Percorre ``(mlb_id, last_checked)`` dos itens com assinantes em ordem de código, sem carregar os objetos
+
+    Paginação por chave a partir do primeiro código maior que ``after``, com
+    no máximo ``limit`` linhas trazidas em blocos de ``chunk_size``.
+    """
+    query = (
+        db.query(CanonicalItem.mlb_id, CanonicalItem.last_checked)
+        .filter(_has_subscribers())
+    )
+    if after is not None:
+        query = query.filter(CanonicalItem.mlb_id > after)
+    return iter(query.order_by(CanonicalItem.mlb_id).limit(limit).yield_per(chunk_size))
+
+def get_canonical_items_by_ids(db: Session, mlb_ids: List[str]) -> List[CanonicalItem]:
+    """ Obtém os itens com os códigos informados que ainda têm assinantes (os demais são ignorados) """
+    if not mlb_ids:
+        return []
+    return (
+        db.query(CanonicalItem)
+        .filter(CanonicalItem.mlb_id.in_(mlb_ids), _has_subscribers())
+        .all()
+    )
+
+def mark_canonical_item_checked(db: Session, mlb_id: str, last_checked: datetime) -> None:
+    """ Registra a checagem de um item inalterado (``304``) para a fila de rechecagem andar """
+    db.execute(
+        update(CanonicalItem)
+        .where(CanonicalItem.mlb_id == mlb_id)
+        .values(last_checked=last_checked)
+    )
+    db.commit()
+
+def apply_scraped_item(db: Session, mlb_id: str, scraped_info: CanonicalScrapedInfo, last_checked: datetime) -> List[UUID]:
+    """ Grava o estado do item e o replica a todos os assinantes
+
+    Um único ``UPDATE`` por tabela atualiza todos os produtos monitorados e
+    concorrentes do item. Retorna os IDs dos produtos monitorados afetados
+    (diretos e donos dos concorrentes), sem repetição, para a comparação de
+    preços.
+    """
+    db.execute(
+        update(CanonicalItem)
+        .where(CanonicalItem.mlb_id == mlb_id)
+        .values(
+            name=scraped_info.name,
+            current_price=scraped_info.current_price,
+            old_price=scraped_info.old_price,
+            free_shipping=scraped_info.free_shipping,
+            seller=scraped_info.seller,
+            thumbnail=scraped_info.thumbnail,
+            etag=scraped_info.etag,
+            last_modified=scraped_info.last_modified,
+            last_checked=last_checked,
+        )
+    )
+
+    monitored_ids = db.execute(
+        update(MonitoredProduct)
+        .where(
+            MonitoredProduct.canonical_item_id == mlb_id,
+            MonitoredProduct.monitoring_type == MonitoringType.scraping,
+        )
+        .values(
+            current_price=scraped_info.current_price,
+            thumbnail=scraped_info.thumbnail,
+            free_shipping=scraped_info.free_shipping,
+            etag=scraped_info.etag,
+            last_modified=scraped_info.last_modified,
+            last_checked=last_checked,
+            status=MonitoredStatus.active,
+        )
+        .returning(MonitoredProduct.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    #O preço anterior do concorrente vira ``old_price``, como na atualização individual
+    owner_ids = db.execute(
+        update(CompetitorProduct)
+        .where(CompetitorProduct.canonical_item_id == mlb_id)
+        .values(
+            old_price=CompetitorProduct.current_price,
+            current_price=scraped_info.current_price,
+            thumbnail=scraped_info.thumbnail,
+            free_shipping=scraped_info.free_shipping,
+            etag=scraped_info.etag,
+            last_modified=scraped_info.last_modified,
+            last_checked=last_checked,
+            status=ProductStatus.available,
+        )
+        .returning(CompetitorProduct.monitored_product_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    db.commit()
+    return list(dict.fromkeys([*monitored_ids, *owner_ids]))
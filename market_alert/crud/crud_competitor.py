@@ -2,7 +2,7 @@
 from unicodedata import normalize
 from uuid import UUID
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
@@ -10,12 +10,14 @@ from alert_app.models.models_products import CompetitorProduct, MonitoredProduct
 from utils.ml_url import canonicalize_ml_url
 from alert_app.enums.enums_products import ProductStatus, MonitoringType
 from alert_app.schemas.schemas_products import CompetitorProductCreateScraping, CompetitorScrapedInfo
+from alert_app.crud.crud_canonical_items import ensure_canonical_item
 
 
 def create_or_update_competitor_product_scraped(db: Session, product_data: CompetitorProductCreateScraping, scraped_info: CompetitorScrapedInfo, last_checked: datetime) -> CompetitorProduct:
     """ Atualiza ou cria um produto concorrente a partir dos dados do scraping manual com link direto """
     canonical = canonicalize_ml_url(str(product_data.product_url))
     normalized_url = canonical or str(product_data.product_url)
+    canonical_item_id = ensure_canonical_item(db, normalized_url)
 
     #Verifica se já existe um concorrente com mesmo monitored_product_id e URL
     existing = (
@@ -33,7 +35,10 @@ def create_or_update_competitor_product_scraped(db: Session, product_data: Compe
         existing.current_price = scraped_info.current_price
         existing.thumbnail = scraped_info.thumbnail
         existing.free_shipping = scraped_info.free_shipping
+        existing.etag = scraped_info.etag
+        existing.last_modified = scraped_info.last_modified
         existing.last_checked = last_checked
+        existing.canonical_item_id = canonical_item_id
         existing.status = ProductStatus.available
         db.commit()
         db.refresh(existing)
@@ -44,12 +49,15 @@ def create_or_update_competitor_product_scraped(db: Session, product_data: Compe
         monitored_product_id=product_data.monitored_product_id,
         name_competitor=scraped_info.name,
         product_url=normalized_url,
+        canonical_item_id=canonical_item_id,
         current_price=scraped_info.current_price,
         old_price=scraped_info.old_price,
         free_shipping=scraped_info.free_shipping,
         seller=scraped_info.seller,
         seller_rating=scraped_info.seller_rating,
         thumbnail=scraped_info.thumbnail,
+        etag=scraped_info.etag,
+        last_modified=scraped_info.last_modified,
         status=ProductStatus.available,
         last_checked=last_checked
     )
@@ -62,6 +70,32 @@ def get_all_competitor_products(db: Session) -> List[CompetitorProduct]:
     """ Retorna todos os produtos concorrentes cadastrados no banco """
     return db.query(CompetitorProduct).all()
 
+def iter_competitor_check_times(db: Session, after: Optional[UUID] = None, limit: int = 2000, chunk_size: int = 500) -> Iterator[Tuple[UUID, Optional[datetime]]]:
+    """ Percorre ``(id, last_checked)`` dos concorrentes em ordem de ID, sem carregar os objetos
+
+    Paginação por chave a partir do primeiro ID maior que ``after``, com no
+    máximo ``limit`` linhas trazidas em blocos de ``chunk_size``. Só entram
+    concorrentes sem item canônico; os demais são rechecados por
+    ``recheck_canonical_items``.
+    """
+    query = (
+        db.query(CompetitorProduct.id, CompetitorProduct.last_checked)
+        .filter(CompetitorProduct.canonical_item_id.is_(None))
+    )
+    if after is not None:
+        query = query.filter(CompetitorProduct.id > after)
+    return iter(query.order_by(CompetitorProduct.id).limit(limit).yield_per(chunk_size))
+
+def get_competitor_products_by_ids(db: Session, competitor_ids: List[UUID]) -> List[CompetitorProduct]:
+    """ Obtém os concorrentes com os IDs informados (os inexistentes são ignorados) """
+    if not competitor_ids:
+        return []
+    return (
+        db.query(CompetitorProduct)
+        .filter(CompetitorProduct.id.in_(competitor_ids))
+        .all()
+    )
+
 def get_competitor_products_by_user(db: Session, user_id: UUID) -> List[CompetitorProduct]:
     """ Lista os concorrentes pertencentes a determinado usuário """
     return (
@@ -82,6 +116,18 @@ def get_competitor_products_by_type(db: Session, user_id: UUID, monitoring_type:
         ).all()
     )
 
+def get_competitor_by_url(db: Session, monitored_product_id: UUID, product_url: str) -> Optional[CompetitorProduct]:
+    """ Obtém o concorrente de um produto monitorado pela URL normalizada """
+    normalized_url = canonicalize_ml_url(product_url) or product_url
+    return (
+        db.query(CompetitorProduct)
+        .filter(
+            CompetitorProduct.monitored_product_id == monitored_product_id,
+            CompetitorProduct.product_url == normalized_url
+        )
+        .first()
+    )
+
 def get_competitors_by_monitored_id(db: Session, monitored_product_id: UUID) -> List[CompetitorProduct]:
     """ Lista todos os produtos concorrentes associados a um produto monitorado pelo ID """
     return (
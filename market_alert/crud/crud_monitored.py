@@ -1,6 +1,6 @@
 """ Operações CRUD para produtos monitorados pelo sistema """
 
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 from unicodedata import normalize
 from uuid import UUID
@@ -15,12 +15,14 @@ from alert_app.schemas.schemas_products import MonitoredProductCreateScraping, M
 from alert_app.enums.enums_alerts import AlertType
 from alert_app.schemas.schemas_alert_rules import AlertRuleCreate
 from alert_app.crud import crud_alert_rules
+from alert_app.crud.crud_canonical_items import ensure_canonical_item
 
 
 def create_or_update_monitored_product_scraped(db: Session, user_id: UUID, product_data: MonitoredProductCreateScraping, scraped_info: MonitoredScrapedInfo, last_checked: datetime) -> MonitoredProduct:
     """ Cria ou atualiza um produto monitorado a partir de dados de scraping """
     canonical = canonicalize_ml_url(str(product_data.product_url))
     normalized_url = canonical or str(product_data.product_url)
+    canonical_item_id = ensure_canonical_item(db, normalized_url)
 
     #Verifica se o produto já existe para o usuário
     existing = (
@@ -37,7 +39,10 @@ def create_or_update_monitored_product_scraped(db: Session, user_id: UUID, produ
         existing.current_price = scraped_info.current_price
         existing.thumbnail = scraped_info.thumbnail
         existing.free_shipping = scraped_info.free_shipping
+        existing.etag = scraped_info.etag
+        existing.last_modified = scraped_info.last_modified
         existing.last_checked = last_checked
+        existing.canonical_item_id = canonical_item_id
         existing.status = MonitoredStatus.active
         db.commit()
         db.refresh(existing)
@@ -50,10 +55,13 @@ def create_or_update_monitored_product_scraped(db: Session, user_id: UUID, produ
         name_identification=product_data.name_identification,
         search_query=None,
         product_url=normalized_url,
+        canonical_item_id=canonical_item_id,
         target_price=product_data.target_price,
         current_price=scraped_info.current_price,
         thumbnail=scraped_info.thumbnail,
         free_shipping=scraped_info.free_shipping,
+        etag=scraped_info.etag,
+        last_modified=scraped_info.last_modified,
         monitoring_type=MonitoringType.scraping,
         status=MonitoredStatus.active,
         last_checked=last_checked
@@ -99,6 +107,37 @@ def get_products_by_type(db: Session, monitoring_type: MonitoringType) -> List[M
         .all()
     )
 
+def iter_product_check_times(db: Session, monitoring_type: MonitoringType, after: Optional[UUID] = None, limit: int = 2000, chunk_size: int = 500) -> Iterator[Tuple[UUID, Optional[datetime]]]:
+    """ Percorre ``(id, last_checked)`` dos produtos do tipo em ordem de ID, sem carregar os objetos
+
+    Paginação por chave: começa no primeiro ID maior que ``after`` e lê no
+    máximo ``limit`` linhas, trazidas do banco em blocos de ``chunk_size``.
+    Só entram produtos sem item canônico (URLs fora do Mercado Livre): os
+    demais são rechecados por ``recheck_canonical_items``.
+    """
+    query = (
+        db.query(MonitoredProduct.id, MonitoredProduct.last_checked)
+        .filter(
+            MonitoredProduct.monitoring_type == monitoring_type,
+            MonitoredProduct.canonical_item_id.is_(None)
+        )
+    )
+    if after is not None:
+        query = query.filter(MonitoredProduct.id > after)
+    return iter(query.order_by(MonitoredProduct.id).limit(limit).yield_per(chunk_size))
+
+def get_monitored_products_by_ids(db: Session, product_ids: List[UUID]) -> List[MonitoredProduct]:
+    """ Obtém os produtos monitorados com os IDs informados (os inexistentes são ignorados) """
+    if not product_ids:
+        return []
+    return (
+        db.query(MonitoredProduct)
+        .filter(
+            MonitoredProduct.id.in_(product_ids)
+        )
+        .all()
+    )
+
 def get_monitored_product_by_id(db: Session, product_id: UUID) -> Optional[MonitoredProduct]:
     """ Obtém um produto monitorado específico pelo ID """
     return (
@@ -5,13 +5,17 @@ pela aplicação e as organiza por domínio.
 Os principais Grupos cobertos são:
 - Tarefas e workers do Celery
 - Scraping de produtos e comportamento HTTP relacionado
+- Pool de navegadores do Playwright
+- Camadas de busca de HTML (HTTP simples e navegador)
+- Token bucket distribuído por host e coalescência de scrapings
+- Pool de conexões do cliente do ``market_scraper``
 - Cache e uso de cache por endpoint
-- Auditoria de logs
+- Auditoria de logs e snapshots de HTML
 - Eventos de autenticação
 - Rotinas de comparação de preços
 - Interações com o servidor HTTP do FastAPI
 - Estado do pool de conexões com o banco de dados
-- Parsing e agendamentos adaptativos de rechecagem
+- Parsing, executor de parsing, agendamentos adaptativos e índice de vencimentos das rechecagens
 - Contadores de logs e erros de API
 - Estatísticas de filas e memória do Redis
 
@@ -161,6 +165,99 @@ SCRAPER_CIRCUIT_STATE_CHANGES_TOTAL = Counter(
 )
 
 
+# ---------- BROWSER POOL METRICS ----------
+#Navegadores iniciados pelo pool (aquecimento ou reciclagem)
+BROWSER_POOL_LAUNCHES_TOTAL = Counter(
+    "browser_pool_launches_total",
+    "Total de navegadores iniciados pelo pool do Playwright",
+    ["reason"],
+)
+
+#Navegadores reciclados por limite de páginas, memória ou desconexão
+BROWSER_POOL_RECYCLES_TOTAL = Counter(
+    "browser_pool_recycles_total",
+    "Total de navegadores reciclados pelo pool do Playwright",
+    ["reason"],
+)
+
+#Páginas sendo renderizadas no pool neste momento
+BROWSER_POOL_IN_USE = Gauge(
+    "browser_pool_in_use",
+    "Número de páginas em renderização no pool de navegadores",
+)
+
+#Tempo de espera por um contexto livre no pool
+BROWSER_POOL_ACQUIRE_WAIT_SECONDS = Histogram(
+    "browser_pool_acquire_wait_seconds",
+    "Tempo de espera por um contexto livre no pool de navegadores (segundos)",
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+
+
+# ---------- FETCH TIER METRICS ----------
+#Buscas de HTML por camada (http/browser) e resultado
+SCRAPER_FETCH_TIER_TOTAL = Counter(
+    "scraper_fetch_tier_total",
+    "Total de buscas de HTML por camada e resultado",
+    ["tier", "outcome"],
+)
+
+#Latência de cada camada de busca de HTML
+SCRAPER_FETCH_TIER_LATENCY_SECONDS = Histogram(
+    "scraper_fetch_tier_latency_seconds",
+    "Latência da busca de HTML por camada (segundos)",
+    ["tier"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+)
+
+#Requisições condicionais (If-None-Match/If-Modified-Since) por resultado
+SCRAPER_CONDITIONAL_REQUESTS_TOTAL = Counter(
+    "scraper_conditional_requests_total",
+    "Total de requisições condicionais por resultado (not_modified/modified)",
+    ["result"],
+)
+
+# ---------- HOST TOKEN BUCKET METRICS ----------
+#Espera até a vaga reservada no token bucket distribuído por host
+HOST_BUCKET_WAIT_SECONDS = Histogram(
+    "host_bucket_wait_seconds",
+    "Espera até a vaga reservada no token bucket do host (segundos)",
+    ["url_host"],
+    buckets=[0, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0],
+)
+
+#Reservas recusadas por exceder a espera máxima
+HOST_BUCKET_REJECTED_TOTAL = Counter(
+    "host_bucket_rejected_total",
+    "Total de reservas recusadas pelo token bucket do host",
+    ["url_host"],
+)
+
+# ---------- SINGLE-FLIGHT METRICS ----------
+#Scrapings por papel na coalescência (leader/merged_local/merged_remote/fallback)
+SCRAPER_SINGLE_FLIGHT_TOTAL = Counter(
+    "scraper_single_flight_total",
+    "Total de scrapings por resultado da coalescência de URLs idênticas",
+    ["outcome"],
+)
+
+# ---------- SCRAPER CLIENT METRICS ----------
+#Ocupação do pool do cliente do market_scraper (fração das conexões em uso) a cada chamada
+SCRAPER_CLIENT_POOL_OCCUPANCY = Histogram(
+    "scraper_client_pool_occupancy",
+    "Fração das conexões do pool do cliente do market_scraper em uso ao iniciar uma chamada",
+    ["mode"],
+    buckets=[0.1, 0.25, 0.5, 0.75, 0.9, 1.0],
+)
+
+#Latência de cada chamada ao market_scraper por endpoint e resultado
+SCRAPER_CLIENT_REQUEST_SECONDS = Histogram(
+    "scraper_client_request_seconds",
+    "Tempo de cada chamada ao market_scraper (segundos)",
+    ["endpoint", "outcome"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+)
+
 # ---------- CACHE METRICS ----------
 CACHE_HITS_TOTAL = Counter(
     "cache_hits_total",
@@ -172,6 +269,41 @@ CACHE_MISSES_TOTAL = Counter(
     "Total de acessos ao cache sem dados disponíveis",
 )
 
+#Consultas ao cache antes do scraping (fresh/stale/miss)
+CACHE_FRESHNESS_TOTAL = Counter(
+    "cache_freshness_total",
+    "Total de consultas ao cache antes do scraping por resultado",
+    ["result"],
+)
+
+#Comparação da impressão digital dos dados ao regravar o cache (match/changed/new)
+CACHE_FINGERPRINT_TOTAL = Counter(
+    "cache_fingerprint_total",
+    "Total de gravações no cache por resultado da impressão digital dos dados",
+    ["result"],
+)
+
+#Distribuição do TTL adaptativo aplicado às entradas
+CACHE_TTL_SECONDS = Histogram(
+    "cache_ttl_seconds",
+    "TTL adaptativo aplicado às entradas do cache (segundos)",
+    buckets=[300, 900, 1800, 3600, 7200, 10800, 14400, 18000, 36000],
+)
+
+#Multiplicador do TTL adaptativo aplicado às entradas
+CACHE_TTL_MULTIPLIER = Histogram(
+    "cache_ttl_multiplier",
+    "Multiplicador do TTL adaptativo aplicado às entradas do cache",
+    buckets=[1, 2, 3, 4, 5, 10],
+)
+
+#Idade das entradas servidas diretamente do cache
+CACHE_SERVED_AGE_SECONDS = Histogram(
+    "cache_served_age_seconds",
+    "Idade das entradas de cache servidas sem novo scraping (segundos)",
+    buckets=[60, 300, 900, 1800, 3600, 7200, 10800, 18000],
+)
+
 
 # ---------- CACHE PER ENDPOINT METRICS ----------
 CACHE_HITS_ENDPOINT_TOTAL = Counter(
@@ -204,9 +336,9 @@ AUDIT_HTML_LENGTH_BYTES = Histogram(
 
 AUDIT_RECORD_DURATION_SECONDS = Histogram(
     "audit_record_duration_seconds",
-    "Tempo gasto para gravar cada registro de auditoria (segundos)",
+    "Tempo entre o registro de auditoria e sua gravação em disco (segundos)",
     ["stage"],
-    buckets=[0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0],
+    buckets=[0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0],
 )
 
 AUDIT_ERRORS_TOTAL = Counter(
@@ -215,6 +347,30 @@ AUDIT_ERRORS_TOTAL = Counter(
     ["stage"],
 )
 
+AUDIT_DROPPED_RECORDS_TOTAL = Counter(
+    "audit_dropped_records_total",
+    "Total de registros de auditoria descartados com a fila cheia",
+    ["stage"],
+)
+
+AUDIT_FLUSH_DURATION_SECONDS = Histogram(
+    "audit_flush_duration_seconds",
+    "Tempo para gravar um lote de registros de auditoria em disco (segundos)",
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5],
+)
+
+#Snapshots de HTML para replay offline
+HTML_SNAPSHOTS_TOTAL = Counter(
+    "html_snapshots_total",
+    "Total de páginas avaliadas para snapshot (stored/duplicate/skipped/dropped/full/error)",
+    ["outcome"],
+)
+
+HTML_SNAPSHOT_STORE_BYTES = Gauge(
+    "html_snapshot_store_bytes",
+    "Bytes ocupados pelos snapshots de HTML compactados após a última limpeza",
+)
+
 
 # ---------- AUTHENTICATION METRICS ----------
 #Métricas de erros de login/autenticação
@@ -233,6 +389,13 @@ PRICE_COMPARISONS_TOTAL = Counter(
     ["status"], #success ou failure
 )
 
+#Pedidos de comparação: enfileirados, agrupados a uma rajada em aberto, adiados e executados
+PRICE_COMPARISON_REQUESTS_TOTAL = Counter(
+    "price_comparison_requests_total",
+    "Pedidos de comparação de preços por resultado do agrupamento",
+    ["outcome"], #scheduled, coalesced, deferred ou executed
+)
+
 #Duração da comparação de preços em segundos
 PRICE_COMPARISON_DURATION_SECONDS = Histogram(
     "price_comparison_duration_seconds",
@@ -288,6 +451,40 @@ PARSER_FAILURE_TOTAL = Counter(
     "Total de falhas ao parser registros de produtos",
 )
 
+#Parses resolvidos sem construir o DOM (hit) ou que precisaram do BeautifulSoup (miss)
+PARSER_FAST_PATH_TOTAL = Counter(
+    "parser_fast_path_total",
+    "Total de parses pelo caminho rápido sem DOM, por resultado",
+    ["outcome"],
+)
+
+#Execuções de cada estratégia do parser: vencedora, rejeitada pela validação ou sem dados
+PARSER_STRATEGY_RUNS_TOTAL = Counter(
+    "parser_strategy_runs_total",
+    "Total de execuções das estratégias do parser, por resultado",
+    ["strategy", "outcome"],
+)
+
+PARSER_STRATEGY_LATENCY_SECONDS = Histogram(
+    "parser_strategy_latency_seconds",
+    "Duração de cada estratégia do parser",
+    ["strategy"],
+)
+
+#Espera por uma vaga e pelo worker do executor de parsing
+PARSE_QUEUE_WAIT_SECONDS = Histogram(
+    "parse_queue_wait_seconds",
+    "Tempo de espera até o parse começar a rodar no executor",
+    ["mode"],
+)
+
+#Tempo de CPU do parse medido no próprio worker
+PARSE_DURATION_SECONDS = Histogram(
+    "parse_duration_seconds",
+    "Duração do parse de uma página de produto no executor",
+    ["mode"],
+)
+
 
 # ---------- ADAPTIVE RECHECK METRICS ----------
 RECHECK_SCHEDULED_TOTAL = Counter(
@@ -295,6 +492,41 @@ RECHECK_SCHEDULED_TOTAL = Counter(
     "Total de rechecks agendados",
 )
 
+#Itens vencidos reivindicados do índice de vencimentos por ciclo
+RECHECK_CLAIMED_TOTAL = Counter(
+    "recheck_claimed_total",
+    "Total de itens vencidos reivindicados para rechecagem",
+    ["kind"],
+)
+
+#Linhas do catálogo lidas pela varredura que alimenta o índice de vencimentos
+RECHECK_SWEEP_ROWS_TOTAL = Counter(
+    "recheck_sweep_rows_total",
+    "Total de linhas do catálogo varridas para o índice de vencimentos",
+    ["kind"],
+)
+
+#Varreduras completas do catálogo (cursor voltou ao início)
+RECHECK_SWEEP_WRAPS_TOTAL = Counter(
+    "recheck_sweep_wraps_total",
+    "Total de varreduras completas do catálogo",
+    ["kind"],
+)
+
+#Tasks de coleta das rechecagens em andamento (limitadas por RECHECK_MAX_IN_FLIGHT)
+RECHECK_IN_FLIGHT_CHUNKS = Gauge(
+    "recheck_in_flight_chunks",
+    "Blocos de rechecagem despachados e ainda não concluídos",
+    ["kind"],
+)
+
+#Itens vencidos que ficaram para os próximos ciclos
+RECHECK_DUE_BACKLOG = Gauge(
+    "recheck_due_backlog",
+    "Itens vencidos aguardando rechecagem no índice de vencimentos",
+    ["kind"],
+)
+
 
 # ---------- LOGGING METRICS ----------
 LOG_ENTRIES_TOTAL = Counter(
@@ -1,4 +1,4 @@
-""" Modelos SQLAlchemy para produtos monitorados e concorrentes """
+""" Modelos SQLAlchemy para itens canônicos, produtos monitorados e concorrentes """
 
 import uuid
 from datetime import datetime, timezone
@@ -11,6 +11,46 @@ from infra.db import Base
 from alert_app.enums.enums_products import MonitoringType, MonitoredStatus, ProductStatus
 
 
+# ---------- ITEM CANÔNICO ----------
+class CanonicalItem(Base):
+    """ Anúncio do Mercado Livre identificado pelo código MLB
+
+    Guarda uma única vez o último estado coletado do anúncio; produtos
+    monitorados e concorrentes que apontam para a mesma página o referenciam.
+    """
+
+    __tablename__ = "canonical_items"
+
+    #Código do anúncio extraído da URL (ex.: MLB123456789)
+    mlb_id = Column(String(32), primary_key=True)
+    canonical_url = Column(Text, nullable=False)
+
+    #Último estado coletado
+    name = Column(String, nullable=True)
+    current_price = Column(Numeric(10,2), nullable=True)
+    old_price = Column(Numeric(10,2), nullable=True)
+    free_shipping = Column(Boolean, default=False)
+    seller = Column(String, nullable=True)
+    thumbnail = Column(Text, nullable=True)
+
+    #Cache condicional
+    etag = Column(String, nullable=True)
+    last_modified = Column(DateTime(timezone=True), nullable=True)
+
+    #Itens nunca coletados ficam nulos e têm prioridade na rechecagem
+    last_checked = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    #Assinantes do item
+    monitored_products = relationship("MonitoredProduct", back_populates="canonical_item")
+    competitor_products = relationship("CompetitorProduct", back_populates="canonical_item")
+
+    def __repr__(self):
+        return f"<CanonicalItem(mlb_id={self.mlb_id}, price={self.current_price})>"
+
+
 # ---------- PRODUTO MONITORADO ----------
 class MonitoredProduct(Base):
     """ Produto que será acompanhado pelo usuário """
@@ -32,6 +72,7 @@ class MonitoredProduct(Base):
     #Para produtos via API (search_query) e scraping (product_url)
     search_query = Column(String, nullable=True, index=True)
     product_url = Column(Text, nullable=False)
+    canonical_item_id = Column(String(32), ForeignKey("canonical_items.mlb_id"), nullable=True, index=True)
 
     target_price = Column(Numeric(10,2), nullable=True)
     current_price = Column(Numeric(10,2), nullable=True)
@@ -49,7 +90,8 @@ class MonitoredProduct(Base):
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
-    #Relacionamento com CompetitorProduct
+    #Relacionamentos com o item canônico e CompetitorProduct
+    canonical_item = relationship("CanonicalItem", back_populates="monitored_products")
     competitors = relationship("CompetitorProduct", back_populates="monitored_product", cascade="all, delete-orphan")
     scraping_errors = relationship("ScrapingError", back_populates="product", cascade="all, delete-orphan", lazy="dynamic")
 
@@ -81,6 +123,7 @@ class CompetitorProduct(Base):
     #Dados do concorrente
     name_competitor = Column("name", String, nullable=False)
     product_url = Column(Text, nullable=False)
+    canonical_item_id = Column(String(32), ForeignKey("canonical_items.mlb_id"), nullable=True, index=True)
 
     current_price = Column(Numeric(10,2), nullable=False)
     old_price = Column(Numeric(10,2), nullable=True)
@@ -100,8 +143,9 @@ class CompetitorProduct(Base):
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
-    #Relacionamento com MonitoredProduct
+    #Relacionamentos com MonitoredProduct e o item canônico
     monitored_product = relationship("MonitoredProduct", back_populates="competitors")
+    canonical_item = relationship("CanonicalItem", back_populates="competitor_products")
 
     def __repr__(self):
         return (
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-import asyncio
 import structlog
 
+from utils.worker_loop import run_coroutine
+
 logger = structlog.get_logger("notifications")
 
 
 class NotificationChannel(ABC):
     """ Interface base de envio de notificações """
     def send(self, user, subject: str, message: str):
-        """ Executa ``send_async`` de forma síncrona """
-        return asyncio.run(self.send_async(user, subject, message))
+        """ Executa ``send_async`` de forma síncrona no loop persistente do worker """
+        return run_coroutine(self.send_async(user, subject, message))
 
     @abstractmethod
     async def send_async(self, user, subject: str, message: str) -> dict | None:
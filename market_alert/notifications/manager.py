@@ -19,6 +19,7 @@ import time
 import structlog
 from sqlalchemy.orm import Session
 
+from utils.worker_loop import run_coroutine
 from alert_app.crud.crud_user import get_user_by_id
 from alert_app.crud.crud_alert_rules import update_last_notified, get_alert_rules_or_default, get_active_alert_rules_for_product as crud_get_active_rules
 from alert_app.crud.crud_notification_logs import create_notification_log, has_recent_duplicate_notification
@@ -144,8 +145,8 @@ class NotificationManager:
         try:
             asyncio.get_running_loop()
         except RuntimeError:
-            #Sem loop running -> executa de forma síncrona
-            asyncio.run(coro)
+            #Sem loop running -> executa no loop persistente do worker
+            run_coroutine(coro)
         else:
             #Dentro de um loop -> retorna a coroutine para ser aguardada
             return coro
@@ -163,7 +164,7 @@ class NotificationManager:
                 )
             await asyncio.gather(*tasks)
 
-        asyncio.run(_dispatch())
+        run_coroutine(_dispatch())
 
 def get_notification_manager() -> NotificationManager:
     """ Cria uma instância de ´NotificationManager´ com os canais padrão """
@@ -22,6 +22,8 @@ class MonitoredScrapedInfo(BaseModel):
     current_price: Decimal
     thumbnail: Optional[str] = None
     free_shipping: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
 
 
 class MonitoredProductResponse(BaseModel):
@@ -58,6 +60,20 @@ class CompetitorScrapedInfo(BaseModel):
     free_shipping: bool = False
     seller: Optional[str] = None
     seller_rating: Optional[float] = None
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+
+class CanonicalScrapedInfo(BaseModel):
+    """ Estado coletado de um item canônico, replicado aos seus assinantes """
+    name: Optional[str] = None
+    current_price: Decimal
+    old_price: Optional[Decimal] = None
+    thumbnail: Optional[str] = None
+    free_shipping: bool = False
+    seller: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
 
 
 class CompetitorProductResponse(BaseModel):
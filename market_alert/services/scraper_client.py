@@ -3,16 +3,38 @@
 Este módulo centraliza as requisições ao ``market_scraper``,
 fornecendo tratamento de erros e mensagens mais claras
 para os chamadores.
+
+As chamadas usam um pool de conexões ``keep-alive`` compartilhado pelo
+processo (e um por event loop na versão assíncrona). Dentro de uma task
+Celery o timeout de cada chamada é limitado ao que resta do
+``soft_time_limit``, evitando que a task seja interrompida no meio da
+requisição.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Sequence
 
-import requests
+import httpx
+import structlog
+from celery import current_task
+from celery.signals import task_prerun
 
 from alert_app.core.config import settings
+from alert_app.metrics import SCRAPER_CLIENT_POOL_OCCUPANCY, SCRAPER_CLIENT_REQUEST_SECONDS
+
+
+logger = structlog.get_logger("scraper_client")
 
 
 class ScraperClientError(Exception):
@@ -26,11 +48,191 @@ class ScraperClientError(Exception):
         super().__init__(message)
         self.status_code = status_code
 
+def conditional_fields(etag: str | None, last_modified: datetime | None) -> Dict[str, str]:
+    """ Monta os validadores enviados ao ``market_scraper`` em rechecagens
+
+    Com eles o scraper faz uma requisição condicional e responde
+    ``not_modified`` quando o anúncio não mudou desde a última coleta.
+    """
+    fields: Dict[str, str] = {}
+    if etag:
+        fields["etag"] = etag
+    if last_modified:
+        fields["last_modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return fields
+
+def parse_last_modified(value: str | None) -> datetime | None:
+    """ Converte o ``Last-Modified`` (data HTTP) devolvido pelo scraper em ``datetime`` """
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+#Início da task Celery em execução em cada thread do worker
+_task_start = threading.local()
+
+@task_prerun.connect
+def _mark_task_start(sender=None, task_id=None, **extra) -> None:
+    """ Registra quando a task atual começou para calcular o prazo restante """
+    _task_start.value = (task_id, time.monotonic())
+
+def remaining_task_time() -> float | None:
+    """ Segundos até o ``soft_time_limit`` da task Celery atual
+
+    Retorna ``None`` fora de uma task ou quando não há limite configurado.
+    """
+    #``current_task`` é um proxy e avalia como falso fora de uma task
+    task = current_task
+    if not task or task.request.called_directly:
+        return None
+    timelimit = task.request.timelimit or (None, None)
+    soft_limit = timelimit[1] or task.soft_time_limit or task.app.conf.task_soft_time_limit
+    started = getattr(_task_start, "value", None)
+    if not soft_limit or not started or started[0] != task.request.id:
+        return None
+    return soft_limit - (time.monotonic() - started[1])
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.SCRAPER_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.SCRAPER_CLIENT_MAX_KEEPALIVE,
+        keepalive_expiry=settings.SCRAPER_CLIENT_KEEPALIVE_EXPIRY,
+    )
+
+class _ConnectionPool:
+    """ Clientes ``httpx`` compartilhados: um por processo e um por event loop """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sync: httpx.Client | None = None
+        self._pid: int | None = None
+        #Clientes assíncronos ficam presos ao loop em que foram criados
+        self._async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self._in_flight: Dict[str, int] = {"sync": 0, "async": 0}
+
+    def sync_client(self) -> httpx.Client:
+        with self._lock:
+            #Conexões herdadas no fork do worker prefork não são reaproveitadas
+            if self._sync is None or self._pid != os.getpid():
+                self._sync = httpx.Client(limits=_limits(), timeout=settings.SCRAPER_CLIENT_TIMEOUT)
+                self._pid = os.getpid()
+            return self._sync
+
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async.get(loop)
+        if client is None or client.is_closed:
+            client = self._async[loop] = httpx.AsyncClient(limits=_limits(), timeout=settings.SCRAPER_CLIENT_TIMEOUT)
+        return client
+
+    @contextmanager
+    def track(self, mode: str) -> Iterator[None]:
+        """ Conta a chamada como conexão em uso e registra a ocupação do pool """
+        with self._lock:
+            self._in_flight[mode] += 1
+            occupancy = self._in_flight[mode] / settings.SCRAPER_CLIENT_MAX_CONNECTIONS
+        SCRAPER_CLIENT_POOL_OCCUPANCY.labels(mode=mode).observe(min(occupancy, 1.0))
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight[mode] -= 1
+
+    def close(self) -> None:
+        """ Fecha o cliente síncrono do processo """
+        with self._lock:
+            if self._sync is not None:
+                self._sync.close()
+                self._sync = None
+
+_pool = _ConnectionPool()
+
+@contextmanager
+def _measure(endpoint: str, mode: str) -> Iterator[None]:
+    """ Mede a latência da chamada por endpoint e resultado """
+    start = time.perf_counter()
+    outcome = "success"
+    with _pool.track(mode):
+        try:
+            yield
+        except ScraperClientError as exc:
+            outcome = "http_error" if exc.status_code else "error"
+            raise
+        finally:
+            SCRAPER_CLIENT_REQUEST_SECONDS.labels(endpoint=endpoint, outcome=outcome).observe(time.perf_counter() - start)
+
+def _client_error(exc: httpx.HTTPError) -> ScraperClientError:
+    """ Converte erros do ``httpx`` em ``ScraperClientError`` """
+    if isinstance(exc, httpx.TimeoutException):
+        return ScraperClientError("Tempo limite excedido ao chamar o serviço de scraping")
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return ScraperClientError(f"Erro HTTP {status} ao chamar o serviço de scraping", status)
+    return ScraperClientError(f"Falha na comunicação com o serviço de scraping: {exc}")
+
+def _chunks(items: Sequence[Dict[str, Any]]) -> Iterator[Sequence[Dict[str, Any]]]:
+    size = max(settings.SCRAPER_CLIENT_BATCH_SIZE, 1)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _batch_body(items: Sequence[Dict[str, Any]], concurrency: int | None) -> Dict[str, Any]:
+    body: Dict[str, Any] = {"items": list(items)}
+    if concurrency:
+        body["concurrency"] = concurrency
+    return body
+
+class _BatchCollector:
+    """ Junta as linhas NDJSON de um lote e preenche os itens sem resposta """
+
+    def __init__(self, items: Sequence[Dict[str, Any]], timeout: float, offset: int = 0) -> None:
+        self.items = items
+        #Posição do lote na lista original, para o ``index`` devolvido ao chamador
+        self.offset = offset
+        self.deadline = time.monotonic() + timeout
+        self.lines: Dict[int, Dict[str, Any]] = {}
+
+    def feed(self, line: str) -> bool:
+        """ Registra uma linha e indica se a leitura deve continuar """
+        if line:
+            item = json.loads(line)
+            self.lines[item["index"]] = item
+        return len(self.lines) < len(self.items) and time.monotonic() < self.deadline
+
+    def fail(self, exc: httpx.HTTPError) -> None:
+        """ Sem nenhum resultado o lote falha; caso contrário mantém o que chegou """
+        error = _client_error(exc)
+        if not self.lines:
+            raise error from exc
+        logger.warning("scraper_batch_interrupted", error=str(error), received=len(self.lines), items=len(self.items))
+
+    def results(self) -> List[Dict[str, Any]]:
+        missing = {"status_code": 504, "data": None, "detail": "Sem resposta do lote dentro do prazo"}
+        return [
+            (self.lines.get(index) or {"url": item.get("url"), **missing}) | {"index": self.offset + index}
+            for index, item in enumerate(self.items)
+        ]
+
 @dataclass
 class ScraperClient:
-    """ Cliente simples para interagir com o ``market_scraper`` """
+    """ Cliente do ``market_scraper`` com conexões reaproveitadas entre chamadas
+
+    Todas as instâncias compartilham o pool do processo (``_pool``), então
+    criar um ``ScraperClient`` por chamada não abre novas conexões.
+    """
 
     base_url: str = settings.SCRAPER_SERVICE_URL
+    timeout: float = settings.SCRAPER_CLIENT_TIMEOUT
+
+    def _call_timeout(self) -> float:
+        """ Timeout da chamada limitado ao tempo restante da task Celery atual """
+        remaining = remaining_task_time()
+        if remaining is None:
+            return self.timeout
+        if remaining < settings.SCRAPER_CLIENT_MIN_TIMEOUT:
+            raise ScraperClientError("Prazo da task esgotado antes da chamada ao serviço de scraping")
+        return min(self.timeout, remaining)
 
     def parse(self, url: str, product_type: str, **extra: Any) -> Dict[str, Any]:
         """ Envia requisição ``POST`` ao endpoint de parsing
@@ -44,29 +246,100 @@ class ScraperClient:
             Dicionário com os dados retornados pelo serviço de scraping
 
         Raises:
-            ScraperClientError: Em casos de ``timeout`` ou respostas ``4xx/5xx``
+            ScraperClientError: Em casos de ``timeout``, respostas ``4xx/5xx``
+                ou prazo da task esgotado
         """
 
         payload = {"url": url, "product_type": product_type} | extra
+        timeout = self._call_timeout()
 
-        try:
-            resp = requests.post(
-                f"{self.base_url}/scraper/parse",
-                json=payload,
-                timeout=30,
-            )
-            resp.raise_for_status()
-            return resp.json()
-        except requests.Timeout as exc:
-            raise ScraperClientError(
-                "Tempo limite excedido ao chamar o serviço de scraping"
-            ) from exc
-        except requests.HTTPError as exc:
-            status = exc.response.status_code if exc.response else 500
-            raise ScraperClientError(
-                f"Erro HTTP {status} ao chamar o serviço de scraping", status
-            ) from exc
-        except requests.RequestException as exc:
-            raise ScraperClientError(
-                f"Falha na comunicação com o serviço de scraping: {exc}"
-            ) from exc
+        with _measure("parse", "sync"):
+            try:
+                resp = _pool.sync_client().post(
+                    f"{self.base_url}/scraper/parse",
+                    json=payload,
+                    timeout=timeout,
+                )
+                resp.raise_for_status()
+                return resp.json()
+            except httpx.HTTPError as exc:
+                raise _client_error(exc) from exc
+
+    async def aparse(self, url: str, product_type: str, **extra: Any) -> Dict[str, Any]:
+        """ Versão assíncrona de :meth:`parse` para uso dentro de event loops """
+
+        payload = {"url": url, "product_type": product_type} | extra
+        timeout = self._call_timeout()
+
+        with _measure("parse", "async"):
+            try:
+                resp = await _pool.async_client().post(
+                    f"{self.base_url}/scraper/parse",
+                    json=payload,
+                    timeout=timeout,
+                )
+                resp.raise_for_status()
+                return resp.json()
+            except httpx.HTTPError as exc:
+                raise _client_error(exc) from exc
+
+    def parse_batch(self, items: Sequence[Dict[str, Any]], concurrency: int | None = None) -> List[Dict[str, Any]]:
+        """ Envia vários itens ao endpoint ``/scraper/parse/batch``
+
+        Os itens são enviados em lotes de ``SCRAPER_CLIENT_BATCH_SIZE`` e o
+        NDJSON é lido conforme chega. Cada item tem os mesmos campos do
+        ``payload`` de :meth:`parse` (``url``, ``product_type`` e extras).
+
+        Returns:
+            Uma entrada por item, na ordem de ``items``, com ``status_code``,
+            ``data`` e ``detail`` no formato de ``/scraper/parse``. Itens sem
+            resposta dentro do prazo da task voltam com ``status_code`` ``504``
+
+        Raises:
+            ScraperClientError: Quando o lote inteiro falha antes de qualquer resultado
+        """
+
+        results: List[Dict[str, Any]] = []
+        for chunk in _chunks(items):
+            timeout = self._call_timeout()
+            collector = _BatchCollector(chunk, timeout, offset=len(results))
+            with _measure("parse_batch", "sync"):
+                try:
+                    with _pool.sync_client().stream(
+                        "POST",
+                        f"{self.base_url}/scraper/parse/batch",
+                        json=_batch_body(chunk, concurrency),
+                        timeout=timeout,
+                    ) as resp:
+                        resp.raise_for_status()
+                        for line in resp.iter_lines():
+                            if not collector.feed(line):
+                                break
+                except httpx.HTTPError as exc:
+                    collector.fail(exc)
+            results.extend(collector.results())
+        return results
+
+    async def aparse_batch(self, items: Sequence[Dict[str, Any]], concurrency: int | None = None) -> List[Dict[str, Any]]:
+        """ Versão assíncrona de :meth:`parse_batch` """
+
+        results: List[Dict[str, Any]] = []
+        for chunk in _chunks(items):
+            timeout = self._call_timeout()
+            collector = _BatchCollector(chunk, timeout, offset=len(results))
+            with _measure("parse_batch", "async"):
+                try:
+                    async with _pool.async_client().stream(
+                        "POST",
+                        f"{self.base_url}/scraper/parse/batch",
+                        json=_batch_body(chunk, concurrency),
+                        timeout=timeout,
+                    ) as resp:
+                        resp.raise_for_status()
+                        async for line in resp.aiter_lines():
+                            if not collector.feed(line):
+                                break
+                except httpx.HTTPError as exc:
+                    collector.fail(exc)
+            results.extend(collector.results())
+        return results
@@ -10,11 +10,9 @@ from decimal import Decimal
 from datetime import datetime, timezone
 from uuid import UUID
 
-import httpx
 import structlog
 from sqlalchemy.orm import Session
 
-from alert_app.core.config import settings
 from utils.circuit_breaker import CircuitBreaker
 from utils.rate_limiter import RateLimiter
 from alert_app.utils.block_recovery import BlockRecoveryManager
@@ -41,14 +39,10 @@ async def _scrape_competitor_product(
 ) -> dict:
     """ Executa o scraping de concorrentes de forma assíncrona """
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.SCRAPER_SERVICE_URL}/scraper/parse",
-            json={"url": url, "product_type": "competitor"},
-            timeout=30,
-        )
-        resp.raise_for_status()
-        details = resp.json()
+    details = await ScraperClient().aparse(
+        url=url,
+        product_type="competitor",
+    )
 
     competitor = create_or_update_competitor_product_scraped(
         db=db,
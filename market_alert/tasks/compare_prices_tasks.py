@@ -5,8 +5,16 @@ um produto monitorado e todos os seus concorrentes, executa a comparação de
 preços e registra métricas para acompanhamento. O ``rate_limit`` definido no
 decorador limita quantas comparações cada worker pode iniciar por minuto e é
 independente da lógica que agenda novas verificações.
+
+As coletas agendam a comparação por ``request_price_comparison``, que agrupa
+rajadas: um produto com vários concorrentes atualizados em sequência é
+comparado uma única vez, ``COMPARE_DEBOUNCE_WINDOW`` segundos após a última
+atualização (ou ``COMPARE_DEBOUNCE_MAX_WAIT`` após a primeira, se elas não
+pararem de chegar).
 """
 
+import time
+
 import structlog
 from uuid import UUID
 from datetime import datetime, timezone
@@ -18,20 +26,90 @@ from utils.redis_client import get_redis_client
 from alert_app.utils.logging_utils import mask_identifier
 from alert_app.services.services_comparison import run_price_comparison
 from alert_app.tasks.alert_tasks import send_notification_task
-from alert_app.metrics import SCRAPING_LATENCY_SECONDS
+from alert_app.metrics import SCRAPING_LATENCY_SECONDS, PRICE_COMPARISON_REQUESTS_TOTAL
 from alert_app.core.config import settings
 
 
 logger = structlog.get_logger("compare_prices")
 redis_client = get_redis_client()
 
+#Silêncio exigido após a última atualização e espera máxima de uma rajada (segundos)
+COMPARE_DEBOUNCE_WINDOW = settings.COMPARE_DEBOUNCE_WINDOW
+COMPARE_DEBOUNCE_MAX_WAIT = settings.COMPARE_DEBOUNCE_MAX_WAIT
+
+def _pending_key(monitored_id: str) -> str:
+    """ Início (epoch) da rajada com comparação já enfileirada """
+    return f"compare:pending:{monitored_id}"
+
+def _last_update_key(monitored_id: str) -> str:
+    """ Instante (epoch) da atualização mais recente da rajada """
+    return f"compare:last_update:{monitored_id}"
+
+def request_price_comparison(monitored_id: str) -> bool:
+    """ Agenda a comparação do produto agrupando pedidos próximos
+
+    O primeiro pedido de uma rajada enfileira ``compare_prices_task`` com
+    ``countdown`` igual à janela; os seguintes apenas registram o instante da
+    atualização. Retorna ``True`` quando uma nova task foi enfileirada.
+    """
+    monitored_id = str(monitored_id)
+    if COMPARE_DEBOUNCE_WINDOW <= 0:
+        compare_prices_task.delay(monitored_id)
+        PRICE_COMPARISON_REQUESTS_TOTAL.labels(outcome="scheduled").inc()
+        return True
+
+    now = time.time()
+    #As chaves sobrevivem à rajada mais longa, com folga para filas atrasadas
+    ttl = int(COMPARE_DEBOUNCE_MAX_WAIT + COMPARE_DEBOUNCE_WINDOW) * 4
+    redis_client.set(_last_update_key(monitored_id), now, ex=ttl)
+    if not redis_client.set(_pending_key(monitored_id), now, nx=True, ex=ttl):
+        PRICE_COMPARISON_REQUESTS_TOTAL.labels(outcome="coalesced").inc()
+        return False
+
+    compare_prices_task.apply_async(args=[monitored_id], kwargs={"debounced": True}, countdown=COMPARE_DEBOUNCE_WINDOW)
+    PRICE_COMPARISON_REQUESTS_TOTAL.labels(outcome="scheduled").inc()
+    return True
+
+def _defer_comparison(monitored_id: str) -> bool:
+    """ Reagenda a comparação se a rajada ainda não terminou
+
+    Sem rajada em aberto (ex.: retentativa) a comparação segue. Ao seguir, a
+    rajada é encerrada antes da comparação: atualizações que chegarem durante
+    ela abrem uma nova rajada e, portanto, uma nova comparação.
+    """
+    first = redis_client.get(_pending_key(monitored_id))
+    if first is None:
+        return False
+    last = redis_client.get(_last_update_key(monitored_id)) or first
+    now = time.time()
+    quiet = now - float(last)
+    if quiet < COMPARE_DEBOUNCE_WINDOW and now - float(first) < COMPARE_DEBOUNCE_MAX_WAIT:
+        compare_prices_task.apply_async(
+            args=[monitored_id],
+            kwargs={"debounced": True},
+            countdown=COMPARE_DEBOUNCE_WINDOW - quiet,
+        )
+        PRICE_COMPARISON_REQUESTS_TOTAL.labels(outcome="deferred").inc()
+        return True
+    redis_client.delete(_pending_key(monitored_id))
+    return False
+
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=10, name="compare_prices_task", rate_limit=settings.COMPARE_RATE_LIMIT, queue="monitor")
-def compare_prices_task(self, monitored_id: str) -> None:
-    """ Carrega um produto monitorado e executa a comparação de preços """
+def compare_prices_task(self, monitored_id: str, debounced: bool = False) -> None:
+    """ Carrega um produto monitorado e executa a comparação de preços
+
+    Com ``debounced`` (agendada por ``request_price_comparison``) a
+    comparação é adiada enquanto o produto continua recebendo atualizações.
+    """
     task_logger = logger.bind(task_id=self.request.id, monitored_id=mask_identifier(monitored_id))
+    if debounced and _defer_comparison(monitored_id):
+        task_logger.info("compare_prices_deferred")
+        return
+
     start = datetime.now(timezone.utc)
     status = "success"
 
+    PRICE_COMPARISON_REQUESTS_TOTAL.labels(outcome="executed").inc()
     task_logger.info("compare_prices_started")
 
     with SessionLocal() as db:
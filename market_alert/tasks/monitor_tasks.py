@@ -2,26 +2,60 @@
 
 As funções deste Módulo são executadas pelo Celery Beat e têm como objetivo
 despachar novas coletas de produtos e concorrentes, além de iniciar a
-comparação de preços.
+comparação de preços. ``recheck_canonical_items`` coleta cada anúncio uma
+única vez e replica o resultado a todos os seus assinantes; os anúncios
+vencidos saem do índice de vencimentos ``recheck:due:canonical``, com o
+código MLB como membro, alimentado pela mesma varredura por chave descrita
+abaixo.
+
+``recheck_monitored_products`` e ``recheck_competitor_products`` cobrem
+apenas os produtos sem item canônico (URLs sem código MLB), que a
+rechecagem por item não alcança. Elas escolhem os itens pelo índice de
+vencimentos (``DueIndex``): cada ciclo reivindica apenas os itens vencidos,
+do mais atrasado ao mais recente, e os reagenda conforme o resultado da
+coleta. O catálogo não é carregado inteiro: cada ciclo lê
+apenas ``id`` e ``last_checked`` de uma página (paginação por chave) a
+partir de um cursor salvo no Redis, percorrendo todos os itens ao longo dos
+ciclos.
+
+A coleta não acontece na task do Beat: os itens reivindicados são
+divididos em blocos e despachados num ``chord``. Cada bloco
+(``recheck_canonical_chunk``/``recheck_monitored_chunk``/
+``recheck_competitor_chunk``) coleta em lote,
+persiste os itens alterados e os reagenda; o callback ``finish_recheck``
+agenda a comparação de preços uma vez por produto monitorado alterado. No
+máximo ``RECHECK_MAX_IN_FLIGHT`` blocos de cada tipo ficam em andamento.
 """
 
 from datetime import datetime, timezone
+from uuid import UUID, uuid4
+from decimal import Decimal
 import time
 import os
 
 import structlog
+from celery import chord, group
 
 from alert_app.core.config import settings
 from alert_app.core.celery_app import celery_app
 from infra.db import SessionLocal
 from utils.redis_client import get_redis_client, is_scraping_suspended
+from utils.due_index import DueIndex, MONITORED_DUE_KEY, COMPETITOR_DUE_KEY, CANONICAL_DUE_KEY
 
 from alert_app.enums.enums_products import MonitoringType
-from alert_app.crud.crud_monitored import get_products_by_type
-from alert_app.crud.crud_competitor import get_all_competitor_products
-from alert_app.tasks.compare_prices_tasks import compare_prices_task
-from alert_app.metrics import SCRAPING_LATENCY_SECONDS
-from utils.scraper_client import ScraperClient, ScraperClientError
+from alert_app.crud.crud_monitored import iter_product_check_times, get_monitored_products_by_ids, create_or_update_monitored_product_scraped
+from alert_app.crud.crud_competitor import iter_competitor_check_times, get_competitor_products_by_ids, create_or_update_competitor_product_scraped
+from alert_app.crud.crud_canonical_items import iter_canonical_check_times, get_canonical_items_by_ids, mark_canonical_item_checked, apply_scraped_item
+from alert_app.schemas.schemas_products import (
+    CanonicalScrapedInfo,
+    MonitoredProductCreateScraping,
+    MonitoredScrapedInfo,
+    CompetitorProductCreateScraping,
+    CompetitorScrapedInfo,
+)
+from alert_app.tasks.compare_prices_tasks import request_price_comparison
+from alert_app.metrics import SCRAPING_LATENCY_SECONDS, RECHECK_SWEEP_ROWS_TOTAL, RECHECK_SWEEP_WRAPS_TOTAL, RECHECK_IN_FLIGHT_CHUNKS
+from utils.scraper_client import ScraperClient, ScraperClientError, conditional_fields, parse_last_modified
 
 
 logger = structlog.get_logger("monitor_tasks")
@@ -31,15 +65,177 @@ scraper_client = ScraperClient()
 #Batch sizes configurado via .env
 BATCH_SIZE_SCRAPING = int(os.getenv("BATCH_SIZE_SCRAPING", "10"))
 BATCH_SIZE_COMPETITOR = int(os.getenv("BATCH_SIZE_COMPETITOR", "20"))
+BATCH_SIZE_ITEMS = int(os.getenv("BATCH_SIZE_ITEMS", "30"))
 
 #Intervalo base usado para reagendamentos automáticos adaptativos
 ADAPTIVE_RECHECK_BASE_INTERVAL = settings.ADAPTIVE_RECHECK_BASE_INTERVAL
 
+#Reserva dos itens reivindicados; itens com falha voltam a vencer ao fim dela
+RECHECK_CLAIM_LEASE = settings.RECHECK_CLAIM_LEASE
+
+#Linhas do catálogo varridas por ciclo e tamanho dos blocos lidos do banco
+RECHECK_SWEEP_SIZE = settings.RECHECK_SWEEP_SIZE
+RECHECK_SWEEP_CHUNK = settings.RECHECK_SWEEP_CHUNK
+
+#Itens por task de coleta e máximo de tasks de coleta em andamento por tipo
+RECHECK_CHUNK_SIZE = settings.RECHECK_CHUNK_SIZE
+RECHECK_MAX_IN_FLIGHT = settings.RECHECK_MAX_IN_FLIGHT
+
+def _sweep(index: DueIndex, page, key=UUID) -> int:
+    """ Inclui no índice os itens novos da próxima página do catálogo
+
+    ``page(after, limit, chunk_size)`` devolve ``(id, last_checked)`` em ordem
+    de ID a partir de ``after`` (convertido com ``key``: ``UUID`` para
+    produtos, ``str`` para códigos MLB). O último ID lido fica em
+    ``recheck:cursor:<kind>`` e o ciclo seguinte continua dali; uma página
+    incompleta encerra a volta pelo catálogo e o cursor recomeça do início.
+    Itens novos vencem ``ADAPTIVE_RECHECK_BASE_INTERVAL`` após a última
+    checagem (ou imediatamente, se nunca foram checados); os já agendados
+    mantêm o vencimento.
+    """
+    cursor_key = f"recheck:cursor:{index.kind}"
+    raw = redis_client.get(cursor_key)
+    try:
+        after = key(raw.decode("utf-8") if isinstance(raw, bytes) else raw) if raw else None
+    except ValueError:
+        after = None
+
+    now = time.time()
+    due: dict[str, float] = {}
+    last = None
+    for item_id, last_checked in page(after, RECHECK_SWEEP_SIZE, RECHECK_SWEEP_CHUNK):
+        due[str(item_id)] = last_checked.timestamp() + ADAPTIVE_RECHECK_BASE_INTERVAL if last_checked else now
+        last = item_id
+    index.schedule_many(due, only_new=True)
+
+    RECHECK_SWEEP_ROWS_TOTAL.labels(kind=index.kind).inc(len(due))
+    if len(due) < RECHECK_SWEEP_SIZE:
+        redis_client.delete(cursor_key)
+        RECHECK_SWEEP_WRAPS_TOTAL.labels(kind=index.kind).inc()
+    else:
+        redis_client.set(cursor_key, str(last))
+    return len(due)
+
+def _claim_due(index: DueIndex, page, limit: int, key=UUID) -> list[str]:
+    """ Varre a próxima página do catálogo e reivindica os ``limit`` itens mais atrasados """
+    _sweep(index, page, key)
+    now = time.time()
+    claimed = index.claim(limit, now=now)
+    index.backlog(now=now)
+    return claimed
+
+def _load_claimed(index: DueIndex, claimed: list[str], loader, db) -> list:
+    """ Carrega os itens reivindicados na ordem de vencimento
+
+    IDs sem registro no banco (itens excluídos) e itens que passaram a ter
+    item canônico (rechecados por ``recheck_canonical_items``) saem do índice.
+    """
+    ids = []
+    for member in claimed:
+        try:
+            ids.append(UUID(member))
+        except ValueError:
+            index.remove(member)
+    found = {
+        str(item.id): item
+        for item in loader(db, ids)
+        if getattr(item, "canonical_item_id", None) is None
+    }
+    missing = [member for member in claimed if member not in found]
+    if missing:
+        index.remove(*missing)
+    return [found[member] for member in claimed if member in found]
+
+def _load_canonical(index: DueIndex, claimed: list[str], db) -> list:
+    """ Carrega os itens canônicos reivindicados na ordem de vencimento
+
+    Itens excluídos ou que perderam todos os assinantes saem do índice.
+    """
+    found = {item.mlb_id: item for item in get_canonical_items_by_ids(db, claimed)}
+    missing = [member for member in claimed if member not in found]
+    if missing:
+        index.remove(*missing)
+    return [found[member] for member in claimed if member in found]
+
+def _reschedule(index: DueIndex, item_ids: list[str]) -> None:
+    """ Reagenda os itens coletados com sucesso; os demais vencem ao fim da reserva """
+    next_check = time.time() + ADAPTIVE_RECHECK_BASE_INTERVAL
+    for item_id in item_ids:
+        index.schedule(item_id, next_check)
+
+def _in_flight_key(kind: str) -> str:
+    """ Sorted set com os blocos de coleta em andamento (score = início em epoch) """
+    return f"recheck:inflight:{kind}"
+
+def _free_slots(kind: str) -> int:
+    """ Blocos que ainda podem ser despachados sem ultrapassar ``RECHECK_MAX_IN_FLIGHT``
+
+    Blocos iniciados há mais de ``RECHECK_CLAIM_LEASE`` (worker encerrado no
+    meio da coleta) deixam de ocupar vaga.
+    """
+    key = _in_flight_key(kind)
+    redis_client.zremrangebyscore(key, "-inf", time.time() - RECHECK_CLAIM_LEASE)
+    in_flight = int(redis_client.zcard(key))
+    RECHECK_IN_FLIGHT_CHUNKS.labels(kind=kind).set(in_flight)
+    return max(0, RECHECK_MAX_IN_FLIGHT - in_flight)
+
+def _release_slot(kind: str, chunk_id: str) -> None:
+    """ Libera a vaga do bloco concluído """
+    redis_client.zrem(_in_flight_key(kind), chunk_id)
+
+def _fan_out(log, kind: str, chunk_task, items: list[dict]) -> int:
+    """ Divide os itens em blocos de ``RECHECK_CHUNK_SIZE`` e os despacha em um ``chord``
+
+    Cada bloco é uma task ``chunk_task`` que coleta e persiste seus itens e
+    devolve os produtos monitorados alterados; ``finish_recheck`` recebe as
+    listas de todos os blocos e agenda a comparação uma vez por produto.
+    Retorna a quantidade de blocos despachados.
+    """
+    if not items:
+        return 0
+    chunks = [items[i:i + RECHECK_CHUNK_SIZE] for i in range(0, len(items), RECHECK_CHUNK_SIZE)]
+    chunk_ids = [uuid4().hex for _ in chunks]
+    now = time.time()
+    redis_client.zadd(_in_flight_key(kind), {chunk_id: now for chunk_id in chunk_ids})
+    header = group(chunk_task.s(chunk_id, chunk) for chunk_id, chunk in zip(chunk_ids, chunks))
+    chord(header)(finish_recheck.s(kind))
+    log.info("recheck_fan_out", kind=kind, items=len(items), chunks=len(chunks))
+    return len(chunks)
+
+def _monitored_scraped_info(details: dict) -> MonitoredScrapedInfo:
+    """ Converte a resposta do ``market_scraper`` nas informações do produto monitorado """
+    return MonitoredScrapedInfo(
+        current_price=Decimal(str(details.get("current_price", 0))),
+        thumbnail=details.get("thumbnail"),
+        free_shipping=details.get("free_shipping", False),
+        etag=details.get("etag"),
+        last_modified=parse_last_modified(details.get("last_modified")),
+    )
+
+def _competitor_scraped_info(details: dict) -> CompetitorScrapedInfo:
+    """ Converte a resposta do ``market_scraper`` nas informações do concorrente """
+    return CompetitorScrapedInfo(
+        name=details.get("name", ""),
+        current_price=Decimal(str(details.get("current_price", 0))),
+        old_price=Decimal(str(details.get("old_price")))
+        if details.get("old_price") is not None
+        else None,
+        thumbnail=details.get("thumbnail"),
+        free_shipping=details.get("free_shipping", False),
+        seller=details.get("seller"),
+        seller_rating=None,
+        etag=details.get("etag"),
+        last_modified=parse_last_modified(details.get("last_modified")),
+    )
+
 @celery_app.task(name="alert_app.tasks.monitor_tasks.recheck_monitored_products")
 def recheck_monitored_products() -> None:
-    """ Rechecagem periódica de produtos monitorados via scraping """
+    """ Rechecagem periódica de produtos monitorados via scraping
+
+    Reivindica os produtos vencidos que cabem nas vagas livres e os coleta
+    em paralelo, em blocos (``recheck_monitored_chunk``).
+    """
     start = time.time()
-    status = "success"
     log = logger.bind(phase="recheck_scraping")
 
     # Flag de suspensão global controlada via Redis
@@ -49,37 +245,38 @@ def recheck_monitored_products() -> None:
 
     with SessionLocal() as db:
         try:
-            products = get_products_by_type(db, MonitoringType.scraping)
-            batch = products[:BATCH_SIZE_SCRAPING]
-
-            for p in batch:
-                log.info(
-                    "chamada_market_scraper",
-                    product_url=p.product_url,
-                    monitored_id=str(p.id),
-                )
-                try:
-                    scraper_client.parse(
-                        url=p.product_url,
-                        product_type="monitored",
-                        monitored_id=str(p.id),
-                    )
-                except ScraperClientError as exc:
-                    status = "failure"
-                    log.error(
-                        "scraper_request_failed",
-                        error=str(exc),
-                        url=p.product_url,
-                    )
+            free = _free_slots("monitored")
+            if not free:
+                log.info("recheck_in_flight_cap", kind="monitored", max_in_flight=RECHECK_MAX_IN_FLIGHT)
+                return
+
+            index = DueIndex(MONITORED_DUE_KEY, lease=RECHECK_CLAIM_LEASE, redis=redis_client)
+            claimed = _claim_due(
+                index,
+                lambda after, limit, chunk: iter_product_check_times(db, MonitoringType.scraping, after, limit, chunk),
+                min(BATCH_SIZE_SCRAPING, free * RECHECK_CHUNK_SIZE),
+            )
+            batch = _load_claimed(index, claimed, get_monitored_products_by_ids, db)
+
+            chunks = _fan_out(log, "monitored", recheck_monitored_chunk, [
+                {
+                    "monitored_id": str(p.id),
+                    "user_id": str(p.user_id),
+                    "url": p.product_url,
+                    "name_identification": p.name_identification,
+                    "target_price": str(p.target_price),
+                    **conditional_fields(p.etag, p.last_modified),
+                }
+                for p in batch
+            ])
 
             elapsed_ms = int((time.time() - start) * 1000)
-            log.info("recheck_monitored_completed", status=status, duration_ms=elapsed_ms, dispatched=len(batch))
+            log.info("recheck_monitored_completed", duration_ms=elapsed_ms, dispatched=len(batch), chunks=chunks)
 
             #Atualizar heartbeat
             redis_client.set("beat:last_scraping", datetime.now(timezone.utc).isoformat())
 
         except Exception as exc:
-            status = "failure"
             elapsed_ms = int((time.time() - start) * 1000)
             log.error("recheck_monitored_failed", message=str(exc), duration_ms=elapsed_ms)
             raise
@@ -91,9 +288,13 @@ def recheck_monitored_products() -> None:
 
 @celery_app.task(name="alert_app.tasks.monitor_tasks.recheck_competitor_products")
 def recheck_competitor_products():
-    """ Rechecagem periódica de produtos concorrentes e comparação de preços """
+    """ Rechecagem periódica de produtos concorrentes e comparação de preços
+
+    Reivindica os concorrentes vencidos que cabem nas vagas livres e os
+    coleta em paralelo, em blocos (``recheck_competitor_chunk``); a
+    comparação é agendada ao final, uma vez por produto monitorado alterado.
+    """
     start = time.time()
-    status = "success"
     log = logger.bind(phase="recheck_competitors")
 
     # Flag de suspensão global controlada via Redis
@@ -103,45 +304,36 @@ def recheck_competitor_products():
 
     with SessionLocal() as db:
         try:
-            competitors = get_all_competitor_products(db)
-            batch = competitors[:BATCH_SIZE_COMPETITOR]
-            monitored_ids = set()
-
-            for c in batch:
-                monitored_ids.add(c.monitored_product_id)
-                log.info(
-                    "chamada_market_scraper_competitor",
-                    monitored_id=str(c.monitored_product_id),
-                    competitor_id=str(c.id),
-                    url=c.product_url,
-                )
-                try:
-                    scraper_client.parse(
-                        url=c.product_url,
-                        product_type="competitor",
-                        competitor_id=str(c.id),
-                        monitored_id=str(c.monitored_product_id),
-                    )
-                except ScraperClientError as exc:
-                    status = "failure"
-                    log.error(
-                        "scraper_competitor_failed",
-                        error=str(exc),
-                        url=c.product_url,
-                    )
+            free = _free_slots("competitor")
+            if not free:
+                log.info("recheck_in_flight_cap", kind="competitor", max_in_flight=RECHECK_MAX_IN_FLIGHT)
+                return
+
+            index = DueIndex(COMPETITOR_DUE_KEY, lease=RECHECK_CLAIM_LEASE, redis=redis_client)
+            claimed = _claim_due(
+                index,
+                lambda after, limit, chunk: iter_competitor_check_times(db, after, limit, chunk),
+                min(BATCH_SIZE_COMPETITOR, free * RECHECK_CHUNK_SIZE),
+            )
+            batch = _load_claimed(index, claimed, get_competitor_products_by_ids, db)
+
+            chunks = _fan_out(log, "competitor", recheck_competitor_chunk, [
+                {
+                    "competitor_id": str(c.id),
+                    "monitored_id": str(c.monitored_product_id),
+                    "url": c.product_url,
+                    **conditional_fields(c.etag, c.last_modified),
+                }
+                for c in batch
+            ])
 
             elapsed_ms = int((time.time() - start) * 1000)
-            log.info("recheck_competitors_completed", status=status, duration_ms=elapsed_ms, count=len(batch))
+            log.info("recheck_competitors_completed", duration_ms=elapsed_ms, count=len(batch), chunks=chunks)
 
             #Atualizar heartbeat
             redis_client.set("beat:last_competitor", datetime.now(timezone.utc).isoformat())
 
-            #Dispara uma nova task de comparação para cada produto monitorado afetado
-            for mp_id in monitored_ids:
-                compare_prices_task.delay(str(mp_id))
-
         except Exception as exc:
-            status = "failure"
             elapsed_ms = int((time.time() - start) * 1000)
             log.error("recheck_competitors_failed", message=str(exc), duration_ms=elapsed_ms)
             raise
@@ -150,3 +342,216 @@ def recheck_competitor_products():
             #Métricas Prometheus
             duration = time.time() - start
             SCRAPING_LATENCY_SECONDS.labels(source="monitor_competitor").observe(duration)
+
+#Chave do índice de vencimentos e campo identificador de cada tipo de bloco
+_CHUNK_KINDS = {
+    "monitored": (MONITORED_DUE_KEY, "monitored_id"),
+    "competitor": (COMPETITOR_DUE_KEY, "competitor_id"),
+    "canonical": (CANONICAL_DUE_KEY, "mlb_id"),
+}
+
+def _collect_chunk(log, kind: str, chunk_id: str, items: list[dict], persist, unchanged=None) -> list[str]:
+    """ Coleta um bloco em lote, persiste os itens alterados e reagenda os bem-sucedidos
+
+    ``persist(db, item, details, now)`` grava um item alterado e retorna os IDs
+    dos produtos monitorados afetados; ``unchanged(db, item, now)``, quando
+    informado, registra a checagem dos itens sem alteração (304). Nunca lança
+    exceção: uma falha no bloco não pode impedir o ``chord`` de chamar
+    ``finish_recheck``.
+    """
+    start = time.time()
+    due_key, id_field = _CHUNK_KINDS[kind]
+    index = DueIndex(due_key, lease=RECHECK_CLAIM_LEASE, redis=redis_client)
+    product_type = "competitor" if kind == "competitor" else "monitored"
+    changed: dict[str, None] = {}
+    done: list[str] = []
+    try:
+        with SessionLocal() as db:
+            results = _dispatch_batch(log, [
+                {
+                    "url": item["url"],
+                    "product_type": product_type,
+                    **{k: item[k] for k in ("monitored_id", "competitor_id", "etag", "last_modified") if item.get(k)},
+                }
+                for item in items
+            ])
+            now = datetime.now(timezone.utc)
+            for item, result in zip(items, results):
+                if result["status_code"] != 200:
+                    log.error(
+                        "scraper_request_failed",
+                        error=result.get("detail"),
+                        status_code=result["status_code"],
+                        url=item["url"],
+                    )
+                    continue
+                details = result["data"]
+                try:
+                    #Anúncio inalterado: nada a comparar, só registra a checagem
+                    if not details.get("not_modified"):
+                        changed.update(dict.fromkeys(persist(db, item, details, now)))
+                    elif unchanged is not None:
+                        unchanged(db, item, now)
+                except Exception as exc:
+                    db.rollback()
+                    log.error("recheck_persist_failed", error=str(exc), url=item["url"])
+                    continue
+                done.append(item[id_field])
+            _reschedule(index, done)
+    except Exception as exc:
+        log.error("recheck_chunk_failed", error=str(exc), items=len(items))
+    finally:
+        _release_slot(kind, chunk_id)
+        SCRAPING_LATENCY_SECONDS.labels(source=f"recheck_{kind}_chunk").observe(time.time() - start)
+    log.info("recheck_chunk_completed", items=len(items), succeeded=len(done), changed=len(changed))
+    return list(changed)
+
+def _persist_monitored(db, item: dict, details: dict, now: datetime) -> list[str]:
+    product = create_or_update_monitored_product_scraped(
+        db=db,
+        user_id=UUID(item["user_id"]),
+        product_data=MonitoredProductCreateScraping.model_validate({
+            "name_identification": item["name_identification"],
+            "product_url": item["url"],
+            "target_price": item["target_price"],
+        }),
+        scraped_info=_monitored_scraped_info(details),
+        last_checked=now,
+    )
+    return [str(product.id)]
+
+def _persist_competitor(db, item: dict, details: dict, now: datetime) -> list[str]:
+    create_or_update_competitor_product_scraped(
+        db=db,
+        product_data=CompetitorProductCreateScraping.model_validate({
+            "monitored_product_id": item["monitored_id"],
+            "product_url": item["url"],
+        }),
+        scraped_info=_competitor_scraped_info(details),
+        last_checked=now,
+    )
+    return [item["monitored_id"]]
+
+def _persist_canonical(db, item: dict, details: dict, now: datetime) -> list[str]:
+    """ Replica o anúncio a todos os assinantes do item canônico """
+    monitored_ids = apply_scraped_item(db, item["mlb_id"], _canonical_scraped_info(details), now)
+    return [str(mp_id) for mp_id in monitored_ids]
+
+def _touch_canonical(db, item: dict, now: datetime) -> None:
+    """ Registra a checagem de um anúncio inalterado (304) """
+    mark_canonical_item_checked(db, item["mlb_id"], now)
+
+@celery_app.task(name="alert_app.tasks.monitor_tasks.recheck_monitored_chunk")
+def recheck_monitored_chunk(chunk_id: str, items: list[dict]) -> list[str]:
+    """ Coleta um bloco de produtos monitorados e devolve os IDs dos alterados """
+    log = logger.bind(phase="recheck_scraping_chunk", chunk_id=chunk_id)
+    return _collect_chunk(log, "monitored", chunk_id, items, _persist_monitored)
+
+@celery_app.task(name="alert_app.tasks.monitor_tasks.recheck_competitor_chunk")
+def recheck_competitor_chunk(chunk_id: str, items: list[dict]) -> list[str]:
+    """ Coleta um bloco de concorrentes e devolve os produtos monitorados afetados """
+    log = logger.bind(phase="recheck_competitors_chunk", chunk_id=chunk_id)
+    return _collect_chunk(log, "competitor", chunk_id, items, _persist_competitor)
+
+@celery_app.task(name="alert_app.tasks.monitor_tasks.recheck_canonical_chunk")
+def recheck_canonical_chunk(chunk_id: str, items: list[dict]) -> list[str]:
+    """ Coleta um bloco de itens canônicos e devolve os produtos monitorados afetados """
+    log = logger.bind(phase="recheck_canonical_items_chunk", chunk_id=chunk_id)
+    return _collect_chunk(log, "canonical", chunk_id, items, _persist_canonical, _touch_canonical)
+
+@celery_app.task(name="alert_app.tasks.monitor_tasks.finish_recheck")
+def finish_recheck(chunk_results: list, kind: str) -> int:
+    """ Callback do ``chord``: uma comparação por produto monitorado alterado no ciclo """
+    monitored_ids = dict.fromkeys(mp_id for chunk in chunk_results for mp_id in (chunk or []))
+    for mp_id in monitored_ids:
+        request_price_comparison(mp_id)
+    logger.info("recheck_fan_out_finished", kind=kind, chunks=len(chunk_results), compared=len(monitored_ids))
+    return len(monitored_ids)
+
+def _dispatch_batch(log, payloads: list[dict]) -> list[dict]:
+    """ Envia os itens do ciclo em lote ao ``market_scraper``
+
+    Retorna os resultados na ordem dos itens, ou lista vazia se o lote inteiro falhar.
+    """
+    if not payloads:
+        return []
+    try:
+        return scraper_client.parse_batch(payloads)
+    except ScraperClientError as exc:
+        log.error("scraper_batch_failed", error=str(exc), items=len(payloads))
+        return []
+
+def _canonical_scraped_info(details: dict) -> CanonicalScrapedInfo:
+    """ Converte a resposta do ``market_scraper`` no estado do item canônico """
+    return CanonicalScrapedInfo(
+        name=details.get("name"),
+        current_price=Decimal(str(details.get("current_price", 0))),
+        old_price=Decimal(str(details.get("old_price")))
+        if details.get("old_price") is not None
+        else None,
+        thumbnail=details.get("thumbnail"),
+        free_shipping=details.get("free_shipping", False),
+        seller=details.get("seller"),
+        etag=details.get("etag"),
+        last_modified=parse_last_modified(details.get("last_modified")),
+    )
+
+@celery_app.task(name="alert_app.tasks.monitor_tasks.recheck_canonical_items")
+def recheck_canonical_items() -> None:
+    """ Rechecagem periódica por item canônico, uma coleta por anúncio
+
+    Reivindica os anúncios vencidos que cabem nas vagas livres, do mais
+    atrasado ao mais recente, e os coleta em paralelo, em blocos
+    (``recheck_canonical_chunk``). O resultado de cada item é gravado de uma
+    vez em todos os produtos monitorados e concorrentes que o referenciam, e
+    a comparação de preços é agendada ao final, uma vez por produto
+    monitorado afetado.
+    """
+    start = time.time()
+    log = logger.bind(phase="recheck_canonical_items")
+
+    # Flag de suspensão global controlada via Redis
+    if is_scraping_suspended():
+        log.warning("suspended_via_flag", detail="scraping suspended flag is set")
+        return
+
+    with SessionLocal() as db:
+        try:
+            free = _free_slots("canonical")
+            if not free:
+                log.info("recheck_in_flight_cap", kind="canonical", max_in_flight=RECHECK_MAX_IN_FLIGHT)
+                return
+
+            index = DueIndex(CANONICAL_DUE_KEY, lease=RECHECK_CLAIM_LEASE, redis=redis_client)
+            claimed = _claim_due(
+                index,
+                lambda after, limit, chunk: iter_canonical_check_times(db, after, limit, chunk),
+                min(BATCH_SIZE_ITEMS, free * RECHECK_CHUNK_SIZE),
+                key=str,
+            )
+            items = _load_canonical(index, claimed, db)
+
+            chunks = _fan_out(log, "canonical", recheck_canonical_chunk, [
+                {
+                    "mlb_id": item.mlb_id,
+                    "url": item.canonical_url,
+                    **conditional_fields(item.etag, item.last_modified),
+                }
+                for item in items
+            ])
+
+            elapsed_ms = int((time.time() - start) * 1000)
+            log.info("recheck_canonical_items_completed", duration_ms=elapsed_ms, items=len(items), chunks=chunks)
+
+            #Atualizar heartbeat
+            redis_client.set("beat:last_canonical", datetime.now(timezone.utc).isoformat())
+
+        except Exception as exc:
+            elapsed_ms = int((time.time() - start) * 1000)
+            log.error("recheck_canonical_items_failed", message=str(exc), duration_ms=elapsed_ms)
+            raise
+
+        finally:
+            #Métricas Prometheus
+            duration = time.time() - start
+            SCRAPING_LATENCY_SECONDS.labels(source="monitor_canonical").observe(duration)
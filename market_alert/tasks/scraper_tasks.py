@@ -15,7 +15,7 @@ import structlog
 
 from infra.db import SessionLocal
 from utils.redis_client import get_redis_client, is_scraping_suspended
-from utils.scraper_client import ScraperClient, ScraperClientError
+from utils.scraper_client import ScraperClient, ScraperClientError, conditional_fields, parse_last_modified
 
 from alert_app.exceptions import ScraperError
 
@@ -23,10 +23,10 @@ from alert_app.core.config import settings
 from alert_app.core.celery_app import celery_app
 
 from alert_app.crud import crud_errors
-from alert_app.crud.crud_monitored import create_or_update_monitored_product_scraped
-from alert_app.crud.crud_competitor import create_or_update_competitor_product_scraped
+from alert_app.crud.crud_monitored import create_or_update_monitored_product_scraped, get_monitored_product_by_id
+from alert_app.crud.crud_competitor import create_or_update_competitor_product_scraped, get_competitor_by_url
 from alert_app.schemas.schemas_products import MonitoredProductCreateScraping, MonitoredScrapedInfo, CompetitorProductCreateScraping, CompetitorScrapedInfo
-from alert_app.tasks.compare_prices_tasks import compare_prices_task
+from alert_app.tasks.compare_prices_tasks import request_price_comparison
 from alert_app.enums.enums_error_codes import ScrapingErrorType
 from alert_app.metrics import SCRAPING_LATENCY_SECONDS, SCRAPER_HEAD_FAILURES_TOTAL, SCRAPER_IN_FLIGHT
 
@@ -78,12 +78,23 @@ def collect_product_task(self, url: str, user_id: str, name_identification: str,
     product_id = monitored_id
     with SessionLocal() as db:
         try:
+            #Validadores da última coleta permitem ao scraper responder "não modificado"
+            existing = get_monitored_product_by_id(db, UUID(monitored_id)) if monitored_id else None
+            validators = conditional_fields(existing.etag, existing.last_modified) if existing else {}
+
             #Envia requisição ao serviço externo de scraping
             details = scraper_client.parse(
                 url=url,
                 product_type="monitored",
+                **validators,
             )
 
+            #Anúncio inalterado: nada a persistir nem comparar
+            if details.get("not_modified"):
+                task_logger.info("collect_product_not_modified", monitored_product_id=product_id)
+                redis_client.set("beat:last_success", datetime.now(timezone.utc).isoformat())
+                return
+
             #Persiste ou atualiza o produto monitorado com as informações obtidas
             product = create_or_update_monitored_product_scraped(
                 db=db,
@@ -93,11 +104,13 @@ def collect_product_task(self, url: str, user_id: str, name_identification: str,
                     current_price=Decimal(str(details.get("current_price", 0))),
                     thumbnail=details.get("thumbnail"),
                     free_shipping=details.get("free_shipping", False),
+                    etag=details.get("etag"),
+                    last_modified=parse_last_modified(details.get("last_modified")),
                 ),
                 last_checked=datetime.now(timezone.utc),
             )
             product_id = str(product.id)
-            compare_prices_task.delay(product_id)
+            request_price_comparison(product_id)
 
             elapsed_ms = int((datetime.now(timezone.utc) - start).total_seconds() * 1000)
             task_logger.info("collect_product_completed", duration_ms=elapsed_ms)
@@ -171,12 +184,22 @@ def collect_competitor_task(self, monitored_product_id: str, url: str) -> None:
     #Scraping propriamente dito e agendamento de comparação de preços
     with SessionLocal() as db:
         try:
+            #Validadores da última coleta do concorrente, quando já cadastrado
+            existing = get_competitor_by_url(db, payload.monitored_product_id, url)
+            validators = conditional_fields(existing.etag, existing.last_modified) if existing else {}
+
             #Requisição ao serviço de scraping para coletar dados do concorrente
             details = scraper_client.parse(
                 url=url,
                 product_type="competitor",
+                **validators,
             )
 
+            #Anúncio inalterado: nada a persistir nem comparar
+            if details.get("not_modified"):
+                task_logger.info("collect_competitor_not_modified")
+                return
+
             #Persiste ou atualiza o concorrente com as informações obtidas
             create_or_update_competitor_product_scraped(
                 db=db,
@@ -191,6 +214,8 @@ def collect_competitor_task(self, monitored_product_id: str, url: str) -> None:
                     free_shipping=details.get("free_shipping", False),
                     seller=details.get("seller"),
                     seller_rating=None,
+                    etag=details.get("etag"),
+                    last_modified=parse_last_modified(details.get("last_modified")),
                 ),
                 last_checked=datetime.now(timezone.utc)
             )
@@ -198,7 +223,7 @@ def collect_competitor_task(self, monitored_product_id: str, url: str) -> None:
             elapsed_ms = int((datetime.now(timezone.utc) - start).total_seconds() * 1000)
             task_logger.info("collect_competitor_completed", duration_ms=elapsed_ms)
 
-            compare_prices_task.delay(str(monitored_product_id))
+            request_price_comparison(str(monitored_product_id))
             task_logger.info("price_comparison_task_dispatched")
 
         except ScraperClientError as req_err:
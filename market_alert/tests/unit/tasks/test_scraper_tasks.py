@@ -83,7 +83,7 @@ def test_collect_product_task_send_request_and_persists(monkeypatch):
     monkeypatch.setattr("alert_app.tasks.scraper_tasks.scraper_client.parse", fake_parse)
     monkeypatch.setattr("alert_app.tasks.scraper_tasks.SessionLocal", lambda: DummySession())
     monkeypatch.setattr("alert_app.tasks.scraper_tasks.create_or_update_monitored_product_scraped", fake_persist)
-    monkeypatch.setattr("alert_app.tasks.scraper_tasks.compare_prices_task.delay", lambda pid: chamado.setdefault("compare", pid))
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.request_price_comparison", lambda pid: chamado.setdefault("compare", pid))
     monkeypatch.setattr("alert_app.tasks.scraper_tasks.redis_client.set", lambda *a, **k: None)
 
     collect_product_task.run("http://produto", VALID_UUID, "Produto", 20.0)
@@ -122,7 +122,8 @@ def test_collect_competitor_task_send_request_and_persist(monkeypatch):
     monkeypatch.setattr("alert_app.tasks.scraper_tasks.scraper_client.parse", fake_parse)
     monkeypatch.setattr("alert_app.tasks.scraper_tasks.SessionLocal", lambda: DummySession())
     monkeypatch.setattr("alert_app.tasks.scraper_tasks.create_or_update_competitor_product_scraped", fake_persist)
-    monkeypatch.setattr("alert_app.tasks.scraper_tasks.compare_prices_task.delay", lambda pid: chamado.setdefault("compare", pid))
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.get_competitor_by_url", lambda *a, **k: None)
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.request_price_comparison", lambda pid: chamado.setdefault("compare", pid))
 
     collect_competitor_task.run(VALID_UUID, "http://concorrente")
 
@@ -130,3 +131,410 @@ def test_collect_competitor_task_send_request_and_persist(monkeypatch):
     assert chamado["product_type"] == "competitor"
     assert str(chamado["persist"]["monitored_id"]) == VALID_UUID
     assert chamado["compare"] == VALID_UUID
+
+def test_collect_product_task_skips_persistence_when_not_modified(monkeypatch):
+    """ Com ``not_modified`` a task envia os validadores e não grava no banco """
+    from datetime import datetime, timezone
+
+    chamado = {}
+    existing = SimpleNamespace(etag='"v1"', last_modified=datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    def fake_parse(url, product_type, **extra):
+        chamado["extra"] = extra
+        return {"not_modified": True, "etag": '"v1"'}
+
+    def fake_persist(*a, **k):
+        chamado["persist"] = True
+
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.scraper_client.parse", fake_parse)
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.SessionLocal", lambda: DummySession())
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.get_monitored_product_by_id", lambda db, pid: existing)
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.create_or_update_monitored_product_scraped", fake_persist)
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.request_price_comparison", lambda pid: chamado.setdefault("compare", pid))
+    monkeypatch.setattr("alert_app.tasks.scraper_tasks.redis_client.set", lambda *a, **k: None)
+
+    collect_product_task.run("http://produto", VALID_UUID, "Produto", 20.0, monitored_id=VALID_UUID)
+
+    assert chamado["extra"] == {"etag": '"v1"', "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    assert "persist" not in chamado
+    assert "compare" not in chamado
+
+def test_recheck_canonical_items_fans_out_due_items(monkeypatch):
+    """ Os itens vencidos são despachados num ``chord``, em blocos, dentro das vagas livres """
+    from alert_app.tasks import monitor_tasks
+
+    items = [
+        SimpleNamespace(mlb_id="MLB1", canonical_url="https://produto.mercadolivre.com.br/MLB-1", etag=None, last_modified=None, last_checked=None),
+        SimpleNamespace(mlb_id="MLB2", canonical_url="https://produto.mercadolivre.com.br/MLB-2", etag='"v2"', last_modified=None, last_checked=None),
+        SimpleNamespace(mlb_id="MLB3", canonical_url="https://produto.mercadolivre.com.br/MLB-3", etag=None, last_modified=None, last_checked=None),
+    ]
+    by_id = {item.mlb_id: item for item in items}
+    fake = CursorRedis()
+    chords = []
+
+    def fake_chord(header):
+        def run(callback):
+            chords.append(([sig.args for sig in header.tasks], callback.args))
+        return run
+
+    monkeypatch.setattr(monitor_tasks, "is_scraping_suspended", lambda: False)
+    monkeypatch.setattr(monitor_tasks, "SessionLocal", lambda: DummySession())
+    monkeypatch.setattr(monitor_tasks, "DueIndex", FakeDueIndex)
+    monkeypatch.setattr(monitor_tasks, "RECHECK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(monitor_tasks, "RECHECK_MAX_IN_FLIGHT", 2)
+    monkeypatch.setattr(monitor_tasks, "iter_canonical_check_times", lambda db, after, limit, chunk: iter([(item.mlb_id, item.last_checked) for item in items]))
+    monkeypatch.setattr(monitor_tasks, "get_canonical_items_by_ids", lambda db, mlb_ids: [by_id[m] for m in mlb_ids])
+    monkeypatch.setattr(monitor_tasks, "chord", fake_chord)
+    monkeypatch.setattr(monitor_tasks, "redis_client", fake)
+
+    monitor_tasks.recheck_canonical_items.run()
+
+    (chunks, callback_args), = chords
+    assert callback_args == ("canonical",)
+    assert [[item["mlb_id"] for item in chunk] for _, chunk in chunks] == [["MLB1", "MLB2"], ["MLB3"]]
+    assert chunks[0][1][1] == {"mlb_id": "MLB2", "url": items[1].canonical_url, "etag": '"v2"'}
+    assert set(fake.zsets["recheck:inflight:canonical"]) == {chunk_id for chunk_id, _ in chunks}
+    assert fake.get("beat:last_canonical") is not None
+
+    #Vagas esgotadas: o ciclo seguinte não reivindica nada
+    monitor_tasks.recheck_canonical_items.run()
+    assert len(chords) == 1
+
+
+def test_recheck_canonical_chunk_scrapes_each_item_once(monkeypatch):
+    """ O bloco coleta cada anúncio uma vez e devolve os produtos monitorados afetados """
+    import time
+    from alert_app.tasks import monitor_tasks
+
+    items = [
+        {"mlb_id": "MLB1", "url": "https://produto.mercadolivre.com.br/MLB-1"},
+        {"mlb_id": "MLB2", "url": "https://produto.mercadolivre.com.br/MLB-2", "etag": '"v2"'},
+        {"mlb_id": "MLB3", "url": "https://produto.mercadolivre.com.br/MLB-3"},
+    ]
+    index = FakeDueIndex("recheck:due:canonical")
+    fake = CursorRedis()
+    fake.zadd("recheck:inflight:canonical", {"chunk-1": time.time()})
+    chamado = {"applied": [], "checked": []}
+
+    def fake_parse_batch(payloads):
+        chamado["payloads"] = payloads
+        return [
+            {"status_code": 200, "data": {"name": "Prod", "current_price": "10.5", "free_shipping": True}},
+            {"status_code": 200, "data": {"not_modified": True}},
+            {"status_code": 503, "detail": "blocked"},
+        ]
+
+    def fake_apply(db, mlb_id, scraped_info, last_checked):
+        chamado["applied"].append((mlb_id, scraped_info.current_price))
+        return ["m1", "m2", "m1"]
+
+    monkeypatch.setattr(monitor_tasks, "SessionLocal", lambda: DummySession())
+    monkeypatch.setattr(monitor_tasks, "DueIndex", lambda *a, **k: index)
+    monkeypatch.setattr(monitor_tasks, "apply_scraped_item", fake_apply)
+    monkeypatch.setattr(monitor_tasks, "mark_canonical_item_checked", lambda db, mlb_id, now: chamado["checked"].append(mlb_id))
+    monkeypatch.setattr(monitor_tasks.scraper_client, "parse_batch", fake_parse_batch)
+    monkeypatch.setattr(monitor_tasks, "redis_client", fake)
+
+    changed = monitor_tasks.recheck_canonical_chunk.run("chunk-1", items)
+
+    assert changed == ["m1", "m2"]
+    assert chamado["payloads"][1] == {"url": items[1]["url"], "product_type": "monitored", "etag": '"v2"'}
+    assert chamado["applied"] == [("MLB1", Decimal("10.5"))]
+    assert chamado["checked"] == ["MLB2"]
+    #Coletados reagendados; o item com falha vence ao fim da reserva
+    assert set(index.scores) == {"MLB1", "MLB2"}
+    assert fake.zsets["recheck:inflight:canonical"] == {}
+
+
+class FakeDueIndex:
+    """ Índice de vencimentos em memória com a mesma interface do ``DueIndex`` """
+    def __init__(self, key, lease=900.0, redis=None):
+        self.scores = {}
+        self.lease = lease
+        self.kind = key.rsplit(":", 1)[-1]
+
+    def schedule(self, member, when):
+        self.scores[member] = when
+
+    def schedule_many(self, due, only_new=False):
+        added = [m for m in due if m not in self.scores]
+        for member, when in due.items():
+            if not only_new or member in added:
+                self.scores[member] = when
+        return len(added)
+
+    def claim(self, limit, now=None, lease=None):
+        due = sorted((score, m) for m, score in self.scores.items() if score <= now)[:limit]
+        for _, member in due:
+            self.scores[member] = now + self.lease
+        return [member for _, member in due]
+
+    def remove(self, *members):
+        for member in members:
+            self.scores.pop(member, None)
+        return len(members)
+
+    def backlog(self, now=None):
+        return sum(1 for score in self.scores.values() if score <= now)
+
+
+class CursorRedis:
+    """ Redis mínimo para cursor da varredura, vagas de coleta, agrupamento de comparações e heartbeat """
+    def __init__(self):
+        self.data = {}
+        self.zsets = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, **kwargs):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zremrangebyscore(self, key, low, high):
+        scores = self.zsets.get(key, {})
+        for member in [m for m, score in scores.items() if score <= high]:
+            del scores[member]
+
+
+def test_sweep_resumes_from_cursor_and_wraps(monkeypatch):
+    """ Cada ciclo lê uma página a partir do último ID e recomeça ao fim do catálogo """
+    from uuid import UUID
+    from alert_app.tasks import monitor_tasks
+
+    catalog = [(UUID(int=n), None) for n in range(1, 6)]
+    pages = []
+
+    def page(after, limit, chunk):
+        pages.append(after)
+        return iter([row for row in catalog if after is None or row[0] > after][:limit])
+
+    fake = CursorRedis()
+    index = FakeDueIndex("recheck:due:competitor")
+    monkeypatch.setattr(monitor_tasks, "redis_client", fake)
+    monkeypatch.setattr(monitor_tasks, "RECHECK_SWEEP_SIZE", 2)
+
+    assert [monitor_tasks._sweep(index, page) for _ in range(4)] == [2, 2, 1, 2]
+    assert pages == [None, UUID(int=2), UUID(int=4), None]
+    assert fake.get("recheck:cursor:competitor") == str(UUID(int=2))
+    assert len(index.scores) == 5
+
+
+def test_sweep_pages_canonical_items_by_mlb_id(monkeypatch):
+    """ O cursor dos itens canônicos guarda o código MLB e é lido como texto """
+    from alert_app.tasks import monitor_tasks
+
+    catalog = [("MLB1", None), ("MLB2", None), ("MLB3", None)]
+    pages = []
+
+    def page(after, limit, chunk):
+        pages.append(after)
+        return iter([row for row in catalog if after is None or row[0] > after][:limit])
+
+    fake = CursorRedis()
+    index = FakeDueIndex("recheck:due:canonical")
+    monkeypatch.setattr(monitor_tasks, "redis_client", fake)
+    monkeypatch.setattr(monitor_tasks, "RECHECK_SWEEP_SIZE", 2)
+
+    assert [monitor_tasks._sweep(index, page, key=str) for _ in range(2)] == [2, 1]
+    assert pages == [None, "MLB2"]
+    assert fake.get("recheck:cursor:canonical") is None
+    assert set(index.scores) == {"MLB1", "MLB2", "MLB3"}
+
+
+def test_recheck_monitored_products_fans_out_due_items(monkeypatch):
+    """ Só os produtos vencidos são despachados, em ordem de vencimento e em blocos de um ``chord`` """
+    from datetime import datetime, timedelta, timezone
+    from uuid import uuid4
+    from alert_app.tasks import monitor_tasks
+
+    #Mesmo relógio usado pela reivindicação (congelado pelo ``fixed_time``)
+    now = datetime.fromtimestamp(monitor_tasks.time.time(), timezone.utc)
+    ids = [uuid4() for _ in range(4)]
+    check_times = [
+        (ids[0], now - timedelta(seconds=monitor_tasks.ADAPTIVE_RECHECK_BASE_INTERVAL + 60)),
+        (ids[1], now),
+        (ids[2], now - timedelta(seconds=monitor_tasks.ADAPTIVE_RECHECK_BASE_INTERVAL + 30)),
+        (ids[3], now - timedelta(seconds=monitor_tasks.ADAPTIVE_RECHECK_BASE_INTERVAL + 10)),
+    ]
+    products = {
+        pid: SimpleNamespace(id=pid, user_id=uuid4(), product_url=f"https://produto.mercadolivre.com.br/MLB-{n}",
+                             name_identification=f"Prod {n}", target_price=Decimal("10"), etag=None, last_modified=None)
+        for n, pid in enumerate(ids)
+    }
+    fake = CursorRedis()
+    chords = []
+
+    def fake_chord(header):
+        def run(callback):
+            chords.append(([sig.args for sig in header.tasks], callback.args))
+        return run
+
+    monkeypatch.setattr(monitor_tasks, "is_scraping_suspended", lambda: False)
+    monkeypatch.setattr(monitor_tasks, "SessionLocal", lambda: DummySession())
+    monkeypatch.setattr(monitor_tasks, "DueIndex", FakeDueIndex)
+    monkeypatch.setattr(monitor_tasks, "BATCH_SIZE_SCRAPING", 10)
+    monkeypatch.setattr(monitor_tasks, "RECHECK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(monitor_tasks, "RECHECK_MAX_IN_FLIGHT", 1)
+    monkeypatch.setattr(monitor_tasks, "iter_product_check_times", lambda db, monitoring_type, after, limit, chunk: iter(check_times))
+    monkeypatch.setattr(monitor_tasks, "get_monitored_products_by_ids", lambda db, pids: [products[p] for p in pids])
+    monkeypatch.setattr(monitor_tasks, "chord", fake_chord)
+    monkeypatch.setattr(monitor_tasks, "redis_client", fake)
+
+    monitor_tasks.recheck_monitored_products.run()
+
+    #Uma única vaga livre: apenas um bloco com os dois produtos mais atrasados
+    (chunks, callback_args), = chords
+    assert callback_args == ("monitored",)
+    (chunk_id, items), = chunks
+    assert [item["monitored_id"] for item in items] == [str(ids[0]), str(ids[2])]
+    assert items[0]["target_price"] == "10"
+    assert list(fake.zsets["recheck:inflight:monitored"]) == [chunk_id]
+
+    #Sem vagas o ciclo seguinte não reivindica nada
+    monitor_tasks.recheck_monitored_products.run()
+    assert len(chords) == 1
+
+
+def test_load_claimed_drops_products_covered_by_canonical_item():
+    """ Produtos com item canônico e IDs excluídos saem do índice da rechecagem por produto """
+    from uuid import uuid4
+    from alert_app.tasks import monitor_tasks
+
+    ids = [str(uuid4()) for _ in range(3)]
+    index = FakeDueIndex("recheck:due:monitored")
+    index.schedule_many({member: 0.0 for member in ids})
+    rows = [
+        SimpleNamespace(id=ids[0], canonical_item_id=None),
+        SimpleNamespace(id=ids[1], canonical_item_id="MLB1"),
+    ]
+
+    loaded = monitor_tasks._load_claimed(index, ids, lambda db, pids: rows, db=None)
+
+    assert [row.id for row in loaded] == [ids[0]]
+    assert set(index.scores) == {ids[0]}
+
+
+def test_recheck_monitored_chunk_persists_and_reschedules(monkeypatch):
+    """ O bloco persiste os alterados, reagenda os bem-sucedidos e libera a vaga """
+    import time
+    from alert_app.tasks import monitor_tasks
+
+    items = [
+        {"monitored_id": "m1", "user_id": VALID_UUID, "url": "https://produto.mercadolivre.com.br/MLB-1",
+         "name_identification": "Prod 1", "target_price": "10"},
+        {"monitored_id": "m2", "user_id": VALID_UUID, "url": "https://produto.mercadolivre.com.br/MLB-2",
+         "name_identification": "Prod 2", "target_price": "10", "etag": '"v2"'},
+        {"monitored_id": "m3", "user_id": VALID_UUID, "url": "https://produto.mercadolivre.com.br/MLB-3",
+         "name_identification": "Prod 3", "target_price": "10"},
+    ]
+    index = FakeDueIndex("recheck:due:monitored")
+    fake = CursorRedis()
+    fake.zadd("recheck:inflight:monitored", {"chunk-1": time.time()})
+    chamado = {"persist": []}
+
+    def fake_parse_batch(payloads):
+        chamado["payloads"] = payloads
+        return [
+            {"status_code": 200, "data": {"current_price": "9.5"}},
+            {"status_code": 200, "data": {"not_modified": True}},
+            {"status_code": 503, "detail": "blocked"},
+        ]
+
+    def fake_persist(db, user_id, product_data, scraped_info, last_checked):
+        chamado["persist"].append((str(product_data.product_url), scraped_info.current_price))
+        return SimpleNamespace(id="m1")
+
+    monkeypatch.setattr(monitor_tasks, "SessionLocal", lambda: DummySession())
+    monkeypatch.setattr(monitor_tasks, "DueIndex", lambda *a, **k: index)
+    monkeypatch.setattr(monitor_tasks, "create_or_update_monitored_product_scraped", fake_persist)
+    monkeypatch.setattr(monitor_tasks.scraper_client, "parse_batch", fake_parse_batch)
+    monkeypatch.setattr(monitor_tasks, "redis_client", fake)
+
+    changed = monitor_tasks.recheck_monitored_chunk.run("chunk-1", items)
+
+    assert changed == ["m1"]
+    assert chamado["persist"] == [("https://produto.mercadolivre.com.br/MLB-1", Decimal("9.5"))]
+    assert chamado["payloads"][1] == {"url": items[1]["url"], "product_type": "monitored", "monitored_id": "m2", "etag": '"v2"'}
+    assert set(index.scores) == {"m1", "m2"}
+    assert fake.zsets["recheck:inflight:monitored"] == {}
+
+
+def test_finish_recheck_compares_each_monitored_product_once(monkeypatch):
+    """ O callback do ``chord`` agenda uma comparação por produto monitorado """
+    from alert_app.tasks import monitor_tasks
+
+    compared = []
+    monkeypatch.setattr(monitor_tasks, "request_price_comparison", lambda mid: compared.append(mid))
+
+    assert monitor_tasks.finish_recheck.run([["m1", "m2"], [], ["m2", "m3"], None], "competitor") == 3
+    assert compared == ["m1", "m2", "m3"]
+
+
+def test_request_price_comparison_coalesces_burst(monkeypatch):
+    """ Vários pedidos seguidos enfileiram uma única comparação, após a janela """
+    from alert_app.tasks import compare_prices_tasks
+
+    fake = CursorRedis()
+    queued = []
+    monkeypatch.setattr(compare_prices_tasks, "redis_client", fake)
+    monkeypatch.setattr(compare_prices_tasks, "COMPARE_DEBOUNCE_WINDOW", 30)
+    monkeypatch.setattr(compare_prices_tasks.compare_prices_task, "apply_async", lambda **kw: queued.append(kw))
+
+    results = [compare_prices_tasks.request_price_comparison(VALID_UUID) for _ in range(3)]
+
+    assert results == [True, False, False]
+    assert queued == [{"args": [VALID_UUID], "kwargs": {"debounced": True}, "countdown": 30}]
+
+
+def test_debounced_comparison_waits_for_quiet_window(monkeypatch):
+    """ A comparação é adiada enquanto chegam atualizações e roda uma vez depois do silêncio """
+    from alert_app.tasks import compare_prices_tasks
+
+    clock = [1000.0]
+    fake = CursorRedis()
+    queued, compared = [], []
+    monkeypatch.setattr(compare_prices_tasks, "time", SimpleNamespace(time=lambda: clock[0]))
+    monkeypatch.setattr(compare_prices_tasks, "redis_client", fake)
+    monkeypatch.setattr(compare_prices_tasks, "COMPARE_DEBOUNCE_WINDOW", 30)
+    monkeypatch.setattr(compare_prices_tasks, "COMPARE_DEBOUNCE_MAX_WAIT", 300)
+    monkeypatch.setattr(compare_prices_tasks.compare_prices_task, "apply_async", lambda **kw: queued.append(kw))
+    monkeypatch.setattr(compare_prices_tasks, "SessionLocal", lambda: DummySession())
+    monkeypatch.setattr(
+        compare_prices_tasks,
+        "run_price_comparison",
+        lambda db, mid, **kw: compared.append(str(mid)) or ({"lowest_competitor": None, "highest_competitor": None}, []),
+    )
+
+    compare_prices_tasks.request_price_comparison(VALID_UUID)
+    clock[0] = 1020.0
+    compare_prices_tasks.request_price_comparison(VALID_UUID)
+
+    #A task enfileirada pelo primeiro pedido encontra uma atualização de 10 s atrás
+    clock[0] = 1030.0
+    compare_prices_tasks.compare_prices_task.run(VALID_UUID, debounced=True)
+    assert compared == []
+    assert queued[-1]["countdown"] == 20
+
+    clock[0] = 1050.0
+    compare_prices_tasks.compare_prices_task.run(VALID_UUID, debounced=True)
+    assert compared == [VALID_UUID]
+    assert f"compare:pending:{VALID_UUID}" not in fake.data
+
+    #Uma atualização depois da comparação abre uma nova rajada
+    assert compare_prices_tasks.request_price_comparison(VALID_UUID) is True
@@ -1,4 +1,4 @@
-from utils.ml_url import canonicalize_ml_url, is_product_url
+from utils.ml_url import canonicalize_ml_url, extract_mlb_id, is_product_url
 
 
 def test_canonicalize_extracts_id():
@@ -17,3 +17,8 @@ def test_is_product_url_detection():
     assert is_product_url("https://produto.mercadolivre.com.br/MLB-1")
     assert is_product_url("https://m.mercadolivre.com.br/MLB-1")
     assert not is_product_url("https://lista.mercadolivre.com.br/MLB-1-foo")
+
+def test_extract_mlb_id_normalizes_separator():
+    assert extract_mlb_id("https://produto.mercadolivre.com.br/MLB_4321-tv") == "MLB4321"
+    assert extract_mlb_id("https://www.mercadolivre.com.br/p/mlb-99") == "MLB99"
+    assert extract_mlb_id("https://www.example.com/MLB-1") is None
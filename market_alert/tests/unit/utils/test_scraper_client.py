@@ -0,0 +1,84 @@
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+from utils import scraper_client as sc
+
+
+def _use_transport(monkeypatch, handler):
+    """ Substitui o cliente síncrono do pool por um transporte falso """
+    monkeypatch.setattr(sc._pool, "_sync", httpx.Client(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(sc._pool, "_pid", os.getpid())
+
+
+def test_instances_share_the_pooled_client(monkeypatch):
+    """ Novas instâncias reaproveitam o mesmo cliente (e conexões) do processo """
+    _use_transport(monkeypatch, lambda request: httpx.Response(200, json={"name": "Produto"}))
+    client = sc._pool.sync_client()
+
+    assert sc.ScraperClient().parse("https://produto", "monitored") == {"name": "Produto"}
+    assert sc.ScraperClient().parse("https://produto", "monitored") == {"name": "Produto"}
+    assert sc._pool.sync_client() is client
+
+def test_parse_maps_http_errors(monkeypatch):
+    """ Respostas ``5xx`` viram ``ScraperClientError`` com o status """
+    _use_transport(monkeypatch, lambda request: httpx.Response(503))
+
+    with pytest.raises(sc.ScraperClientError) as exc:
+        sc.ScraperClient().parse("https://produto", "monitored")
+    assert exc.value.status_code == 503
+
+def test_timeout_follows_remaining_task_time(monkeypatch):
+    """ O timeout da chamada respeita o prazo restante da task """
+    seen = {}
+
+    def handler(request):
+        seen["timeout"] = request.extensions["timeout"]["read"]
+        return httpx.Response(200, json={})
+
+    _use_transport(monkeypatch, handler)
+    monkeypatch.setattr(sc, "remaining_task_time", lambda: 4.0)
+    sc.ScraperClient(timeout=30).parse("https://produto", "monitored")
+    assert seen["timeout"] == pytest.approx(4.0)
+
+    monkeypatch.setattr(sc, "remaining_task_time", lambda: 0.1)
+    with pytest.raises(sc.ScraperClientError):
+        sc.ScraperClient().parse("https://produto", "monitored")
+
+def test_parse_batch_orders_results_and_fills_missing_items(monkeypatch):
+    """ O NDJSON é devolvido na ordem dos itens e itens sem resposta viram ``504`` """
+    monkeypatch.setattr(sc.settings, "SCRAPER_CLIENT_BATCH_SIZE", 2)
+    bodies = []
+
+    def handler(request):
+        items = json.loads(request.content)["items"]
+        bodies.append([item["url"] for item in items])
+        #Responde fora de ordem e omite ``u3``
+        lines = [{"index": i, "url": item["url"], "status_code": 200, "data": {"name": item["url"]}}
+                 for i, item in enumerate(items) if item["url"] != "u3"]
+        return httpx.Response(200, content="\n".join(json.dumps(line) for line in reversed(lines)))
+
+    _use_transport(monkeypatch, handler)
+    results = sc.ScraperClient().parse_batch([{"url": f"u{i}", "product_type": "monitored"} for i in range(4)])
+
+    assert bodies == [["u0", "u1"], ["u2", "u3"]]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["status_code"] for r in results] == [200, 200, 200, 504]
+    assert results[2]["data"] == {"name": "u2"}
+
+def test_aparse_uses_async_client(monkeypatch):
+    """ A versão assíncrona envia o mesmo ``payload`` pelo cliente do event loop """
+    seen = {}
+
+    def handler(request):
+        seen["payload"] = json.loads(request.content)
+        return httpx.Response(200, json={"current_price": 10.0})
+
+    monkeypatch.setattr(sc._pool, "async_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    result = asyncio.run(sc.ScraperClient().aparse("https://produto", "competitor", etag='"v1"'))
+
+    assert result == {"current_price": 10.0}
+    assert seen["payload"] == {"url": "https://produto", "product_type": "competitor", "etag": '"v1"'}
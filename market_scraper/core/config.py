@@ -16,6 +16,8 @@ class Settings(ConfigBase):
 
     #TTL base do cache de scraping
     CACHE_BASE_TTL: int = int(os.getenv("CACHE_BASE_TTL", str(3600)))
+    #Serve entradas ainda frescas do cache antes de qualquer requisição ao site
+    CACHE_SERVE_FRESH: bool = os.getenv("CACHE_SERVE_FRESH", "1") == "1"
 
     #Parâmetros para o HumanizedDelayManager
     HUMAN_AVG_WPM: int = int(os.getenv("HUMAN_AVG_WPM", "200"))
@@ -29,6 +31,45 @@ class Settings(ConfigBase):
     JITTER_MIN: float = float(os.getenv("JITTER_MIN", "2.0"))
     JITTER_MAX: float = float(os.getenv("JITTER_MAX", "7.0"))
 
+    #Token bucket por host compartilhado entre réplicas via Redis
+    HOST_BUCKET_ENABLED: bool = os.getenv("HOST_BUCKET_ENABLED", "1") == "1"
+    HOST_BUCKET_MAX_WAIT: float = float(os.getenv("HOST_BUCKET_MAX_WAIT", "30"))
+    HOST_BUCKET_PENALTY_TTL: int = int(os.getenv("HOST_BUCKET_PENALTY_TTL", "3600"))
+
+    #Limites do endpoint de scraping em lote
+    SCRAPER_BATCH_MAX_ITEMS: int = int(os.getenv("SCRAPER_BATCH_MAX_ITEMS", "500"))
+    SCRAPER_BATCH_CONCURRENCY: int = int(os.getenv("SCRAPER_BATCH_CONCURRENCY", "8"))
+
+    #Coalescência de scrapings da mesma URL canônica (single-flight)
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "1") == "1"
+    SINGLE_FLIGHT_LEASE_TTL: float = float(os.getenv("SINGLE_FLIGHT_LEASE_TTL", "90"))
+    SINGLE_FLIGHT_RESULT_TTL: int = int(os.getenv("SINGLE_FLIGHT_RESULT_TTL", "30"))
+    SINGLE_FLIGHT_POLL_INTERVAL: float = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "0.25"))
+
+    #Executor do parsing (inline, thread ou process); 0 usa os núcleos da máquina
+    PARSE_EXECUTOR_MODE: str = os.getenv("PARSE_EXECUTOR_MODE", "thread")
+    PARSE_EXECUTOR_WORKERS: int = int(os.getenv("PARSE_EXECUTOR_WORKERS", "0"))
+    PARSE_EXECUTOR_MAX_QUEUE: int = int(os.getenv("PARSE_EXECUTOR_MAX_QUEUE", "0"))
+
+    #Ordem aprendida das estratégias do parser, sincronizada com o Redis
+    PARSER_STRATEGY_FLUSH_INTERVAL: float = float(os.getenv("PARSER_STRATEGY_FLUSH_INTERVAL", "60"))
+    PARSER_STRATEGY_STATS_TTL: int = int(os.getenv("PARSER_STRATEGY_STATS_TTL", "604800"))
+
+    #Snapshots de HTML compactados para replay offline do scraping
+    HTML_SNAPSHOT_ENABLED: bool = os.getenv("HTML_SNAPSHOT_ENABLED", "0") == "1"
+    HTML_SNAPSHOT_DIR: str = os.getenv("HTML_SNAPSHOT_DIR", "logs/snapshots")
+    HTML_SNAPSHOT_SAMPLE_RATE: float = float(os.getenv("HTML_SNAPSHOT_SAMPLE_RATE", "0.05"))
+    HTML_SNAPSHOT_RETENTION_DAYS: int = int(os.getenv("HTML_SNAPSHOT_RETENTION_DAYS", "7"))
+    HTML_SNAPSHOT_MAX_MB: int = int(os.getenv("HTML_SNAPSHOT_MAX_MB", "512"))
+    HTML_SNAPSHOT_QUEUE_MAX: int = int(os.getenv("HTML_SNAPSHOT_QUEUE_MAX", "200"))
+
+    #Auditoria em lote: fila em memória gravada por uma thread em segmentos JSONL
+    AUDIT_QUEUE_MAX: int = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+    AUDIT_SEGMENT_MAX_MB: int = int(os.getenv("AUDIT_SEGMENT_MAX_MB", "64"))
+    AUDIT_SEGMENT_MAX_AGE: int = int(os.getenv("AUDIT_SEGMENT_MAX_AGE", "3600"))
+
     MONITORED_RATE_LIMIT: int = int(os.getenv("MONITORED_RATE_LIMIT", "100"))
     COMPETITOR_SERVICE_RATE_LIMIT: int = int(
         os.getenv("COMPETITOR_SERVICE_RATE_LIMIT", "200")
@@ -39,6 +80,19 @@ class Settings(ConfigBase):
     PLAYWRIGHT_HEADLESS: bool = os.getenv("PLAYWRIGHT_HEADLESS", "1") == "1"
     PLAYWRIGHT_TIMEOUT: int = int(os.getenv("PLAYWRIGHT_TIMEOUT", "30000"))
 
+    #Pool de navegadores aquecidos mantido pelo lifespan da aplicação
+    BROWSER_POOL_ENABLED: bool = os.getenv("BROWSER_POOL_ENABLED", "1") == "1"
+    BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+    BROWSER_POOL_CONTEXTS: int = int(os.getenv("BROWSER_POOL_CONTEXTS", "2"))
+    BROWSER_POOL_MAX_PAGES: int = int(os.getenv("BROWSER_POOL_MAX_PAGES", "200"))
+    BROWSER_POOL_MAX_MEMORY_MB: int = int(os.getenv("BROWSER_POOL_MAX_MEMORY_MB", "1024"))
+
+    #Busca via HTTP simples antes de recorrer ao Playwright
+    HTTP_FETCH_ENABLED: bool = os.getenv("HTTP_FETCH_ENABLED", "1") == "1"
+    HTTP_FETCH_TIMEOUT: float = float(os.getenv("HTTP_FETCH_TIMEOUT", "10"))
+    HTTP_POOL_MAX_CONNECTIONS: int = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+    HTTP_POOL_MAX_KEEPALIVE: int = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10"))
+
     #Intervalo base para o AdaptiveRecheckManager
     ADAPTIVE_RECHECK_BASE_INTERVAL: int = int(
         os.getenv("ADAPTIVE_RECHECK_BASE_INTERVAL", "7200")
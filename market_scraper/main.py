@@ -2,6 +2,7 @@
 
 import logging
 import time
+from contextlib import asynccontextmanager
 
 import structlog
 
@@ -17,6 +18,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 import scraper_app.metrics as metrics_module
 from scraper_app.core.config import settings
+from scraper_app.utils.browser_pool import BrowserPool, set_browser_pool
 
 try:
     from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
@@ -114,6 +116,38 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         return response
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """ Mantém o pool de navegadores aquecido enquanto a aplicação estiver ativa
+
+    Ao encerrar, também fecha as conexões keep-alive do cliente HTTP, o
+    executor de parsing e grava a fila de auditoria pendente.
+    """
+    pool = None
+    if settings.BROWSER_POOL_ENABLED:
+        pool = BrowserPool()
+        try:
+            await pool.start()
+            set_browser_pool(pool)
+        except Exception as exc:
+            #Sem o pool, cada scraping volta a iniciar o próprio navegador
+            logger.error("browser_pool_start_failed", error=str(exc))
+            pool = None
+
+    yield
+
+    from scraper_app.services.services_scraper_common import http_fetcher
+    from scraper_app.utils.parse_executor import parse_executor
+    from scraper_app.utils.audit_logger import audit_writer
+    await http_fetcher.aclose()
+    parse_executor.shutdown(wait=False)
+    audit_writer.shutdown()
+
+    if pool:
+        set_browser_pool(None)
+        await pool.stop()
+
+
 #Criação da aplicação FastAPI
 def create_app() -> FastAPI:
     """ Cria e configura a instância principal da aplicação """
@@ -122,6 +156,7 @@ def create_app() -> FastAPI:
         description="Serviço de scraping para coleta de dados",
         version="1.0.0",
         debug=getattr(settings, "debug", False),
+        lifespan=lifespan,
     )
 
     #Instrumentação condicional com OpenTelemetry
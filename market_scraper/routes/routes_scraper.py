@@ -2,22 +2,29 @@
 
 Permite que serviços externos enviem uma URL e recebam de volta
 os dados estruturados do anúncio, sem qualquer persistência de dados.
+O endpoint em lote recebe várias URLs e devolve cada resultado em NDJSON
+assim que fica pronto.
 """
 
 from __future__ import annotations
 
+import asyncio
 from decimal import Decimal
-from typing import Literal
+from typing import AsyncIterator, Literal
 from uuid import UUID
 
+import structlog
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, HttpUrl
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
 
-from scraper_app.services.services_scraper_common import _scrape_product_common
+from scraper_app.core.config import settings
+from scraper_app.services.services_scraper_common import scrape_product_coalesced
 from scraper_app.schemas import MonitoredProductCreateScraping, CompetitorProductCreateScraping
 from scraper_app.utils.price import parse_price_str, parse_optional_price_str
 
 
+logger = structlog.get_logger("routes_scraper")
 router = APIRouter(prefix="/scraper", tags=["scraper"])
 
 class ScrapeRequest(BaseModel):
@@ -26,21 +33,49 @@ class ScrapeRequest(BaseModel):
     url: HttpUrl
     product_type: Literal["monitored", "competitor"] = "monitored"
     user_id: UUID | None = None
+    #Validadores da última coleta para requisição condicional
+    etag: str | None = None
+    last_modified: str | None = None
+    #Idade máxima (segundos) aceita para servir do cache; 0 força novo scraping
+    max_age: int | None = Field(default=None, ge=0)
 
 class ScrapeResponse(BaseModel):
     """ Resposta com os dados extraídos do anúncio """
 
     name: str | None = None
-    current_price: float
+    current_price: float | None = None
     old_price: float | None = None
     thumbnail: str | None = None
     free_shipping: bool = False
     seller: str | None = None
     shipping: str | None = None
+    #Validadores da resposta e indicação de conteúdo inalterado (304)
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
 
-@router.post("/parse", response_model=ScrapeResponse)
-async def parse_endpoint(payload: ScrapeRequest) -> ScrapeResponse:
-    """ Executa o scraping e retorna apenas os dados parseados """
+class BatchScrapeRequest(BaseModel):
+    """ Corpo da requisição de scraping em lote """
+
+    items: list[ScrapeRequest] = Field(min_length=1, max_length=settings.SCRAPER_BATCH_MAX_ITEMS)
+    #Limite de scrapings simultâneos; o padrão vem de ``SCRAPER_BATCH_CONCURRENCY``
+    concurrency: int | None = Field(default=None, ge=1)
+
+class BatchScrapeItem(BaseModel):
+    """ Linha NDJSON com o resultado de um item do lote
+
+    ``status_code`` segue a semântica de ``/scraper/parse``: ``200`` com
+    ``data`` preenchido ou o código e ``detail`` do erro equivalente.
+    """
+
+    index: int
+    url: str
+    status_code: int
+    data: ScrapeResponse | None = None
+    detail: str | None = None
+
+async def scrape_one(payload: ScrapeRequest) -> ScrapeResponse:
+    """ Executa o scraping de uma URL e monta a resposta de ``/scraper/parse`` """
 
     if payload.product_type == "monitored":
         base_payload = MonitoredProductCreateScraping(
@@ -54,15 +89,25 @@ async def parse_endpoint(payload: ScrapeRequest) -> ScrapeResponse:
             product_url=payload.url,
         )
 
-    result = await _scrape_product_common(
+    result = await scrape_product_coalesced(
         url=str(payload.url),
         user_id=payload.user_id or UUID(int=0),
         payload=base_payload,
         product_type=payload.product_type,
+        etag=payload.etag,
+        last_modified=payload.last_modified,
+        max_age=payload.max_age,
     )
 
+    not_modified = result.get("status") == "not_modified"
     details = result.get("details")
     if not details:
+        if not_modified:
+            return ScrapeResponse(
+                etag=result.get("etag"),
+                last_modified=result.get("last_modified"),
+                not_modified=True,
+            )
         raise HTTPException(status_code=500, detail="Falha ao extrair dados")
 
     return ScrapeResponse(
@@ -75,4 +120,58 @@ async def parse_endpoint(payload: ScrapeRequest) -> ScrapeResponse:
         free_shipping=details.get("shipping") == "Frete Grátis",
         seller=details.get("seller"),
         shipping=details.get("shipping"),
+        etag=result.get("etag"),
+        last_modified=result.get("last_modified"),
+        not_modified=not_modified,
     )
+
+@router.post("/parse", response_model=ScrapeResponse)
+async def parse_endpoint(payload: ScrapeRequest) -> ScrapeResponse:
+    """ Executa o scraping e retorna apenas os dados parseados
+
+    Com ``etag``/``last_modified`` a coleta é condicional; se o anúncio não
+    mudou a resposta vem com ``not_modified`` e, sem dados em cache, apenas
+    com os validadores.
+    """
+    return await scrape_one(payload)
+
+async def _scrape_item(index: int, item: ScrapeRequest, slots: asyncio.Semaphore) -> BatchScrapeItem:
+    """ Executa um item do lote convertendo erros no resultado da linha """
+    async with slots:
+        try:
+            data = await scrape_one(item)
+        except HTTPException as exc:
+            return BatchScrapeItem(index=index, url=str(item.url), status_code=exc.status_code, detail=str(exc.detail))
+        except Exception as exc:
+            logger.error("batch_item_failed", url=str(item.url), error=str(exc))
+            return BatchScrapeItem(index=index, url=str(item.url), status_code=500, detail=str(exc))
+    return BatchScrapeItem(index=index, url=str(item.url), status_code=200, data=data)
+
+async def stream_batch(items: list[ScrapeRequest], concurrency: int) -> AsyncIterator[str]:
+    """ Gera uma linha NDJSON por item, na ordem em que os scrapings terminam
+
+    Throttle por host e pool de navegadores continuam valendo para cada item;
+    o semáforo apenas limita quantos scrapings do lote ficam em andamento.
+    Se o cliente desconectar, os itens pendentes são cancelados.
+    """
+    slots = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.create_task(_scrape_item(i, item, slots)) for i, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            yield result.model_dump_json() + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+
+@router.post("/parse/batch")
+async def parse_batch_endpoint(payload: BatchScrapeRequest) -> StreamingResponse:
+    """ Executa o scraping de várias URLs e transmite os resultados em NDJSON
+
+    Cada linha é um ``BatchScrapeItem``; ``index`` indica a posição do item
+    na requisição, já que as linhas chegam fora de ordem. Erros de um item
+    não interrompem o lote.
+    """
+    concurrency = min(payload.concurrency or settings.SCRAPER_BATCH_CONCURRENCY, settings.SCRAPER_BATCH_CONCURRENCY)
+    logger.info("batch_started", items=len(payload.items), concurrency=concurrency)
+    return StreamingResponse(stream_batch(payload.items, concurrency), media_type="application/x-ndjson")
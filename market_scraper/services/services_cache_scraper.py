@@ -3,11 +3,13 @@
 Este módulo concentra a lógica de reaproveitamento de cache com base no
 hash do HTML. Identificamos alterações de conteúdo e reutilizamos os
 dados armazenados em Redis sempre que o HTML não mudou para reduzir
-requisições desnecessárias.
+requisições desnecessárias. Respostas ``304`` de requisições condicionais
+também são atendidas com os dados já armazenados.
 """
 
 from __future__ import annotations
 
+import time
 from typing import Optional
 
 from utils.circuit_breaker import CircuitBreaker
@@ -19,13 +21,61 @@ from scraper_app.core.config import settings
 from scraper_app.utils.audit_logger import audit_scrape
 from alert_app.metrics import (
     CACHE_HITS_TOTAL, CACHE_MISSES_TOTAL,
-    CACHE_HITS_ENDPOINT_TOTAL, CACHE_MISSES_ENDPOINT_TOTAL
+    CACHE_HITS_ENDPOINT_TOTAL, CACHE_MISSES_ENDPOINT_TOTAL,
+    CACHE_FRESHNESS_TOTAL, CACHE_SERVED_AGE_SECONDS
 )
 
 
 logger = structlog.get_logger("scraper_common")
 cache_manager = IntelligentCacheManager(base_ttl=settings.CACHE_BASE_TTL)
 
+def use_fresh_cache(
+    target_url: str,
+    payload,
+    max_age: int | None = None,
+    endpoint: str | None = None
+) -> Optional[dict]:
+    """ Retorna os dados em cache antes de qualquer requisição, se ainda frescos
+
+    Entradas dentro do TTL adaptativo (ou de ``max_age``, quando informado)
+    dispensam throttle, atraso humano e navegador. Entradas vencidas
+    retornam ``None`` e seguem para o scraping normal.
+    """
+    if not settings.CACHE_SERVE_FRESH or max_age == 0:
+        return None
+
+    cached = cache_manager.get(target_url)
+    if not cached or not cached.get("data"):
+        CACHE_FRESHNESS_TOTAL.labels(result="miss").inc()
+        return None
+
+    if not cache_manager.is_fresh(cached, max_age):
+        CACHE_FRESHNESS_TOTAL.labels(result="stale").inc()
+        logger.info("cache_stale", url=target_url, max_age=max_age)
+        return None
+
+    CACHE_FRESHNESS_TOTAL.labels(result="fresh").inc()
+    CACHE_HITS_TOTAL.inc()
+    if endpoint:
+        CACHE_HITS_ENDPOINT_TOTAL.labels(endpoint=endpoint).inc()
+    if cached.get("stored_at") is not None:
+        CACHE_SERVED_AGE_SECONDS.observe(max(0.0, time.time() - cached["stored_at"]))
+    audit_scrape(
+        stage="cache_fresh",
+        url=target_url,
+        payload=payload.model_dump(),
+        html=None,
+        details=cached["data"],
+        error=None
+    )
+    logger.info("cache_fresh_hit", url=target_url)
+    return {
+        "status": "cached",
+        "details": cached["data"],
+        "etag": cached.get("etag"),
+        "last_modified": cached.get("last_modified"),
+    }
+
 def use_cache_if_not_modified(
     target_url: str,
     html: str | None,
@@ -69,6 +119,45 @@ def use_cache_if_not_modified(
     logger.info("cache_miss_after_hash", url=target_url)
     return None
 
-def update_cache(target_url: str, data: dict, html: str, etag: str | None) -> None:
-    """ Persistem no cache o HTML e os dados recém extraídos """
-    cache_manager.set(target_url, data, html, etag=etag)
+def use_cache_on_not_modified(
+    target_url: str,
+    payload,
+    circuit_breaker: CircuitBreaker,
+    circuit_key: str,
+    etag: str | None,
+    last_modified: str | None,
+    endpoint: str | None = None,
+    cached_data: dict | None = None
+) -> dict:
+    """ Responde a um ``304`` sem parsing, reaproveitando os dados em cache
+
+    Com validadores do chamador a resposta é ``not_modified``; quando o cache
+    já expirou, ``details`` vem vazio e o chamador continua com os dados que
+    possui. Com validadores lidos do cache (``cached_data``) o chamador não
+    tem dados próprios, então recebe os guardados como uma resposta normal.
+    """
+    data = cached_data or cache_manager.get_data(target_url)
+    if data:
+        CACHE_HITS_TOTAL.inc()
+        if endpoint:
+            CACHE_HITS_ENDPOINT_TOTAL.labels(endpoint=endpoint).inc()
+    audit_scrape(
+        stage="not_modified",
+        url=target_url,
+        payload=payload.model_dump(),
+        html=None,
+        details=data,
+        error=None
+    )
+    circuit_breaker.record_success(circuit_key)
+    logger.info("not_modified", url=target_url, cached=bool(data))
+    return {
+        "status": "not_modified" if cached_data is None else "cached",
+        "details": data,
+        "etag": etag,
+        "last_modified": last_modified,
+    }
+
+def update_cache(target_url: str, data: dict, html: str, etag: str | None, last_modified: str | None = None) -> None:
+    """ Persistem no cache o HTML, os dados recém extraídos e os validadores da resposta """
+    cache_manager.set(target_url, data, html, etag=etag, last_modified=last_modified)
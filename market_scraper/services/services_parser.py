@@ -3,63 +3,279 @@
 Este módulo reúne funções de apoio e o ``RobustProductParser`` que implementa
 variáveis estratégicas de coleta de dados em páginas do Mercado Livre. Cada
 estratégia fornece um ``score`` indicando a confiança da extração.
+
+O HTML é analisado uma única vez por ``ParseContext``, que memoiza o
+documento, os blocos de script, o JSON decodificado (e seu índice de
+chaves) e o texto da página para a verificação de página de produto e para
+todas as estratégias.
 """
 
 import re
-import json
-from typing import Any, Dict, Tuple, Iterable
+import time
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 
+from scraper_app.utils.script_extractor import (
+    extract_meta,
+    first_element_text,
+    has_element,
+    iter_scripts,
+    loads,
+    to_text,
+    visible_text,
+)
+
 from scraper_app.utils.data_quality_validator import DataQualityValidator
-from alert_app.metrics import PARSER_SUCCESS_TOTAL, PARSER_FAILURE_TOTAL
-
-
-def _deep_search(data: Any, keys: Iterable[str]) -> Any:
-    """ Busca recursivamente pela primeira ocorrência de qualquer chave """
-    stack = [data]
-    while stack:
-        current = stack.pop()
-        if isinstance(current, dict):
-            for k, v in current.items():
-                if k in keys:
-                    return v
-                stack.append(v)
-        elif isinstance(current, list):
-            stack.extend(current)
-    return None
+from scraper_app.utils.json_index import JsonLookup, PathCache
+from scraper_app.utils.strategy_stats import strategy_stats
+from scraper_app.utils.metrics_buffer import record_metric, register_metrics
+from alert_app.metrics import (
+    PARSER_SUCCESS_TOTAL,
+    PARSER_FAILURE_TOTAL,
+    PARSER_FAST_PATH_TOTAL,
+    PARSER_STRATEGY_RUNS_TOTAL,
+    PARSER_STRATEGY_LATENCY_SECONDS,
+)
+
+#O parse pode rodar em processos filhos do ``ParseExecutor``; as métricas voltam ao pai pelo nome
+register_metrics(
+    PARSER_SUCCESS_TOTAL,
+    PARSER_FAILURE_TOTAL,
+    PARSER_FAST_PATH_TOTAL,
+    PARSER_STRATEGY_RUNS_TOTAL,
+    PARSER_STRATEGY_LATENCY_SECONDS,
+)
+
+
+#Grupos de chaves procurados no JSON embutido, na ordem de preferência
+TITLE_KEYS = ("title", "name")
+PRICE_KEYS = ("price", "priceDisplay", "amount")
+OLD_PRICE_KEYS = ("original_price", "regular_price", "listPrice")
+SELLER_KEYS = ("seller", "sellerName", "nickname")
+THUMBNAIL_KEYS = ("thumbnail", "picture", "image", "url")
+_INDEXED_KEYS = TITLE_KEYS + PRICE_KEYS + OLD_PRICE_KEYS + SELLER_KEYS + THUMBNAIL_KEYS
+
+#Caminhos aprendidos por layout, compartilhados pelas páginas do processo
+path_cache = PathCache()
+
+_PRELOADED_STATE_RE = re.compile(r"__PRELOADED_STATE__\s*=\s*(\{.*?\})\s*;", re.DOTALL)
+
+class ParseContext:
+    """ Página analisada uma única vez e compartilhada entre verificações e estratégias
+
+    Cada atributo é calculado na primeira leitura e reaproveitado depois.
+    Blocos ``<script>``, JSON embutido e meta tags vêm direto do HTML bruto
+    (``script_extractor``); o ``BeautifulSoup`` só é construído quando uma
+    leitura depende do DOM (texto da página, ``<h1>`` e seletores de
+    vendedor) e ``dom`` está habilitado.
+    """
+
+    def __init__(self, html: Union[str, bytes], soup: Optional[BeautifulSoup] = None) -> None:
+        self.html = to_text(html)
+        if soup is not None:
+            self.__dict__["soup"] = soup
+        #Com ``dom`` desabilitado as leituras usam apenas o HTML bruto
+        self.dom = True
+        #JSON decodificado por conteúdo bruto; ``None`` marca conteúdo inválido
+        self._decoded: Dict[str, Any] = {}
+        #Leituras que dependem do modo, por ``(nome, dom)``
+        self._by_mode: Dict[Tuple[str, bool], Any] = {}
+        #Consultas indexadas por ``(conteúdo bruto, estratégia)``
+        self._lookups: Dict[Tuple[str, str], Optional[JsonLookup]] = {}
+
+    @classmethod
+    def from_soup(cls, soup: BeautifulSoup) -> "ParseContext":
+        """ Cria o contexto a partir de um documento já construído """
+        return cls(str(soup), soup=soup)
+
+    @contextmanager
+    def raw_only(self) -> Iterator["ParseContext"]:
+        """ Desabilita o DOM durante o bloco (caminho rápido do parser) """
+        previous, self.dom = self.dom, False
+        try:
+            yield self
+        finally:
+            self.dom = previous
+
+    @property
+    def has_dom(self) -> bool:
+        """ Indica se o ``BeautifulSoup`` já foi construído """
+        return "soup" in self.__dict__
+
+    @cached_property
+    def lower(self) -> str:
+        return self.html.lower()
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "html.parser")
+
+    @cached_property
+    def _script_blocks(self) -> List[Tuple[Dict[str, str], str]]:
+        return list(iter_scripts(self.html, self.lower))
+
+    @cached_property
+    def scripts(self) -> List[str]:
+        """ Conteúdo de todos os blocos ``<script>``, na ordem do documento """
+        return [body for _, body in self._script_blocks]
+
+    @cached_property
+    def meta(self) -> Dict[str, str]:
+        """ Meta tags por ``property``/``name`` """
+        return extract_meta(self.html)
+
+    @cached_property
+    def json_ld(self) -> List[Any]:
+        """ Blocos ``application/ld+json`` decodificados, ignorando os inválidos """
+        blocks = []
+        for attrs, body in self._script_blocks:
+            if attrs.get("type", "").lower() != "application/ld+json":
+                continue
+            data = self.decode(body.strip() or "{}")
+            if data is not None:
+                blocks.append(data)
+        return blocks
+
+    @cached_property
+    def preloaded_states(self) -> List[str]:
+        """ Objetos ``__PRELOADED_STATE__`` (brutos) encontrados nos scripts """
+        states = []
+        for text in self.scripts:
+            if not text or "__PRELOADED_STATE__" not in text:
+                continue
+            match = _PRELOADED_STATE_RE.search(text)
+            if match:
+                states.append(match.group(1))
+        return states
+
+    @cached_property
+    def json_scripts(self) -> List[str]:
+        """ Scripts com JSON embutido: ``__PRELOADED_STATE__`` ou um objeto puro """
+        blocks = []
+        for text in self.scripts:
+            if not text:
+                continue
+            if "__PRELOADED_STATE__" in text:
+                match = _PRELOADED_STATE_RE.search(text)
+                if match:
+                    blocks.append(match.group(1))
+            elif text.strip().startswith("{") and text.strip().endswith("}"):
+                blocks.append(text.strip())
+        return blocks
+
+    @cached_property
+    def next_data(self) -> Optional[str]:
+        """ Conteúdo do script ``__NEXT_DATA__`` das páginas ``/p/`` """
+        for attrs, body in self._script_blocks:
+            if attrs.get("id") == "__NEXT_DATA__":
+                return body or None
+        return None
+
+    @cached_property
+    def layout(self) -> str:
+        """ Impressão digital do layout pelas fontes de dados embutidas, sem decodificar JSON """
+        parts = []
+        if any(attrs.get("type", "").lower() == "application/ld+json" for attrs, _ in self._script_blocks):
+            parts.append("ld")
+        if self.preloaded_states:
+            parts.append("state")
+        if self.next_data:
+            parts.append("next")
+        return "+".join(parts) or "html"
+
+    @property
+    def og_image(self) -> Optional[str]:
+        return self.meta.get("og:image") or None
+
+    def _mode_value(self, name: str, from_dom: Callable[[], Any], from_raw: Callable[[], Any]) -> Any:
+        key = (name, self.dom)
+        if key not in self._by_mode:
+            self._by_mode[key] = from_dom() if self.dom else from_raw()
+        return self._by_mode[key]
+
+    @property
+    def text(self) -> str:
+        """ Texto visível da página em minúsculas; sem DOM, recortado do HTML bruto """
+        return self._mode_value(
+            "text",
+            lambda: self.soup.get_text(separator=" ", strip=True).lower(),
+            lambda: visible_text(self.html).lower(),
+        )
+
+    @property
+    def h1(self) -> Optional[str]:
+        def from_dom():
+            h1 = self.soup.find("h1")
+            return h1.get_text(strip=True) if h1 else None
+        return self._mode_value("h1", from_dom, lambda: first_element_text(self.html, "h1"))
+
+    def lookup(self, raw: str, scope: str) -> Optional[JsonLookup]:
+        """ Consultas indexadas sobre o JSON de ``raw``; ``None`` se for inválido
+
+        O índice é montado uma única vez por bloco e reaproveitado entre o
+        caminho rápido e o do DOM. ``scope`` separa os caminhos aprendidos
+        de cada estratégia.
+        """
+        key = (raw.strip(), scope)
+        if key not in self._lookups:
+            data = self.decode(raw)
+            self._lookups[key] = None if data is None else JsonLookup(data, f"{scope}:{self.layout}", _INDEXED_KEYS, path_cache)
+        return self._lookups[key]
+
+    def decode(self, raw: str) -> Any:
+        """ Decodifica ``raw`` uma única vez; retorna ``None`` se for inválido """
+        #Espaços nas bordas não mudam o JSON e variam conforme a origem do bloco
+        raw = raw.strip()
+        if raw not in self._decoded:
+            try:
+                self._decoded[raw] = loads(raw)
+            except ValueError:
+                self._decoded[raw] = None
+        return self._decoded[raw]
+
+PageSource = Union[str, bytes, BeautifulSoup, ParseContext]
+
+def as_parse_context(source: PageSource) -> ParseContext:
+    """ Normaliza HTML, ``BeautifulSoup`` ou contexto em um ``ParseContext`` """
+    if isinstance(source, ParseContext):
+        return source
+    if isinstance(source, BeautifulSoup):
+        return ParseContext.from_soup(source)
+    return ParseContext(source)
 
 class CaptchaDetectedError(RuntimeError):
     """ Exceção lançada quando o HTML indica um captcha """
     pass
 
-def looks_like_product_page(html: str) -> bool:
-    """ Retorna ``True`` se o HTML possui elementos típicos de uma página de produto """
-    soup = BeautifulSoup(html, "html.parser")
+def looks_like_product_page(html: PageSource) -> bool:
+    """ Retorna ``True`` se o HTML possui elementos típicos de uma página de produto
+
+    As verificações usam apenas o HTML bruto, sem construir o DOM.
+    """
+    ctx = as_parse_context(html)
 
     #Indicadores de página de listagem devem retornar ``False`` imediatamente
-    if soup.select_one(".ui-search-layout"):
+    if has_element(ctx.html, r"\w+", "ui-search-layout"):
         return False
 
-    og_type = soup.find("meta", property="og:type")
-    if og_type and og_type.get("content") != "product":
+    og_type = ctx.meta.get("og:type")
+    if og_type is not None and og_type != "product":
         return False
 
     #Elemento de título padrão (algumas páginas usam 'tittle' por engano)
-    if soup.select_one("h1.ui-pdp-title") or soup.select_one("h1.ui-pdp-tittle"):
+    if has_element(ctx.html, "h1", "ui-pdp-title") or has_element(ctx.html, "h1", "ui-pdp-tittle"):
         return True
 
     #Meta tag de produto no OpenGraph
-    if og_type and og_type.get("content") == "product":
+    if og_type == "product":
         return True
 
     #JSON-LD com tipo Product
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(script.string or "{}")
-        except json.JSONDecodeError:
-            continue
-
+    for data in ctx.json_ld:
         if isinstance(data, list):
             if any(isinstance(d, dict) and d.get("@type") == "Product" for d in data):
                 return True
@@ -68,9 +284,25 @@ def looks_like_product_page(html: str) -> bool:
 
     return False
 
-def extract_shipping(soup: BeautifulSoup) -> str:
+#Marcadores dos blocos de script lidos pelas estratégias do ``ProductParser``
+EMBEDDED_DATA_MARKERS = ("application/ld+json", "__PRELOADED_STATE__", "__NEXT_DATA__")
+
+def has_embedded_product_data(html: str) -> bool:
+    """ Indica se o HTML cru já traz os dados usados pelo parser
+
+    Verificação apenas textual, barata o bastante para decidir se o HTML
+    obtido via HTTP dispensa a renderização no navegador.
+    """
+    if not html:
+        return False
+    lower = html.lower()
+    if "captcha" in lower or "digite os caracteres" in lower:
+        return False
+    return any(marker.lower() in lower for marker in EMBEDDED_DATA_MARKERS)
+
+def extract_shipping(soup: PageSource) -> str:
     """ Tenta identificar se o anúncio oferece frete grátis """
-    text = soup.get_text(separator=" ", strip=True).lower()
+    text = as_parse_context(soup).text
     if "frete grátis" in text or "frete gratuito" in text:
         return "Frete Grátis"
     return "Não informado"
@@ -85,16 +317,18 @@ def format_decimal_price(raw: str) -> str:
     return f"R$ {formatted}"
 
 # ---------- EXTRAIR VENDEDOR ----------
-def extrair_seller(soup: BeautifulSoup) -> str:
+def extrair_seller(soup: PageSource) -> str:
     """ Tenta identificar o vendedor responsável pelo anúncio em diversas abordagens """
+    ctx = as_parse_context(soup)
     #Primeira tentativa: buscar em scripts JSON-LD embutidos na página
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(script.string or "{}")
-            if seller := (data.get("seller") or {}).get("name"):
-                return seller
-        except json.JSONDecodeError:
-            continue
+    for data in ctx.json_ld:
+        if isinstance(data, dict) and (seller := (data.get("seller") or {}).get("name")):
+            return seller
+
+    #Os seletores abaixo exigem o DOM, fora do caminho rápido
+    if not ctx.dom:
+        return "Não informado"
+    soup = ctx.soup
 
     #Link direto exibido no template principal
     elem = soup.select_one("a.ui-pdp-seller__link-trigger")
@@ -109,12 +343,16 @@ def extrair_seller(soup: BeautifulSoup) -> str:
     return "Não informado"
 
 # ---------- EXTRAIR DETALHES DO ANUNCIO ----------
+#Estratégias na ordem padrão, da maior para a menor pontuação
+STRATEGIES = ("preloaded_state", "json_ld", "p_page")
+
 class ProductParser:
     """Parser que combina múltiplas estratégias de extração
 
     Cada método `` _from_*`` tenta obter os mesmos campos a partir de diferentes
-    fontes do HTML e retorna uma pontuação de confiança. O parser executa todas
-    as estratégias e escolhe o resultado mais completo.
+    fontes do HTML e retorna uma pontuação de confiança. O parser executa as
+    estratégias na ordem aprendida para o host e layout da página e para no
+    primeiro resultado aprovado pelo ``DataQualityValidator``.
     """
 
     def __init__(self) -> None:
@@ -129,14 +367,9 @@ class ProductParser:
         self._validator = DataQualityValidator(self.required_fields)
 
     #--- ESTRATÉGIAS DE EXTRAÇÃO ---
-    def _from_json_ld(self, soup: BeautifulSoup) -> Tuple[float, Dict[str, Any]]:
+    def _from_json_ld(self, ctx: ParseContext) -> Tuple[float, Dict[str, Any]]:
         """ Extrai informações de scripts ``JSON-LD`` encontrados na página """
-        for script in soup.find_all("script", type="application/ld+json"):
-            try:
-                data = json.loads(script.string or "{}")
-            except json.JSONDecodeError:
-                continue
-
+        for data in ctx.json_ld:
             if isinstance(data, list):
                 for entry in data:
                     if isinstance(entry, dict) and entry.get("@type") == "Product":
@@ -153,110 +386,83 @@ class ProductParser:
                 elif isinstance(data.get("image"), str):
                     image = data.get("image")
                 if not image:
-                    og_tag = soup.find("meta", property="og:image")
-                    image = og_tag.get("content") if og_tag and og_tag.get("content") else None
+                    image = ctx.og_image
                 name = data.get("name") or data.get("headline")
                 if not name:
-                    h1 = soup.find("h1")
-                    name = h1.get_text(strip=True) if h1 else "Nome não encontrado"
+                    name = ctx.h1 or "Nome não encontrado"
 
                 result = {
                     "name": name,
                     "current_price": format_decimal_price(str(price)) if price else None,
                     "old_price": format_decimal_price(str(old)) if old else None,
-                    "shipping": extract_shipping(soup),
-                    "seller": (data.get("seller") or {}).get("name") or extrair_seller(soup),
+                    "shipping": extract_shipping(ctx),
+                    "seller": (data.get("seller") or {}).get("name") or extrair_seller(ctx),
                     "thumbnail": image
                 }
                 return 0.9, result
         return 0.0, {}
 
-    def _from_preloaded_state(self, soup: BeautifulSoup) -> Tuple[float, Dict[str, Any]]:
+    def _from_preloaded_state(self, ctx: ParseContext) -> Tuple[float, Dict[str, Any]]:
         """ Extrai dados do objeto ``__PRELOADED_STATE__`` injetado via JavaScript """
-        scripts: list[str] = []
-        for sc in soup.find_all("script"):
-            text = sc.string or sc.get_text()
-            if not text or "__PRELOADED_STATE__" not in text:
+        for raw in ctx.preloaded_states:
+            data = ctx.lookup(raw, "preloaded_state")
+            if data is None:
                 continue
-            match = re.search(r"__PRELOADED_STATE__\s*=\s*(\{.*?\})\s*;", text, re.DOTALL)
-            if match:
-                scripts.append(match.group(1))
 
-        for raw in scripts:
-            try:
-                data = json.loads(raw)
-            except json.JSONDecodeError:
-                continue
-
-            name = _deep_search(data, ["title", "name"])
+            name = data.find(TITLE_KEYS)
             if not name:
-                h1 = soup.find("h1")
-                name = h1.get_text(strip=True) if h1 else None
-            price = _deep_search(data, ["price", "priceDisplay", "amount"])
-            seller_info = _deep_search(data, ["seller", "sellerName", "nickname"])
+                name = ctx.h1
+            price = data.find(PRICE_KEYS)
+            seller_info = data.find(SELLER_KEYS)
             if isinstance(seller_info, dict):
                 seller = seller_info.get("name") or seller_info.get("nickname")
             else:
                 seller = seller_info
             if not seller:
-                seller = extrair_seller(soup)
+                seller = extrair_seller(ctx)
 
-            thumb = _deep_search(data, ["thumbnail", "picture", "image", "url"])
+            thumb = data.find(THUMBNAIL_KEYS)
             if isinstance(thumb, list):
                 first = thumb[0]
                 thumb = first.get("url") if isinstance(first, dict) else first
             if not thumb:
-                og_tag = soup.find("meta", property="og:image")
-                thumb = og_tag.get("content") if og_tag and og_tag.get("content") else None
+                thumb = ctx.og_image
 
             result = {
                 "name": name or "Nome não encontrado",
                 "current_price": format_decimal_price(str(price)) if price else None,
                 "old_price": None,
-                "shipping": extract_shipping(soup),
-                "seller": seller or extrair_seller(soup),
+                "shipping": extract_shipping(ctx),
+                "seller": seller or extrair_seller(ctx),
                 "thumbnail": thumb
             }
             if price or name:
                 return 0.95, result
         return 0.0, {}
 
-    def _from_p_page(self, soup: BeautifulSoup) -> Tuple[float, Dict[str, Any]]:
+    def _from_p_page(self, ctx: ParseContext) -> Tuple[float, Dict[str, Any]]:
         """ Extrai dados de páginas no formato ``/p/`` com JSON embutido """
         scripts: list[str] = []
-        tag = soup.find("script", id="__NEXT_DATA__")
-        if tag and tag.string:
-            scripts.append(tag.string)
-
-        for sc in soup.find_all("script"):
-            text = sc.string or sc.get_text()
-            if not text:
-                continue
-            if "__PRELOADED_STATE__" in text:
-                match = re.search(r"__PRELOADED_STATE__\s*=\s*(\{.*?\})\s*;", text, re.DOTALL)
-                if match:
-                    scripts.append(match.group(1))
-            elif text.strip().startswith("{") and text.strip().endswith("}"):
-                scripts.append(text.strip())
+        if ctx.next_data:
+            scripts.append(ctx.next_data)
+        scripts.extend(ctx.json_scripts)
 
         for raw in scripts:
-            try:
-                data = json.loads(raw)
-            except json.JSONDecodeError:
+            data = ctx.lookup(raw, "p_page")
+            if data is None:
                 continue
 
-            name = _deep_search(data, ["title", "name"])
+            name = data.find(TITLE_KEYS)
             if not name:
-                h1 = soup.find("h1")
-                name = h1.get_text(strip=True) if h1 else "Nome não encontrado"
-            price = _deep_search(data, ["price", "priceDisplay", "amount"])
-            old = _deep_search(data, ["original_price", "regular_price", "listPrice"])
-            seller_info = _deep_search(data, ["seller", "sellerName", "nickname"])
+                name = ctx.h1 or "Nome não encontrado"
+            price = data.find(PRICE_KEYS)
+            old = data.find(OLD_PRICE_KEYS)
+            seller_info = data.find(SELLER_KEYS)
             if isinstance(seller_info, dict):
                 seller = seller_info.get("name") or seller_info.get("nickname")
             else:
                 seller = seller_info
-            thumb = _deep_search(data, ["thumbnail", "picture", "image", "url"])
+            thumb = data.find(THUMBNAIL_KEYS)
             if isinstance(thumb, list):
                 first = thumb[0]
                 if isinstance(first, dict):
@@ -268,58 +474,104 @@ class ProductParser:
                 "name": name,
                 "current_price": format_decimal_price(str(price)) if price else None,
                 "old_price": format_decimal_price(str(old)) if old else None,
-                "shipping": extract_shipping(soup),
-                "seller": seller or extrair_seller(soup),
+                "shipping": extract_shipping(ctx),
+                "seller": seller or extrair_seller(ctx),
                 "thumbnail": thumb
             }
             if any(result.values()):
                 return 0.85, result
         return 0.0, {}
 
-    def parse(self, html: str, url: str) -> Dict[str, Any]:
-        """ Executa todas as estratégias e retorna o melhor resultado. """
-        lower = html.lower()
-        if "captcha" in lower or "digite os caracteres" in lower:
-            raise CaptchaDetectedError("CAPTCHA detectado ou bloqueio humano")
-
-        soup = BeautifulSoup(html, "html.parser")
-        strategies = [
-            lambda: self._from_preloaded_state(soup),
-            lambda: self._from_json_ld(soup),
-            lambda: self._from_p_page(soup),
-        ]
-
-        results = []
-        for strat in strategies:
-            score, data = strat()
-            if data:
-                data["url"] = url
-                results.append((score, data))
-
-        if not results:
-            raise ValueError("Nenhuma estratégia retornou dados")
-
-        results.sort(key=lambda x: x[0], reverse=True)
-        for _, data in results:
+    @staticmethod
+    def strategy_key(ctx: ParseContext, url: str) -> str:
+        """ Chave ``host|layout`` usada para aprender a ordem das estratégias """
+        parsed = urlparse(url)
+        kind = "p" if "/p/" in parsed.path else "item"
+        return f"{parsed.hostname or ''}|{kind}:{ctx.layout}"
+
+    def _run_strategies(
+        self, ctx: ParseContext, url: str, order: Sequence[str] = STRATEGIES
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], List[Tuple[float, Dict[str, Any]]]]:
+        """ Executa as estratégias na ordem dada e para no primeiro resultado válido
+
+        Retorna o nome da estratégia vencedora, seus dados e os resultados
+        rejeitados pelo ``DataQualityValidator``.
+        """
+        rejected: List[Tuple[float, Dict[str, Any]]] = []
+        for name in order:
+            started = time.perf_counter()
+            score, data = getattr(self, f"_from_{name}")(ctx)
+            record_metric(PARSER_STRATEGY_LATENCY_SECONDS, "observe", time.perf_counter() - started, strategy=name)
+            if not data:
+                record_metric(PARSER_STRATEGY_RUNS_TOTAL, "inc", strategy=name, outcome="empty")
+                continue
+            data["url"] = url
             try:
                 self._validator.validate(data)
-                PARSER_SUCCESS_TOTAL.inc()
-                return data
             except ValueError:
-                PARSER_FAILURE_TOTAL.inc()
+                record_metric(PARSER_STRATEGY_RUNS_TOTAL, "inc", strategy=name, outcome="invalid")
+                rejected.append((score, data))
                 continue
+            record_metric(PARSER_STRATEGY_RUNS_TOTAL, "inc", strategy=name, outcome="win")
+            return name, data, rejected
+        return None, None, rejected
+
+    def parse(self, html: PageSource, url: str) -> Dict[str, Any]:
+        """ Executa as estratégias e retorna o primeiro resultado válido.
+
+        ``html`` pode ser um ``ParseContext`` já usado por
+        ``looks_like_product_page``, evitando uma nova análise do documento.
+        A estratégia que mais venceu para o host e layout da página roda
+        primeiro. As estratégias rodam primeiro apenas sobre o HTML bruto; o
+        DOM só é construído quando nenhum desses resultados passa na validação.
+        """
+        ctx = as_parse_context(html)
+        lower = ctx.lower
+        if "captcha" in lower or "digite os caracteres" in lower:
+            raise CaptchaDetectedError("CAPTCHA detectado ou bloqueio humano")
 
-        best = results[0][1]
-        self._validator.validate(best)
-        PARSER_SUCCESS_TOTAL.inc()
-        return best
+        key = self.strategy_key(ctx, url)
+        order = strategy_stats.order(key, STRATEGIES)
+
+        #Caminho rápido: scripts e meta tags recortados do HTML, sem BeautifulSoup
+        with ctx.raw_only():
+            winner, data, _ = self._run_strategies(ctx, url, order)
+        record_metric(PARSER_FAST_PATH_TOTAL, "inc", outcome="hit" if data is not None else "miss")
+
+        if data is None:
+            winner, data, rejected = self._run_strategies(ctx, url, order)
+            record_metric(PARSER_FAILURE_TOTAL, "inc", len(rejected))
+            if data is None:
+                if not rejected:
+                    raise ValueError("Nenhuma estratégia retornou dados")
+                #Nenhum resultado válido: o de maior pontuação explica a falha
+                best = max(rejected, key=lambda x: x[0])[1]
+                self._validator.validate(best)
+                data = best
+
+        strategy_stats.record_win(key, winner)
+        record_metric(PARSER_SUCCESS_TOTAL, "inc")
+        return data
 
 #--- API DE ALTO NÍVEL ---
 class RobustProductParser(ProductParser):
     """ Alias de ``ProductParser`` para retrocompatibilidade """
     pass
 
-def parse_product_details(html: str, url: str) -> Dict[str, Any]:
+def parse_product_details(html: PageSource, url: str) -> Dict[str, Any]:
     """ Instancia ``RobustProductParser`` e executa o parse """
     parser = RobustProductParser()
     return parser.parse(html, url)
+
+def parse_page(html: PageSource, url: str, check_product: bool = True) -> Optional[Dict[str, Any]]:
+    """ Verifica e interpreta a página em uma única chamada
+
+    Ponto de entrada usado pelo executor de parsing: recebe o HTML (de
+    preferência em ``bytes``, barato de serializar para outro processo) e
+    monta o ``ParseContext`` no próprio worker. Retorna ``None`` quando a
+    página não é de produto.
+    """
+    page = as_parse_context(html)
+    if check_product and not looks_like_product_page(page):
+        return None
+    return parse_product_details(page, url)
@@ -12,6 +12,7 @@ from uuid import UUID
 from datetime import datetime, timezone
 
 import asyncio
+import time
 import structlog
 
 from fastapi import HTTPException, status
@@ -22,7 +23,9 @@ from scraper_app.core.config import settings
 from utils.circuit_breaker import CircuitBreaker
 from utils.redis_client import get_redis_client, is_scraping_suspended, suspend_scraping
 from utils.rate_limiter import RateLimiter
+from utils.host_token_bucket import HostTokenBucket
 from utils.ml_url import canonicalize_ml_url, is_product_url
+from utils.worker_loop import run_coroutine
 
 from scraper_app.utils.constants import to_mobile_url, THROTTLE_RATE, THROTTLE_CAPACITY, JITTER_RANGE, PRODUCT_HOSTS
 from scraper_app.utils.user_agent_manager import IntelligentUserAgentManager
@@ -36,11 +39,15 @@ from scraper_app.utils.price import parse_price_str
 from scraper_app.utils.robots_txt import RobotsTxtParser
 from scraper_app.utils.cookie_manager import cookie_manager
 from scraper_app.utils.playwright_client import get_playwright_client
+from scraper_app.utils.http_fetcher import HttpFetcher, FetchedPage
+from scraper_app.utils.single_flight import SingleFlight
+from scraper_app.utils.parse_executor import parse_executor
+from scraper_app.utils.html_snapshots import html_snapshots
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 import scraper_app.services.services_parser as parser
 from scraper_app.services.services_parser import CaptchaDetectedError
-from scraper_app.services.services_cache_scraper import use_cache_if_not_modified, update_cache
+from scraper_app.services.services_cache_scraper import cache_manager, use_fresh_cache, use_cache_if_not_modified, use_cache_on_not_modified, update_cache
 from scraper_app.schemas.schemas_products import MonitoredProductCreateScraping, CompetitorProductCreateScraping
 from scraper_app.metrics import (
     SCRAPER_HTTP_BLOCKED_TOTAL,
@@ -49,17 +56,44 @@ from scraper_app.metrics import (
     SCRAPER_RESPONSE_SIZE_BYTES,
     SCRAPER_URL_STATUS_TOTAL,
 )
+from alert_app.metrics import SCRAPER_FETCH_TIER_TOTAL, SCRAPER_FETCH_TIER_LATENCY_SECONDS
 
 
 logger = structlog.get_logger("scraper_common")
 #Conexão Redis usada para cache e controle
 redis_client = get_redis_client()
 
-#ClienteHTTP é criado dinamicamente por requisição
-
 #Gerenciador de User-Agent com rotação inteligente
 ua_manager = IntelligentUserAgentManager()
 
+#Cliente HTTP com conexões keep-alive reaproveitadas entre scrapings
+http_fetcher = HttpFetcher(ua_manager=ua_manager, cookie_manager=cookie_manager)
+
+#Token bucket por host compartilhado entre réplicas, criado no primeiro uso
+_host_bucket: HostTokenBucket | None = None
+
+def get_host_bucket() -> HostTokenBucket:
+    """ Retorna o token bucket distribuído por host do processo """
+    global _host_bucket
+    if _host_bucket is None:
+        _host_bucket = HostTokenBucket(
+            rate=THROTTLE_RATE,
+            capacity=THROTTLE_CAPACITY,
+            max_wait=settings.HOST_BUCKET_MAX_WAIT,
+            penalty_ttl=settings.HOST_BUCKET_PENALTY_TTL,
+            redis=redis_client,
+        )
+    return _host_bucket
+
+#Coalesce scrapings simultâneos do mesmo anúncio no processo e entre réplicas
+single_flight = SingleFlight(redis=redis_client)
+
+def penalize_host(host: str) -> None:
+    """ Reduz a taxa compartilhada do host após um bloqueio """
+    if settings.HOST_BUCKET_ENABLED:
+        factor = get_host_bucket().penalize(host)
+        logger.info("host_rate_reduced", url_host=host, factor=factor)
+
 async def fetch_html_playwright(url: str) -> str:
     """ Retorna apenas o HTML da ``url`` utilizando Playwright
 
@@ -70,6 +104,35 @@ async def fetch_html_playwright(url: str) -> str:
         html = await client.fetch_html(url)
         return html
 
+async def fetch_html(url: str, etag: str | None = None, last_modified: str | None = None) -> FetchedPage:
+    """ Obtém o HTML via HTTP simples e recorre ao Playwright só quando necessário
+
+    O navegador é usado quando a resposta HTTP falha, é bloqueada ou não traz
+    os dados embutidos lidos pelo parser. Com ``etag``/``last_modified`` a
+    requisição HTTP é condicional e pode retornar ``not_modified``. Erros do
+    Playwright são propagados para o tratamento de bloqueios do fluxo principal.
+    """
+    if settings.HTTP_FETCH_ENABLED:
+        page = await http_fetcher.fetch_html(
+            url,
+            parser.has_embedded_product_data,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        if page is not None:
+            return page
+
+    start = time.monotonic()
+    try:
+        html = await fetch_html_playwright(url)
+    except Exception:
+        SCRAPER_FETCH_TIER_TOTAL.labels(tier="browser", outcome="error").inc()
+        raise
+    finally:
+        SCRAPER_FETCH_TIER_LATENCY_SECONDS.labels(tier="browser").observe(time.monotonic() - start)
+    SCRAPER_FETCH_TIER_TOTAL.labels(tier="browser", outcome="success").inc()
+    return FetchedPage(html=html)
+
 async def _scrape_product_common(
         *,
         url: str,
@@ -78,12 +141,20 @@ async def _scrape_product_common(
         product_type: Literal["monitored", "competitor"],
         rate_limiter: RateLimiter | None = None,
         circuit_breaker: CircuitBreaker | None = None,
-        recovery_manager: BlockRecoveryManager | None = None
+        recovery_manager: BlockRecoveryManager | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        max_age: int | None = None
 ) -> dict:
-    """ Executa o fluxo assíncrono de scraping usando Playwright
+    """ Executa o fluxo assíncrono de scraping via HTTP com fallback para o Playwright
 
     A função não realiza qualquer persistência em banco de dados,
-    retornando apenas os dados extraídos do anúncio.
+    retornando apenas os dados extraídos do anúncio. Entradas de cache
+    ainda frescas (TTL adaptativo ou ``max_age``) são devolvidas antes de
+    qualquer requisição. ``etag`` e ``last_modified`` são os validadores
+    conhecidos pelo chamador; sem eles são usados os do cache. Se o site
+    responder ``304`` o parsing é dispensado e o resultado vem com status
+    ``not_modified``.
     """
     if product_type == "monitored":
         rate_limiter = rate_limiter or RateLimiter(
@@ -117,6 +188,20 @@ async def _scrape_product_common(
 
     url_host = extract_hostname(url)
 
+    original_url = str(url)
+    target_url = to_mobile_url(original_url)
+
+    #Cache ainda fresco dispensa throttle, atraso humano e navegador
+    fresh_result = use_fresh_cache(
+        target_url=target_url,
+        payload=payload,
+        max_age=max_age,
+        endpoint=f"{product_type}_scrape",
+    )
+    if fresh_result:
+        SCRAPER_URL_STATUS_TOTAL.labels(url_host=url_host, status="success").inc()
+        return fresh_result
+
     if is_scraping_suspended():
         if product_type == "competitor":
             logger.warning("scraping_suspended", url=str(url), user_id=str(user_id))
@@ -135,8 +220,6 @@ async def _scrape_product_common(
             detail=f"Scraping suspenso temporariamente por falhas repetitivas {url}" if product_type == "competitor" else f"Scraping suspenso temporariamente por falhas repetitivas em {url}"
         )
 
-    original_url = str(url)
-    target_url = to_mobile_url(original_url)
     url_host = extract_hostname(target_url)
 
     #Respeita eventuais diretivas de robots.txt
@@ -146,17 +229,44 @@ async def _scrape_product_common(
         throttle.jitter_min = delay * 0.5
         throttle.jitter_max = delay * 1.5
 
-    human_delay.wait(None)
-    throttle.wait(identifier="get", circuit_key=circuit_key)
+    #Validadores para a requisição condicional (If-None-Match/If-Modified-Since)
+    #Sem validadores do chamador usa os do cache, lidos junto dos dados que respondem a um 304
+    cached_data: dict | None = None
+    if not (etag or last_modified):
+        cached = cache_manager.get(target_url)
+        if cached and cached.get("data"):
+            etag, last_modified = cached.get("etag"), cached.get("last_modified")
+            cached_data = cached["data"]
+
+    #Vaga no token bucket do host, disputada por todas as réplicas do scraper
+    if settings.HOST_BUCKET_ENABLED:
+        slot = get_host_bucket().reserve(url_host, crawl_delay=delay)
+        if slot is None:
+            logger.warning("host_bucket_saturated", url=target_url, url_host=url_host)
+            SCRAPER_URL_STATUS_TOTAL.labels(url_host=url_host, status="failure").inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Limite de requisições para {url_host} atingido, tente novamente mais tarde"
+            )
+        await asyncio.sleep(max(0.0, slot - time.time()))
+
+    await human_delay.wait_async(None)
+    await throttle.wait_async(identifier="get", circuit_key=circuit_key)
 
     #HTML capturado da página. Se ocorrer bloqueio, pode ser substituído
     html: str | None = None
+    page: FetchedPage | None = None
     try:
-        html = await fetch_html_playwright(target_url)
-        SCRAPER_REQUESTS_TOTAL.labels(method="GET", status_code=200).inc()
-        SCRAPER_RESPONSE_SIZE_BYTES.labels(method="GET", status_code=200).observe(len(html))
-        audit_scrape(stage="get", url=target_url, payload=jsonable_encoder(payload), html=html, details=None, error=None)
-        human_delay.wait(html)
+        page = await fetch_html(target_url, etag=etag, last_modified=last_modified)
+        if page.not_modified:
+            SCRAPER_REQUESTS_TOTAL.labels(method="GET", status_code=304).inc()
+        else:
+            html = page.html
+            SCRAPER_REQUESTS_TOTAL.labels(method="GET", status_code=200).inc()
+            SCRAPER_RESPONSE_SIZE_BYTES.labels(method="GET", status_code=200).observe(len(html))
+            audit_scrape(stage="get", url=target_url, payload=jsonable_encoder(payload), html=html, details=None, error=None)
+            html_snapshots.capture(url=target_url, html=html, payload=jsonable_encoder(payload), product_type=product_type)
+            await human_delay.wait_async(html)
     except PlaywrightTimeoutError as e:
         logger.warning("playwright_timeout", url=target_url, error=str(e))
         circuit_breaker.record_failure(circuit_key)
@@ -172,7 +282,7 @@ async def _scrape_product_common(
 
         html = recovered
         SCRAPER_REQUESTS_TOTAL.labels(method="GET", status_code=200).inc()
-        human_delay.wait(html)
+        await human_delay.wait_async(html)
         audit_scrape(stage="block_recovered", url=target_url, payload=jsonable_encoder(payload), html=None, details=None, error=None)
     except Exception as e:
         logger.error("get_request_failed", url=target_url, error=str(e))
@@ -186,6 +296,7 @@ async def _scrape_product_common(
             block_type = "429"
 
         SCRAPER_HTTP_BLOCKED_TOTAL.inc()
+        penalize_host(url_host)
         #Aciona o gerenciador de recuperação informando o tipo de bloqueio
         recovered = await recovery_manager.handle_block(block_type, url=target_url)
         if recovered is None:
@@ -200,9 +311,23 @@ async def _scrape_product_common(
         #Se houver HTML recuperado, continua o fluxo normalmente
         html = recovered
         SCRAPER_REQUESTS_TOTAL.labels(method="GET", status_code=200).inc()
-        human_delay.wait(html)
+        await human_delay.wait_async(html)
         audit_scrape(stage="block_recovered", url=target_url, payload=jsonable_encoder(payload), html=None, details=None, error=None)
 
+    #Conteúdo inalterado (304) dispensa parsing e atualização do cache
+    if page is not None and page.not_modified:
+        SCRAPER_URL_STATUS_TOTAL.labels(url_host=url_host, status="success").inc()
+        return use_cache_on_not_modified(
+            target_url=target_url,
+            payload=payload,
+            circuit_breaker=circuit_breaker,
+            circuit_key=circuit_key,
+            etag=page.etag,
+            last_modified=page.last_modified,
+            endpoint=f"{product_type}_scrape",
+            cached_data=cached_data,
+        )
+
     if product_type == "monitored":
         cached_result = use_cache_if_not_modified(
             target_url=target_url,
@@ -226,21 +351,14 @@ async def _scrape_product_common(
         SCRAPER_URL_STATUS_TOTAL.labels(url_host=url_host, status="success").inc()
         return cached_result
 
-    if not parser.looks_like_product_page(html):
-        logger.warning("not_product_page", url=original_url)
-        audit_scrape(stage="error", url=target_url, payload=jsonable_encoder(payload), html=html, details=None, error="not_product_page")
-        SCRAPER_URL_STATUS_TOTAL.labels(url_host=url_host, status="failure").inc()
-        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="Página não é de produto")
-
+    #Verificação e parse rodam juntos no executor, fora do event loop; o HTML vai em bytes
     try:
-        details: Dict[str, Optional[str]] = parser.parse_product_details(html, target_url)
-        logger.debug("parsed_details", details=details)
-        logger.debug("raw_price_extracted", url=original_url, raw_price=details.get("current_price"))
-        audit_scrape(stage="parser", url=target_url, payload=payload.model_dump(), html=None, details=details, error=None)
+        details: Dict[str, Optional[str]] | None = await parse_executor.run(parser.parse_page, html.encode("utf-8"), target_url)
     except CaptchaDetectedError as exc:
         logger.warning("captcha_detected", url=original_url)
         circuit_breaker.record_failure(circuit_key)
         SCRAPER_CAPTCHA_TOTAL.inc()
+        penalize_host(url_host)
         audit_scrape(stage="error", url=target_url, payload=jsonable_encoder(payload), html=html, details=None, error=str(exc))
         #Tenta recuperar o HTML caso o site apresente CAPTCHA
         recovered = await recovery_manager.handle_block("captcha", url=target_url)
@@ -248,7 +366,7 @@ async def _scrape_product_common(
             html = recovered
             audit_scrape(stage="captcha_recovered", url=target_url, payload=jsonable_encoder(payload), html=html, details=None, error=None)
             try:
-                details = parser.parse_product_details(html, target_url)
+                details = await parse_executor.run(parser.parse_page, html.encode("utf-8"), target_url, False)
                 logger.debug("parsed_details", details=details)
                 logger.debug("raw_price_extracted", url=original_url, raw_price=details.get("current_price"))
                 audit_scrape(stage="parser", url=target_url, payload=payload.model_dump(), html=None, details=details, error=None)
@@ -279,6 +397,15 @@ async def _scrape_product_common(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=("Erro ao extrair dados do produto" if product_type == "monitored" else f"Erro ao extrair dados do produto concorrente: {exc}")
         )
+    else:
+        if details is None:
+            logger.warning("not_product_page", url=original_url)
+            audit_scrape(stage="error", url=target_url, payload=jsonable_encoder(payload), html=html, details=None, error="not_product_page")
+            SCRAPER_URL_STATUS_TOTAL.labels(url_host=url_host, status="failure").inc()
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="Página não é de produto")
+        logger.debug("parsed_details", details=details)
+        logger.debug("raw_price_extracted", url=original_url, raw_price=details.get("current_price"))
+        audit_scrape(stage="parser", url=target_url, payload=payload.model_dump(), html=None, details=details, error=None)
 
     raw_current = details.get("current_price")
     if raw_current is None:
@@ -291,7 +418,10 @@ async def _scrape_product_common(
 
     current_price = parse_price_str(raw_current, target_url)
 
-    update_cache(target_url, details, html, None)
+    #Validadores só são confiáveis quando o HTML veio da própria resposta HTTP
+    response_etag = page.etag if page is not None else None
+    response_last_modified = page.last_modified if page is not None else None
+    update_cache(target_url, details, html, response_etag, response_last_modified)
     audit_scrape(
         stage="persist",
         url=target_url,
@@ -302,7 +432,65 @@ async def _scrape_product_common(
     )
     circuit_breaker.record_success(circuit_key)
     SCRAPER_URL_STATUS_TOTAL.labels(url_host=url_host, status="success").inc()
-    return {"status": "success", "details": details}
+    return {
+        "status": "success",
+        "details": details,
+        "etag": response_etag,
+        "last_modified": response_last_modified,
+    }
+
+
+def single_flight_key(
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        max_age: int | None = None
+) -> str:
+    """ Chave de coalescência: URL canônica do anúncio, validadores condicionais e ``max_age``
+
+    Os validadores entram na chave porque um ``304`` obtido com eles não
+    serve a quem pediu sem validadores; ``max_age`` entra porque um líder
+    atendido pelo cache não serve a quem exige dados mais recentes.
+    """
+    canonical = canonicalize_ml_url(url) or str(url)
+    return "|".join((canonical, etag or "", last_modified or "", "" if max_age is None else str(max_age)))
+
+async def scrape_product_coalesced(
+        url: str,
+        user_id: UUID,
+        payload,
+        product_type: Literal["monitored", "competitor"],
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        recovery_manager: BlockRecoveryManager | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        max_age: int | None = None
+) -> dict:
+    """ Executa ``_scrape_product_common`` compartilhando a coleta entre pedidos da mesma URL
+
+    Assinantes diferentes do mesmo anúncio (monitorados ou concorrentes) que
+    chegam enquanto um scraping está em andamento recebem o resultado dele.
+    Pedidos com ``max_age=0`` nunca são coalescidos: o resultado publicado por
+    outra réplica pode ter até ``SINGLE_FLIGHT_RESULT_TTL`` segundos.
+    """
+    async def run() -> dict:
+        return await _scrape_product_common(
+            url=url,
+            user_id=user_id,
+            payload=payload,
+            product_type=product_type,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            recovery_manager=recovery_manager,
+            etag=etag,
+            last_modified=last_modified,
+            max_age=max_age
+        )
+
+    if not settings.SINGLE_FLIGHT_ENABLED or max_age == 0:
+        return await run()
+    return await single_flight.do(single_flight_key(url, etag, last_modified, max_age), run)
 
 
 def scrape_product_common(
@@ -312,17 +500,27 @@ def scrape_product_common(
         product_type: Literal["monitored", "competitor"],
         rate_limiter: RateLimiter | None = None,
         circuit_breaker: CircuitBreaker | None = None,
-        recovery_manager: BlockRecoveryManager | None = None
+        recovery_manager: BlockRecoveryManager | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        max_age: int | None = None
 ) -> dict:
-    """ Executa ``_scrape_product_common`` em contexto síncrono """
-    return asyncio.run(
-        _scrape_product_common(
+    """ Executa ``_scrape_product_common`` em contexto síncrono
+
+    A coroutine roda no loop persistente do processo, reaproveitando os
+    clientes assíncronos entre chamadas.
+    """
+    return run_coroutine(
+        scrape_product_coalesced(
             url=url,
             user_id=user_id,
             payload=payload,
             product_type=product_type,
             rate_limiter=rate_limiter,
             circuit_breaker=circuit_breaker,
-            recovery_manager=recovery_manager
+            recovery_manager=recovery_manager,
+            etag=etag,
+            last_modified=last_modified,
+            max_age=max_age
         )
     )
@@ -54,6 +54,19 @@ class FakeRedis:
     def zcard(self, redis_key):
         return len(self.data.get(redis_key, []))
 
+    def zadd(self, redis_key, mapping, nx=False):
+        scores = self.data.setdefault(redis_key, {})
+        added = 0
+        for member, score in mapping.items():
+            if nx and member in scores:
+                continue
+            added += member not in scores
+            scores[member] = score
+        return added
+
+    def zscore(self, redis_key, member):
+        return self.data.get(redis_key, {}).get(member)
+
     def delete(self, redis_key):
         if redis_key in self.data:
             del self.data[redis_key]
@@ -0,0 +1,13 @@
+""" Benchmark do parser sobre um corpus versionado de páginas anonimizadas
+
+Uso (a partir de ``market_scraper``)::
+
+    PYTHONPATH=. python -m tests.performance.parser_bench --output report.json --baseline baseline.json
+
+O relatório JSON traz, por página, o resultado do parse, latências e
+memória do parse completo e de cada estratégia. Com ``--baseline`` o
+comando termina com código ``1`` se houver regressões.
+"""
+
+from .corpus import CURRENT_VERSION, CorpusError, CorpusPage, load_corpus
+from .runner import compare, main, run_benchmark
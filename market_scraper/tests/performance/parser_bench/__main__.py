@@ -0,0 +1,6 @@
+""" Executa o benchmark do parser pela linha de comando """
+
+from .runner import main
+
+
+raise SystemExit(main())
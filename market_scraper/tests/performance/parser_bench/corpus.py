@@ -0,0 +1,50 @@
+""" Leitura do corpus versionado de páginas do Mercado Livre
+
+Cada versão fica em ``corpus/<versão>/`` com os HTMLs anonimizados e um
+``manifest.json`` descrevendo, por página, o layout, a URL usada no parse,
+o ``sha256`` do arquivo e o resultado esperado. Alterar uma página exige
+uma nova versão do corpus, para que relatórios antigos continuem
+comparáveis.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+CURRENT_VERSION = "v1"
+
+class CorpusError(RuntimeError):
+    """ Corpus ausente ou com arquivos diferentes do manifesto """
+
+@dataclass(frozen=True)
+class CorpusPage:
+    """ Página do corpus com o resultado esperado do parser """
+    name: str
+    layout: str
+    url: str
+    html: bytes
+    expected: Dict[str, Any]
+
+def load_corpus(version: str = CURRENT_VERSION) -> List[CorpusPage]:
+    """ Carrega as páginas da versão conferindo o ``sha256`` de cada arquivo
+
+    Raises:
+        CorpusError: Quando a versão não existe ou algum arquivo foi alterado
+    """
+    base = CORPUS_DIR / version
+    manifest_path = base / "manifest.json"
+    if not manifest_path.is_file():
+        raise CorpusError(f"Corpus {version!r} não encontrado em {base}")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    pages = []
+    for entry in manifest["pages"]:
+        html = (base / entry["file"]).read_bytes()
+        if hashlib.sha256(html).hexdigest() != entry["sha256"]:
+            raise CorpusError(f"{entry['file']} difere do manifesto; publique uma nova versão do corpus")
+        pages.append(CorpusPage(entry["name"], entry["layout"], entry["url"], html, entry["expected"]))
+    return pages
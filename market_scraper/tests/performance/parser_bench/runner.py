@@ -0,0 +1,240 @@
+""" Medição do parser sobre o corpus e comparação com um relatório base
+
+Para cada página do corpus são medidos:
+
+- ``check``: ``looks_like_product_page``;
+- ``parse``: ``parse_product_details`` completo (incluindo o fallback do DOM);
+- ``strategies``: cada estratégia do ``ProductParser`` no caminho rápido,
+  sobre um ``ParseContext`` novo (inclui a extração dos scripts).
+
+A latência é a mediana, o p95 e o mínimo de ``repeat`` execuções após
+``warmup`` rodadas de aquecimento, com a ordem das estratégias e os
+caminhos de JSON já aprendidos. A memória vem do ``tracemalloc`` em uma
+execução isolada: pico alocado durante a chamada e o que permaneceu
+alocado ao final.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import scraper_app.services.services_parser as services_parser
+from scraper_app.services.services_parser import (
+    STRATEGIES,
+    ParseContext,
+    ProductParser,
+    looks_like_product_page,
+    parse_product_details,
+)
+from scraper_app.utils.json_index import PathCache
+from scraper_app.utils.script_extractor import orjson
+from scraper_app.utils.strategy_stats import StrategyStats
+
+from .corpus import CURRENT_VERSION, CorpusPage, load_corpus
+
+
+SCHEMA_VERSION = 1
+
+@contextmanager
+def isolated_parser_state() -> Iterator[None]:
+    """ Ordem de estratégias e caminhos aprendidos apenas durante a medição, sem Redis """
+    previous = services_parser.strategy_stats, services_parser.path_cache
+    services_parser.strategy_stats = StrategyStats(flush_interval=float("inf"))
+    services_parser.path_cache = PathCache()
+    try:
+        yield
+    finally:
+        services_parser.strategy_stats, services_parser.path_cache = previous
+
+def _outcome(fn: Callable[[], Any]) -> str:
+    """ ``ok`` ou o nome da exceção lançada """
+    try:
+        fn()
+    except Exception as exc:
+        return type(exc).__name__
+    return "ok"
+
+def measure_latency(fn: Callable[[], Any], repeat: int, warmup: int) -> Dict[str, float]:
+    """ Mediana, p95 e mínimo em milissegundos """
+    for _ in range(warmup):
+        _outcome(fn)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _outcome(fn)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median": round(statistics.median(samples), 4),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min": round(samples[0], 4),
+    }
+
+def measure_memory(fn: Callable[[], Any]) -> Dict[str, float]:
+    """ Pico e memória retida (KiB) de uma execução, via ``tracemalloc`` """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        _outcome(fn)
+        _, peak = tracemalloc.get_traced_memory()
+        #Ciclos de referência (ex.: árvore do BeautifulSoup) não contam como retidos
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_kib": round((peak - base) / 1024, 1),
+        "retained_kib": round(max(current - base, 0) / 1024, 1),
+    }
+
+def _strategy_call(parser: ProductParser, name: str, html: bytes) -> Callable[[], Any]:
+    def run() -> Any:
+        ctx = ParseContext(html)
+        with ctx.raw_only():
+            return getattr(parser, f"_from_{name}")(ctx)
+    return run
+
+def _matches(page: CorpusPage, product_page: bool, outcome: str, details: Optional[Dict[str, Any]]) -> bool:
+    expected = page.expected
+    if product_page != expected["product_page"]:
+        return False
+    if "error" in expected:
+        return outcome == expected["error"]
+    return outcome == "ok" and all(details.get(field) == value for field, value in expected["fields"].items())
+
+def measure_page(page: CorpusPage, repeat: int, warmup: int) -> Dict[str, Any]:
+    """ Resultado e medições de uma página do corpus """
+    parser = ProductParser()
+    details: Dict[str, Any] = {}
+
+    def parse() -> None:
+        details.clear()
+        details.update(parse_product_details(page.html, page.url))
+
+    with isolated_parser_state():
+        product_page = looks_like_product_page(page.html)
+        outcome = _outcome(parse)
+        strategies = {}
+        for name in STRATEGIES:
+            call = _strategy_call(parser, name, page.html)
+            score, _ = call()
+            strategies[name] = {
+                "found": score > 0,
+                "latency_ms": measure_latency(call, repeat, warmup),
+                "memory": measure_memory(call),
+            }
+        result = {
+            "layout": page.layout,
+            "outcome": outcome,
+            "product_page": product_page,
+            "matches_expected": _matches(page, product_page, outcome, details),
+            "check": {"latency_ms": measure_latency(lambda: looks_like_product_page(page.html), repeat, warmup)},
+            "parse": {
+                "latency_ms": measure_latency(parse, repeat, warmup),
+                "memory": measure_memory(parse),
+            },
+            "strategies": strategies,
+        }
+    return result
+
+def run_benchmark(version: str = CURRENT_VERSION, repeat: int = 20, warmup: int = 3) -> Dict[str, Any]:
+    """ Executa o benchmark em todas as páginas e monta o relatório JSON """
+    pages = load_corpus(version)
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "corpus_version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "orjson": orjson is not None,
+        },
+        "settings": {"repeat": repeat, "warmup": warmup},
+        "pages": {page.name: measure_page(page, repeat, warmup) for page in pages},
+    }
+
+def _measurements(page: Dict[str, Any]) -> Iterator[tuple]:
+    """ ``(nome, tipo, valor)`` das medições comparáveis de uma página """
+    yield "check.latency_ms.median", "latency", page["check"]["latency_ms"]["median"]
+    yield "parse.latency_ms.median", "latency", page["parse"]["latency_ms"]["median"]
+    yield "parse.memory.peak_kib", "memory", page["parse"]["memory"]["peak_kib"]
+    for name, data in page["strategies"].items():
+        yield f"strategies.{name}.latency_ms.median", "latency", data["latency_ms"]["median"]
+        yield f"strategies.{name}.memory.peak_kib", "memory", data["memory"]["peak_kib"]
+
+def compare(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    latency_tolerance: float = 0.25,
+    memory_tolerance: float = 0.10,
+    min_latency_ms: float = 0.05,
+    min_memory_kib: float = 16.0,
+) -> List[str]:
+    """ Regressões do relatório em relação à base, uma mensagem por item
+
+    Latência e pico de memória regridem quando ultrapassam a base pela
+    tolerância relativa e por um mínimo absoluto, que ignora ruído em
+    medições muito pequenas. Mudanças de resultado sempre contam.
+    """
+    if report["corpus_version"] != baseline["corpus_version"]:
+        return [f"corpus {report['corpus_version']} não é comparável com a base {baseline['corpus_version']}"]
+
+    regressions = []
+    limits = {"latency": (latency_tolerance, min_latency_ms), "memory": (memory_tolerance, min_memory_kib)}
+    for name, page in report["pages"].items():
+        if not page["matches_expected"]:
+            regressions.append(f"{name}: resultado diferente do esperado ({page['outcome']})")
+        base_page = baseline["pages"].get(name)
+        if base_page is None:
+            continue
+        if page["outcome"] != base_page["outcome"]:
+            regressions.append(f"{name}: resultado mudou de {base_page['outcome']} para {page['outcome']}")
+        base_values = {metric: value for metric, _, value in _measurements(base_page)}
+        for metric, kind, value in _measurements(page):
+            base = base_values.get(metric)
+            if base is None:
+                continue
+            tolerance, minimum = limits[kind]
+            if value > base * (1 + tolerance) and value - base > minimum:
+                regressions.append(f"{name}: {metric} {base} -> {value} (+{(value / base - 1) * 100 if base else float('inf'):.0f}%)")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Gera o relatório e, com ``--baseline``, falha se houver regressões """
+    cli = argparse.ArgumentParser(description="Benchmark do parser sobre o corpus de páginas do Mercado Livre")
+    cli.add_argument("--corpus-version", default=CURRENT_VERSION)
+    cli.add_argument("--repeat", type=int, default=20)
+    cli.add_argument("--warmup", type=int, default=3)
+    cli.add_argument("--output", help="arquivo do relatório JSON (padrão: saída padrão)")
+    cli.add_argument("--baseline", help="relatório base para comparação")
+    cli.add_argument("--latency-tolerance", type=float, default=0.25)
+    cli.add_argument("--memory-tolerance", type=float, default=0.10)
+    args = cli.parse_args(argv)
+
+    report = run_benchmark(args.corpus_version, args.repeat, args.warmup)
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = compare(report, json.load(fh), args.latency_tolerance, args.memory_tolerance)
+    else:
+        regressions = compare(report, {"corpus_version": report["corpus_version"], "pages": {}})
+    for message in regressions:
+        print(f"REGRESSÃO {message}", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,13 @@
+""" Replay offline de snapshots de HTML pelo fluxo completo de scraping
+
+Uso (a partir de ``market_scraper``)::
+
+    PYTHONPATH=. python -m tests.performance.scrape_replay --dir logs/snapshots --concurrency 16
+
+Os snapshots são gravados pelo scraper com ``HTML_SNAPSHOT_ENABLED=1``. O
+relatório JSON traz a vazão, o resultado de cada página e os tempos por
+etapa (busca em disco, cache, parse, validação do preço e auditoria).
+"""
+
+from .local_redis import LocalRedis
+from .runner import main, replay, replay_environment, select_snapshots
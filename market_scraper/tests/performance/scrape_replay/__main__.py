@@ -0,0 +1,6 @@
+""" Executa o replay de snapshots pela linha de comando """
+
+from .runner import main
+
+
+raise SystemExit(main())
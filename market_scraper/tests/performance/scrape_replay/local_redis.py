@@ -0,0 +1,124 @@
+""" Substituto em memória do Redis usado pelo replay
+
+Implementa apenas os comandos usados no caminho de scraping (cache,
+circuit breaker, flag de suspensão e contadores do parser), com expiração
+e respostas decodificadas como o cliente configurado com
+``decode_responses=True``.
+"""
+
+import fnmatch
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class LocalRedis:
+    """ Chaves e hashes em um dicionário protegido por lock """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        #chave -> (valor, instante de expiração ou None)
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _expiry(self, key: str) -> Optional[float]:
+        entry = self._data.get(key)
+        return entry[1] if entry else None
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._live(key)
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None, px: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+            self._data[key] = (str(value), time.monotonic() + ttl if ttl is not None else None)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._live(key) is not None:
+                    del self._data[key]
+                    removed += 1
+            return removed
+
+    def exists(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._live(key) is not None)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = int(self._live(key) or 0) + amount
+            self._data[key] = (str(value), self._expiry(key))
+            return value
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            value = self._live(key)
+            if value is None:
+                return False
+            self._data[key] = (value, time.monotonic() + seconds)
+            return True
+
+    def ttl(self, key: str) -> int:
+        with self._lock:
+            if self._live(key) is None:
+                return -2
+            expires_at = self._expiry(key)
+            return -1 if expires_at is None else max(0, int(expires_at - time.monotonic()))
+
+    def scan_iter(self, match: str = "*", count: Optional[int] = None) -> Iterator[str]:
+        with self._lock:
+            keys = [key for key in list(self._data) if self._live(key) is not None]
+        return iter([key for key in keys if fnmatch.fnmatchcase(key, match)])
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        with self._lock:
+            bucket = self._live(key)
+            if bucket is None:
+                bucket = {}
+                self._data[key] = (bucket, None)
+            bucket[field] = str(int(bucket.get(field, 0)) + amount)
+            return int(bucket[field])
+
+    def hgetall(self, key: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._live(key) or {})
+
+    def pipeline(self) -> "LocalPipeline":
+        return LocalPipeline(self)
+
+    def flushall(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+class LocalPipeline:
+    """ Enfileira comandos e executa todos em ``execute`` """
+
+    def __init__(self, redis: LocalRedis) -> None:
+        self._redis = redis
+        self._calls: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs) -> "LocalPipeline":
+            self._calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        with self._redis._lock:
+            calls, self._calls = self._calls, []
+            return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in calls]
@@ -0,0 +1,292 @@
+""" Replay de snapshots de HTML pelo ``_scrape_product_common``
+
+O fluxo completo de scraping roda sobre as páginas arquivadas pelo
+``HtmlSnapshotStore``, sem acessar o site:
+
+- a busca do HTML lê o snapshot do disco;
+- o Redis é um ``LocalRedis`` em memória (cache, circuit breaker, flag de
+  suspensão e contadores do parser);
+- robots.txt, atrasos humanizados, throttle e token bucket por host não
+  atuam, e bloqueios não acionam recuperação.
+
+Cada etapa (``fetch``, ``cache_lookup``, ``parse``, ``validate``,
+``cache_update`` e ``audit``) é cronometrada, além do total por página e
+da vazão do replay. Sem ``--keep-cache`` o cache é limpo a cada iteração,
+para que todas as páginas passem pelo parse.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+
+import utils.redis_client as redis_client_module
+from utils.circuit_breaker import CircuitBreaker
+
+import scraper_app.services.services_cache_scraper as services_cache_scraper
+import scraper_app.services.services_parser as services_parser
+import scraper_app.services.services_scraper_common as common
+import scraper_app.utils.audit_logger as audit_logger
+from scraper_app.core.config import settings
+from scraper_app.schemas.schemas_products import CompetitorProductCreateScraping, MonitoredProductCreateScraping
+from scraper_app.utils.html_snapshots import HtmlSnapshotStore, SnapshotRecord
+from scraper_app.utils.http_fetcher import FetchedPage
+from scraper_app.utils.json_index import PathCache
+from scraper_app.utils.parse_executor import parse_executor
+from scraper_app.utils.strategy_stats import StrategyStats
+
+from .local_redis import LocalRedis
+
+
+#Usuário fixo: a chave do circuit breaker depende apenas da URL
+REPLAY_USER_ID = UUID(int=0)
+
+#Snapshot servido pela busca da tarefa atual
+_current_snapshot: ContextVar[str] = ContextVar("current_snapshot")
+
+class StageTimer:
+    """ Amostras de duração por etapa do fluxo """
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.samples[stage].append(seconds)
+
+    def wrap_sync(self, stage: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+        return timed
+
+    def wrap_async(self, stage: str, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+        return timed
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """ Quantidade, soma, mediana e p95 (ms) de cada etapa """
+        result = {}
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[stage] = {
+                "count": len(ordered),
+                "total_ms": round(sum(ordered) * 1000, 3),
+                "median_ms": round(statistics.median(ordered) * 1000, 4),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+            }
+        return result
+
+class _TimedExecutor:
+    """ ``parse_executor`` cronometrado, incluindo a espera por vaga na fila """
+
+    def __init__(self, executor, timer: StageTimer) -> None:
+        self.run = timer.wrap_async("parse", executor.run)
+
+class _NoDelay:
+    """ Substitui throttle e atraso humanizado """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.jitter_min = self.jitter_max = 0.0
+
+    async def wait_async(self, *args, **kwargs) -> None:
+        return None
+
+class _NoRobots:
+    """ robots.txt sem ``Crawl-delay`` e sem acesso à rede """
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+
+    def get_crawl_delay(self, user_agent: str = "*") -> None:
+        return None
+
+class _NoRecovery:
+    """ Bloqueios (ex.: CAPTCHA arquivado) terminam sem nova tentativa """
+
+    async def handle_block(self, *args, **kwargs) -> None:
+        return None
+
+class _NoRateLimit:
+    def is_allowed(self, *args, **kwargs) -> bool:
+        return True
+
+def _no_audit(**kwargs) -> None:
+    return None
+
+def _fetch_from(store: HtmlSnapshotStore) -> Callable[..., Awaitable[FetchedPage]]:
+    async def fetch_html(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> FetchedPage:
+        html = await asyncio.to_thread(store.load, _current_snapshot.get())
+        return FetchedPage(html=html)
+    return fetch_html
+
+@contextmanager
+def replay_environment(store: HtmlSnapshotStore, redis: LocalRedis, timer: StageTimer, audit_dir: Optional[str] = None) -> Iterator[None]:
+    """ Troca rede, Redis e atrasos do fluxo de scraping pelos substitutos do replay """
+    audit = common.audit_scrape if audit_dir else _no_audit
+    swaps = [
+        (redis_client_module, "_redis_client", redis),
+        (common, "redis_client", redis),
+        (common.cache_manager, "redis", redis),
+        (common, "fetch_html", timer.wrap_async("fetch", _fetch_from(store))),
+        (common, "use_cache_if_not_modified", timer.wrap_sync("cache_lookup", common.use_cache_if_not_modified)),
+        (common, "parse_executor", _TimedExecutor(common.parse_executor, timer)),
+        (common, "parse_price_str", timer.wrap_sync("validate", common.parse_price_str)),
+        (common, "update_cache", timer.wrap_sync("cache_update", common.update_cache)),
+        (common, "audit_scrape", timer.wrap_sync("audit", audit)),
+        (services_cache_scraper, "audit_scrape", audit),
+        (common, "RobotsTxtParser", _NoRobots),
+        (common, "HumanizedDelayManager", _NoDelay),
+        (common, "ThrottleManager", _NoDelay),
+        (common.html_snapshots, "enabled", False),
+        (settings, "HOST_BUCKET_ENABLED", False),
+        (services_parser, "strategy_stats", StrategyStats(redis=redis, flush_interval=float("inf"))),
+        (services_parser, "path_cache", PathCache()),
+    ]
+    if audit_dir:
+        swaps.append((audit_logger, "AUDIT_DIR", audit_dir))
+
+    previous = [(target, name, getattr(target, name)) for target, name, _ in swaps]
+    try:
+        for target, name, value in swaps:
+            setattr(target, name, value)
+        yield
+    finally:
+        if audit_dir:
+            #Registros ainda na fila iriam para o diretório original
+            audit_logger.flush()
+        for target, name, value in reversed(previous):
+            setattr(target, name, value)
+
+def _payload(record: SnapshotRecord):
+    model = MonitoredProductCreateScraping if record.product_type == "monitored" else CompetitorProductCreateScraping
+    return model(**record.payload)
+
+async def _replay_one(record: SnapshotRecord, redis: LocalRedis, timer: StageTimer, limit: asyncio.Semaphore) -> str:
+    """ Executa o fluxo para um snapshot e retorna o resultado (status ou ``http_<código>``) """
+    async with limit:
+        _current_snapshot.set(record.sha256)
+        started = time.perf_counter()
+        try:
+            result = await common._scrape_product_common(
+                url=record.url,
+                user_id=REPLAY_USER_ID,
+                payload=_payload(record),
+                product_type=record.product_type,
+                rate_limiter=_NoRateLimit(),
+                circuit_breaker=CircuitBreaker(redis=redis),
+                recovery_manager=_NoRecovery(),
+                max_age=0,
+            )
+            outcome = result.get("status", "unknown")
+        except HTTPException as exc:
+            outcome = f"http_{exc.status_code}"
+        except Exception as exc:
+            outcome = type(exc).__name__
+        timer.record("total", time.perf_counter() - started)
+        return outcome
+
+async def replay(
+    store: HtmlSnapshotStore,
+    records: List[SnapshotRecord],
+    concurrency: int = 8,
+    iterations: int = 1,
+    keep_cache: bool = False,
+    audit_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """ Reprocessa os snapshots e monta o relatório com etapas e vazão """
+    redis = LocalRedis()
+    timer = StageTimer()
+    limit = asyncio.Semaphore(concurrency)
+    outcomes: Counter = Counter()
+
+    with replay_environment(store, redis, timer, audit_dir):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if not keep_cache:
+                redis.flushall()
+            results = await asyncio.gather(*(_replay_one(record, redis, timer, limit) for record in records))
+            outcomes.update(results)
+        elapsed = time.perf_counter() - started
+
+    scrapes = len(records) * iterations
+    return {
+        "snapshots": len(records),
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "keep_cache": keep_cache,
+        "parse_executor": parse_executor.mode,
+        "scrapes": scrapes,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(scrapes / elapsed, 2) if elapsed else None,
+        "outcomes": dict(outcomes),
+        "stages": timer.summary(),
+    }
+
+def select_snapshots(
+    store: HtmlSnapshotStore,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    limit: Optional[int] = None,
+) -> Tuple[List[SnapshotRecord], int]:
+    """ Capturas do período com objeto ainda em disco e quantas foram descartadas pela retenção """
+    records, missing = [], 0
+    for record in store.iter_snapshots(since, until):
+        if not store.exists(record.sha256):
+            missing += 1
+            continue
+        records.append(record)
+        if limit and len(records) >= limit:
+            break
+    return records, missing
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Executa o replay e imprime (ou grava) o relatório JSON """
+    cli = argparse.ArgumentParser(description="Replay offline de snapshots de HTML pelo fluxo de scraping")
+    cli.add_argument("--dir", default=settings.HTML_SNAPSHOT_DIR, help="diretório dos snapshots")
+    cli.add_argument("--since", type=date.fromisoformat, help="primeiro dia (AAAA-MM-DD)")
+    cli.add_argument("--until", type=date.fromisoformat, help="último dia (AAAA-MM-DD)")
+    cli.add_argument("--limit", type=int, help="máximo de snapshots")
+    cli.add_argument("--concurrency", type=int, default=8)
+    cli.add_argument("--iterations", type=int, default=1)
+    cli.add_argument("--keep-cache", action="store_true", help="mantém o cache entre iterações (mede o caminho de cache)")
+    cli.add_argument("--audit-dir", help="grava a auditoria neste diretório em vez de descartá-la")
+    cli.add_argument("--output", help="arquivo do relatório JSON (padrão: saída padrão)")
+    args = cli.parse_args(argv)
+
+    store = HtmlSnapshotStore(base_dir=args.dir, enabled=False)
+    records, missing = select_snapshots(store, args.since, args.until, args.limit)
+    if not records:
+        print(f"Nenhum snapshot encontrado em {args.dir}", file=sys.stderr)
+        return 1
+
+    try:
+        report = asyncio.run(replay(store, records, args.concurrency, args.iterations, args.keep_cache, args.audit_dir))
+    finally:
+        parse_executor.shutdown()
+    report["missing"] = missing
+
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+    else:
+        print(payload)
+    return 0
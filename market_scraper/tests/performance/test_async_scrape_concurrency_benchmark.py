@@ -0,0 +1,61 @@
+""" Benchmark de vazão de scrapings concorrentes em um único processo
+
+Simula o trecho de espera do ``_scrape_product_common`` (atraso humano,
+throttle e novo atraso após o HTML) para várias requisições simultâneas.
+Com as versões assíncronas as esperas se sobrepõem; com as síncronas cada
+requisição bloqueia o event loop e o tempo total cresce linearmente.
+"""
+
+import asyncio
+import time
+
+from scraper_app.utils.humanized_delay import HumanizedDelayManager
+from scraper_app.utils.throttle_manager import ThrottleManager
+
+
+CONCURRENT_REQUESTS = 20
+DELAY_SECONDS = 0.01
+#Vazão de um processo que atende uma requisição por vez (três esperas cada)
+SERIAL_THROUGHPUT = 1 / (3 * DELAY_SECONDS)
+
+class DummyCB:
+    def record_failure(self, *a, **k):
+        pass
+
+def _managers():
+    delay = HumanizedDelayManager(avg_wpm=200, base_delay=DELAY_SECONDS, fatigue_range=(0.0, 0.0))
+    throttle = ThrottleManager(rate=1e6, capacity=1e6, jitter_range=(DELAY_SECONDS, DELAY_SECONDS), circuit_breaker=DummyCB())
+    return delay, throttle
+
+async def _scrape_async(delay: HumanizedDelayManager, throttle: ThrottleManager) -> None:
+    await delay.wait_async(None, reflection_time=0.0)
+    await throttle.wait_async(circuit_key="bench")
+    await delay.wait_async(None, reflection_time=0.0)
+
+async def _scrape_blocking(delay: HumanizedDelayManager, throttle: ThrottleManager) -> None:
+    delay.wait(None, reflection_time=0.0)
+    throttle.wait(circuit_key="bench")
+    delay.wait(None, reflection_time=0.0)
+
+def _run(scrape) -> float:
+    """ Executa as requisições concorrentes e retorna a vazão (req/s) """
+    delay, throttle = _managers()
+
+    async def scenario():
+        await asyncio.gather(*(scrape(delay, throttle) for _ in range(CONCURRENT_REQUESTS)))
+
+    start = time.perf_counter()
+    asyncio.run(scenario())
+    return CONCURRENT_REQUESTS / (time.perf_counter() - start)
+
+def test_async_waits_concurrent_throughput(benchmark):
+    throughput = benchmark.pedantic(_run, args=(_scrape_async,), rounds=3, iterations=1)
+    benchmark.extra_info["requests_per_second"] = throughput
+    #As esperas se sobrepõem, multiplicando a vazão do processo
+    assert throughput > SERIAL_THROUGHPUT * 4
+
+def test_blocking_waits_concurrent_throughput(benchmark):
+    throughput = benchmark.pedantic(_run, args=(_scrape_blocking,), rounds=3, iterations=1)
+    benchmark.extra_info["requests_per_second"] = throughput
+    #Referência: com ``time.sleep`` as requisições são atendidas em série
+    assert throughput <= SERIAL_THROUGHPUT * 1.1
@@ -1,4 +1,20 @@
-from scraper_app.services.services_parser import parse_product_details
+import json
+
+from scraper_app.utils.json_index import JsonIndex, JsonLookup, PathCache
+
+from scraper_app.services.services_parser import (
+    STRATEGIES,
+    TITLE_KEYS,
+    PRICE_KEYS,
+    OLD_PRICE_KEYS,
+    SELLER_KEYS,
+    THUMBNAIL_KEYS,
+    _INDEXED_KEYS,
+    ParseContext,
+    ProductParser,
+    looks_like_product_page,
+    parse_product_details,
+)
 
 html_sample = """
 <html>
@@ -29,3 +45,179 @@ html_sample = """
 
 def test_parse_product_details_performance(benchmark):
     benchmark(parse_product_details, html_sample, url="https://produto.mercadolivre.com.br/ABC123")
+
+def build_product_page(components: int = 400) -> str:
+    """ Monta uma página de produto no formato da versão mobile do Mercado Livre
+
+    Reproduz a estrutura das páginas reais (JSON-LD, ``__PRELOADED_STATE__``
+    volumoso e corpo com centenas de blocos) com conteúdo anonimizado,
+    resultando em algumas centenas de KB como as páginas coletadas.
+    """
+    state = {
+        "initialState": {
+            "id": "MLB123456789",
+            "components": [
+                {"id": f"component_{i}", "type": "ui-pdp-section", "state": "VISIBLE",
+                 "labels": [{"text": f"Característica {i}", "values": {"value": f"Valor {i}"}}],
+                 "track": {"melidata_event": {"path": f"/pdp/section/{i}", "event_data": {"position": i}}}}
+                for i in range(components)
+            ],
+            "header": {"title": "Smartphone Modelo X 128 GB", "subtitle": "Novo | +1000 vendidos"},
+            "price": 1899.9,
+            "currency_id": "BRL",
+            "seller": {"nickname": "LOJA_EXEMPLO", "name": "Loja Exemplo"},
+            "pictures": [{"url": f"https://http2.mlstatic.com/D_NQ_NP_{i}-O.webp"} for i in range(12)],
+        }
+    }
+    json_ld = {
+        "@context": "https://schema.org/",
+        "@type": "Product",
+        "name": "Smartphone Modelo X 128 GB",
+        "image": "https://http2.mlstatic.com/D_NQ_NP_0-O.webp",
+        "offers": {"@type": "Offer", "price": "1899.90", "priceCurrency": "BRL"},
+        "seller": {"name": "Loja Exemplo"},
+    }
+    sections = "\n".join(
+        f'<div class="ui-pdp-container__row"><span class="ui-pdp-family--REGULAR">Característica {i}</span>'
+        f'<a href="/MLB-{i}" class="ui-pdp-media__action">Ver mais {i}</a></div>'
+        for i in range(components * 2)
+    )
+    return f"""
+<html>
+  <head>
+    <meta property="og:type" content="product" />
+    <meta property="og:image" content="https://http2.mlstatic.com/D_NQ_NP_0-O.webp" />
+    <script type="application/ld+json">{json.dumps(json_ld)}</script>
+  </head>
+  <body>
+    <h1 class="ui-pdp-title">Smartphone Modelo X 128 GB</h1>
+    <p class="ui-pdp-color--GREEN">Frete grátis</p>
+    {sections}
+    <script>window.__PRELOADED_STATE__ = {json.dumps(state)};</script>
+  </body>
+</html>
+"""
+
+large_page = build_product_page()
+large_url = "https://produto.mercadolivre.com.br/MLB-123456789"
+
+def _parse_separately():
+    """ Fluxo anterior: verificação e parse analisam o HTML cada um """
+    looks_like_product_page(large_page)
+    return parse_product_details(large_page, url=large_url)
+
+def _parse_with_shared_context():
+    """ Fluxo atual: um único ``ParseContext`` para verificação e parse """
+    page = ParseContext(large_page)
+    looks_like_product_page(page)
+    return parse_product_details(page, url=large_url)
+
+def test_shared_context_returns_same_result():
+    assert _parse_with_shared_context() == _parse_separately()
+
+def test_large_page_parse_separately_performance(benchmark):
+    benchmark(_parse_separately)
+
+def test_large_page_parse_shared_context_performance(benchmark):
+    benchmark(_parse_with_shared_context)
+
+def _parse_with_dom():
+    """ Estratégias lendo o DOM completo (caminho usado quando o rápido não valida) """
+    parser = ProductParser()
+    _, data, _ = parser._run_strategies(ParseContext(large_page), large_url)
+    return data
+
+def test_fast_path_matches_dom_result():
+    assert parse_product_details(large_page, url=large_url) == _parse_with_dom()
+
+def test_large_page_parse_dom_performance(benchmark):
+    benchmark(_parse_with_dom)
+
+def test_large_page_parse_bytes_performance(benchmark):
+    payload = large_page.encode("utf-8")
+    benchmark(parse_product_details, payload, url=large_url)
+
+def _run_every_strategy():
+    """ Fluxo anterior: todas as estratégias rodam antes da validação """
+    parser = ProductParser()
+    ctx = ParseContext(large_page)
+    with ctx.raw_only():
+        return [getattr(parser, f"_from_{name}")(ctx) for name in STRATEGIES]
+
+def _run_until_first_valid():
+    """ Fluxo atual: para na primeira estratégia aprovada pelo validador """
+    parser = ProductParser()
+    ctx = ParseContext(large_page)
+    with ctx.raw_only():
+        return parser._run_strategies(ctx, large_url)
+
+def test_large_page_every_strategy_performance(benchmark):
+    benchmark(_run_every_strategy)
+
+def test_large_page_early_exit_performance(benchmark):
+    benchmark(_run_until_first_valid)
+
+def build_state_blob(components: int = 400) -> dict:
+    """ Estado no formato das páginas ``/p/``, com os dados dentro dos componentes
+
+    Como nos estados coletados, título, preço, vendedor e imagens ficam em
+    componentes no início da lista (os últimos a serem visitados pela busca
+    em profundidade) e não há preço original.
+    """
+    filler = [
+        {"id": f"component_{i}", "type": "ui-pdp-section", "state": "VISIBLE",
+         "labels": [{"text": f"Característica {i}", "values": {"value": f"Valor {i}"}}],
+         "track": {"melidata_event": {"path": f"/pdp/section/{i}", "event_data": {"position": i}}}}
+        for i in range(components)
+    ]
+    product = [
+        {"id": "header", "state": {"title": "Smartphone Modelo X 128 GB", "subtitle": "Novo"}},
+        {"id": "price", "state": {"price": {"amount": 1899.9, "currency_id": "BRL"}}},
+        {"id": "seller", "state": {"seller": {"nickname": "LOJA_EXEMPLO"}}},
+        {"id": "gallery", "state": {"pictures": [{"url": f"https://http2.mlstatic.com/D_NQ_NP_{i}-O.webp"} for i in range(12)]}},
+    ]
+    return {"props": {"pageProps": {"initialState": {"components": product + filler}}}}
+
+state_blob = build_state_blob()
+state_groups = (TITLE_KEYS, PRICE_KEYS, OLD_PRICE_KEYS, SELLER_KEYS, THUMBNAIL_KEYS)
+
+def _deep_search(data, keys):
+    """ Busca em profundidade completa, como as estratégias faziam por grupo """
+    stack = [data]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            for k, v in current.items():
+                if k in keys:
+                    return v
+                stack.append(v)
+        elif isinstance(current, list):
+            stack.extend(current)
+    return None
+
+def _search_each_group():
+    return [_deep_search(state_blob, keys) for keys in state_groups]
+
+def _index_once():
+    index = JsonIndex(state_blob, _INDEXED_KEYS)
+    return [index.find(keys) for keys in state_groups]
+
+learned_paths = PathCache(stable_after=1)
+for _keys in state_groups:
+    JsonLookup(state_blob, "bench", _INDEXED_KEYS, learned_paths).find(_keys)
+
+def _learned_paths():
+    lookup = JsonLookup(state_blob, "bench", _INDEXED_KEYS, learned_paths)
+    return [lookup.find(keys) for keys in state_groups]
+
+def test_state_lookups_agree():
+    assert _index_once() == _search_each_group() == _learned_paths()
+
+def test_state_deep_search_per_group_performance(benchmark):
+    benchmark(_search_each_group)
+
+def test_state_single_pass_index_performance(benchmark):
+    benchmark(_index_once)
+
+def test_state_learned_paths_performance(benchmark):
+    benchmark(_learned_paths)
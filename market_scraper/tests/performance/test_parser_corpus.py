@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from .parser_bench import compare, load_corpus, run_benchmark
+from .parser_bench.corpus import CorpusError
+from .parser_bench.runner import main, measure_page
+from scraper_app.services.services_parser import CaptchaDetectedError, looks_like_product_page, parse_product_details
+
+
+corpus = load_corpus()
+
+@pytest.mark.parametrize("page", corpus, ids=[page.name for page in corpus])
+def test_corpus_page_matches_expected_result(page):
+    """ Cada página do corpus produz o resultado registrado no manifesto """
+    assert looks_like_product_page(page.html) is page.expected["product_page"]
+    if "error" in page.expected:
+        errors = {"CaptchaDetectedError": CaptchaDetectedError, "ValueError": ValueError}
+        with pytest.raises(errors[page.expected["error"]]):
+            parse_product_details(page.html, page.url)
+    else:
+        details = parse_product_details(page.html, page.url)
+        assert {field: details.get(field) for field in page.expected["fields"]} == page.expected["fields"]
+
+def test_corpus_covers_all_layouts():
+    assert {page.layout for page in corpus} == {"product", "p_page", "mobile", "captcha", "listing"}
+
+def test_unknown_corpus_version_fails():
+    with pytest.raises(CorpusError):
+        load_corpus("v0")
+
+def test_report_has_latency_and_memory_per_strategy():
+    """ O relatório mede o parse completo e cada estratégia """
+    report = run_benchmark(repeat=1, warmup=0)
+    page = report["pages"]["mobile_state"]
+
+    assert report["corpus_version"] == "v1"
+    assert page["matches_expected"] and page["outcome"] == "ok"
+    assert page["parse"]["latency_ms"]["median"] > 0
+    assert page["parse"]["memory"]["peak_kib"] > 0
+    assert set(page["strategies"]) == {"preloaded_state", "json_ld", "p_page"}
+    assert page["strategies"]["preloaded_state"]["found"] is True
+    json.dumps(report)
+
+def test_compare_flags_latency_memory_and_outcome_regressions():
+    """ Só variações acima da tolerância e do mínimo absoluto contam como regressão """
+    page = measure_page(corpus[0], repeat=1, warmup=0)
+    baseline = {"corpus_version": "v1", "pages": {"product_item": page}}
+    slower = json.loads(json.dumps(baseline))
+    slower["pages"]["product_item"]["parse"]["latency_ms"]["median"] = page["parse"]["latency_ms"]["median"] * 2 + 1
+    slower["pages"]["product_item"]["parse"]["memory"]["peak_kib"] = page["parse"]["memory"]["peak_kib"] + 1
+    slower["pages"]["product_item"]["outcome"] = "ValueError"
+
+    regressions = compare(slower, baseline)
+
+    assert any("parse.latency_ms.median" in message for message in regressions)
+    assert not any("parse.memory.peak_kib" in message for message in regressions)
+    assert any("resultado mudou" in message for message in regressions)
+    assert compare(baseline, baseline) == []
+    assert compare({**baseline, "corpus_version": "v2"}, baseline)
+
+def test_cli_writes_report_and_fails_on_regression(tmp_path):
+    output = tmp_path / "report.json"
+    assert main(["--repeat", "1", "--warmup", "0", "--output", str(output)]) == 0
+
+    baseline = json.loads(output.read_text(encoding="utf-8"))
+    for page in baseline["pages"].values():
+        page["parse"]["latency_ms"]["median"] = 0.0
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline), encoding="utf-8")
+
+    assert main(["--repeat", "1", "--warmup", "0", "--output", str(output), "--baseline", str(tmp_path / "baseline.json")]) == 1
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+
+from .parser_bench import load_corpus
+from .scrape_replay import LocalRedis, main, replay, select_snapshots
+import scraper_app.services.services_scraper_common as common
+from scraper_app.utils.html_snapshots import HtmlSnapshotStore
+
+
+@pytest.fixture
+def snapshot_store(tmp_path):
+    """ Snapshots das páginas do corpus do benchmark do parser """
+    store = HtmlSnapshotStore(base_dir=str(tmp_path), enabled=True, sample_rate=1.0)
+    for page in load_corpus():
+        store.store(
+            url=page.url,
+            html=page.html.decode("utf-8"),
+            payload={"name_identification": page.name, "product_url": page.url, "target_price": "100"},
+            product_type="monitored",
+        )
+    return store
+
+def test_replay_runs_full_pipeline_offline(snapshot_store):
+    """ Páginas de produto chegam a ``success``; CAPTCHA e listagem são recusadas """
+    records, missing = select_snapshots(snapshot_store)
+    report = asyncio.run(replay(snapshot_store, records, concurrency=2, iterations=2))
+
+    assert missing == 0
+    assert report["scrapes"] == 10
+    assert report["outcomes"] == {"success": 6, "http_400": 4}
+    assert report["throughput_per_s"] > 0
+    for stage in ("fetch", "cache_lookup", "parse", "validate", "cache_update", "total"):
+        assert report["stages"][stage]["count"] > 0
+
+def test_keep_cache_serves_unchanged_pages_from_cache(snapshot_store):
+    """ Mantendo o cache, a segunda passada não repete o parse das páginas de produto """
+    records, _ = select_snapshots(snapshot_store)
+    report = asyncio.run(replay(snapshot_store, records, iterations=2, keep_cache=True))
+
+    assert report["outcomes"]["cached"] == 3
+    assert report["stages"]["parse"]["count"] == 7
+
+def test_replay_restores_the_scraper_module(snapshot_store):
+    """ Após o replay o fluxo volta a usar a busca e o Redis originais """
+    fetch, redis = common.fetch_html, common.redis_client
+    records, _ = select_snapshots(snapshot_store, limit=1)
+    asyncio.run(replay(snapshot_store, records))
+    assert common.fetch_html is fetch and common.redis_client is redis
+
+def test_pruned_snapshots_are_reported_as_missing(snapshot_store):
+    sha = next(snapshot_store.iter_snapshots()).sha256
+    snapshot_store._object_path(sha).unlink()
+    records, missing = select_snapshots(snapshot_store)
+    assert missing == 1 and len(records) == 4
+
+def test_cli_without_snapshots_fails(tmp_path):
+    assert main(["--dir", str(tmp_path)]) == 1
+
+def test_local_redis_expires_keys():
+    redis = LocalRedis()
+    redis.set("a", 1, ex=0.01)
+    assert redis.incr("b") == 1 and redis.exists("a", "b") == 2
+    time.sleep(0.02)
+    assert redis.get("a") is None and redis.ttl("a") == -2
+    assert list(redis.scan_iter(match="b*")) == ["b"]
@@ -52,6 +52,19 @@ class FakeRedis:
     def zcard(self, redis_key):
         return len(self.data.get(redis_key, []))
 
+    def zadd(self, redis_key, mapping, nx=False):
+        scores = self.data.setdefault(redis_key, {})
+        added = 0
+        for member, score in mapping.items():
+            if nx and member in scores:
+                continue
+            added += member not in scores
+            scores[member] = score
+        return added
+
+    def zscore(self, redis_key, member):
+        return self.data.get(redis_key, {}).get(member)
+
     def delete(self, redis_key):
         if redis_key in self.data:
             del self.data[redis_key]
@@ -101,3 +114,15 @@ def patch_rate_limiter(monkeypatch):
 def fixed_time(monkeypatch):
     """ Congela o tempo para simulação precisa """
     monkeypatch.setattr(time, "time", lambda: 0.0)
+
+@pytest.fixture(autouse=True)
+def disable_http_tier(monkeypatch):
+    """ Mantém os testes no caminho do Playwright, sem requisições HTTP reais """
+    from scraper_app.core.config import settings
+    monkeypatch.setattr(settings, "HTTP_FETCH_ENABLED", False)
+
+@pytest.fixture(autouse=True)
+def disable_host_bucket(monkeypatch):
+    """ Dispensa o token bucket distribuído, que depende do script Lua no Redis """
+    from scraper_app.core.config import settings
+    monkeypatch.setattr(settings, "HOST_BUCKET_ENABLED", False)
@@ -1,4 +1,5 @@
 import uuid
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from decimal import Decimal
 
@@ -21,12 +22,17 @@ class DummyQuery:
 class DummyDB:
     def __init__(self):
         self.obj = None
+        self.added = []
 
     def query(self, model):
         return DummyQuery(None)
 
+    def begin_nested(self):
+        return nullcontext()
+
     def add(self, obj):
         self.obj = obj
+        self.added.append(obj)
 
     def commit(self):
         if getattr(self.obj, "id", None) is None:
@@ -55,6 +61,8 @@ def test_monitored_url_is_canonicalized(monkeypatch):
     )
 
     assert prod.product_url == "https://produto.mercadolivre.com.br/MLB-12345"
+    assert prod.canonical_item_id == "MLB12345"
+    assert any(getattr(obj, "mlb_id", None) == "MLB12345" for obj in db.added)
 
 def test_competitor_url_is_canonicalized():
     db = DummyDB()
@@ -78,3 +86,4 @@ def test_competitor_url_is_canonicalized():
     )
 
     assert comp.product_url == "https://produto.mercadolivre.com.br/MLB-99999"
+    assert comp.canonical_item_id == "MLB99999"
@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+from fastapi import FastAPI, HTTPException, status
+from fastapi.testclient import TestClient
+
+import scraper_app.routes.routes_scraper as routes
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(routes.router)
+    return TestClient(app)
+
+def _details(price="R$ 10,00"):
+    return {"name": "Produto", "current_price": price, "old_price": None, "shipping": "Frete Grátis",
+            "seller": "Loja", "thumbnail": "img"}
+
+def test_batch_streams_one_line_per_item_with_single_endpoint_status(monkeypatch):
+    """ Cada item vira uma linha NDJSON com o mesmo status do endpoint unitário """
+    async def fake_scrape(url, **kwargs):
+        if "captcha" in url:
+            return {"status": "captcha"}
+        if "suspenso" in url:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Scraping suspenso")
+        return {"status": "success", "details": _details()}
+
+    monkeypatch.setattr(routes, "scrape_product_coalesced", fake_scrape)
+    body = {"items": [
+        {"url": "https://produto.mercadolivre.com.br/MLB-1-ok"},
+        {"url": "https://produto.mercadolivre.com.br/MLB-2-suspenso"},
+        {"url": "https://produto.mercadolivre.com.br/MLB-3-captcha", "product_type": "competitor"},
+    ]}
+
+    response = _client().post("/scraper/parse/batch", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = {item["index"]: item for item in map(json.loads, response.text.splitlines())}
+    assert lines[0]["status_code"] == 200
+    assert lines[0]["data"]["current_price"] == 10.0
+    assert lines[0]["data"]["free_shipping"] is True
+    assert lines[1] == {"index": 1, "url": body["items"][1]["url"], "status_code": 429,
+                        "data": None, "detail": "Scraping suspenso"}
+    assert lines[2]["status_code"] == 500
+    assert lines[2]["detail"] == "Falha ao extrair dados"
+
+def test_batch_limits_concurrency(monkeypatch):
+    """ O lote nunca executa mais scrapings simultâneos que o limite pedido """
+    running = {"now": 0, "peak": 0}
+
+    async def fake_scrape(url, **kwargs):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return {"status": "success", "details": _details()}
+
+    monkeypatch.setattr(routes, "scrape_product_coalesced", fake_scrape)
+    body = {"concurrency": 2, "items": [
+        {"url": f"https://produto.mercadolivre.com.br/MLB-{i}"} for i in range(6)
+    ]}
+
+    response = _client().post("/scraper/parse/batch", json=body)
+
+    assert len(response.text.splitlines()) == 6
+    assert running["peak"] == 2
+
+def test_batch_rejects_empty_items():
+    """ Lote vazio é recusado na validação """
+    response = _client().post("/scraper/parse/batch", json={"items": []})
+    assert response.status_code == 422
@@ -1,7 +1,7 @@
 from types import SimpleNamespace
 
 import scraper_app.services.services_cache_scraper as cache_scraper
-from scraper_app.services.services_cache_scraper import use_cache_if_not_modified, update_cache
+from scraper_app.services.services_cache_scraper import use_cache_if_not_modified, use_cache_on_not_modified, use_fresh_cache, update_cache
 
 def _html():
     return "<html></html>"
@@ -69,14 +69,55 @@ def test_use_cache_returns_none_with_other_hash(monkeypatch):
 def test_update_cache_stores(monkeypatch):
     captured = {}
 
-    def fake_set(url, data, html, etag=None):
-        captured.update(dict(url=url, data=data, html=html, etag=etag))
+    def fake_set(url, data, html, etag=None, last_modified=None):
+        captured.update(dict(url=url, data=data, html=html, etag=etag, last_modified=last_modified))
 
     monkeypatch.setattr(cache_scraper.cache_manager, "set", fake_set)
-    update_cache("http://example.com", {"x": 1}, "<html></html>", "tag")
+    update_cache("http://example.com", {"x": 1}, "<html></html>", "tag", "Wed, 01 Jan 2025 00:00:00 GMT")
     assert captured == {
         "url": "http://example.com",
         "data": {"x": 1},
         "html": "<html></html>",
         "etag": "tag",
+        "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT",
     }
+
+def test_use_fresh_cache_serves_entry_inside_max_age(monkeypatch):
+    cached = {"data": {"v": 1}, "etag": "tag", "stored_at": 1000.0}
+    monkeypatch.setattr(cache_scraper.cache_manager, "get", lambda url: cached)
+    monkeypatch.setattr(cache_scraper, "audit_scrape", lambda *a, **k: None)
+    monkeypatch.setattr(cache_scraper.time, "time", lambda: 1030.0)
+
+    result = use_fresh_cache("http://example.com", _payload(), max_age=60)
+
+    assert result == {"status": "cached", "details": {"v": 1}, "etag": "tag", "last_modified": None}
+
+def test_use_fresh_cache_skips_stale_or_forced_entries(monkeypatch):
+    cached = {"data": {"v": 1}, "stored_at": 1000.0}
+    monkeypatch.setattr(cache_scraper.cache_manager, "get", lambda url: cached)
+    monkeypatch.setattr(cache_scraper.time, "time", lambda: 1100.0)
+
+    assert use_fresh_cache("http://example.com", _payload(), max_age=60) is None
+    assert use_fresh_cache("http://example.com", _payload(), max_age=0) is None
+
+def test_not_modified_with_caller_validators_reports_not_modified(monkeypatch):
+    """ O ``304`` pedido com validadores do chamador é informado como ``not_modified`` """
+    monkeypatch.setattr(cache_scraper.cache_manager, "get_data", lambda url: {"v": 1})
+    monkeypatch.setattr(cache_scraper, "audit_scrape", lambda *a, **k: None)
+    cb = DummyCB()
+
+    result = use_cache_on_not_modified("http://example.com", _payload(), cb, "c", etag="tag", last_modified=None)
+
+    assert result == {"status": "not_modified", "details": {"v": 1}, "etag": "tag", "last_modified": None}
+    assert cb.called == "c"
+
+def test_not_modified_with_cache_validators_returns_cached_details(monkeypatch):
+    """ Validadores lidos do cache: o chamador não tem dados, então recebe os guardados como resposta normal """
+    monkeypatch.setattr(cache_scraper.cache_manager, "get_data", lambda url: None)
+    monkeypatch.setattr(cache_scraper, "audit_scrape", lambda *a, **k: None)
+
+    result = use_cache_on_not_modified(
+        "http://example.com", _payload(), DummyCB(), "c", etag="tag", last_modified=None, cached_data={"v": 1}
+    )
+
+    assert result == {"status": "cached", "details": {"v": 1}, "etag": "tag", "last_modified": None}
@@ -30,7 +30,10 @@ def _patch_common(monkeypatch):
         lambda *a, **k: None,
         raising=False
     )
-    monkeypatch.setattr("scraper_app.services.services_scraper_common.HumanizedDelayManager.wait", lambda self, *a, **k: None)
+    async def no_delay(self, *a, **k):
+        pass
+
+    monkeypatch.setattr("scraper_app.services.services_scraper_common.HumanizedDelayManager.wait_async", no_delay)
     class DummyRecovery:
         async def handle_block(self, *a, **k):
             pass
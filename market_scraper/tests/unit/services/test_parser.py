@@ -4,6 +4,7 @@ import pytest
 from bs4 import BeautifulSoup
 
 from scraper_app.services.services_parser import (
+    ParseContext,
     parse_product_details,
     RobustProductParser,
     CaptchaDetectedError
@@ -182,3 +183,189 @@ def test_looks_like_product_page_returns_false_when_og_type_not_product():
     from scraper_app.services.services_parser import looks_like_product_page
 
     assert looks_like_product_page(html) is False
+
+def test_parse_context_decodes_json_once_without_building_dom(monkeypatch):
+    """ Verificação e parse compartilham o JSON decodificado e dispensam o DOM """
+    import scraper_app.services.services_parser as services_parser
+    from scraper_app.services.services_parser import ParseContext, looks_like_product_page
+
+    html = """
+    <html>
+      <head>
+        <meta property="og:image" content="https://example.com/img.jpg" />
+        <script type="application/ld+json">
+        {"@type": "Product", "name": "Produto", "offers": {"price": "10.00"}, "seller": {"name": "Loja"}}
+        </script>
+      </head>
+      <body>
+        <h1 class="ui-pdp-title">Produto</h1>
+        <p>Frete grátis</p>
+        <script>
+        window.__PRELOADED_STATE__ = {"title": "Produto", "price": 10.0, "seller": {"nickname": "Loja"}};
+        </script>
+      </body>
+    </html>
+    """
+    counts = {"soup": 0, "json": 0}
+    real_soup, real_loads = services_parser.BeautifulSoup, services_parser.loads
+
+    def counting_soup(*args, **kwargs):
+        counts["soup"] += 1
+        return real_soup(*args, **kwargs)
+
+    def counting_loads(*args, **kwargs):
+        counts["json"] += 1
+        return real_loads(*args, **kwargs)
+
+    monkeypatch.setattr(services_parser, "BeautifulSoup", counting_soup)
+    monkeypatch.setattr(services_parser, "loads", counting_loads)
+
+    page = ParseContext(html)
+    assert looks_like_product_page(page) is True
+    result = parse_product_details(page, url="https://produto.mercadolivre.com.br/MLB-1")
+
+    assert result["shipping"] == "Frete Grátis"
+    assert result["seller"] == "Loja"
+    assert counts["soup"] == 0
+    #O ``__PRELOADED_STATE__`` é válido, então o JSON-LD nem chega a ser decodificado
+    assert counts["json"] == 1
+
+def test_extrair_seller_accepts_soup():
+    """ Funções auxiliares continuam aceitando um ``BeautifulSoup`` pronto """
+    from scraper_app.services.services_parser import extrair_seller
+
+    soup = BeautifulSoup('<span class="ui-seller-data-header__title">Loja Y</span>', "html.parser")
+    assert extrair_seller(soup) == "Loja Y"
+
+def test_parser_builds_dom_when_fast_path_fails_validation(monkeypatch):
+    """ Sem vendedor nos scripts o caminho rápido não valida e o DOM é construído uma vez """
+    import scraper_app.services.services_parser as services_parser
+
+    html = """
+    <html>
+      <head>
+        <meta property="og:image" content="https://example.com/img.jpg" />
+        <script type="application/ld+json">
+        {"@type": "Product", "name": "Produto", "offers": {"price": "25.50"}}
+        </script>
+      </head>
+      <body>
+        <span class="ui-seller-data-header__title">Loja do DOM</span>
+        <p>Frete grátis</p>
+      </body>
+    </html>
+    """
+    built = []
+
+    class CountingSoup(BeautifulSoup):
+        def __init__(self, *args, **kwargs):
+            built.append(1)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(services_parser, "BeautifulSoup", CountingSoup)
+
+    result = parse_product_details(html.encode("utf-8"), url="https://produto.mercadolivre.com.br/MLB-2")
+
+    assert result["seller"] == "Loja do DOM"
+    assert result["current_price"] == "R$ 25,50"
+    assert len(built) == 1
+
+_TWO_SOURCES_HTML = """
+<html>
+  <head>
+    <meta property="og:image" content="https://example.com/img.jpg" />
+    <script type="application/ld+json">
+    {"@type": "Product", "name": "Produto LD", "offers": {"price": "30.00"}, "seller": {"name": "Loja LD"}}
+    </script>
+  </head>
+  <body>
+    <p>Frete grátis</p>
+    <script>window.__PRELOADED_STATE__ = {"title": "Produto State", "price": 30.0, "seller": {"nickname": "Loja State"}};</script>
+  </body>
+</html>
+"""
+
+def _tracking_parser(monkeypatch, stats):
+    """ Parser que registra a ordem em que as estratégias rodam """
+    import scraper_app.services.services_parser as services_parser
+
+    monkeypatch.setattr(services_parser, "strategy_stats", stats)
+    parser = RobustProductParser()
+    calls = []
+    for name in services_parser.STRATEGIES:
+        method = getattr(parser, f"_from_{name}")
+        def tracked(ctx, _name=name, _method=method):
+            calls.append(_name)
+            return _method(ctx)
+        monkeypatch.setattr(parser, f"_from_{name}", tracked)
+    return parser, calls
+
+def test_parser_stops_at_first_valid_strategy(monkeypatch):
+    """ O primeiro resultado aprovado pelo validador encerra o parse """
+    from scraper_app.utils.strategy_stats import StrategyStats
+
+    stats = StrategyStats(redis=object(), flush_interval=3600)
+    parser, calls = _tracking_parser(monkeypatch, stats)
+    url = "https://produto.mercadolivre.com.br/MLB-3"
+
+    result = parser.parse(_TWO_SOURCES_HTML, url)
+
+    assert result["seller"] == "Loja State"
+    assert calls == ["preloaded_state"]
+    key = parser.strategy_key(ParseContext(_TWO_SOURCES_HTML), url)
+    assert stats.wins(key) == {"preloaded_state": 1}
+
+def test_parser_tries_learned_strategy_first(monkeypatch):
+    """ A estratégia que mais venceu para o host e layout roda primeiro """
+    from scraper_app.utils.strategy_stats import StrategyStats
+
+    stats = StrategyStats(redis=object(), flush_interval=3600)
+    parser, calls = _tracking_parser(monkeypatch, stats)
+    url = "https://produto.mercadolivre.com.br/MLB-4"
+    key = parser.strategy_key(ParseContext(_TWO_SOURCES_HTML), url)
+    for _ in range(3):
+        stats.record_win(key, "json_ld")
+
+    result = parser.parse(_TWO_SOURCES_HTML, url)
+
+    assert result["seller"] == "Loja LD"
+    assert calls == ["json_ld"]
+
+def test_paused_listings_do_not_hide_price_from_later_pages(monkeypatch):
+    """ Páginas sem preço (anúncio pausado) não ensinam o layout a desistir do preço """
+    import scraper_app.services.services_parser as services_parser
+    from scraper_app.utils.json_index import PathCache
+
+    monkeypatch.setattr(services_parser, "path_cache", PathCache())
+    page = """
+    <html>
+      <head><meta property="og:image" content="https://example.com/img.jpg" /></head>
+      <body><script>window.__PRELOADED_STATE__ = {"title": "Produto", %s"seller": {"nickname": "Loja"}};</script></body>
+    </html>
+    """
+    url = "https://produto.mercadolivre.com.br/MLB-5"
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            parse_product_details(page % "", url=url)
+
+    result = parse_product_details(page % '"price": 15.0, ', url=url)
+    assert result["current_price"] == "R$ 15,00"
+
+@pytest.mark.parametrize("body", [
+    '<script>window.__PRELOADED_STATE__ = {"promo": "Frete grátis acima de R$ 79"};</script><p>Entrega em 2 dias</p>',
+    "<p>Frete gr&aacute;tis</p>",
+    "<span>Frete</span> <span>grátis</span>",
+    "<!-- frete grátis --><style>.frete-grátis{}</style><p>Chega amanhã</p>",
+    "<p>Frete&nbsp;grátis</p>",
+])
+def test_fast_path_shipping_matches_dom(body):
+    """ Sem DOM o frete é lido do texto visível, como no ``BeautifulSoup`` """
+    from scraper_app.services.services_parser import extract_shipping
+
+    html = f"<html><body>{body}</body></html>"
+    ctx = ParseContext(html)
+    with ctx.raw_only():
+        fast = extract_shipping(ctx)
+
+    assert fast == extract_shipping(ParseContext(html))
+    assert not ctx.has_dom
@@ -37,9 +37,12 @@ def _patch_common(monkeypatch):
 
     monkeypatch.setattr("scraper_app.services.services_scraper_common.RobotsTxtParser", lambda *a, **k: DummyRobots())
     monkeypatch.setattr("scraper_app.services.services_scraper_common.CircuitBreaker", lambda: DummyCB())
-    monkeypatch.setattr("scraper_app.services.services_scraper_common.ThrottleManager.wait", lambda self, identifier=None, circuit_key="": None)
-    monkeypatch.setattr("scraper_app.services.services_scraper_common.ThrottleManager.backoff", lambda self, attempt, circuit_key="": None)
-    monkeypatch.setattr("scraper_app.services.services_scraper_common.HumanizedDelayManager.wait", lambda self, *a, **k: None)
+    async def no_delay(self, *a, **k):
+        pass
+
+    monkeypatch.setattr("scraper_app.services.services_scraper_common.ThrottleManager.wait_async", no_delay)
+    monkeypatch.setattr("scraper_app.services.services_scraper_common.ThrottleManager.backoff_async", no_delay)
+    monkeypatch.setattr("scraper_app.services.services_scraper_common.HumanizedDelayManager.wait_async", no_delay)
     monkeypatch.setattr("scraper_app.services.services_scraper_common.BlockRecoveryManager", lambda *a, **k: DummyRecovery())
 
     redis = DummyRedis()
@@ -190,3 +193,34 @@ def test_timeout_triggers_recovery(monkeypatch):
 
     assert result["status"] == "success"
     assert recovery.called
+
+def test_single_flight_key_includes_max_age():
+    """ Pedidos com ``max_age`` diferentes não compartilham a mesma coleta """
+    from scraper_app.services.services_scraper_common import single_flight_key
+
+    url = "https://produto.mercadolivre.com.br/MLB-123456-produto-_JM"
+    assert single_flight_key(url) != single_flight_key(url, max_age=60)
+    assert single_flight_key(url, max_age=60) == single_flight_key(url, max_age=60)
+
+def test_max_age_zero_bypasses_single_flight(monkeypatch):
+    """ ``max_age=0`` exige coleta própria e não passa pela coalescência """
+    import asyncio
+    import scraper_app.services.services_scraper_common as common
+
+    async def scrape(**kwargs):
+        return {"status": "success", "max_age": kwargs["max_age"]}
+
+    async def coalesce(key, fn):
+        raise AssertionError("max_age=0 não deve ser coalescido")
+
+    monkeypatch.setattr(common, "_scrape_product_common", scrape)
+    monkeypatch.setattr(common.single_flight, "do", coalesce)
+
+    result = asyncio.run(common.scrape_product_coalesced(
+        url="https://produto.mercadolivre.com.br/MLB-123456-produto-_JM",
+        user_id=uuid4(),
+        payload=None,
+        product_type="monitored",
+        max_age=0,
+    ))
+    assert result == {"status": "success", "max_age": 0}
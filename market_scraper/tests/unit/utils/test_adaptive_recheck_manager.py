@@ -40,5 +40,12 @@ def test_should_recheck(patch_rate_limiter):
     mgr.schedule_next(prod)
     assert not mgr.should_recheck(str(prod.id))
     past = datetime.now(timezone.utc) - timedelta(seconds=1)
-    mgr.redis.set(mgr._next_key(str(prod.id)), past.isoformat())
+    mgr.due_index.schedule(str(prod.id), past.timestamp())
     assert mgr.should_recheck(str(prod.id))
+
+def test_schedule_next_uses_due_index(patch_rate_limiter):
+    mgr = AdaptiveRecheckManager(base_interval=100, min_interval=1, jitter=0)
+    prod = make_product()
+    assert mgr.should_recheck(str(prod.id))
+    nxt = mgr.schedule_next(prod)
+    assert mgr.due_index.score(str(prod.id)) == nxt.timestamp()
@@ -1,4 +1,7 @@
+import gzip
 import json
+from datetime import datetime, timezone
+
 from scraper_app.utils import audit_exporter
 from scraper_app.utils import audit_logger
 
@@ -18,3 +21,90 @@ def test_metrics_counts(monkeypatch, tmp_path):
     body = resp.body.decode()
     assert 'audit_records_total{stage="ok"} 1.0' in body
     assert 'audit_errors_total{stage="unknown"} 1.0' in body
+
+def test_metrics_counts_jsonl_segments(monkeypatch, tmp_path):
+    """ Segmentos ativos e compactados são contados linha a linha """
+    day = tmp_path / "2024-01-02"
+    day.mkdir(parents=True)
+    (day / "audit-000000-1-0001.jsonl").write_text('{"stage": "get"}\n{"stage": "parser"}\n', encoding="utf-8")
+    (day / "audit-000000-1-0002.jsonl.gz").write_bytes(gzip.compress(b'{"stage": "get"}\n{broken\n'))
+
+    monkeypatch.setattr(audit_exporter, "AUDIT_DIR", str(tmp_path))
+
+    body = audit_exporter.metrics().body.decode()
+    assert 'audit_records_total{stage="get"} 2.0' in body
+    assert 'audit_records_total{stage="parser"} 1.0' in body
+    assert 'audit_errors_total{stage="unknown"} 1.0' in body
+
+def _today(tmp_path):
+    day = tmp_path / datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    day.mkdir(parents=True, exist_ok=True)
+    return day
+
+def test_only_new_lines_are_read_on_each_pass(tmp_path):
+    """ Cada passada conta apenas o que foi gravado depois da anterior """
+    segment = _today(tmp_path) / "audit-000000-1-0001.jsonl"
+    segment.write_text('{"stage": "get"}\n', encoding="utf-8")
+    index = audit_exporter.AuditIndex(str(tmp_path))
+    assert index.refresh() == 1
+
+    with open(segment, "a", encoding="utf-8") as fh:
+        fh.write('{"stage": "parser"}\n{"stage": "pers')
+    assert index.refresh() == 1
+    assert index.refresh() == 0
+
+    with open(segment, "a", encoding="utf-8") as fh:
+        fh.write('ist"}\n')
+    assert index.refresh() == 1
+    assert index.state["records"] == {"get": 1, "parser": 1, "persist": 1}
+
+def test_sealed_segment_continues_from_active_offset(tmp_path):
+    """ Ao compactar o segmento, só as linhas ainda não contadas entram """
+    day = _today(tmp_path)
+    active = day / "audit-000000-1-0001.jsonl"
+    active.write_text('{"stage": "get"}\n', encoding="utf-8")
+    index = audit_exporter.AuditIndex(str(tmp_path))
+    index.refresh()
+
+    (day / "audit-000000-1-0001.jsonl.gz").write_bytes(gzip.compress(b'{"stage": "get"}\n{"stage": "parser"}\n'))
+    active.unlink()
+    assert index.refresh() == 1
+    assert index.state["records"] == {"get": 1, "parser": 1}
+
+def test_counters_survive_restart_without_rereading(tmp_path):
+    """ Um novo processo parte do índice persistido, sem reler dias concluídos """
+    day = tmp_path / "2024-01-03"
+    day.mkdir()
+    (day / "audit-000000-1-0001.jsonl.gz").write_bytes(gzip.compress(b'{"stage": "get"}\n'))
+    audit_exporter.AuditIndex(str(tmp_path)).refresh()
+    (day / "audit-000000-1-0002.jsonl.gz").write_bytes(gzip.compress(b'{"stage": "late"}\n'))
+
+    restarted = audit_exporter.AuditIndex(str(tmp_path))
+    assert restarted.refresh() == 0
+    assert restarted.state["records"] == {"get": 1}
+    assert restarted.state["done_days"] == ["2024-01-03"]
+
+def test_rebuild_recounts_everything(tmp_path, capsys):
+    day = tmp_path / "2024-01-03"
+    day.mkdir()
+    (day / "audit-000000-1-0001.jsonl.gz").write_bytes(gzip.compress(b'{"stage": "get"}\n'))
+    audit_exporter.AuditIndex(str(tmp_path)).refresh()
+    (day / "audit-000000-1-0002.jsonl.gz").write_bytes(gzip.compress(b'{"stage": "get"}\n'))
+
+    assert audit_exporter.main(["--dir", str(tmp_path), "--rebuild"]) == 0
+    assert json.loads(capsys.readouterr().out)["records"] == {"get": 2}
+
+def test_metrics_are_served_from_memory_between_scrapes(monkeypatch, tmp_path):
+    """ Sem registros novos o endpoint não reabre os segmentos """
+    segment = _today(tmp_path) / "audit-000000-1-0001.jsonl"
+    segment.write_text('{"stage": "get"}\n', encoding="utf-8")
+    monkeypatch.setattr(audit_exporter, "AUDIT_DIR", str(tmp_path))
+    audit_exporter.metrics()
+
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda path, *a, **k: opened.append(str(path)) or real_open(path, *a, **k))
+    body = audit_exporter.metrics().body.decode()
+
+    assert 'audit_records_total{stage="get"} 1.0' in body
+    assert not [path for path in opened if path.endswith(".jsonl")]
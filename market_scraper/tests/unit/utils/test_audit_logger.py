@@ -1,5 +1,8 @@
+import gzip
 import importlib
 import builtins
+import json
+import time
 
 import pytest
 
@@ -15,19 +18,94 @@ class DummyLogger:
         self.called = True
         self.args = a
         self.kwargs = k
-        
-def test_audit_logger_logs_error(monkeypatch, tmp_path):
+
+@pytest.fixture
+def audit_logger(monkeypatch, tmp_path):
     monkeypatch.setenv("AUDIT_LOG_DIR", str(tmp_path))
-    audit_logger = importlib.reload(audit_logger_mod)
+    module = importlib.reload(audit_logger_mod)
+    yield module
+    module.audit_writer.shutdown()
+
+def _segments(path, suffix):
+    return sorted(p for p in path.glob(f"*/*{suffix}"))
 
+def test_audit_logger_logs_error(monkeypatch, audit_logger):
     dummy = DummyLogger()
     monkeypatch.setattr(audit_logger, "logger", dummy)
 
+    audit_logger.audit_scrape(stage="test", url="http://example.com", payload={}, html=None)
+
     def fake_open(*a, **k):
         raise IOError("disk full")
 
     monkeypatch.setattr(builtins, "open", fake_open)
 
-    audit_logger.audit_scrape(stage="test", url="http://example.com", payload={}, html=None)
+    assert audit_logger.flush() == 0
+    assert dummy.called
+
+def test_records_are_batched_into_one_jsonl_segment(audit_logger, tmp_path):
+    """ Várias etapas vão para o mesmo segmento, uma linha JSON por registro """
+    for stage in ("get", "parser", "persist"):
+        audit_logger.audit_scrape(stage=stage, url="http://example.com", payload={"a": 1}, html="<html/>")
+    assert audit_logger.flush() == 3
+
+    [segment] = _segments(tmp_path, audit_logger.SEGMENT_SUFFIX)
+    records = [json.loads(line) for line in segment.read_text(encoding="utf-8").splitlines()]
+    assert [record["stage"] for record in records] == ["get", "parser", "persist"]
+    assert records[0]["html_length"] == len("<html/>")
+
+def test_payload_is_copied_when_queued(audit_logger, tmp_path):
+    details = {"price": "10"}
+    audit_logger.audit_scrape(stage="parser", url="u", payload={}, details=details)
+    details["price"] = "20"
+    audit_logger.flush()
+
+    [segment] = _segments(tmp_path, audit_logger.SEGMENT_SUFFIX)
+    assert json.loads(segment.read_text(encoding="utf-8"))["details"] == {"price": "10"}
+
+def test_full_queue_drops_records(audit_logger):
+    """ Com a fila cheia o registro é descartado sem bloquear o scraping """
+    writer = audit_logger.AuditWriter(max_queue=2, flush_interval=60)
+    try:
+        assert writer.submit({"stage": "get"}) and writer.submit({"stage": "get"})
+        assert writer.submit({"stage": "get"}) is False
+        assert writer.flush() == 2
+    finally:
+        writer.shutdown()
+
+def test_segment_rotates_by_size_and_is_compressed(audit_logger, tmp_path):
+    """ Segmentos acima do limite são fechados e compactados em ``.jsonl.gz`` """
+    writer = audit_logger.AuditWriter(batch_size=1, segment_max_bytes=1, flush_interval=60)
+    try:
+        for stage in ("get", "parser"):
+            writer.submit({"stage": stage})
+        writer.flush()
+    finally:
+        writer.shutdown()
+
+    sealed = _segments(tmp_path, audit_logger.SEALED_SUFFIX)
+    assert len(sealed) == 2
+    assert not _segments(tmp_path, audit_logger.SEGMENT_SUFFIX)
+    stages = [json.loads(gzip.decompress(path.read_bytes()))["stage"] for path in sealed]
+    assert sorted(stages) == ["get", "parser"]
+
+def test_idle_segment_is_sealed_after_max_age(audit_logger, tmp_path):
+    writer = audit_logger.AuditWriter(segment_max_age=0, flush_interval=60)
+    try:
+        writer.submit({"stage": "get"})
+        writer.flush()
+        assert _segments(tmp_path, audit_logger.SEALED_SUFFIX)
+    finally:
+        writer.shutdown()
 
-    assert dummy.called
\ No newline at end of file
+def test_background_thread_flushes_without_explicit_call(audit_logger, tmp_path):
+    writer = audit_logger.AuditWriter(flush_interval=0.01)
+    try:
+        writer.submit({"stage": "get"})
+        for _ in range(200):
+            if _segments(tmp_path, audit_logger.SEGMENT_SUFFIX):
+                break
+            time.sleep(0.01)
+        assert _segments(tmp_path, audit_logger.SEGMENT_SUFFIX)
+    finally:
+        writer.shutdown()
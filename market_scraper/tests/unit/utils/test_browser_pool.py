@@ -0,0 +1,140 @@
+import asyncio
+
+from scraper_app.utils.browser_pool import BrowserPool, set_browser_pool
+from scraper_app.utils.playwright_client import get_playwright_client
+
+
+class DummyContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+class DummyBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def close(self):
+        self.closed = True
+
+class DummyDriver:
+    async def stop(self):
+        pass
+
+def _patch_client(pool: BrowserPool, browsers: list, rendered: list):
+    """ Substitui o Playwright real por objetos falsos no cliente do pool """
+    async def start_driver():
+        return DummyDriver()
+
+    async def launch_browser(_playwright):
+        browser = DummyBrowser()
+        browsers.append(browser)
+        return browser
+
+    async def new_context(browser, session_id=None):
+        return DummyContext(), 1280, 720
+
+    async def render(context, url, width, height):
+        rendered.append((context, url))
+        await context.close()
+        return f"<html>{url}</html>"
+
+    pool._client.start_driver = start_driver
+    pool._client.launch_browser = launch_browser
+    pool._client.new_context = new_context
+    pool._client.render = render
+
+def test_pool_reuses_warm_browser_and_precreated_context():
+    """ Várias páginas devem usar o mesmo navegador sem novo launch """
+    browsers, rendered = [], []
+
+    async def scenario():
+        pool = BrowserPool(size=1, contexts_per_browser=2, max_pages=100, max_memory_mb=0)
+        _patch_client(pool, browsers, rendered)
+        await pool.start()
+        html = await pool.fetch_html("https://example.com/a")
+        await pool.fetch_html("https://example.com/b")
+        await asyncio.sleep(0)
+        await pool.stop()
+        return html
+
+    html = asyncio.run(scenario())
+    assert html == "<html>https://example.com/a</html>"
+    assert len(browsers) == 1
+    assert [url for _, url in rendered] == ["https://example.com/a", "https://example.com/b"]
+
+def test_pool_recycles_browser_after_max_pages():
+    """ Ao atingir o limite de páginas o navegador é fechado e substituído """
+    browsers, rendered = [], []
+
+    async def scenario():
+        pool = BrowserPool(size=1, contexts_per_browser=1, max_pages=2, max_memory_mb=0)
+        _patch_client(pool, browsers, rendered)
+        await pool.start()
+        await pool.fetch_html("https://example.com/1")
+        await pool.fetch_html("https://example.com/2")
+        #Aguarda a manutenção em segundo plano
+        await asyncio.gather(*pool._tasks)
+        await pool.fetch_html("https://example.com/3")
+        await pool.stop()
+
+    asyncio.run(scenario())
+    assert len(browsers) == 2
+    assert browsers[0].closed
+    assert browsers[1].closed
+
+def test_get_playwright_client_yields_active_pool():
+    """ ``get_playwright_client`` entrega o pool ativo sem iniciar navegador """
+    browsers, rendered = [], []
+
+    async def scenario():
+        pool = BrowserPool(size=1, contexts_per_browser=1, max_pages=0, max_memory_mb=0)
+        _patch_client(pool, browsers, rendered)
+        await pool.start()
+        set_browser_pool(pool)
+        try:
+            async with get_playwright_client() as client:
+                assert client is pool
+                return await client.fetch_html("https://example.com/x")
+        finally:
+            set_browser_pool(None)
+            await pool.stop()
+
+    assert asyncio.run(scenario()) == "<html>https://example.com/x</html>"
+    assert len(browsers) == 1
+
+def test_pool_keeps_browser_active_when_recycle_launch_fails():
+    """ Falha no launch do substituto não aposenta o navegador; a reciclagem é refeita depois """
+    browsers, rendered = [], []
+
+    async def scenario():
+        pool = BrowserPool(size=1, contexts_per_browser=1, max_pages=1, max_memory_mb=0)
+        _patch_client(pool, browsers, rendered)
+        await pool.start()
+        launch_browser = pool._client.launch_browser
+        failures = [RuntimeError("chromium crashed")]
+
+        async def flaky_launch(playwright):
+            if failures:
+                raise failures.pop()
+            return await launch_browser(playwright)
+
+        pool._client.launch_browser = flaky_launch
+        first = pool._browsers[0]
+        await pool.fetch_html("https://example.com/1")
+        await asyncio.gather(*pool._tasks)
+        assert pool._browsers == [first]
+        assert not first.retiring and not first.closed
+
+        await pool.fetch_html("https://example.com/2")
+        await asyncio.gather(*pool._tasks)
+        assert first.retiring and first.browser.closed
+        assert pool._browsers[0] is not first
+        await pool.stop()
+
+    asyncio.run(scenario())
+    assert len(browsers) == 2
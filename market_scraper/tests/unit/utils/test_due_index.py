@@ -0,0 +1,84 @@
+from redis.exceptions import NoScriptError
+
+from alert_app.utils.due_index import DueIndex
+
+
+class DueRedis:
+    """ Redis falso com sorted sets que executa o script de reivindicação em Python """
+    def __init__(self):
+        self.zsets = {}
+        self.loads = 0
+        self.fail_once = False
+
+    def script_load(self, source):
+        assert "ZRANGEBYSCORE" in source
+        self.loads += 1
+        return f"sha-{self.loads}"
+
+    def evalsha(self, sha, num_keys, key, now, limit, lease):
+        if self.fail_once:
+            self.fail_once = False
+            raise NoScriptError("NOSCRIPT")
+        scores = self.zsets.setdefault(key, {})
+        due = sorted((score, member) for member, score in scores.items() if score <= float(now))
+        claimed = [member for _, member in due[:int(limit)]]
+        for member in claimed:
+            scores[member] = float(now) + float(lease)
+        return claimed
+
+    def zadd(self, key, mapping, nx=False):
+        scores = self.zsets.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            if nx and member in scores:
+                continue
+            added += member not in scores
+            scores[member] = score
+        return added
+
+    def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    def zrem(self, key, *members):
+        scores = self.zsets.get(key, {})
+        return sum(scores.pop(member, None) is not None for member in members)
+
+    def zcount(self, key, low, high):
+        return sum(1 for score in self.zsets.get(key, {}).values() if score <= float(high))
+
+
+def test_claim_returns_due_items_in_due_order_and_leases_them():
+    """ Só os itens vencidos saem, do mais antigo ao mais recente, e ficam reservados """
+    fake = DueRedis()
+    index = DueIndex("recheck:due:monitored", lease=300, redis=fake)
+    index.schedule_many({"c": 90.0, "a": 10.0, "b": 50.0, "future": 500.0})
+
+    assert index.claim(2, now=100.0) == ["a", "b"]
+    assert index.score("a") == 400.0
+    assert index.claim(5, now=100.0) == ["c"]
+    assert index.claim(5, now=100.0) == []
+    assert index.backlog(now=100.0) == 0
+
+
+def test_schedule_many_only_new_keeps_existing_schedule():
+    """ A semeadura não antecipa itens já agendados """
+    fake = DueRedis()
+    index = DueIndex("recheck:due:competitor", redis=fake)
+    index.schedule("a", 1000.0)
+
+    assert index.schedule_many({"a": 0.0, "b": 0.0}, only_new=True) == 1
+    assert index.score("a") == 1000.0
+    assert index.score("b") == 0.0
+    assert index.remove("a", "missing") == 1
+    assert index.score("a") is None
+
+
+def test_claim_reloads_script_after_noscript():
+    """ Um ``SCRIPT FLUSH`` no Redis não interrompe as reivindicações """
+    fake = DueRedis()
+    index = DueIndex("recheck:due:monitored", redis=fake)
+    index.schedule("a", 1.0)
+    fake.fail_once = True
+
+    assert index.claim(1, now=2.0) == ["a"]
+    assert index.lua_sha == f"sha-{fake.loads}"
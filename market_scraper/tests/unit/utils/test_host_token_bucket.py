@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from redis.exceptions import NoScriptError
+
+from alert_app.utils.host_token_bucket import HostTokenBucket
+
+
+class BucketRedis:
+    """ Redis falso que registra as chamadas ao script e devolve esperas pré-definidas """
+    def __init__(self, waits=None):
+        self.data = {}
+        self.calls = []
+        self.loads = 0
+        self.waits = list(waits or [0])
+        self.fail_once = False
+
+    def script_load(self, source):
+        assert "HMGET" in source
+        self.loads += 1
+        return f"sha-{self.loads}"
+
+    def evalsha(self, sha, num_keys, key, rate, capacity, max_wait_ms, ttl_ms):
+        if self.fail_once:
+            self.fail_once = False
+            raise NoScriptError("NOSCRIPT")
+        self.calls.append({"sha": sha, "key": key, "rate": rate, "capacity": capacity,
+                           "max_wait_ms": max_wait_ms, "ttl_ms": ttl_ms})
+        return self.waits.pop(0) if len(self.waits) > 1 else self.waits[0]
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = str(value)
+        if ex:
+            self.data[f"ttl:{key}"] = ex
+
+
+def test_reserve_returns_next_slot_without_sleeping(monkeypatch):
+    """ A espera devolvida pelo script vira o instante da vaga """
+    monkeypatch.setattr(time, "time", lambda: 100.0)
+    fake = BucketRedis(waits=[0, 2500])
+    bucket = HostTokenBucket(rate=0.5, capacity=2, max_wait=10, redis=fake)
+
+    assert bucket.reserve("produto.mercadolivre.com.br") == pytest.approx(100.0)
+    assert bucket.reserve("produto.mercadolivre.com.br") == pytest.approx(102.5)
+    assert fake.calls[0]["key"] == "throttle:host:produto.mercadolivre.com.br:bucket"
+    assert fake.calls[0]["max_wait_ms"] == 10000
+
+def test_reserve_returns_none_when_host_is_saturated():
+    """ ``-1`` do script indica espera além do máximo e nenhuma vaga reservada """
+    bucket = HostTokenBucket(rate=0.5, capacity=2, redis=BucketRedis(waits=[-1]))
+    assert bucket.reserve("produto.mercadolivre.com.br") is None
+
+def test_rate_respects_crawl_delay_and_penalties():
+    """ Crawl-delay limita a taxa e cada bloqueio a reduz pelo ``decrease_factor`` """
+    fake = BucketRedis()
+    bucket = HostTokenBucket(rate=1.0, capacity=3, decrease_factor=0.5, penalty_ttl=600, redis=fake)
+    host = "produto.mercadolivre.com.br"
+
+    assert bucket.rate_for(host) == pytest.approx(1.0)
+    assert bucket.rate_for(host, crawl_delay=4) == pytest.approx(0.25)
+
+    assert bucket.penalize(host) == pytest.approx(0.5)
+    assert bucket.penalize(host) == pytest.approx(0.25)
+    assert fake.data[f"ttl:throttle:host:{host}:factor"] == 600
+
+    bucket.reserve(host, crawl_delay=4)
+    assert fake.calls[-1]["rate"] == pytest.approx(0.0625)
+
+def test_penalty_never_drops_below_min_rate():
+    """ O fator acumulado respeita a taxa mínima configurada """
+    bucket = HostTokenBucket(rate=1.0, capacity=1, min_rate=0.2, decrease_factor=0.1, redis=BucketRedis())
+    for _ in range(5):
+        bucket.penalize("m.mercadolivre.com.br")
+    assert bucket.rate_for("m.mercadolivre.com.br") == pytest.approx(0.2)
+
+def test_reserve_reloads_script_after_noscript():
+    """ Após reinício do Redis o script é recarregado e a chamada repetida """
+    fake = BucketRedis()
+    bucket = HostTokenBucket(rate=1.0, capacity=1, redis=fake)
+    loads = fake.loads
+    fake.fail_once = True
+
+    assert bucket.reserve("m.mercadolivre.com.br") is not None
+    assert fake.loads == loads + 1
+    assert fake.calls[-1]["sha"] == bucket.lua_sha
@@ -0,0 +1,139 @@
+import gzip
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from scraper_app.utils.html_snapshots import HtmlSnapshotStore
+
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+PAYLOAD = {"name_identification": "Fone", "product_url": "https://produto.mercadolivre.com.br/MLB-1", "target_price": "100"}
+
+def _store(tmp_path, **kwargs) -> HtmlSnapshotStore:
+    kwargs.setdefault("enabled", True)
+    kwargs.setdefault("sample_rate", 1.0)
+    return HtmlSnapshotStore(base_dir=str(tmp_path), **kwargs)
+
+def _save(store, html, day=NOW, url=PAYLOAD["product_url"]):
+    return store.store(url=url, html=html, payload=PAYLOAD, product_type="monitored", now=day)
+
+def _age_objects(store, seconds=3600):
+    """ Simula objetos gravados antes da janela de tolerância da limpeza """
+    past = time.time() - seconds
+    for path in store.objects_dir.glob("*/*.html.gz"):
+        os.utime(path, (past, past))
+
+def test_snapshot_is_content_addressed_and_compressed(tmp_path):
+    """ O objeto fica em ``objects/<prefixo>/<sha256>.html.gz`` e volta idêntico """
+    store = _store(tmp_path)
+    html = "<html>" + "preço " * 500 + "</html>"
+    sha = _save(store, html)
+
+    path = tmp_path / "objects" / sha[:2] / f"{sha}.html.gz"
+    assert path.is_file()
+    assert path.stat().st_size < len(html.encode())
+    assert gzip.decompress(path.read_bytes()).decode() == html
+    assert store.load(sha) == html
+
+def test_repeated_page_is_stored_once(tmp_path):
+    """ Capturas do mesmo HTML geram linhas no índice, mas um único objeto """
+    store = _store(tmp_path)
+    first = _save(store, "<html>a</html>")
+    second = _save(store, "<html>a</html>")
+
+    assert first == second
+    assert len(list(store.objects_dir.glob("*/*.html.gz"))) == 1
+    records = list(store.iter_snapshots())
+    assert [record.sha256 for record in records] == [first, first]
+    assert records[0].payload == PAYLOAD and records[0].product_type == "monitored"
+
+def test_capture_respects_sampling_and_flag(tmp_path):
+    """ Páginas fora da amostra ou com o recurso desligado não são enfileiradas """
+    assert not _store(tmp_path, enabled=False).capture(url="u", html="<html/>", payload={}, product_type="monitored")
+    assert not _store(tmp_path, sampler=lambda: 0.5, sample_rate=0.1).capture(url="u", html="<html/>", payload={}, product_type="monitored")
+    assert _store(tmp_path, sampler=lambda: 0.05, sample_rate=0.1).capture(url="u", html="<html/>", payload={}, product_type="monitored")
+
+def test_capture_queues_page_for_writer_thread(tmp_path):
+    """ ``capture`` só enfileira; a gravação acontece no ``flush`` da thread """
+    store = _store(tmp_path)
+    store._start = lambda: None
+
+    assert store.capture(url="u", html="<html>fila</html>", payload=PAYLOAD, product_type="monitored")
+    assert not store.objects_dir.exists()
+
+    assert store.flush() == 1
+    (record,) = store.iter_snapshots()
+    assert record.url == "u" and store.load(record.sha256) == "<html>fila</html>"
+
+def test_capture_drops_pages_when_queue_is_full(tmp_path):
+    """ Com a fila cheia a página é descartada em vez de acumular memória """
+    store = _store(tmp_path, max_queue=1)
+    store._start = lambda: None
+
+    assert store.capture(url="a", html="<html>a</html>", payload={}, product_type="monitored")
+    assert not store.capture(url="b", html="<html>b</html>", payload={}, product_type="monitored")
+    assert store.flush() == 1
+
+def test_capture_never_raises(tmp_path):
+    """ Falhas de disco não interrompem o scraping nem a thread de gravação """
+    blocker = tmp_path / "file"
+    blocker.write_text("x")
+    store = HtmlSnapshotStore(base_dir=str(blocker), enabled=True, sample_rate=1.0)
+    store._start = lambda: None
+    assert store.capture(url="u", html="<html/>", payload={}, product_type="monitored")
+    assert store.flush() == 0
+
+def test_prune_removes_days_past_retention(tmp_path):
+    """ Dias antigos saem do índice e seus objetos não referenciados são apagados """
+    store = _store(tmp_path, retention_days=7)
+    old = _save(store, "<html>velho</html>", day=NOW - timedelta(days=10))
+    shared = _save(store, "<html>comum</html>", day=NOW - timedelta(days=10))
+    _save(store, "<html>comum</html>", day=NOW)
+    _age_objects(store)
+
+    assert store.prune(now=NOW) == 1
+    assert not store.exists(old)
+    assert store.exists(shared)
+    assert [record.captured_at[:10] for record in store.iter_snapshots()] == [NOW.date().isoformat()]
+
+def test_prune_enforces_size_limit_keeping_today(tmp_path):
+    """ Acima do limite os dias mais antigos são descartados, preservando o atual """
+    store = _store(tmp_path)
+    yesterday = _save(store, "<html>ontem</html>", day=NOW - timedelta(days=1))
+    today = _save(store, "<html>hoje</html>")
+    _age_objects(store)
+
+    store.max_bytes = 1
+    store.prune(now=NOW)
+    assert not store.exists(yesterday)
+    assert store.exists(today)
+
+def test_store_refuses_new_objects_when_full(tmp_path):
+    """ Com o limite atingido, novas páginas esperam a próxima limpeza """
+    store = _store(tmp_path, max_bytes=1)
+    store._start = lambda: None
+    store.capture(url="a", html="<html>a</html>", payload={}, product_type="monitored")
+    assert store.flush() == 1
+    store.capture(url="b", html="<html>b</html>", payload={}, product_type="monitored")
+    assert store.flush() == 0
+
+def test_recent_unindexed_objects_survive_prune(tmp_path):
+    """ Objeto recém-gravado por outro processo, ainda sem índice, não é apagado """
+    store = _store(tmp_path)
+    sha = _save(store, "<html>novo</html>")
+    for index_file in store.index_dir.glob("*.jsonl"):
+        index_file.unlink()
+
+    assert store.prune(now=NOW) == 0
+    assert store.exists(sha)
+
+def test_iter_snapshots_filters_by_day_and_skips_bad_lines(tmp_path):
+    store = _store(tmp_path)
+    _save(store, "<html>1</html>", day=NOW - timedelta(days=2))
+    _save(store, "<html>2</html>", day=NOW)
+    with open(store.index_dir / f"{NOW.date().isoformat()}.jsonl", "a", encoding="utf-8") as fh:
+        fh.write('{"sha256": "trunc')
+
+    records = list(store.iter_snapshots(since=NOW.date() - timedelta(days=1)))
+    assert len(records) == 1
+    assert list(store.iter_snapshots(until=date(2026, 10, 15)))[0].captured_at.startswith("2026-10-15")
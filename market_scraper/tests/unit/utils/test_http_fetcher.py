@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+
+from scraper_app.utils.cookie_manager import CookieManager
+from scraper_app.utils.http_fetcher import HttpFetcher
+from scraper_app.services.services_parser import has_embedded_product_data
+
+
+PRODUCT_HTML = '<html><script type="application/ld+json">{"@type": "Product"}</script></html>'
+
+def _fetcher(handler, cookies=None) -> HttpFetcher:
+    """ Cria um ``HttpFetcher`` que responde via ``handler`` sem acessar a rede """
+    return HttpFetcher(cookie_manager=cookies or CookieManager(), transport=httpx.MockTransport(handler))
+
+def test_http_tier_returns_html_with_embedded_data():
+    """ HTML com dados embutidos dispensa o navegador """
+    seen = {}
+
+    def handler(request):
+        seen["ua"] = request.headers.get("User-Agent")
+        seen["cookie"] = request.headers.get("Cookie")
+        return httpx.Response(200, text=PRODUCT_HTML, headers={"Set-Cookie": "sid=abc", "ETag": '"v1"'})
+
+    cookies = CookieManager()
+    fetcher = _fetcher(handler, cookies)
+
+    async def scenario():
+        page = await fetcher.fetch_html("https://example.com/p", has_embedded_product_data, session_id="s1")
+        await fetcher.aclose()
+        return page
+
+    page = asyncio.run(scenario())
+    assert page.html == PRODUCT_HTML
+    assert page.etag == '"v1"'
+    assert not page.not_modified
+    assert seen["ua"]
+    assert seen["cookie"]
+    assert cookies.get_cookies("s1").get("sid") == "abc"
+
+def test_http_tier_escalates_on_block_and_missing_data():
+    """ Bloqueios e HTML sem dados do produto devolvem ``None`` """
+    responses = iter([
+        httpx.Response(403, text="forbidden"),
+        httpx.Response(200, text="<html>captcha</html>"),
+        httpx.Response(200, text="<html><div id='root'></div></html>"),
+    ])
+    fetcher = _fetcher(lambda request: next(responses))
+
+    async def scenario():
+        results = [await fetcher.fetch_html("https://example.com/p", has_embedded_product_data) for _ in range(3)]
+        await fetcher.aclose()
+        return results
+
+    assert asyncio.run(scenario()) == [None, None, None]
+
+def test_http_tier_escalates_on_network_error():
+    """ Falhas de rede não propagam exceção, apenas acionam o navegador """
+    def handler(request):
+        raise httpx.ConnectError("offline", request=request)
+
+    fetcher = _fetcher(handler)
+    assert asyncio.run(fetcher.fetch_html("https://example.com/p", has_embedded_product_data)) is None
+
+def test_http_tier_sends_validators_and_handles_not_modified():
+    """ Validadores geram requisição condicional e ``304`` dispensa o HTML """
+    seen = {}
+
+    def handler(request):
+        seen["if_none_match"] = request.headers.get("If-None-Match")
+        seen["if_modified_since"] = request.headers.get("If-Modified-Since")
+        return httpx.Response(304, headers={"ETag": '"v2"'})
+
+    fetcher = _fetcher(handler)
+    page = asyncio.run(fetcher.fetch_html(
+        "https://example.com/p",
+        has_embedded_product_data,
+        etag='"v1"',
+        last_modified="Wed, 01 Jan 2025 00:00:00 GMT",
+    ))
+
+    assert seen == {"if_none_match": '"v1"', "if_modified_since": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    assert page.not_modified
+    assert page.html is None
+    assert page.etag == '"v2"'
+    assert page.last_modified == "Wed, 01 Jan 2025 00:00:00 GMT"
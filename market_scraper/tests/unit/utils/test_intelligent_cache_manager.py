@@ -17,3 +17,45 @@ def test_adaptive_ttl_and_retrieval(patch_rate_limiter):
     cache.set(url, {"current_price": "2"}, "<html>v2</html>")
     ttl3 = fake_redis.data[f"ttl:{cache._key(url)}"]
     assert ttl3 == cache.base_ttl
+
+def test_ttl_grows_when_only_volatile_html_changes(patch_rate_limiter):
+    """ Tokens e timestamps diferentes no HTML não reiniciam o TTL adaptativo """
+    cache = IntelligentCacheManager(base_ttl=10, max_multiplier=3)
+    fake_redis = patch_rate_limiter
+    url = "https://example.com/item"
+    data = {"name": "Produto", "current_price": "R$ 10,00", "thumbnail": "https://img.com/a.jpg?trk=1"}
+
+    cache.set(url, data, "<html>token=a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6 ts=1700000000000</html>")
+    cache.set(url, dict(data, thumbnail="https://img.com/a.jpg?trk=2"), "<html>token=ffffeeeeddddccccbbbbaaaa99998888 ts=1700000005000</html>")
+    cache.set(url, dict(data, name="  produto "), "<html>token=0000111122223333444455556666777 ts=1700000009000</html>")
+
+    assert fake_redis.data[f"ttl:{cache._key(url)}"] == 30
+    assert cache.get(url)["multiplier"] == 3
+
+def test_hash_content_ignores_volatile_tokens():
+    """ O hash do HTML desconsidera tokens longos e timestamps """
+    cache = IntelligentCacheManager.__new__(IntelligentCacheManager)
+    first = cache._hash_content('<div data-id="a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6" data-ts="1700000000">R$ 10</div>')
+    second = cache._hash_content('<div data-id="99998888777766665555444433332222" data-ts="1700009999">R$ 10</div>')
+    changed = cache._hash_content('<div data-id="99998888777766665555444433332222" data-ts="1700009999">R$ 12</div>')
+
+    assert first == second
+    assert first != changed
+
+def test_ttl_grows_across_expired_entries(patch_rate_limiter):
+    """ O multiplicador persiste mesmo quando a entrada expira entre dois scrapings """
+    cache = IntelligentCacheManager(base_ttl=10, max_multiplier=3)
+    fake_redis = patch_rate_limiter
+    url = "https://example.com/item"
+
+    cache.set(url, {"current_price": "1"}, "<html>v1</html>")
+    fake_redis.delete(cache._key(url))
+    assert cache.get(url) is None
+
+    cache.set(url, {"current_price": "1"}, "<html>v1</html>")
+    assert fake_redis.data[f"ttl:{cache._key(url)}"] == 20
+    assert fake_redis.data[f"ttl:{cache._meta_key(url)}"] == 60
+
+    fake_redis.delete(cache._key(url))
+    cache.set(url, {"current_price": "2"}, "<html>v2</html>")
+    assert fake_redis.data[f"ttl:{cache._key(url)}"] == 10
@@ -0,0 +1,93 @@
+import random
+
+from scraper_app.utils.json_index import MISSING, JsonIndex, JsonLookup, PathCache, resolve
+
+
+GROUPS = [
+    ("title", "name"),
+    ("price", "priceDisplay", "amount"),
+    ("seller", "sellerName", "nickname"),
+    ("thumbnail", "picture", "image", "url"),
+]
+KEYS = [key for group in GROUPS for key in group]
+
+def _deep_search(data, keys):
+    """ Busca em profundidade por grupo, usada como referência """
+    stack = [data]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            for k, v in current.items():
+                if k in keys:
+                    return v
+                stack.append(v)
+        elif isinstance(current, list):
+            stack.extend(current)
+    return None
+
+def _random_tree(rng, depth=0):
+    if depth > 4 or rng.random() < 0.2:
+        return rng.choice([1, "x", None, 2.5])
+    if rng.random() < 0.3:
+        return [_random_tree(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    names = KEYS + ["a", "b", "c", "d"]
+    return {rng.choice(names): _random_tree(rng, depth + 1) for _ in range(rng.randint(0, 5))}
+
+def test_index_matches_deep_search_on_random_trees():
+    """ Uma passada encontra o mesmo valor que uma busca completa por grupo """
+    rng = random.Random(7)
+    for _ in range(300):
+        tree = _random_tree(rng)
+        index = JsonIndex(tree, KEYS)
+        for group in GROUPS:
+            assert index.find(group) == _deep_search(tree, group)
+
+def test_path_points_to_the_first_occurrence():
+    """ O caminho leva ao mesmo valor devolvido pelo índice """
+    data = {"components": [{"id": 1}, {"seller": {"nickname": "LOJA"}}], "price": 10}
+    index = JsonIndex(data, KEYS)
+
+    assert index.path(("seller", "sellerName", "nickname")) == ("components", 1, "seller")
+    assert resolve(data, ("components", 1, "seller")) == {"nickname": "LOJA"}
+    assert resolve(data, ("components", 5, "seller")) is MISSING
+    assert index.path(("title", "name")) is None
+
+def test_stable_path_skips_the_index_until_it_breaks():
+    """ Após se repetir, o caminho é lido direto; se sumir, o índice volta a ser usado """
+    cache = PathCache(stable_after=2)
+    group = ("price", "priceDisplay", "amount")
+    page = lambda price: {"header": {"title": "Produto"}, "offer": {"price": price}}
+
+    for price in (10, 11):
+        assert JsonLookup(page(price), "state:ld", KEYS, cache).find(group) == price
+    assert cache.stable_path("state:ld", group) == (True, ("offer", "price"))
+
+    lookup = JsonLookup(page(12), "state:ld", KEYS, cache)
+    assert lookup.find(group) == 12
+    assert lookup._index is None
+
+    moved = JsonLookup({"offers": [{"price": 13}]}, "state:ld", KEYS, cache)
+    assert moved.find(group) == 13
+    assert cache.stable_path("state:ld", group) == (False, None)
+
+def test_absent_group_is_never_learned():
+    """ Páginas sem o grupo (anúncio pausado) não fazem o layout desistir dele """
+    cache = PathCache(stable_after=1)
+    group = ("price", "priceDisplay", "amount")
+
+    for _ in range(3):
+        assert JsonLookup({"header": {"title": "Pausado"}}, "state:state", KEYS, cache).find(group) is None
+    assert cache.stable_path("state:state", group) == (False, None)
+    assert JsonLookup({"offer": {"price": 10}}, "state:state", KEYS, cache).find(group) == 10
+
+def test_absent_group_discards_stable_path():
+    """ Um grupo ausente descarta o caminho aprendido, que precisa se repetir de novo """
+    cache = PathCache(stable_after=2)
+    group = ("price", "priceDisplay", "amount")
+
+    for price in (10, 11):
+        JsonLookup({"offer": {"price": price}}, "state:state", KEYS, cache).find(group)
+    assert cache.stable_path("state:state", group) == (True, ("offer", "price"))
+
+    assert JsonLookup({"offer": {}}, "state:state", KEYS, cache).find(group) is None
+    assert cache.stable_path("state:state", group) == (False, None)
@@ -0,0 +1,28 @@
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from scraper_app.utils.metrics_buffer import collect, record_metric, register_metrics, replay
+
+
+def test_record_metric_updates_immediately_outside_collect():
+    registry = CollectorRegistry()
+    runs = Counter("buffer_runs_total", "Execuções", ["outcome"], registry=registry)
+
+    record_metric(runs, "inc", outcome="win")
+
+    assert registry.get_sample_value("buffer_runs_total", {"outcome": "win"}) == 1
+
+def test_collected_events_are_applied_only_on_replay():
+    """ Dentro de ``collect`` os eventos são guardados e aplicados depois pelo nome """
+    registry = CollectorRegistry()
+    total = Counter("buffer_total", "Total", registry=registry)
+    latency = Histogram("buffer_latency_seconds", "Latência", ["strategy"], registry=registry)
+    register_metrics(total, latency)
+
+    with collect() as events:
+        record_metric(total, "inc", 3)
+        record_metric(latency, "observe", 0.25, strategy="json_ld")
+    assert registry.get_sample_value("buffer_total") == 0
+
+    replay(events)
+    assert registry.get_sample_value("buffer_total") == 3
+    assert registry.get_sample_value("buffer_latency_seconds_sum", {"strategy": "json_ld"}) == 0.25
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from scraper_app.utils.parse_executor import ParseExecutor
+from scraper_app.services.services_parser import CaptchaDetectedError
+
+
+def _current_thread() -> str:
+    return threading.current_thread().name
+
+def _current_pid() -> int:
+    return os.getpid()
+
+_PRODUCT_HTML = (
+    b'<html><head><meta property="og:image" content="https://example.com/img.jpg" /></head><body>'
+    b'<script>window.__PRELOADED_STATE__ = {"title": "Produto", "price": 10.0, "seller": {"nickname": "Loja"}};</script>'
+    b'</body></html>'
+)
+
+def _captcha(html: bytes) -> None:
+    raise CaptchaDetectedError(html.decode())
+
+def test_inline_runs_on_the_event_loop_thread():
+    """ No modo ``inline`` o parse roda na própria thread do loop """
+    executor = ParseExecutor(mode="inline", workers=1, max_queue=1)
+    assert asyncio.run(executor.run(_current_thread)) == threading.current_thread().name
+
+def test_thread_mode_releases_the_event_loop():
+    """ No modo ``thread`` o parse roda em uma thread do pool """
+    executor = ParseExecutor(mode="thread", workers=2, max_queue=4)
+    try:
+        assert asyncio.run(executor.run(_current_thread)).startswith("parse")
+    finally:
+        executor.shutdown()
+
+def test_process_mode_uses_another_process():
+    """ No modo ``process`` o parse roda em outro processo """
+    executor = ParseExecutor(mode="process", workers=1, max_queue=2)
+    try:
+        assert asyncio.run(executor.run(_current_pid)) != os.getpid()
+    finally:
+        executor.shutdown()
+
+def test_exceptions_reach_the_caller():
+    """ Exceções do parse (ex.: CAPTCHA) são relançadas para o scraper """
+    executor = ParseExecutor(mode="thread", workers=1, max_queue=1)
+    try:
+        with pytest.raises(CaptchaDetectedError):
+            asyncio.run(executor.run(_captcha, b"captcha"))
+    finally:
+        executor.shutdown()
+
+def test_queue_depth_is_bounded():
+    """ Acima de ``max_queue`` parses pendentes, os demais aguardam uma vaga """
+    executor = ParseExecutor(mode="thread", workers=4, max_queue=2)
+    release = threading.Event()
+    running = []
+    lock = threading.Lock()
+
+    def job():
+        with lock:
+            running.append(1)
+            peak = len(running)
+        release.wait(1)
+        with lock:
+            running.pop()
+        return peak
+
+    async def main():
+        tasks = [asyncio.create_task(executor.run(job)) for _ in range(5)]
+        await asyncio.sleep(0.1)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    try:
+        assert max(asyncio.run(main())) == 2
+    finally:
+        executor.shutdown()
+
+def test_invalid_mode_is_rejected():
+    """ Modos desconhecidos falham na criação do executor """
+    with pytest.raises(ValueError):
+        ParseExecutor(mode="gpu")
+
+def test_process_mode_reports_parser_metrics_in_the_parent():
+    """ Métricas do parse registradas no worker chegam ao ``/metrics`` do servidor """
+    from prometheus_client import REGISTRY
+    from scraper_app.services.services_parser import parse_page
+
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    before = (sample("parser_success_total"), sample("parser_fast_path_total", outcome="hit"))
+    executor = ParseExecutor(mode="process", workers=1, max_queue=2)
+    try:
+        result = asyncio.run(executor.run(parse_page, _PRODUCT_HTML, "https://produto.mercadolivre.com.br/MLB-1", False))
+    finally:
+        executor.shutdown()
+
+    assert result["seller"] == "Loja"
+    assert sample("parser_success_total") == before[0] + 1
+    assert sample("parser_fast_path_total", outcome="hit") == before[1] + 1
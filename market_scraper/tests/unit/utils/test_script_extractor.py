@@ -0,0 +1,64 @@
+import math
+
+from scraper_app.utils.script_extractor import (
+    extract_meta,
+    first_element_text,
+    has_element,
+    iter_scripts,
+    loads,
+    to_text,
+    visible_text,
+)
+
+
+def test_iter_scripts_returns_attributes_and_raw_body():
+    """ Cada ``<script>`` vem com atributos normalizados e conteúdo sem alterações """
+    html = """
+    <SCRIPT type='application/ld+json'>{"@type": "Product"}</SCRIPT>
+    <script id="__NEXT_DATA__" type="application/json">{"props": {}}</script>
+    <script>window.__PRELOADED_STATE__ = {"a": "<b>"};</script>
+    """
+    blocks = list(iter_scripts(html))
+
+    assert [attrs.get("type") for attrs, _ in blocks] == ["application/ld+json", "application/json", None]
+    assert blocks[1][0]["id"] == "__NEXT_DATA__"
+    assert blocks[2][1] == 'window.__PRELOADED_STATE__ = {"a": "<b>"};'
+
+def test_extract_meta_accepts_any_attribute_order():
+    """ ``content`` antes de ``property`` e entidades HTML são tratados """
+    html = '<meta content="https://img/a.jpg?x=1&amp;y=2" property="og:image"><meta property="og:type" content="product">'
+    meta = extract_meta(html)
+
+    assert meta["og:image"] == "https://img/a.jpg?x=1&y=2"
+    assert meta["og:type"] == "product"
+
+def test_has_element_matches_whole_class_names():
+    """ A classe precisa aparecer inteira na lista de classes da tag """
+    html = '<h1 class="ui-pdp-title extra">Produto</h1><div class="ui-search-layout-x"></div>'
+
+    assert has_element(html, "h1", "ui-pdp-title")
+    assert not has_element(html, r"\w+", "ui-search-layout")
+
+def test_first_element_text_strips_inner_tags():
+    assert first_element_text("<h1 class='t'>Produto <b>X</b> &amp; Cia</h1>", "h1") == "Produto X & Cia"
+
+def test_loads_falls_back_for_values_outside_fast_parser():
+    """ ``NaN`` não é aceito pelo ``orjson`` mas continua decodificado """
+    assert math.isnan(loads('{"price": NaN}')["price"])
+    assert loads(b'{"price": 10}') == {"price": 10}
+
+def test_to_text_decodes_bytes():
+    assert to_text("Frete grátis".encode("utf-8")) == "Frete grátis"
+
+def test_visible_text_matches_beautifulsoup_get_text():
+    """ Scripts, estilos e comentários ficam de fora e as entidades são decodificadas """
+    from bs4 import BeautifulSoup
+
+    html = """
+    <html><head><title>Produto</title><style>p { color: red }</style></head>
+    <body><!-- oculto --><p>Frete gr&aacute;tis</p><span>R$</span><span>10</span>
+    <script>var promo = "Frete grátis acima de R$ 79";</script></body></html>
+    """
+
+    assert visible_text(html) == BeautifulSoup(html, "html.parser").get_text(separator=" ", strip=True)
+    assert visible_text(html) == "Produto Frete grátis R$ 10"
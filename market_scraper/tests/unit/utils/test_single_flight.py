@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+from scraper_app.utils.single_flight import SingleFlight
+
+
+class LeaseRedis:
+    """ Redis falso com suporte a ``SET NX`` e ao script que libera o lease """
+    def __init__(self):
+        self.data = {}
+
+    def script_load(self, source):
+        assert "DEL" in source
+        return "sha-release"
+
+    def evalsha(self, sha, num_keys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_concurrent_calls_share_one_execution():
+    """ Chamadas simultâneas com a mesma chave executam ``fn`` uma única vez """
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"status": "success", "details": {"name": "Produto"}}
+
+    async def scenario():
+        flight = SingleFlight(redis=LeaseRedis(), poll_interval=0.001)
+        return await asyncio.gather(*(flight.do("MLB-1", fetch) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(r["details"]["name"] == "Produto" for r in results)
+
+def test_leader_error_reaches_local_followers_and_releases_lease():
+    """ Falha do líder é repassada aos seguidores e o lease é liberado """
+    redis = LeaseRedis()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("bloqueado")
+
+    async def scenario():
+        flight = SingleFlight(redis=redis, poll_interval=0.001)
+        return await asyncio.gather(flight.do("MLB-2", fetch), flight.do("MLB-2", fetch), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert "singleflight:lease:MLB-2" not in redis.data
+
+def test_follower_uses_result_published_by_other_replica():
+    """ Com o lease de outra réplica ativo, o seguidor aguarda o resultado publicado """
+    redis = LeaseRedis()
+    redis.set("singleflight:lease:MLB-3", "outra-replica")
+
+    async def fetch():
+        raise AssertionError("seguidor não deve executar o scraping")
+
+    async def publish_later():
+        await asyncio.sleep(0.01)
+        redis.set("singleflight:result:MLB-3", json.dumps({"status": "success", "details": {"name": "Remoto"}}))
+
+    async def scenario():
+        flight = SingleFlight(redis=redis, poll_interval=0.001)
+        result, _ = await asyncio.gather(flight.do("MLB-3", fetch), publish_later())
+        return result
+
+    assert asyncio.run(scenario())["details"]["name"] == "Remoto"
+
+def test_follower_runs_itself_when_remote_lease_is_released_without_result():
+    """ Lease liberado sem resultado faz o seguidor executar o scraping """
+    redis = LeaseRedis()
+    redis.set("singleflight:lease:MLB-4", "outra-replica")
+
+    async def fetch():
+        return {"status": "success", "details": {"name": "Local"}}
+
+    async def release_later():
+        await asyncio.sleep(0.01)
+        redis.delete("singleflight:lease:MLB-4")
+
+    async def scenario():
+        flight = SingleFlight(redis=redis, poll_interval=0.001)
+        result, _ = await asyncio.gather(flight.do("MLB-4", fetch), release_later())
+        return result
+
+    assert asyncio.run(scenario())["details"]["name"] == "Local"
+
+def test_leader_does_not_release_lease_taken_by_other_replica():
+    """ Lease expirado e readquirido por outra réplica não é removido pelo líder antigo """
+    redis = LeaseRedis()
+
+    async def fetch():
+        #O lease expira durante a coleta e outra réplica o adquire
+        redis.data["singleflight:lease:MLB-5"] = "outra-replica"
+        return {"status": "success", "details": {"name": "Local"}}
+
+    async def scenario():
+        flight = SingleFlight(redis=redis, poll_interval=0.001)
+        return await flight.do("MLB-5", fetch)
+
+    assert asyncio.run(scenario())["details"]["name"] == "Local"
+    assert redis.data["singleflight:lease:MLB-5"] == "outra-replica"
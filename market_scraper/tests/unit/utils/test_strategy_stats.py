@@ -0,0 +1,96 @@
+import pytest
+
+from scraper_app.utils.strategy_stats import StrategyStats
+
+
+class StatsRedis:
+    """ Redis falso com suporte mínimo a pipelines de hashes """
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+        self.fail = False
+
+    def pipeline(self):
+        return StatsPipeline(self)
+
+class StatsPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def hincrby(self, key, field, amount):
+        self.ops.append(("hincrby", key, field, amount))
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key, ttl))
+
+    def hgetall(self, key):
+        self.ops.append(("hgetall", key))
+
+    def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("redis indisponível")
+        results = []
+        for op, key, *args in self.ops:
+            bucket = self.redis.hashes.setdefault(key, {})
+            if op == "hincrby":
+                field, amount = args
+                bucket[field] = str(int(bucket.get(field, 0)) + amount)
+                results.append(int(bucket[field]))
+            elif op == "expire":
+                self.redis.ttls[key] = args[0]
+                results.append(True)
+            else:
+                results.append(dict(bucket))
+        return results
+
+
+def test_order_prefers_most_wins_and_keeps_default_on_ties():
+    """ Sem vitórias a ordem padrão é mantida; depois a vencedora vem primeiro """
+    stats = StrategyStats(redis=StatsRedis(), flush_interval=3600)
+    default = ("preloaded_state", "json_ld", "p_page")
+
+    assert stats.order("host|item:ld", default) == list(default)
+    stats.record_win("host|item:ld", "p_page")
+    assert stats.order("host|item:ld", default) == ["p_page", "preloaded_state", "json_ld"]
+    assert stats.order("outro|item:ld", default) == list(default)
+
+def test_flush_sends_increments_and_reads_other_replicas():
+    """ A sincronização soma os incrementos no Redis e adota os totais das réplicas """
+    redis = StatsRedis()
+    redis.hashes["parser:strategy_wins:host|item:ld"] = {"json_ld": "5"}
+    stats = StrategyStats(redis=redis, flush_interval=3600, ttl=60)
+
+    stats.record_win("host|item:ld", "preloaded_state")
+    stats.flush()
+
+    assert redis.hashes["parser:strategy_wins:host|item:ld"] == {"json_ld": "5", "preloaded_state": "1"}
+    assert redis.ttls["parser:strategy_wins:host|item:ld"] == 60
+    assert stats.wins("host|item:ld") == {"json_ld": 5, "preloaded_state": 1}
+
+    #Uma nova sincronização sem vitórias não reenvia incrementos
+    stats.flush()
+    assert redis.hashes["parser:strategy_wins:host|item:ld"]["preloaded_state"] == "1"
+
+def test_record_win_flushes_when_interval_expires():
+    """ A sincronização acontece na própria contagem quando o intervalo expira """
+    redis = StatsRedis()
+    stats = StrategyStats(redis=redis, flush_interval=0)
+
+    stats.record_win("host|p:next", "p_page")
+
+    assert redis.hashes["parser:strategy_wins:host|p:next"] == {"p_page": "1"}
+
+def test_failed_flush_keeps_pending_increments():
+    """ Com o Redis indisponível os incrementos aguardam a próxima sincronização """
+    redis = StatsRedis()
+    stats = StrategyStats(redis=redis, flush_interval=3600)
+    stats.record_win("host|item:state", "preloaded_state")
+
+    redis.fail = True
+    stats.flush()
+    assert stats.wins("host|item:state") == {"preloaded_state": 1}
+
+    redis.fail = False
+    stats.flush()
+    assert redis.hashes["parser:strategy_wins:host|item:state"] == {"preloaded_state": "1"}
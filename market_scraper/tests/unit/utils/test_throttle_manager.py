@@ -105,3 +105,44 @@ def test_wait_raises_when_rate_limiter_blocks(monkeypatch):
 
     assert exc.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
     fake_cb.record_failure.assert_called_once()
+
+def test_wait_async_does_not_block_event_loop(monkeypatch):
+    """ ``wait_async`` aguarda com ``asyncio.sleep`` e reserva vagas em fila """
+    import asyncio
+
+    slept = []
+
+    async def fake_async_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(time, "sleep", lambda s: pytest.fail("time.sleep bloqueou o event loop"))
+    monkeypatch.setattr("scraper_app.utils.throttle_manager.asyncio.sleep", fake_async_sleep)
+    tm = ThrottleManager(rate=1.0, capacity=1, circuit_breaker=Mock())
+
+    async def scenario():
+        await asyncio.gather(*(tm.wait_async(circuit_key="t") for _ in range(3)))
+
+    asyncio.run(scenario())
+
+    #Primeiro token imediato, os demais aguardam 1s e 2s pela recarga
+    assert [round(s) for s in sorted(slept)] == [0, 1, 2]
+
+def test_backoff_async_reduces_rate(monkeypatch):
+    """ ``backoff_async`` aplica a mesma penalidade de ``backoff`` sem bloquear """
+    import asyncio
+
+    slept = []
+
+    async def fake_async_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr("scraper_app.utils.throttle_manager.asyncio.sleep", fake_async_sleep)
+    monkeypatch.setattr("random.uniform", lambda a, b: 0.5)
+    fake_cb = Mock()
+    tm = ThrottleManager(rate=2.0, capacity=2, circuit_breaker=fake_cb)
+
+    asyncio.run(tm.backoff_async(attempt=2, circuit_key="t"))
+
+    assert tm.rate < 2.0
+    assert slept == [2.0]
+    fake_cb.record_failure.assert_called_once()
@@ -0,0 +1,88 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+from alert_app.utils.worker_loop import WorkerLoop
+
+
+def test_submissions_share_the_same_loop_and_thread():
+    """ Todas as coroutines rodam no mesmo loop, fora da thread chamadora """
+    loop = WorkerLoop()
+
+    async def current():
+        return asyncio.get_running_loop(), threading.current_thread()
+
+    try:
+        first = loop.submit(current())
+        second = loop.submit(current())
+    finally:
+        loop.stop()
+
+    assert first == second
+    assert first[1] is not threading.current_thread()
+
+def test_async_resources_survive_between_submissions():
+    """ Objetos presos ao loop (ex.: clientes assíncronos) são reaproveitados """
+    loop = WorkerLoop()
+    lock = loop.submit(_make_lock())
+
+    async def use_lock():
+        async with lock:
+            return True
+
+    try:
+        assert loop.submit(use_lock())
+        assert loop.submit(use_lock())
+    finally:
+        loop.stop()
+
+async def _make_lock():
+    return asyncio.Lock()
+
+def test_exceptions_reach_the_caller():
+    """ Exceções da coroutine são relançadas no código síncrono """
+    loop = WorkerLoop()
+
+    async def boom():
+        raise ValueError("falhou")
+
+    try:
+        with pytest.raises(ValueError):
+            loop.submit(boom())
+        #O loop segue ativo após a falha
+        assert loop.submit(asyncio.sleep(0, result=1)) == 1
+    finally:
+        loop.stop()
+
+def test_timeout_cancels_the_coroutine():
+    """ Ao expirar o ``timeout`` a coroutine é cancelada """
+    loop = WorkerLoop()
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    try:
+        with pytest.raises(concurrent.futures.TimeoutError):
+            loop.submit(slow(), timeout=0.05)
+        assert cancelled.wait(1)
+    finally:
+        loop.stop()
+
+def test_stop_allows_restart():
+    """ Após ``stop`` uma nova submissão inicia outro loop """
+    loop = WorkerLoop()
+    loop.start()
+    loop.stop()
+    assert not loop.running
+
+    try:
+        assert loop.submit(asyncio.sleep(0, result="ok")) == "ok"
+    finally:
+        loop.stop()
@@ -3,8 +3,10 @@ from __future__ import annotations
 """ Gerencia o agendamento adaptativo de novas coletas
 
 Este módulo calcula quando cada produto deve ser rechecado levando em conta
-histórico de falhas e dinâmica de preços. Os horários são armazenados em Redis
-e utilizados pelas tasks para priorizar as coletas.
+histórico de falhas e dinâmica de preços. Os horários são gravados no índice
+de vencimentos (``DueIndex``, um sorted set do Redis com score igual ao epoch
+da próxima coleta), de onde as tasks periódicas reivindicam os produtos
+vencidos em ordem de vencimento.
 """
 
 import random
@@ -13,6 +15,7 @@ from datetime import datetime, timezone, timedelta
 from typing import List, Optional, Any
 
 import utils.redis_client as _rc
+from utils.due_index import DueIndex, MONITORED_DUE_KEY
 from alert_app.metrics import RECHECK_SCHEDULED_TOTAL
 
 
@@ -25,32 +28,31 @@ class AdaptiveRecheckManager:
             min_interval: int = 120,
             max_interval: int = 3600,
             peak_hours: tuple[int, int] = (18, 22),
-            jitter: float = 0.1
+            jitter: float = 0.1,
+            due_key: str = MONITORED_DUE_KEY
     ) -> None:
         self.redis = _rc.get_redis_client()
+        self.due_index = DueIndex(due_key, redis=self.redis)
         self.base_interval = float(base_interval)
         self.min_interval = float(min_interval)
         self.max_interval = float(max_interval)
         self.peak_start, self.peak_end = peak_hours
         self.jitter = jitter
 
-    def _next_key(self, identifier: str) -> str:
-        """ Chave Redis onde armazena o próximo horário de coleta """
-        return f"recheck:next:{identifier}"
-
     def _fail_key(self, identifier: str) -> str:
         """ Chave Redis onde registra o número de falhas consecutivas """
         return f"recheck:fail:{identifier}"
 
     def should_recheck(self, identifier: str) -> bool:
         """ Indica se já passou do horário agendado para nova coleta """
-        raw = self.redis.get(self._next_key(identifier))
-        if not raw:
+        due = self.due_index.score(identifier)
+        if due is None:
             return True
-        if isinstance(raw, (bytes, bytearray)):
-            raw = raw.decode("utf-8")
-        next_time = datetime.fromisoformat(raw)
-        return next_time <= datetime.now(timezone.utc)
+        return due <= datetime.now(timezone.utc).timestamp()
+
+    def claim_due(self, limit: int) -> List[str]:
+        """ Reivindica os próximos ``limit`` produtos vencidos, em ordem de vencimento """
+        return self.due_index.claim(limit)
 
     def record_result(self, identifier: str, success: bool) -> None:
         """ Atualiza o contador de falhas para o identificador informado """
@@ -116,7 +118,7 @@ class AdaptiveRecheckManager:
 
         interval = max(self.min_interval, min(interval, self.max_interval))
         next_time = datetime.now(timezone.utc) + timedelta(seconds=interval)
-        #Persiste o horário calculado no Redis
-        self.redis.set(self._next_key(identifier), next_time.isoformat())
+        #Persiste o horário calculado no índice de vencimentos
+        self.due_index.schedule(identifier, next_time.timestamp())
         RECHECK_SCHEDULED_TOTAL.inc()
         return next_time
@@ -1,13 +1,42 @@
-""" Exporta registros de auditoria para o Prometheus """
+""" Exporta registros de auditoria para o Prometheus
 
+Os contadores por ``stage`` ficam em memória e em um índice persistente
+(``AUDIT_DIR/.exporter_index.json``) com a posição já lida de cada
+segmento. A cada ``/metrica`` apenas o que foi gravado desde a passada
+anterior é lido: o final dos segmentos ativos (``.jsonl``), os segmentos
+recém-compactados (``.jsonl.gz``, a partir da posição já lida do ativo
+correspondente) e arquivos JSON antigos ainda não contados. Dias
+anteriores sem segmento ativo são marcados como concluídos e não são mais
+listados.
+
+Se o índice se perder ou divergir dos arquivos, reconstrua-o com::
+
+    python -m scraper_app.utils.audit_exporter --rebuild
+"""
+
+import argparse
+import fcntl
+import gzip
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import structlog
 from fastapi import FastAPI, Response
 from prometheus_client import CollectorRegistry, Counter, generate_latest, CONTENT_TYPE_LATEST
-import os
-import json
 
 #Diretório base onde os arquivos de auditoria são gravados
-from scraper_app.utils.audit_logger import AUDIT_DIR
+from scraper_app.utils.audit_logger import AUDIT_DIR, SEGMENT_SUFFIX, SEALED_SUFFIX
+
 
+logger = structlog.get_logger("audit_exporter")
+
+#Nome do índice dentro de AUDIT_DIR; não é um diretório de data, então não é lido como auditoria
+INDEX_FILENAME = ".exporter_index.json"
+INDEX_VERSION = 1
 
 app = FastAPI(
     title="Audit Exporter",
@@ -15,9 +44,210 @@ app = FastAPI(
     version="1.0"
 )
 
+class AuditIndex:
+    """ Contadores e posições de leitura persistidos dos arquivos de auditoria
+
+    ``files`` guarda, por ``dia/segmento``, quantos bytes (descompactados)
+    já foram contados e se o segmento está fechado. Vários processos podem
+    compartilhar o índice: a atualização é feita sob ``flock`` e o estado é
+    relido do disco apenas quando outro processo o alterou.
+    """
+
+    def __init__(self, base_dir: str, path: Optional[str] = None) -> None:
+        self.base_dir = base_dir
+        self.path = path or os.path.join(base_dir, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self.state: Dict[str, Any] = self._empty()
+        #(mtime, tamanho) do índice na última leitura ou gravação deste processo
+        self._seen: Optional[tuple] = None
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {"version": INDEX_VERSION, "records": {}, "errors": {}, "done_days": [], "files": {}}
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        os.makedirs(self.base_dir, exist_ok=True)
+        with open(self.path + ".lock", "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _stamp(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self) -> None:
+        """ Relê o índice se ele mudou desde a última vez que este processo o viu """
+        stamp = self._stamp()
+        if stamp == self._seen and self._seen is not None:
+            return
+        state = self._empty()
+        if stamp is not None:
+            try:
+                with open(self.path, encoding="utf-8") as fh:
+                    loaded = json.load(fh)
+                if loaded.get("version") == INDEX_VERSION:
+                    state = loaded
+                else:
+                    logger.warning("audit_index_version_mismatch", path=self.path)
+            except (OSError, ValueError) as exc:
+                #Índice corrompido: recomeça do zero, como em ``rebuild``
+                logger.error("audit_index_unreadable", path=self.path, error=str(exc))
+        self.state = state
+        self._seen = stamp
+
+    def _save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.state, fh, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._seen = self._stamp()
+
+    def refresh(self) -> int:
+        """ Conta os registros gravados desde a última passada e retorna quantos eram novos """
+        with self._lock, self._file_lock():
+            self._load()
+            new, changed = self._scan()
+            if changed:
+                self._save()
+            return new
+
+    def rebuild(self) -> int:
+        """ Descarta o índice e recontabiliza todos os arquivos de auditoria """
+        with self._lock, self._file_lock():
+            self.state = self._empty()
+            new, _ = self._scan()
+            self._save()
+            return new
+
+    def _count(self, bucket: str, stage: str, amount: int = 1) -> None:
+        counters = self.state[bucket]
+        counters[stage] = counters.get(stage, 0) + amount
+
+    def _count_lines(self, data: bytes) -> int:
+        lines = 0
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._count("records", json.loads(line).get("stage", "unknown"))
+                lines += 1
+            except Exception:
+                self._count("errors", "unknown")
+        return lines
+
+    def _scan(self) -> tuple:
+        """ Lê o que há de novo nos dias ainda não concluídos; retorna ``(novos, índice alterado)`` """
+        if not os.path.isdir(self.base_dir):
+            return 0, False
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        done = set(self.state["done_days"])
+        files: Dict[str, Dict[str, Any]] = self.state["files"]
+        new, changed = 0, False
+
+        for day in sorted(os.listdir(self.base_dir)):
+            day_path = os.path.join(self.base_dir, day)
+            if day in done or not os.path.isdir(day_path):
+                continue
+            names = set(os.listdir(day_path))
+            active = False
+            for name in sorted(names):
+                if name.endswith(SEALED_SUFFIX):
+                    kind, segment = "sealed", name[:-len(SEALED_SUFFIX)]
+                elif name.endswith(SEGMENT_SUFFIX):
+                    #Durante a compactação os dois arquivos coexistem; vale o fechado
+                    if name[:-len(SEGMENT_SUFFIX)] + SEALED_SUFFIX in names:
+                        continue
+                    kind, segment = "active", name[:-len(SEGMENT_SUFFIX)]
+                    active = True
+                elif name.endswith(".json"):
+                    kind, segment = "legacy", name
+                else:
+                    continue
+                key = f"{day}/{segment}"
+                entry = files.get(key) or {"offset": 0, "sealed": False}
+                if entry["sealed"]:
+                    continue
+                counted, updated = self._read(os.path.join(day_path, name), kind, entry)
+                new += counted
+                if updated or key not in files:
+                    files[key] = updated or entry
+                    changed = True
+
+            #Dias anteriores sem segmento ativo não recebem mais registros
+            if day < today and not active:
+                done.add(day)
+                for key in [key for key in files if key.startswith(f"{day}/")]:
+                    del files[key]
+                changed = True
+
+        #Dias removidos pela retenção saem do índice; os contadores continuam
+        existing = sorted(day for day in done if os.path.isdir(os.path.join(self.base_dir, day)))
+        if existing != self.state["done_days"]:
+            self.state["done_days"] = existing
+            changed = True
+        return new, changed
+
+    def _read(self, path: str, kind: str, entry: Dict[str, Any]) -> tuple:
+        """ Conta o trecho novo de um arquivo; retorna ``(registros, entrada atualizada ou None)`` """
+        offset = entry["offset"]
+        try:
+            if kind == "legacy":
+                with open(path, "r", encoding="utf-8") as fh:
+                    try:
+                        self._count("records", json.load(fh).get("stage", "unknown"))
+                        counted = 1
+                    except Exception:
+                        self._count("errors", "unknown")
+                        counted = 0
+                return counted, {"offset": 0, "sealed": True}
+
+            if kind == "sealed":
+                #O conteúdo descompactado é o mesmo do segmento ativo: pula o que já foi contado
+                with gzip.open(path, "rb") as fh:
+                    fh.seek(offset)
+                    data = fh.read()
+                return self._count_lines(data), {"offset": offset + len(data), "sealed": True}
+
+            if os.path.getsize(path) <= offset:
+                return 0, None
+            with open(path, "rb") as fh:
+                fh.seek(offset)
+                data = fh.read()
+            #Linha final incompleta fica para a próxima passada
+            complete = data[:data.rfind(b"\n") + 1]
+            if not complete:
+                return 0, None
+            return self._count_lines(complete), {"offset": offset + len(complete), "sealed": False}
+        except FileNotFoundError:
+            #Segmento compactado ou removido entre a listagem e a leitura
+            return 0, None
+        except (OSError, EOFError) as exc:
+            self._count("errors", "unknown")
+            logger.error("audit_segment_unreadable", path=path, error=str(exc))
+            return 0, {"offset": offset, "sealed": True}
+
+#Índices por diretório de auditoria, mantidos em memória entre requisições
+_indexes: Dict[str, AuditIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_index(base_dir: Optional[str] = None) -> AuditIndex:
+    """ Índice do diretório de auditoria (``AUDIT_DIR`` por padrão) """
+    base_dir = base_dir or AUDIT_DIR
+    with _indexes_lock:
+        if base_dir not in _indexes:
+            _indexes[base_dir] = AuditIndex(base_dir)
+        return _indexes[base_dir]
+
 @app.get("/metrica")
 def metrics() -> Response:
-    """ Varre todos os arquivos JSON de AUDIT_DIR/YYYY-MM-DD/*.json """
+    """ Contadores por ``stage``, atualizados apenas com os registros novos """
     registry = CollectorRegistry(auto_describe=True)
 
     #Contador de registros de auditoria por stage
@@ -36,28 +266,32 @@ def metrics() -> Response:
         registry=registry
     )
 
-    #Percorre recursivamente as pastas de datas
-    if not os.path.isdir(AUDIT_DIR):
-        #Diretório de auditoria ainda não existente
-        data = generate_latest(registry)
-        return Response(content=data, media_type=CONTENT_TYPE_LATEST)
-
-    for date_dir in os.listdir(AUDIT_DIR):
-        date_path = os.path.join(AUDIT_DIR, date_dir)
-        if not os.path.isdir(date_path):
-            continue
-        for filename in os.listdir(date_path):
-            if not filename.endswith(".json"):
-                continue
-            filepath = os.path.join(date_path, filename)
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    record = json.load(f)
-                stage = record.get("stage", "unknown")
-                records_counter.labels(stage=stage).inc()
-            except Exception:
-                errors_counter.labels(stage="unknown").inc()
-                continue
+    if os.path.isdir(AUDIT_DIR):
+        index = get_index()
+        index.refresh()
+        for stage, count in index.state["records"].items():
+            records_counter.labels(stage=stage).inc(count)
+        for stage, count in index.state["errors"].items():
+            errors_counter.labels(stage=stage).inc(count)
 
     data = generate_latest(registry)
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Atualiza ou reconstrói o índice e imprime os contadores """
+    cli = argparse.ArgumentParser(description="Índice incremental dos registros de auditoria")
+    cli.add_argument("--dir", default=AUDIT_DIR, help="diretório de auditoria")
+    cli.add_argument("--rebuild", action="store_true", help="descarta o índice e relê todos os arquivos")
+    args = cli.parse_args(argv)
+
+    index = get_index(args.dir)
+    counted = index.rebuild() if args.rebuild else index.refresh()
+    print(json.dumps({
+        "counted": counted,
+        "records": index.state["records"],
+        "errors": index.state["errors"],
+    }, ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,15 +1,43 @@
-""" Registro detalhado das etapas de scraping para auditoria """
+""" Registro detalhado das etapas de scraping para auditoria
 
-import os
+``audit_scrape`` roda no caminho quente do scraping (até cinco vezes por
+página), então apenas monta o registro e o coloca em uma fila em memória.
+Uma thread do processo grava a fila em lotes, como JSON Lines, no segmento
+ativo ``AUDIT_DIR/AAAA-MM-DD/audit-HHMMSS-<pid>-<seq>.jsonl``. O segmento é
+rotacionado por tamanho (``AUDIT_SEGMENT_MAX_MB``), idade
+(``AUDIT_SEGMENT_MAX_AGE``) ou troca de dia e compactado para
+``.jsonl.gz``.
+
+Com a fila cheia (``AUDIT_QUEUE_MAX``) o registro é descartado e contado em
+``audit_dropped_records_total``: a auditoria nunca atrasa o scraping. As
+métricas de registros, tamanho do HTML e latência são emitidas pela thread,
+por lote.
+"""
+
+import atexit
+import gzip
 import json
+import os
+import shutil
+import threading
 import time
-import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
 import structlog
 
 from datetime import datetime, timezone
 from fastapi.encoders import jsonable_encoder
 
-from alert_app.metrics import AUDIT_RECORDS_TOTAL, AUDIT_HTML_LENGTH_BYTES, AUDIT_RECORD_DURATION_SECONDS, AUDIT_ERRORS_TOTAL
+from scraper_app.core.config import settings
+from alert_app.metrics import (
+    AUDIT_RECORDS_TOTAL,
+    AUDIT_HTML_LENGTH_BYTES,
+    AUDIT_RECORD_DURATION_SECONDS,
+    AUDIT_ERRORS_TOTAL,
+    AUDIT_DROPPED_RECORDS_TOTAL,
+    AUDIT_FLUSH_DURATION_SECONDS,
+)
 
 
 logger = structlog.get_logger("audit_logger")
@@ -17,53 +45,220 @@ logger = structlog.get_logger("audit_logger")
 #Diretório base para os arquivos de auditoria
 AUDIT_DIR = os.getenv("AUDIT_LOG_DIR", "logs/audit")
 
+#Extensões do segmento ativo e dos segmentos fechados
+SEGMENT_SUFFIX = ".jsonl"
+SEALED_SUFFIX = ".jsonl.gz"
+
 def _ensure_dir(path: str) -> None:
     """ Garante que o diretório exista """
     os.makedirs(path, exist_ok=True)
 
+class _Segment:
+    """ Arquivo JSONL aberto para gravação """
+
+    def __init__(self, path: str, day: str) -> None:
+        self.path = path
+        self.day = day
+        self.opened_at = time.monotonic()
+        self.size = 0
+        self.fh = open(path, "a", encoding="utf-8")
+
+class AuditWriter:
+    """ Fila de registros de auditoria gravada em lotes por uma thread """
+
+    def __init__(
+        self,
+        max_queue: int = settings.AUDIT_QUEUE_MAX,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL,
+        segment_max_bytes: int = settings.AUDIT_SEGMENT_MAX_MB * 1024 * 1024,
+        segment_max_age: float = settings.AUDIT_SEGMENT_MAX_AGE,
+    ) -> None:
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        #``append``/``popleft`` do deque dispensam lock no caminho quente
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        #Serializa gravações da thread e de ``flush`` chamados por outras threads
+        self._io_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._segment: Optional[_Segment] = None
+        self._seq = 0
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """ Enfileira o registro; retorna ``False`` quando ele foi descartado """
+        if self._pid != os.getpid():
+            self._start()
+        if len(self._queue) >= self.max_queue:
+            AUDIT_DROPPED_RECORDS_TOTAL.labels(stage=record.get("stage", "unknown")).inc()
+            return False
+        self._queue.append(record)
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _start(self) -> None:
+        """ Inicia a thread de gravação (uma vez por processo, inclusive após fork) """
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            #Registros e segmento herdados do processo pai pertencem a ele
+            self._queue = deque()
+            self._segment = None
+            self._io_lock = threading.Lock()
+            self._wake = threading.Event()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """ Grava tudo o que está na fila e retorna quantos registros foram gravados """
+        with self._io_lock:
+            written = 0
+            started = time.perf_counter()
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self.batch_size:
+                    batch.append(self._queue.popleft())
+                written += self._write(batch)
+            if self._segment is not None and self._segment_expired(self._segment, datetime.now(timezone.utc)):
+                self._seal()
+            if written:
+                AUDIT_FLUSH_DURATION_SECONDS.observe(time.perf_counter() - started)
+            return written
+
+    def _write(self, batch) -> int:
+        """ Serializa o lote e grava no segmento ativo, rotacionando se necessário """
+        now = datetime.now(timezone.utc)
+        lines = []
+        stages: Dict[str, int] = {}
+        queued_at = []
+        for record in batch:
+            stage = record.get("stage", "unknown")
+            created = record.get("timestamp") or time.time()
+            try:
+                record["timestamp"] = datetime.fromtimestamp(created, timezone.utc).isoformat() + "z"
+                lines.append(json.dumps(jsonable_encoder(record), ensure_ascii=False, separators=(",", ":")))
+            except Exception as e:
+                AUDIT_ERRORS_TOTAL.labels(stage=stage).inc()
+                logger.error("audit_encode_failed", stage=stage, error=str(e))
+                continue
+            stages[stage] = stages.get(stage, 0) + 1
+            queued_at.append((stage, created))
+            #Emite métricas de tamanho de HTML
+            if record.get("html_length") is not None:
+                AUDIT_HTML_LENGTH_BYTES.labels(stage=stage).observe(record["html_length"])
+        if not lines:
+            return 0
+        data = "\n".join(lines) + "\n"
+
+        try:
+            segment = self._segment
+            if segment is None or self._segment_expired(segment, now):
+                self._seal()
+                segment = self._open(now)
+            segment.fh.write(data)
+            segment.fh.flush()
+            segment.size += len(data)
+        except Exception as e:
+            #Caso de erro de I/O, registra no logger para não interromper o fluxo
+            AUDIT_ERRORS_TOTAL.labels(stage="flush").inc()
+            logger.error("audit_write_failed", records=len(lines), error=str(e))
+            return 0
+
+        #Métricas agregadas por lote, fora do caminho do scraping
+        for stage, count in stages.items():
+            AUDIT_RECORDS_TOTAL.labels(stage=stage).inc(count)
+        written_at = time.time()
+        for stage, created in queued_at:
+            AUDIT_RECORD_DURATION_SECONDS.labels(stage=stage).observe(written_at - created)
+        return len(lines)
+
+    def _segment_expired(self, segment: _Segment, now: datetime) -> bool:
+        return (
+            segment.size >= self.segment_max_bytes
+            or time.monotonic() - segment.opened_at >= self.segment_max_age
+            or segment.day != now.strftime("%Y-%m-%d")
+            or os.path.dirname(segment.path) != os.path.join(AUDIT_DIR, segment.day)
+        )
+
+    def _open(self, now: datetime) -> _Segment:
+        day = now.strftime("%Y-%m-%d")
+        base_path = os.path.join(AUDIT_DIR, day)
+        _ensure_dir(base_path)
+        self._seq += 1
+        filename = f"audit-{now.strftime('%H%M%S')}-{os.getpid()}-{self._seq:04d}{SEGMENT_SUFFIX}"
+        self._segment = _Segment(os.path.join(base_path, filename), day)
+        return self._segment
+
+    def _seal(self) -> None:
+        """ Fecha o segmento ativo e o compacta em ``.jsonl.gz`` """
+        segment, self._segment = self._segment, None
+        if segment is None:
+            return
+        try:
+            segment.fh.close()
+            if segment.size == 0:
+                os.remove(segment.path)
+                return
+            sealed = segment.path[:-len(SEGMENT_SUFFIX)] + SEALED_SUFFIX
+            tmp = sealed + ".tmp"
+            with open(segment.path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp, sealed)
+            os.remove(segment.path)
+        except Exception as e:
+            AUDIT_ERRORS_TOTAL.labels(stage="rotate").inc()
+            logger.error("audit_rotate_failed", filepath=segment.path, error=str(e))
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """ Para a thread, grava o restante da fila e fecha o segmento ativo """
+        if self._pid not in (None, os.getpid()):
+            #Fila herdada do processo pai: a gravação cabe a ele
+            return
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout)
+        self.flush()
+        with self._io_lock:
+            self._seal()
+        self._pid = None
+
+#Fila de auditoria do processo
+audit_writer = AuditWriter()
+atexit.register(audit_writer.shutdown)
+
 def audit_scrape( *, stage: str, url: str, payload: dict, html: str | None = None, details: dict | None = None, error: str | None = None) -> None:
-    """ Grava um dump JSON de cada etapa do scraping para auditoria/debug """
-    #Timestamp para organização
-    start_time = time.time()
-    now = datetime.now(timezone.utc)
-    date_dir = now.strftime("%Y-%m-%d")
-    time_str = now.strftime("%H-%M-%S")
-
-    #Monta o caminho final
-    base_path = os.path.join(AUDIT_DIR, date_dir)
-    _ensure_dir(base_path)
-
-    filename = f"{time_str}_{uuid.uuid4().hex[:8]}_{stage}.json"
-    filepath = os.path.join(base_path, filename)
-
-    #Monta o objeto de auditoria
-    record = {
-        "timestamp": now.isoformat() + "z",
+    """ Enfileira o registro de uma etapa do scraping para auditoria/debug
+
+    Serialização, formatação do timestamp e métricas ficam com a thread de
+    auditoria; ``payload`` e ``details`` são copiados para não refletirem
+    alterações posteriores.
+    """
+    audit_writer.submit({
+        "timestamp": time.time(),
         "stage": stage,
         "url": url,
-        "payload": payload,
+        "payload": dict(payload) if isinstance(payload, dict) else payload,
         "html_length": len(html) if html is not None else None,
-        "details": details,
+        "details": dict(details) if isinstance(details, dict) else details,
         "error": error
-    }
-
-    #Emite métricas de contagem de registros
-    AUDIT_RECORDS_TOTAL.labels(stage=stage).inc()
-
-    #Emite métricas de tamanho de HTML
-    if html is not None:
-        AUDIT_HTML_LENGTH_BYTES.labels(stage=stage).observe(len(html))
-
-    #Serializa e grava
-    try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(jsonable_encoder(record), f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        #Caso de erro de I/O, registra no logger para não interromper o fluxo
-        AUDIT_ERRORS_TOTAL.labels(stage=stage).inc()
-        logger.error("audit_write_failed", filepath=filepath, error=str(e))
-        return
-
-    #Emite métrica de latência de gravação
-    duration = time.time() - start_time
-    AUDIT_RECORD_DURATION_SECONDS.labels(stage=stage).observe(duration)
+    })
+
+def flush() -> int:
+    """ Grava imediatamente os registros pendentes do processo """
+    return audit_writer.flush()
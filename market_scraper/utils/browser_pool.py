@@ -0,0 +1,281 @@
+""" Pool de navegadores Chromium mantidos aquecidos durante a vida do processo
+
+Iniciar o driver do Playwright e um novo Chromium a cada scraping custa
+alguns segundos por requisição. O ``BrowserPool`` mantém ``size`` navegadores
+abertos, cada um com contextos pré-criados prontos para uso, e recicla o
+navegador quando ele atinge o limite de páginas ou de memória configurado.
+
+O pool é iniciado e encerrado pelo ``lifespan`` da aplicação FastAPI e fica
+disponível para ``get_playwright_client`` através de ``get_browser_pool``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Set, Tuple
+
+import structlog
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+from scraper_app.core.config import settings
+from scraper_app.utils.playwright_client import PlaywrightClient
+from alert_app.metrics import (
+    BROWSER_POOL_LAUNCHES_TOTAL,
+    BROWSER_POOL_RECYCLES_TOTAL,
+    BROWSER_POOL_IN_USE,
+    BROWSER_POOL_ACQUIRE_WAIT_SECONDS,
+)
+
+
+logger = structlog.get_logger("browser_pool")
+
+@dataclass
+class _PooledBrowser:
+    """ Estado de um navegador mantido pelo pool """
+    browser: Any
+    pids: Set[int] = field(default_factory=set)
+    contexts: List[Tuple[Any, int, int]] = field(default_factory=list)
+    pages: int = 0
+    in_use: int = 0
+    recycling: bool = False
+    retiring: bool = False
+    closed: bool = False
+
+class BrowserPool:
+    """ Mantém navegadores e contextos aquecidos para o scraping via Playwright
+
+    Expõe o mesmo ``fetch_html`` do ``PlaywrightClient``, podendo ser usado
+    no lugar dele por qualquer chamador.
+    """
+
+    def __init__(
+        self,
+        size: int = settings.BROWSER_POOL_SIZE,
+        contexts_per_browser: int = settings.BROWSER_POOL_CONTEXTS,
+        max_pages: int = settings.BROWSER_POOL_MAX_PAGES,
+        max_memory_mb: int = settings.BROWSER_POOL_MAX_MEMORY_MB,
+        headless: bool = settings.PLAYWRIGHT_HEADLESS,
+        timeout: int = settings.PLAYWRIGHT_TIMEOUT,
+    ) -> None:
+        self.size = max(1, size)
+        self.contexts_per_browser = max(0, contexts_per_browser)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self._client = PlaywrightClient(headless=headless, timeout=timeout)
+        self._playwright = None
+        self._browsers: List[_PooledBrowser] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.started = False
+
+    async def start(self) -> None:
+        """ Inicia o driver do Playwright e aquece todos os navegadores """
+        if self.started:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._playwright = await self._client.start_driver()
+        #Cada navegador atende em paralelo a quantidade de contextos configurada
+        self._slots = asyncio.Semaphore(self.size * max(1, self.contexts_per_browser))
+        self._lock = asyncio.Lock()
+        for _ in range(self.size):
+            self._browsers.append(await self._launch("warm"))
+        self.started = True
+        logger.info("browser_pool_started", size=self.size, contexts=self.contexts_per_browser)
+
+    async def stop(self) -> None:
+        """ Fecha todos os navegadores e encerra o driver """
+        self.started = False
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for entry in self._browsers:
+            await self._close(entry)
+        self._browsers.clear()
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info("browser_pool_stopped")
+
+    def available(self) -> bool:
+        """ Indica se o pool pode ser usado no event loop corrente
+
+        Objetos do Playwright ficam presos ao loop em que foram criados, então
+        chamadas vindas de outro loop (ex.: ``asyncio.run`` em contexto
+        síncrono) devem abrir um cliente próprio.
+        """
+        if not self.started:
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    # ---------- CICLO DE VIDA DOS NAVEGADORES ----------
+    def _child_pids(self) -> Set[int]:
+        """ PIDs de todos os processos filhos do processo atual """
+        if psutil is None:
+            return set()
+        try:
+            return {p.pid for p in psutil.Process().children(recursive=True)}
+        except Exception:
+            return set()
+
+    def _memory_mb(self, entry: _PooledBrowser) -> float:
+        """ Soma o RSS (MB) dos processos do navegador e de seus filhos """
+        if psutil is None or not entry.pids:
+            return 0.0
+        total = 0
+        for pid in entry.pids:
+            try:
+                proc = psutil.Process(pid)
+                total += proc.memory_info().rss
+                for child in proc.children(recursive=True):
+                    total += child.memory_info().rss
+            except Exception:
+                continue
+        return total / (1024 * 1024)
+
+    async def _launch(self, reason: str) -> _PooledBrowser:
+        """ Inicia um navegador e pré-cria seus contextos """
+        #Os PIDs novos após o launch identificam os processos deste navegador
+        before = self._child_pids()
+        browser = await self._client.launch_browser(self._playwright)
+        entry = _PooledBrowser(browser=browser, pids=self._child_pids() - before)
+        try:
+            await self._fill_contexts(entry)
+        except Exception:
+            #Não deixa um navegador meio iniciado aberto fora do pool
+            await self._close(entry)
+            raise
+        BROWSER_POOL_LAUNCHES_TOTAL.labels(reason=reason).inc()
+        return entry
+
+    async def _fill_contexts(self, entry: _PooledBrowser) -> None:
+        """ Completa a reserva de contextos prontos do navegador """
+        while not entry.retiring and len(entry.contexts) < self.contexts_per_browser:
+            entry.contexts.append(await self._client.new_context(entry.browser))
+
+    async def _close(self, entry: _PooledBrowser) -> None:
+        """ Fecha os contextos reservados e o navegador """
+        if entry.closed:
+            return
+        entry.closed = True
+        for context, _, _ in entry.contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        entry.contexts.clear()
+        try:
+            await entry.browser.close()
+        except Exception as exc:
+            logger.warning("browser_close_failed", error=str(exc))
+
+    def _recycle_reason(self, entry: _PooledBrowser) -> Optional[str]:
+        """ Retorna o motivo de reciclagem do navegador ou ``None`` """
+        is_connected = getattr(entry.browser, "is_connected", None)
+        if is_connected and not is_connected():
+            return "disconnected"
+        if self.max_pages and entry.pages >= self.max_pages:
+            return "pages"
+        if self.max_memory_mb and self._memory_mb(entry) >= self.max_memory_mb:
+            return "memory"
+        return None
+
+    async def _maintain(self, entry: _PooledBrowser) -> None:
+        """ Repõe contextos ou substitui o navegador após cada uso
+
+        O navegador só é aposentado depois que o substituto entra no pool. Se
+        o launch do substituto falhar, o navegador continua ativo e a
+        reciclagem é tentada de novo na manutenção seguinte.
+        """
+        reason = None if entry.retiring or entry.recycling else self._recycle_reason(entry)
+        if reason:
+            entry.recycling = True
+            logger.info("browser_recycling", reason=reason, pages=entry.pages)
+            try:
+                async with self._lock:
+                    replacement = await self._launch("recycle")
+                    if entry in self._browsers:
+                        self._browsers[self._browsers.index(entry)] = replacement
+            except Exception as exc:
+                logger.warning("browser_recycle_failed", reason=reason, error=str(exc))
+            else:
+                entry.retiring = True
+                BROWSER_POOL_RECYCLES_TOTAL.labels(reason=reason).inc()
+            finally:
+                entry.recycling = False
+
+        if entry.retiring:
+            #O último uso em andamento fecha o navegador aposentado
+            if entry.in_use == 0:
+                await self._close(entry)
+            return
+
+        await self._fill_contexts(entry)
+
+    def _spawn(self, coro) -> None:
+        """ Executa manutenção em segundo plano sem atrasar a resposta """
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning("browser_pool_maintenance_failed", error=str(task.exception()))
+
+    def _pick(self) -> _PooledBrowser:
+        """ Escolhe o navegador ativo com menos páginas em andamento """
+        candidates = [b for b in self._browsers if not b.retiring] or self._browsers
+        return min(candidates, key=lambda b: b.in_use)
+
+    # ---------- API PÚBLICA ----------
+    async def fetch_html(self, url: str, *, session_id: str | None = None) -> str:
+        """ Renderiza ``url`` em um navegador aquecido e retorna o HTML
+
+        Contextos pré-criados são usados quando não há ``session_id``; com
+        sessão explícita um contexto novo é criado para respeitar o
+        user-agent da sessão.
+        """
+        if not self.started:
+            raise RuntimeError("BrowserPool is not started")
+
+        wait_start = time.monotonic()
+        async with self._slots:
+            BROWSER_POOL_ACQUIRE_WAIT_SECONDS.observe(time.monotonic() - wait_start)
+            entry = self._pick()
+            entry.in_use += 1
+            BROWSER_POOL_IN_USE.inc()
+            try:
+                if session_id is None and entry.contexts:
+                    context, width, height = entry.contexts.pop()
+                else:
+                    context, width, height = await self._client.new_context(entry.browser, session_id)
+                return await self._client.render(context, url, width, height)
+            finally:
+                entry.in_use -= 1
+                entry.pages += 1
+                BROWSER_POOL_IN_USE.dec()
+                self._spawn(self._maintain(entry))
+
+#Instância do processo, definida pelo lifespan da aplicação
+_browser_pool: Optional[BrowserPool] = None
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """ Retorna o pool de navegadores ativo no processo, se houver """
+    return _browser_pool
+
+def set_browser_pool(pool: Optional[BrowserPool]) -> None:
+    """ Registra (ou remove) o pool de navegadores do processo """
+    global _browser_pool
+    _browser_pool = pool
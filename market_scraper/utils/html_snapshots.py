@@ -0,0 +1,323 @@
+""" Snapshots de HTML endereçados por conteúdo para replay offline
+
+O ``audit_scrape`` registra as etapas do scraping, mas não guarda as
+páginas. Com ``HTML_SNAPSHOT_ENABLED`` uma amostra
+(``HTML_SNAPSHOT_SAMPLE_RATE``) do HTML obtido é gravada em disco para ser
+reprocessada depois pelo replay (``tests/performance/scrape_replay``)::
+
+    <dir>/objects/ab/<sha256>.html.gz   HTML compactado, gravado uma vez por conteúdo
+    <dir>/index/<AAAA-MM-DD>.jsonl      uma linha por captura (URL, tipo, payload e sha256)
+
+Páginas repetidas ocupam espaço uma única vez. A limpeza remove os dias
+mais antigos que ``HTML_SNAPSHOT_RETENTION_DAYS`` e, acima de
+``HTML_SNAPSHOT_MAX_MB``, os dias mais antigos restantes; objetos sem
+referência nos índices são apagados em seguida.
+
+``capture`` apenas sorteia e enfileira a página: compressão, gravação e a
+limpeza periódica rodam numa thread do processo, como a fila de auditoria,
+e nunca no event loop do scraping.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import atexit
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from scraper_app.core.config import settings
+from alert_app.metrics import HTML_SNAPSHOTS_TOTAL, HTML_SNAPSHOT_STORE_BYTES
+
+
+logger = structlog.get_logger("html_snapshots")
+
+@dataclass(frozen=True)
+class SnapshotRecord:
+    """ Uma captura registrada no índice """
+    sha256: str
+    url: str
+    product_type: str
+    payload: Dict[str, Any]
+    captured_at: str
+    size: int
+
+class HtmlSnapshotStore:
+    """ Armazena e lê snapshots de HTML compactados, com amostragem e retenção """
+
+    def __init__(
+        self,
+        base_dir: str = settings.HTML_SNAPSHOT_DIR,
+        enabled: bool = settings.HTML_SNAPSHOT_ENABLED,
+        sample_rate: float = settings.HTML_SNAPSHOT_SAMPLE_RATE,
+        retention_days: int = settings.HTML_SNAPSHOT_RETENTION_DAYS,
+        max_bytes: int = settings.HTML_SNAPSHOT_MAX_MB * 1024 * 1024,
+        prune_interval: float = 300.0,
+        max_queue: int = settings.HTML_SNAPSHOT_QUEUE_MAX,
+        sampler: Callable[[], float] = random.random,
+    ) -> None:
+        self.base_dir = Path(base_dir)
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self.max_queue = max_queue
+        self._sampler = sampler
+        self._lock = threading.Lock()
+        #Estimativa do espaço ocupado, corrigida a cada limpeza
+        self._bytes: Optional[int] = None
+        self._last_prune = 0.0
+        #Páginas sorteadas aguardando a thread de gravação
+        self._queue: Deque[Tuple[str, str, Dict[str, Any], str, datetime]] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._io_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.base_dir / "objects"
+
+    @property
+    def index_dir(self) -> Path:
+        return self.base_dir / "index"
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / f"{sha256}.html.gz"
+
+    def capture(self, *, url: str, html: str, payload: Dict[str, Any], product_type: str) -> bool:
+        """ Enfileira o HTML se estiver habilitado e sorteado, sem bloquear o scraping
+
+        Retorna ``False`` quando a página não entrou na fila (recurso
+        desligado, fora da amostra ou fila cheia).
+        """
+        if not self.enabled or not html:
+            return False
+        if self._sampler() >= self.sample_rate:
+            HTML_SNAPSHOTS_TOTAL.labels(outcome="skipped").inc()
+            return False
+        if self._pid != os.getpid():
+            self._start()
+        if len(self._queue) >= self.max_queue:
+            HTML_SNAPSHOTS_TOTAL.labels(outcome="dropped").inc()
+            return False
+        self._queue.append((url, html, payload, product_type, datetime.now(timezone.utc)))
+        self._wake.set()
+        return True
+
+    def _start(self) -> None:
+        """ Inicia a thread de gravação (uma vez por processo, inclusive após fork) """
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            #Páginas herdadas do processo pai pertencem a ele
+            self._queue = deque()
+            self._io_lock = threading.Lock()
+            self._wake = threading.Event()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name="html-snapshots", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.flush()
+            self._wake.wait(self.prune_interval)
+            self._wake.clear()
+
+    def flush(self) -> int:
+        """ Grava as páginas da fila e aplica a limpeza, se vencida; retorna quantas foram gravadas """
+        with self._io_lock:
+            stored = 0
+            while self._queue:
+                url, html, payload, product_type, captured_at = self._queue.popleft()
+                try:
+                    if self.store(url=url, html=html, payload=payload, product_type=product_type, now=captured_at):
+                        stored += 1
+                except Exception as exc:
+                    HTML_SNAPSHOTS_TOTAL.labels(outcome="error").inc()
+                    logger.error("html_snapshot_failed", url=url, error=str(exc))
+            try:
+                self._maybe_prune(datetime.now(timezone.utc))
+            except Exception as exc:
+                logger.error("html_snapshot_prune_failed", error=str(exc))
+            return stored
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """ Para a thread e grava o restante da fila """
+        if self._pid not in (None, os.getpid()):
+            return
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout)
+        self.flush()
+        self._pid = None
+
+    def store(
+        self,
+        *,
+        url: str,
+        html: str,
+        payload: Dict[str, Any],
+        product_type: str,
+        now: Optional[datetime] = None,
+    ) -> Optional[str]:
+        """ Grava o objeto (se ainda não existir) e a linha do índice
+
+        Retorna ``None`` quando o limite de espaço foi atingido; novas páginas
+        voltam a ser gravadas depois que a limpeza periódica liberar espaço.
+        """
+        now = now or datetime.now(timezone.utc)
+        content = html.encode("utf-8")
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._object_path(sha256)
+
+        if path.exists():
+            outcome = "duplicate"
+        else:
+            if self._bytes is not None and self._bytes >= self.max_bytes:
+                HTML_SNAPSHOTS_TOTAL.labels(outcome="full").inc()
+                return None
+            compressed = gzip.compress(content, compresslevel=6)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            #Grava em arquivo temporário para o leitor nunca ver um objeto parcial
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(compressed)
+            os.replace(tmp, path)
+            with self._lock:
+                if self._bytes is not None:
+                    self._bytes += len(compressed)
+            outcome = "stored"
+
+        record = {
+            "sha256": sha256,
+            "url": url,
+            "product_type": product_type,
+            "payload": payload,
+            "captured_at": now.isoformat(),
+            "size": len(content),
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        #O objeto vem antes do índice: uma linha nunca aponta para um objeto inexistente
+        with self._lock, open(self.index_dir / f"{now.date().isoformat()}.jsonl", "a", encoding="utf-8") as fh:
+            fh.write(line)
+        HTML_SNAPSHOTS_TOTAL.labels(outcome=outcome).inc()
+        return sha256
+
+    def _index_files(self) -> List[Path]:
+        """ Arquivos de índice ordenados do dia mais antigo ao mais recente """
+        if not self.index_dir.is_dir():
+            return []
+        return sorted(self.index_dir.glob("*.jsonl"))
+
+    def iter_snapshots(self, since: Optional[date] = None, until: Optional[date] = None) -> Iterator[SnapshotRecord]:
+        """ Capturas registradas entre ``since`` e ``until`` (inclusive), em ordem de gravação """
+        for index_file in self._index_files():
+            day = date.fromisoformat(index_file.stem)
+            if (since and day < since) or (until and day > until):
+                continue
+            with open(index_file, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        yield SnapshotRecord(**json.loads(line))
+                    except (ValueError, TypeError):
+                        #Linha truncada por uma gravação interrompida
+                        logger.warning("html_snapshot_bad_index_line", file=str(index_file))
+
+    def exists(self, sha256: str) -> bool:
+        """ Indica se o objeto do snapshot ainda está em disco """
+        return self._object_path(sha256).is_file()
+
+    def load(self, sha256: str) -> str:
+        """ HTML de um snapshot
+
+        Raises:
+            FileNotFoundError: Quando o objeto já foi removido pela retenção
+        """
+        with gzip.open(self._object_path(sha256), "rb") as fh:
+            return fh.read().decode("utf-8")
+
+    def _maybe_prune(self, now: datetime) -> None:
+        """ Limpa no início da thread de gravação e depois a cada ``prune_interval`` """
+        if self._bytes is None or time.monotonic() - self._last_prune >= self.prune_interval:
+            self.prune(now)
+
+    def prune(self, now: Optional[datetime] = None, grace_seconds: float = 60.0) -> int:
+        """ Aplica retenção por idade e por espaço; retorna quantos objetos foram removidos
+
+        Objetos gravados há menos de ``grace_seconds`` são mantidos, pois outro
+        processo pode ainda não ter escrito a linha do índice correspondente.
+        """
+        now = now or datetime.now(timezone.utc)
+        self._last_prune = time.monotonic()
+        cutoff = now.date() - timedelta(days=self.retention_days)
+        today = now.date().isoformat()
+
+        index_files = []
+        for index_file in self._index_files():
+            if date.fromisoformat(index_file.stem) < cutoff:
+                index_file.unlink(missing_ok=True)
+            else:
+                index_files.append(index_file)
+
+        objects = {}
+        if self.objects_dir.is_dir():
+            for path in self.objects_dir.glob("*/*.html.gz"):
+                stat = path.stat()
+                objects[path.name[:-len(".html.gz")]] = (path, stat.st_size, stat.st_mtime)
+
+        def referenced(files) -> set:
+            shas = set()
+            for index_file in files:
+                with open(index_file, encoding="utf-8") as fh:
+                    for line in fh:
+                        try:
+                            shas.add(json.loads(line)["sha256"])
+                        except (ValueError, KeyError):
+                            continue
+            return shas
+
+        keep = referenced(index_files)
+        total = sum(size for sha, (_, size, _) in objects.items() if sha in keep)
+        #Acima do limite descarta os dias mais antigos, preservando o dia atual
+        while total > self.max_bytes and index_files and index_files[0].stem != today:
+            index_files.pop(0).unlink(missing_ok=True)
+            keep = referenced(index_files)
+            total = sum(size for sha, (_, size, _) in objects.items() if sha in keep)
+
+        removed = 0
+        recent = time.time() - grace_seconds
+        for sha, (path, size, mtime) in objects.items():
+            if sha in keep:
+                continue
+            if mtime > recent:
+                total += size
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+
+        with self._lock:
+            self._bytes = total
+        HTML_SNAPSHOT_STORE_BYTES.set(total)
+        if removed:
+            logger.info("html_snapshots_pruned", removed=removed, bytes=total)
+        return removed
+
+#Armazenamento usado pelo scraper do processo
+html_snapshots = HtmlSnapshotStore()
+atexit.register(html_snapshots.shutdown)
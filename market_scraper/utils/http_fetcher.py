@@ -0,0 +1,185 @@
+""" Camada de busca via HTTP simples usada antes do Playwright
+
+Boa parte das páginas de produto já entrega os dados no HTML servido pelo
+servidor (JSON-LD, ``__PRELOADED_STATE__`` ou ``__NEXT_DATA__``). O
+``HttpFetcher`` tenta obter esse HTML com um cliente ``httpx`` assíncrono de
+conexões reaproveitadas e só indica a necessidade do navegador quando a
+resposta é bloqueada ou não traz os dados esperados pelo parser.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import httpx
+import structlog
+
+from scraper_app.core.config import settings
+from scraper_app.enums.enums_block_results import BlockResult
+from scraper_app.utils.block_detector import detect_block
+from scraper_app.utils.constants import STEALTH_HEADERS
+from scraper_app.utils.cookie_manager import CookieManager, cookie_manager as default_cookie_manager
+from scraper_app.utils.user_agent_manager import IntelligentUserAgentManager
+from alert_app.metrics import (
+    SCRAPER_FETCH_TIER_TOTAL,
+    SCRAPER_FETCH_TIER_LATENCY_SECONDS,
+    SCRAPER_CONDITIONAL_REQUESTS_TOTAL,
+)
+
+
+logger = structlog.get_logger("http_fetcher")
+
+@dataclass
+class FetchedPage:
+    """ HTML obtido e validadores de cache (``ETag``/``Last-Modified``) da resposta
+
+    Quando ``not_modified`` é verdadeiro o servidor respondeu ``304`` e
+    ``html`` fica vazio, pois o conteúdo conhecido pelo chamador continua válido.
+    """
+    html: Optional[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+class HttpFetcher:
+    """ Cliente HTTP assíncrono com pool de conexões por event loop
+
+    Conexões do ``httpx`` ficam presas ao loop em que foram abertas, por isso
+    um cliente é mantido para cada loop ativo. No FastAPI há um único loop e
+    as conexões keep-alive são reaproveitadas entre requisições.
+    """
+
+    def __init__(
+        self,
+        ua_manager: IntelligentUserAgentManager | None = None,
+        cookie_manager: CookieManager | None = None,
+        timeout: float = settings.HTTP_FETCH_TIMEOUT,
+        max_connections: int = settings.HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive: int = settings.HTTP_POOL_MAX_KEEPALIVE,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.ua_manager = ua_manager or IntelligentUserAgentManager()
+        self.cookie_manager = cookie_manager or default_cookie_manager
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self._transport = transport
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+    def _client(self) -> httpx.AsyncClient:
+        """ Retorna o cliente do loop corrente, criando-o na primeira chamada """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                headers=STEALTH_HEADERS,
+                timeout=self.timeout,
+                limits=self.limits,
+                follow_redirects=True,
+                transport=self._transport,
+            )
+            self._clients[loop] = client
+        return client
+
+    def _request_headers(
+        self,
+        session_id: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> dict[str, str]:
+        """ Monta user-agent, cookies da sessão e validadores condicionais """
+        headers = {"User-Agent": self.ua_manager.get_user_agent(session_id)}
+        jar = self.cookie_manager.get_cookies(session_id)
+        cookie_header = "; ".join(f"{c.name}={c.value}" for c in jar)
+        if cookie_header:
+            headers["Cookie"] = cookie_header
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    async def get(
+        self,
+        url: str,
+        session_id: str = "default",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> httpx.Response:
+        """ Executa um GET reaproveitando conexões e atualiza os cookies da sessão """
+        headers = self._request_headers(session_id, etag, last_modified)
+        response = await self._client().get(url, headers=headers)
+        self.cookie_manager.update_from_response(session_id, response)
+        return response
+
+    async def fetch_html(
+        self,
+        url: str,
+        is_sufficient: Callable[[str], bool],
+        session_id: str = "default",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Optional[FetchedPage]:
+        """ Retorna a página obtida via HTTP ou ``None`` quando o navegador é necessário
+
+        Com ``etag``/``last_modified`` a requisição é condicional e um ``304``
+        retorna ``FetchedPage`` com ``not_modified``. O retorno ``None`` cobre
+        falhas de rede, outros status diferentes de 200, bloqueios detectados
+        por ``detect_block`` e HTML em que ``is_sufficient`` não encontra os
+        dados do produto.
+        """
+        start = time.monotonic()
+        outcome = "success"
+        page: Optional[FetchedPage] = None
+        conditional = bool(etag or last_modified)
+        try:
+            response = await self.get(url, session_id, etag=etag, last_modified=last_modified)
+        except httpx.HTTPError as exc:
+            outcome = "error"
+            logger.info("http_tier_failed", url=url, error=str(exc))
+        else:
+            block = detect_block(response)
+            if conditional and response.status_code == 304:
+                outcome = "not_modified"
+                page = FetchedPage(
+                    html=None,
+                    etag=response.headers.get("ETag") or etag,
+                    last_modified=response.headers.get("Last-Modified") or last_modified,
+                    not_modified=True,
+                )
+            elif block != BlockResult.OK:
+                outcome = "blocked"
+            elif response.status_code != 200:
+                outcome = "status"
+            elif not is_sufficient(response.text):
+                outcome = "insufficient"
+            else:
+                page = FetchedPage(
+                    html=response.text,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+            if page is None:
+                logger.info("http_tier_escalated", url=url, reason=outcome, status_code=response.status_code)
+            if conditional:
+                result = "not_modified" if outcome == "not_modified" else "modified"
+                SCRAPER_CONDITIONAL_REQUESTS_TOTAL.labels(result=result).inc()
+
+        SCRAPER_FETCH_TIER_TOTAL.labels(tier="http", outcome=outcome).inc()
+        SCRAPER_FETCH_TIER_LATENCY_SECONDS.labels(tier="http").observe(time.monotonic() - start)
+        return page
+
+    async def aclose(self) -> None:
+        """ Fecha o cliente do loop corrente e descarta os demais """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        clients = list(self._clients.items())
+        self._clients.clear()
+        for client_loop, client in clients:
+            if client_loop is loop:
+                await client.aclose()
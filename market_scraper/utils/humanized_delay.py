@@ -2,6 +2,7 @@ from __future__ import annotations
 
 """ Utilitário para calcular atrasos de comportamento humano """
 
+import asyncio
 import random
 import time
 
@@ -36,6 +37,11 @@ class HumanizedDelayManager:
         delay = self.calculate_delay(text, reflection_time)
         time.sleep(delay)
 
+    async def wait_async(self, text: str | None, reflection_time: float = 1.0) -> None:
+        """ Aguarda o tempo calculado sem bloquear o event loop """
+        delay = self.calculate_delay(text, reflection_time)
+        await asyncio.sleep(delay)
+
     def prolong(self, factor: float = 1.5) -> None:
         """ Aumenta o delay base pelo *factor* para reduzir o ritmo de scraping """
         self.base_delay *= factor
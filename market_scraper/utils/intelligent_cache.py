@@ -1,16 +1,36 @@
 """ Gerencia o cache inteligente de produtos com TTL adaptativo.
 
 Este módulo armazena em Redis os dados extraídos, um hash do HTML
-e o ETag relacionado. Quando o mesmo conteúdo é visto repetidamente
-o TTL é aumentado, reduzindo novas requisições de scraping.
+e os validadores ``ETag``/``Last-Modified`` da resposta. O TTL cresce
+conforme a impressão digital dos campos extraídos (preço, vendedor,
+frete...) se repete, reduzindo novas requisições de scraping.
+
+A impressão digital e o multiplicador ficam numa chave própria
+(``cache:meta:<url>``) que vive mais que a entrada de dados: o novo
+scraping costuma acontecer justamente depois que a entrada expirou, e
+sem esse histórico o TTL voltaria sempre ao valor base.
 """
 
+import re
 import json
+import time
 import hashlib
 from typing import Optional
+from urllib.parse import urlsplit
 
 from utils.redis_client import get_redis_client
 from scraper_app.core.config import settings
+from alert_app.metrics import CACHE_FINGERPRINT_TOTAL, CACHE_TTL_SECONDS, CACHE_TTL_MULTIPLIER
+
+#Campos que definem se o anúncio mudou de fato
+FINGERPRINT_FIELDS = ("name", "current_price", "old_price", "shipping", "seller", "thumbnail")
+
+#Ruído volátil das páginas: tokens longos, UUIDs e timestamps
+_VOLATILE_PATTERNS = (
+    re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"),
+    re.compile(r"[A-Za-z0-9_\-]{32,}"),
+    re.compile(r"\d{10,}"),
+)
 
 
 class IntelligentCacheManager:
@@ -26,13 +46,42 @@ class IntelligentCacheManager:
         """ Retorna a chave Redis utilizada para a URL. """
         return f"cache:product:{url}"
 
+    def _meta_key(self, url: str) -> str:
+        """ Retorna a chave Redis com a impressão digital e o multiplicador da URL """
+        return f"cache:meta:{url}"
+
+    def _meta_ttl(self) -> int:
+        """ Validade da chave de metadados, maior que o maior TTL da entrada """
+        return self.base_ttl * self.max_multiplier * 2
+
     def _hash_content(self, content: str) -> str:
-        """ Gera hash SHA-256 do HTML para identificar alterações """
+        """ Gera hash SHA-256 do HTML sem tokens, UUIDs e timestamps voláteis """
+        for pattern in _VOLATILE_PATTERNS:
+            content = pattern.sub("", content)
         return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
-    def get(self, url: str) -> Optional[dict]:
-        """ Recupera a entrada completa do cache ou ``None`` caso ausente """
-        raw = self.redis.get(self._key(url))
+    def fingerprint(self, data: dict) -> str:
+        """ Impressão digital semântica dos campos extraídos do anúncio
+
+        Considera apenas ``FINGERPRINT_FIELDS`` como texto, com espaços e
+        caixa normalizados; a query string da miniatura é descartada por carregar
+        parâmetros de rastreamento.
+        """
+        normalized = {}
+        for field in FINGERPRINT_FIELDS:
+            value = data.get(field)
+            if value is not None:
+                value = " ".join(str(value).split()).lower()
+                if field == "thumbnail":
+                    parts = urlsplit(value)
+                    value = f"{parts.netloc}{parts.path}" if parts.netloc else value
+            normalized[field] = value
+        raw = json.dumps(normalized, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load(self, key: str) -> Optional[dict]:
+        """ Lê e decodifica um JSON salvo no Redis """
+        raw = self.redis.get(key)
         if not raw:
             return None
         if isinstance(raw, (bytes, bytearray)):
@@ -42,33 +91,83 @@ class IntelligentCacheManager:
         except Exception:
             return None
 
+    def get(self, url: str) -> Optional[dict]:
+        """ Recupera a entrada completa do cache ou ``None`` caso ausente """
+        return self._load(self._key(url))
+
     def get_data(self, url: str) -> Optional[dict]:
         """ Retorna apenas o campo ``data`` salvo para a URL """
         entry = self.get(url)
         return entry.get("data") if entry else None
 
-    def set(self, url: str, data: dict, content: str, etag: Optional[str] = None) -> None:
-        """ Armazena dados e HTML no cache ajustando o TTL conforme o conteúdo """
+    def is_fresh(self, entry: Optional[dict], max_age: Optional[int] = None) -> bool:
+        """ Indica se a entrada pode ser servida sem novo scraping
+
+        Sem ``max_age`` vale o TTL adaptativo, ou seja, qualquer entrada ainda
+        presente no Redis. Com ``max_age`` a idade da entrada é comparada ao
+        limite informado; ``0`` força sempre um novo scraping.
+        """
+        if not entry or not entry.get("data"):
+            return False
+        if max_age is None:
+            return True
+        stored_at = entry.get("stored_at")
+        if stored_at is None:
+            return False
+        return (time.time() - stored_at) <= max_age
+
+    def get_validators(self, url: str) -> tuple[Optional[str], Optional[str]]:
+        """ Retorna ``(etag, last_modified)`` salvos para a URL, se houver dados """
+        entry = self.get(url)
+        if not entry or not entry.get("data"):
+            return None, None
+        return entry.get("etag"), entry.get("last_modified")
+
+    def set(
+        self,
+        url: str,
+        data: dict,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """ Armazena dados e HTML no cache ajustando o TTL conforme os dados extraídos """
         key = self._key(url)
         content_hash = self._hash_content(content)
-        existing = self.get(url)
+        fingerprint = self.fingerprint(data)
+        #Os metadados sobrevivem à expiração da entrada; entradas antigas ainda os carregam
+        existing = self._load(self._meta_key(url)) or self.get(url)
         multiplier = 1
 
-        #Se o conteúdo não mudou, aumenta o multiplicador para ampliar o TTL
+        #Se os dados do anúncio não mudaram, aumenta o multiplicador para ampliar o TTL
         if existing:
-            if content_hash == existing.get("hash"):
+            if fingerprint == existing.get("fingerprint"):
                 multiplier = min(existing.get("multiplier", 1) + 1, self.max_multiplier)
+                CACHE_FINGERPRINT_TOTAL.labels(result="match").inc()
             else:
                 multiplier = 1
+                CACHE_FINGERPRINT_TOTAL.labels(result="changed").inc()
+        else:
+            CACHE_FINGERPRINT_TOTAL.labels(result="new").inc()
 
         ttl = self.base_ttl * multiplier #TTL adaptativo
+        CACHE_TTL_SECONDS.observe(ttl)
+        CACHE_TTL_MULTIPLIER.observe(multiplier)
         entry = {
             "data": data,
             "hash": content_hash,
+            "fingerprint": fingerprint,
             "etag": etag,
-            "multiplier": multiplier
+            "last_modified": last_modified,
+            "multiplier": multiplier,
+            "stored_at": time.time()
         }
         self.redis.set(key, json.dumps(entry), ex=ttl)
+        self.redis.set(
+            self._meta_key(url),
+            json.dumps({"fingerprint": fingerprint, "multiplier": multiplier}),
+            ex=self._meta_ttl(),
+        )
 
     def invalidate(self, url: str) -> None:
         """ Remove a entrada de cache da URL informada """
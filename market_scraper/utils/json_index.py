@@ -0,0 +1,181 @@
+""" Índice de chaves do JSON embutido, montado em uma única passada
+
+As estratégias do parser procuram quatro ou cinco grupos de chaves
+(``title``/``name``, ``price``...) no mesmo ``__PRELOADED_STATE__``, que
+costuma ter centenas de KB. Em vez de uma busca em profundidade completa
+por grupo, o ``JsonIndex`` percorre o objeto no máximo uma vez, na mesma
+ordem da busca original, e guarda a primeira ocorrência de cada chave
+rastreada.
+
+O ``PathCache`` aprende o caminho de cada grupo por layout de página.
+Depois que o mesmo caminho se repete ``stable_after`` vezes, as páginas
+seguintes desse layout leem o valor direto pelo caminho, sem montar o
+índice; se o caminho deixar de existir ele é descartado. A ausência de um
+grupo nunca é aprendida: ela vale para a página (um anúncio pausado, sem
+preço), não para o layout.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+
+#Passo de um caminho: chave de objeto ou posição de lista
+PathStep = Union[str, int]
+Path = Tuple[PathStep, ...]
+
+#Marca valores ausentes, já que ``None`` é um valor JSON válido
+MISSING = object()
+
+class JsonIndex:
+    """ Primeira ocorrência de cada chave rastreada no JSON decodificado
+
+    O percurso é incremental: cada consulta avança a mesma busca em
+    profundidade só até encontrar o grupo pedido, e as chaves vistas no
+    caminho ficam registradas para as consultas seguintes. Somadas, as
+    consultas percorrem o objeto no máximo uma vez.
+    """
+
+    def __init__(self, data: Any, keys: Iterable[str]) -> None:
+        self.data = data
+        self._wanted: FrozenSet[str] = frozenset(keys)
+        #chave -> (ordem de visita do objeto, posição da chave, valor, elo do caminho)
+        self._first: Dict[str, Tuple[int, int, Any, Any]] = {}
+        #Cada item é ``(nó, elo)``, com elo ``(elo do pai, passo)``; o caminho
+        #só é montado para as chaves encontradas
+        self._stack = [(data, None)]
+        self._visit = 0
+
+    def _advance(self, keys: Iterable[str]) -> None:
+        """ Continua o percurso até registrar alguma chave de ``keys`` """
+        keys = [key for key in keys if key in self._wanted]
+        if not keys:
+            return
+        first, wanted, stack = self._first, self._wanted, self._stack
+        while stack and not any(key in first for key in keys):
+            node, link = stack.pop()
+            if isinstance(node, dict):
+                self._visit += 1
+                for pos, (key, value) in enumerate(node.items()):
+                    if key in wanted and key not in first:
+                        first[key] = (self._visit, pos, value, (link, key))
+                    if isinstance(value, (dict, list)):
+                        stack.append((value, (link, key)))
+            elif isinstance(node, list):
+                for pos, value in enumerate(node):
+                    if isinstance(value, (dict, list)):
+                        stack.append((value, (link, pos)))
+
+    def _match(self, keys: Iterable[str]) -> Optional[Tuple[int, int, Any, Any]]:
+        self._advance(keys)
+        found = [self._first[key] for key in keys if key in self._first]
+        if not found:
+            return None
+        return min(found, key=lambda entry: (entry[0], entry[1]))
+
+    def find(self, keys: Iterable[str]) -> Any:
+        """ Valor da primeira ocorrência de qualquer chave, como a busca em profundidade """
+        match = self._match(keys)
+        return match[2] if match else None
+
+    def path(self, keys: Iterable[str]) -> Optional[Path]:
+        """ Caminho até a primeira ocorrência de qualquer chave """
+        match = self._match(keys)
+        if not match:
+            return None
+        steps = []
+        link = match[3]
+        while link is not None:
+            link, step = link
+            steps.append(step)
+        return tuple(reversed(steps))
+
+def resolve(data: Any, path: Path) -> Any:
+    """ Segue ``path`` em ``data`` e retorna ``MISSING`` se algum passo não existir """
+    current = data
+    for step in path:
+        if isinstance(step, str):
+            if not isinstance(current, dict) or step not in current:
+                return MISSING
+        elif not isinstance(current, list) or step >= len(current):
+            return MISSING
+        current = current[step]
+    return current
+
+class PathCache:
+    """ Caminhos estáveis de cada grupo de chaves, por layout
+
+    Só caminhos encontrados são aprendidos: um grupo ausente em uma página
+    descarta o caminho do layout, para que a próxima página volte ao índice.
+    A cada ``revalidate_every`` usos um caminho estável é conferido
+    novamente pelo índice, para acompanhar mudanças no layout.
+    """
+
+    def __init__(self, stable_after: int = 3, revalidate_every: int = 100, max_entries: int = 1024) -> None:
+        self.stable_after = stable_after
+        self.revalidate_every = revalidate_every
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        #(layout, grupo) -> [caminho, repetições consecutivas, usos desde a confirmação]
+        self._paths: Dict[Tuple[str, Tuple[str, ...]], List[Any]] = {}
+
+    def stable_path(self, layout: str, keys: Sequence[str]) -> Tuple[bool, Optional[Path]]:
+        """ Indica se há caminho confirmado para o grupo no layout e qual é ele """
+        entry = self._paths.get((layout, tuple(keys)))
+        if not entry or entry[1] < self.stable_after:
+            return False, None
+        with self._lock:
+            entry[2] += 1
+            if entry[2] >= self.revalidate_every:
+                entry[2] = 0
+                return False, None
+        return True, entry[0]
+
+    def learn(self, layout: str, keys: Sequence[str], path: Optional[Path]) -> None:
+        """ Registra o caminho encontrado pelo índice; caminhos diferentes reiniciam a contagem
+
+        ``path=None`` (grupo ausente na página) apenas descarta o que havia.
+        """
+        key = (layout, tuple(keys))
+        with self._lock:
+            if path is None:
+                self._paths.pop(key, None)
+                return
+            current = self._paths.get(key)
+            if current and current[0] == path:
+                current[1] += 1
+            elif current or len(self._paths) < self.max_entries:
+                self._paths[key] = [path, 1, 0]
+
+    def forget(self, layout: str, keys: Sequence[str]) -> None:
+        """ Descarta um caminho que deixou de existir nas páginas do layout """
+        with self._lock:
+            self._paths.pop((layout, tuple(keys)), None)
+
+class JsonLookup:
+    """ Consultas por grupo de chaves em um JSON, usando o caminho aprendido quando possível """
+
+    def __init__(self, data: Any, layout: str, keys: Iterable[str], cache: PathCache) -> None:
+        self.data = data
+        self.layout = layout
+        self._keys = tuple(keys)
+        self._cache = cache
+        self._index: Optional[JsonIndex] = None
+
+    @property
+    def index(self) -> JsonIndex:
+        if self._index is None:
+            self._index = JsonIndex(self.data, self._keys)
+        return self._index
+
+    def find(self, keys: Sequence[str]) -> Any:
+        """ Primeiro valor de qualquer chave do grupo """
+        known, path = self._cache.stable_path(self.layout, keys)
+        if known:
+            value = resolve(self.data, path)
+            if value is not MISSING and value is not None:
+                return value
+            self._cache.forget(self.layout, keys)
+        self._cache.learn(self.layout, keys, self.index.path(keys))
+        return self.index.find(keys)
@@ -0,0 +1,70 @@
+""" Métricas registradas por código que pode rodar em processos filhos
+
+O ``ParseExecutor`` no modo ``process`` executa o parse em um
+``ProcessPoolExecutor``; contadores e histogramas incrementados ali ficam no
+registro do processo filho e nunca chegam ao ``/metrics`` do servidor. O
+código do parse registra suas métricas por ``record_metric``: fora de
+``collect`` a métrica é atualizada na hora; dentro dele o evento é guardado
+e devolvido ao processo pai, que o aplica com ``replay``.
+
+Os eventos carregam apenas o nome da métrica, já que os objetos do
+``prometheus_client`` não são serializáveis; por isso toda métrica usada com
+``record_metric`` precisa ser registrada com ``register_metrics`` na
+importação do módulo que a utiliza.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger("metrics_buffer")
+
+#Evento: (nome da métrica, rótulos, método, valor)
+MetricEvent = Tuple[str, Dict[str, str], str, float]
+
+_metrics: Dict[str, Any] = {}
+_local = threading.local()
+
+def _name(metric: Any) -> str:
+    return metric.describe()[0].name
+
+def register_metrics(*metrics: Any) -> None:
+    """ Torna as métricas conhecidas por nome para o ``replay`` """
+    for metric in metrics:
+        _metrics[_name(metric)] = metric
+
+def _apply(metric: Any, labels: Dict[str, str], method: str, value: float) -> None:
+    target = metric.labels(**labels) if labels else metric
+    getattr(target, method)(value)
+
+def record_metric(metric: Any, method: str, value: float = 1.0, **labels: str) -> None:
+    """ Executa ``metric.labels(**labels).<method>(value)`` agora ou ao fim de ``collect`` """
+    events = getattr(_local, "events", None)
+    if events is None:
+        _apply(metric, labels, method, value)
+    else:
+        events.append((_name(metric), labels, method, value))
+
+@contextmanager
+def collect() -> Iterator[List[MetricEvent]]:
+    """ Guarda os eventos da thread atual em vez de atualizar as métricas """
+    previous = getattr(_local, "events", None)
+    _local.events = []
+    try:
+        yield _local.events
+    finally:
+        _local.events = previous
+
+def replay(events: List[MetricEvent]) -> None:
+    """ Aplica no processo atual os eventos coletados em outro processo """
+    for name, labels, method, value in events:
+        metric = _metrics.get(name)
+        if metric is None:
+            logger.warning("metric_not_registered", metric=name)
+            continue
+        _apply(metric, labels, method, value)
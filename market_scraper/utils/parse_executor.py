@@ -0,0 +1,143 @@
+""" Executor configurável para o parsing das páginas de produto
+
+O parsing é CPU-bound e, executado direto no ``_scrape_product_common``,
+bloqueia o event loop e fica limitado pelo GIL. O ``ParseExecutor`` roda o
+parse em um dos modos abaixo, escolhido por ``PARSE_EXECUTOR_MODE``:
+
+- ``inline``: no próprio event loop, como antes;
+- ``thread``: em um ``ThreadPoolExecutor``, liberando o loop;
+- ``process``: em um ``ProcessPoolExecutor``, usando todos os núcleos do nó.
+
+O número de parses pendentes (na fila ou em execução) é limitado por
+``PARSE_EXECUTOR_MAX_QUEUE``; acima disso as coroutines aguardam uma vaga,
+sem acumular HTML em memória no executor. O tempo de espera e o tempo de
+parse são medidos separadamente. No modo ``process`` as métricas que o parse
+registra com ``record_metric`` são coletadas no worker e aplicadas no
+processo do servidor junto com as medições.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+import weakref
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple
+
+import structlog
+
+from scraper_app.core.config import settings
+from scraper_app.utils.metrics_buffer import MetricEvent, collect, replay
+from alert_app.metrics import PARSE_QUEUE_WAIT_SECONDS, PARSE_DURATION_SECONDS
+
+
+logger = structlog.get_logger("parse_executor")
+
+MODES = ("inline", "thread", "process")
+
+def _timed_call(
+    fn: Callable[..., Any], args: Tuple[Any, ...]
+) -> Tuple[float, float, Any, Optional[BaseException], List[MetricEvent]]:
+    """ Executa ``fn`` e devolve início, duração, resultado, exceção e métricas
+
+    A medição acontece onde o parse roda, pois métricas registradas em um
+    processo filho não chegam ao ``/metrics`` do servidor: as de ``fn``
+    voltam como eventos para o processo pai.
+    """
+    started = time.time()
+    begin = time.perf_counter()
+    with collect() as events:
+        try:
+            result, error = fn(*args), None
+        except Exception as exc:
+            result, error = None, exc
+    return started, time.perf_counter() - begin, result, error, events
+
+class ParseExecutor:
+    """ Executa funções de parsing inline, em threads ou em processos """
+
+    def __init__(
+        self,
+        mode: str = settings.PARSE_EXECUTOR_MODE,
+        workers: int = settings.PARSE_EXECUTOR_WORKERS,
+        max_queue: int = settings.PARSE_EXECUTOR_MAX_QUEUE,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"PARSE_EXECUTOR_MODE inválido: {mode!r} (use {', '.join(MODES)})")
+        self.mode = mode
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_queue = max(max_queue if max_queue > 0 else self.workers * 4, 1)
+        self._lock = threading.Lock()
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self._pid: Optional[int] = None
+        #Semáforos ficam presos ao loop em que foram criados, então há um por loop
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slot = self._slots.get(loop)
+        if slot is None:
+            slot = self._slots[loop] = asyncio.Semaphore(self.max_queue)
+        return slot
+
+    def _executor(self) -> concurrent.futures.Executor:
+        """ Cria o pool no primeiro uso (e novamente após um ``fork``) """
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                if self.mode == "process":
+                    self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+                self._pid = os.getpid()
+                logger.info("parse_executor_started", mode=self.mode, workers=self.workers, max_queue=self.max_queue)
+            return self._pool
+
+    def _discard(self, pool: concurrent.futures.Executor) -> None:
+        """ Descarta um pool quebrado para que o próximo parse crie outro """
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """ Executa ``fn(*args)`` conforme o modo e retorna o resultado
+
+        No modo ``process`` a função e os argumentos são serializados para o
+        worker; prefira HTML em ``bytes``. Exceções de ``fn`` são relançadas.
+        """
+        submitted = time.time()
+        async with self._slot():
+            if self.mode == "inline":
+                started, elapsed, result, error, events = _timed_call(fn, args)
+            else:
+                pool = self._executor()
+                try:
+                    started, elapsed, result, error, events = await asyncio.get_running_loop().run_in_executor(
+                        pool, _timed_call, fn, args
+                    )
+                except BrokenProcessPool:
+                    #Worker morto (ex.: OOM) invalida o pool inteiro
+                    logger.error("parse_executor_broken", mode=self.mode)
+                    self._discard(pool)
+                    raise
+
+        replay(events)
+        PARSE_QUEUE_WAIT_SECONDS.labels(mode=self.mode).observe(max(started - submitted, 0.0))
+        PARSE_DURATION_SECONDS.labels(mode=self.mode).observe(elapsed)
+        if error is not None:
+            raise error
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """ Encerra o pool de threads ou processos, se houver """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None and self._pid == os.getpid():
+            pool.shutdown(wait=wait, cancel_futures=True)
+            logger.info("parse_executor_stopped", mode=self.mode)
+
+#Executor compartilhado pelo processo do scraper
+parse_executor = ParseExecutor()
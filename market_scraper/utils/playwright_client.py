@@ -43,11 +43,16 @@ class PlaywrightClient:
         await page.mouse.wheel(0, random.randint(300, 800))
         await page.wait_for_timeout(random.randint(100, 300))
 
-    async def __aenter__(self) -> "PlaywrightClient":
+    async def start_driver(self):
+        """ Inicia o driver do Playwright já com o stealth registrado """
         playwright = await async_playwright().start()
         #Garante que qualquer nova página ou contexto criado utilize o stealth
         self._stealth.hook_playwright_context(playwright)
-        browser = await playwright.chromium.launch(
+        return playwright
+
+    async def launch_browser(self, playwright) -> Browser:
+        """ Inicia uma instância do Chromium com os argumentos padrão """
+        return await playwright.chromium.launch(
             headless=self.headless,
             #Argumentos extras ajudam a mascarar o processo do navegador
             args=[
@@ -56,6 +61,10 @@ class PlaywrightClient:
                 "--disable-blink-features=AutomationControlled"
             ],
         )
+
+    async def __aenter__(self) -> "PlaywrightClient":
+        playwright = await self.start_driver()
+        browser = await self.launch_browser(playwright)
         self._browser = browser
         self._playwright = playwright
         return self
@@ -66,30 +75,32 @@ class PlaywrightClient:
         if getattr(self, "_playwright", None):
             await self._playwright.stop()
 
-    async def fetch_html(self, url: str, *, session_id: str | None = None) -> str:
-        """ Retorna o HTML gerado pelo navegador para ``url``
+    async def new_context(self, browser: Browser, session_id: str | None = None):
+        """ Cria um contexto com user-agent, viewport aleatório e stealth aplicados
 
-        O método aguarda o carregamento básico do DOM e então espera
-        que o seletor principal (titulo ou preço) esteja visível. Caso
-        o tempo de espera estoure, será registrado um erro, um screenshot
-        será salvo e a exeção será relançada
+        Retorna a tupla ``(context, width, height)`` para que a simulação de
+        interação utilize as mesmas dimensões do viewport.
         """
-        if not self._browser:
-            raise RuntimeError("PlaywrightClient is not started")
-
-        SCRAPER_BROWSER_FALLBACK_TOTAL.inc()
-
         #Define dimensões aleatórias de viewport para evitar padrão fixo
         width = random.randint(1280, 1920)
         height = random.randint(720, 1080)
 
-        context = await self._browser.new_context(
+        context = await browser.new_context(
             user_agent=self._ua_manager.get_user_agent(session_id or "default"),
             java_script_enabled=True,
             viewport={"width": width, "height": height}
         )
         #Aplica stealth para reduzir a chance de bloqueio
         await self._stealth.apply_stealth_async(context)
+        return context, width, height
+
+    async def render(self, context, url: str, width: int, height: int) -> str:
+        """ Navega até ``url`` em uma nova página do ``context`` e retorna o HTML
+
+        O contexto é sempre fechado ao final, com sucesso ou erro.
+        """
+        SCRAPER_BROWSER_FALLBACK_TOTAL.inc()
+
         try:
             page = await context.new_page()
             await self._stealth.apply_stealth_async(page)
@@ -118,9 +129,35 @@ class PlaywrightClient:
         finally:
             await context.close()
 
+    async def fetch_html(self, url: str, *, session_id: str | None = None) -> str:
+        """ Retorna o HTML gerado pelo navegador para ``url``
+
+        O método aguarda o carregamento básico do DOM e então espera
+        que o seletor principal (titulo ou preço) esteja visível. Caso
+        o tempo de espera estoure, será registrado um erro, um screenshot
+        será salvo e a exeção será relançada
+        """
+        if not self._browser:
+            raise RuntimeError("PlaywrightClient is not started")
+
+        context, width, height = await self.new_context(self._browser, session_id)
+        return await self.render(context, url, width, height)
+
 @asynccontextmanager
 async def get_playwright_client(headless: bool = settings.PLAYWRIGHT_HEADLESS, timeout: int = settings.PLAYWRIGHT_TIMEOUT) -> AsyncGenerator[PlaywrightClient, None]:
-    """ Context manager auxiliar para uso fácil do cliente """
+    """ Context manager auxiliar para uso fácil do cliente
+
+    Quando o pool de navegadores do processo estiver ativo (iniciado pelo
+    lifespan do FastAPI), ele é entregue no lugar de um cliente novo e nenhum
+    navegador é iniciado ou encerrado aqui.
+    """
+    from scraper_app.utils.browser_pool import get_browser_pool
+
+    pool = get_browser_pool()
+    if pool is not None and pool.available():
+        yield pool
+        return
+
     client = PlaywrightClient(headless=headless, timeout=timeout)
     await client.__aenter__()
     try:
@@ -0,0 +1,103 @@
+""" Extração dos dados embutidos direto do HTML bruto, sem construir o DOM
+
+As estratégias do ``ProductParser`` só precisam dos blocos ``<script>``
+(JSON-LD, ``__PRELOADED_STATE__`` e ``__NEXT_DATA__``) e de algumas meta
+tags. Este módulo localiza e recorta esses trechos com buscas de texto,
+evitando o ``BeautifulSoup`` em páginas mobile de centenas de KB, e
+decodifica o JSON com ``orjson`` quando disponível.
+"""
+
+import html as html_lib
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+_ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_META_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+#Tags e trechos que não viram texto visível: scripts, estilos e comentários
+_TEXT_SPLIT_RE = re.compile(
+    r"<script\b[^>]*>.*?(?:</script\s*>|\Z)|<style\b[^>]*>.*?(?:</style\s*>|\Z)|<!--.*?(?:-->|\Z)|<[^>]+>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+def to_text(html: Union[str, bytes]) -> str:
+    """ Converte o HTML recebido em ``bytes`` para ``str`` """
+    if isinstance(html, bytes):
+        return html.decode("utf-8", errors="replace")
+    return html
+
+def loads(raw: Union[str, bytes]) -> Any:
+    """ Decodifica JSON com ``orjson`` e recorre ao ``json`` padrão quando necessário
+
+    Raises:
+        ValueError: Quando o conteúdo não é JSON válido
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            #``NaN``/``Infinity`` e inteiros acima de 64 bits só o ``json`` aceita
+            pass
+    return json.loads(raw)
+
+def parse_attrs(tag: str) -> Dict[str, str]:
+    """ Atributos de uma tag de abertura, com nomes em minúsculas """
+    attrs: Dict[str, str] = {}
+    for name, dq, sq, bare in _ATTR_RE.findall(tag):
+        attrs.setdefault(name.lower(), html_lib.unescape(dq or sq or bare))
+    return attrs
+
+def iter_scripts(html: str, lower: Optional[str] = None) -> Iterator[Tuple[Dict[str, str], str]]:
+    """ Percorre os blocos ``<script>`` devolvendo atributos e conteúdo bruto """
+    lower = lower if lower is not None else html.lower()
+    pos = 0
+    while True:
+        start = lower.find("<script", pos)
+        if start == -1:
+            return
+        tag_end = lower.find(">", start)
+        if tag_end == -1:
+            return
+        close = lower.find("</script", tag_end)
+        if close == -1:
+            close = len(html)
+        yield parse_attrs(html[start + len("<script"):tag_end]), html[tag_end + 1:close]
+        pos = close + 1
+
+def extract_meta(html: str) -> Dict[str, str]:
+    """ Conteúdo das meta tags por ``property`` ou ``name`` (primeira ocorrência) """
+    meta: Dict[str, str] = {}
+    for tag in _META_RE.findall(html):
+        attrs = parse_attrs(tag[len("<meta"):])
+        key = attrs.get("property") or attrs.get("name")
+        if key and "content" in attrs:
+            meta.setdefault(key, attrs["content"])
+    return meta
+
+def has_element(html: str, tag: str, css_class: str) -> bool:
+    """ Indica se existe ``<tag>`` com a classe informada """
+    pattern = rf"""<{tag}\b[^>]*(?<![\w-])class\s*=\s*["']?[^"'>]*(?<![\w-]){re.escape(css_class)}(?![\w-])"""
+    return re.search(pattern, html, re.IGNORECASE) is not None
+
+def first_element_text(html: str, tag: str) -> Optional[str]:
+    """ Texto do primeiro ``<tag>`` sem marcações internas """
+    match = re.search(rf"<{tag}\b[^>]*>(.*?)</{tag}\s*>", html, re.IGNORECASE | re.DOTALL)
+    if not match:
+        return None
+    return html_lib.unescape(_TAG_RE.sub("", match.group(1))).strip()
+
+def visible_text(html: str) -> str:
+    """ Texto visível da página, equivalente a ``get_text(separator=" ", strip=True)``
+
+    Descarta ``<script>``, ``<style>`` e comentários, decodifica as entidades
+    HTML e une os trechos de texto entre as tags com um espaço.
+    """
+    chunks = (html_lib.unescape(chunk).strip() for chunk in _TEXT_SPLIT_RE.split(html))
+    return " ".join(chunk for chunk in chunks if chunk)
@@ -0,0 +1,163 @@
+""" Coalescência de scrapings simultâneos da mesma página (single-flight)
+
+Vários usuários monitoram o mesmo anúncio, e cada assinatura gera o seu
+próprio scraping. O ``SingleFlight`` faz com que chamadas concorrentes para
+a mesma chave compartilhem uma única execução:
+
+- no processo, seguidores aguardam o ``Future`` do líder no mesmo event loop;
+- entre réplicas, um lease no Redis (``SET NX``) elege o líder e os demais
+  aguardam o resultado que ele publica por alguns segundos.
+
+Se o lease expirar ou for liberado sem resultado (ex.: erro do líder), o
+seguidor executa o scraping por conta própria.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+from fastapi.encoders import jsonable_encoder
+
+from utils.redis_lease import release_lease
+from scraper_app.core.config import settings
+from alert_app.metrics import SCRAPER_SINGLE_FLIGHT_TOTAL
+
+
+logger = structlog.get_logger("single_flight")
+
+class SingleFlight:
+    """ Executa no máximo uma chamada por chave, no processo e entre réplicas """
+
+    def __init__(
+        self,
+        redis=None,
+        lease_ttl: float = settings.SINGLE_FLIGHT_LEASE_TTL,
+        result_ttl: int = settings.SINGLE_FLIGHT_RESULT_TTL,
+        poll_interval: float = settings.SINGLE_FLIGHT_POLL_INTERVAL,
+        prefix: str = "singleflight",
+    ) -> None:
+        self.redis = redis
+        self.lease_ttl = lease_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        #Futures ficam presos ao loop em que foram criados, então há um mapa por loop
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+
+    def _lease_key(self, key: str) -> str:
+        return f"{self.prefix}:lease:{key}"
+
+    def _result_key(self, key: str) -> str:
+        return f"{self.prefix}:result:{key}"
+
+    def _inflight(self) -> Dict[str, asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        calls = self._calls.get(loop)
+        if calls is None:
+            calls = self._calls[loop] = {}
+        return calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """ Retorna o resultado de ``fn`` compartilhado entre chamadas com a mesma ``key``
+
+        Exceções do líder local são repassadas aos seguidores do processo.
+        """
+        calls = self._inflight()
+        future = calls.get(key)
+        if future is not None:
+            SCRAPER_SINGLE_FLIGHT_TOTAL.labels(outcome="merged_local").inc()
+            try:
+                #O cancelamento de um seguidor não deve cancelar o líder
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                #Líder cancelado (ex.: cliente desconectou): tenta novamente
+                return await self.do(key, fn)
+
+        future = asyncio.get_running_loop().create_future()
+        calls[key] = future
+        try:
+            result = await self._run_distributed(key, fn)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            #Marca a exceção como consumida quando não há seguidores
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            calls.pop(key, None)
+
+    async def _run_distributed(self, key: str, fn: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """ Disputa o lease no Redis e executa ``fn`` ou aguarda o líder remoto """
+        if self.redis is None:
+            SCRAPER_SINGLE_FLIGHT_TOTAL.labels(outcome="leader").inc()
+            return await fn()
+
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.redis.set(self._lease_key(key), token, nx=True, px=int(self.lease_ttl * 1000))
+        except Exception as exc:
+            logger.warning("single_flight_lease_failed", key=key, error=str(exc))
+            acquired = True
+            token = None
+
+        if not acquired:
+            result = await self._wait_remote(key)
+            if result is not None:
+                SCRAPER_SINGLE_FLIGHT_TOTAL.labels(outcome="merged_remote").inc()
+                return result
+            SCRAPER_SINGLE_FLIGHT_TOTAL.labels(outcome="fallback").inc()
+            return await fn()
+
+        SCRAPER_SINGLE_FLIGHT_TOTAL.labels(outcome="leader").inc()
+        try:
+            result = await fn()
+            if token is not None:
+                self._publish(key, result)
+            return result
+        finally:
+            if token is not None:
+                self._release(key, token)
+
+    async def _wait_remote(self, key: str) -> Optional[Dict[str, Any]]:
+        """ Aguarda o resultado do líder de outra réplica enquanto o lease existir """
+        deadline = time.monotonic() + self.lease_ttl
+        while time.monotonic() < deadline:
+            try:
+                raw = self.redis.get(self._result_key(key))
+                if raw:
+                    return json.loads(raw)
+                if not self.redis.exists(self._lease_key(key)):
+                    #Lease liberado sem resultado: o líder falhou
+                    return None
+            except Exception as exc:
+                logger.warning("single_flight_wait_failed", key=key, error=str(exc))
+                return None
+            await asyncio.sleep(self.poll_interval)
+        return None
+
+    def _publish(self, key: str, result: Dict[str, Any]) -> None:
+        """ Disponibiliza o resultado do líder para seguidores de outras réplicas """
+        try:
+            self.redis.set(self._result_key(key), json.dumps(jsonable_encoder(result)), ex=self.result_ttl)
+        except Exception as exc:
+            logger.warning("single_flight_publish_failed", key=key, error=str(exc))
+
+    def _release(self, key: str, token: str) -> None:
+        """ Remove o lease apenas se ele ainda pertencer a este líder (compara e remove no Redis) """
+        try:
+            release_lease(self.redis, self._lease_key(key), token)
+        except Exception as exc:
+            logger.warning("single_flight_release_failed", key=key, error=str(exc))
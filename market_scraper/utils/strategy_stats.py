@@ -0,0 +1,119 @@
+""" Vitórias das estratégias do ``ProductParser`` por host e layout
+
+Cada página recebe uma chave ``host|layout``, formada pelo host da URL e por
+uma impressão digital barata do layout (formato da URL e fontes de dados
+embutidas). O parser tenta primeiro a estratégia que mais venceu para a
+chave e para no primeiro resultado válido.
+
+Os contadores ficam em memória e, a cada ``PARSER_STRATEGY_FLUSH_INTERVAL``
+segundos, os incrementos pendentes são somados a um hash no Redis; na mesma
+ida os totais das demais réplicas (e dos demais processos do executor de
+parsing) são lidos de volta. Falhas do Redis apenas adiam a sincronização.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Sequence
+
+import structlog
+
+from scraper_app.core.config import settings
+from utils.redis_client import get_redis_client
+
+
+logger = structlog.get_logger("strategy_stats")
+
+class StrategyStats:
+    """ Contadores de vitória por chave ``host|layout`` e estratégia """
+
+    def __init__(
+        self,
+        redis=None,
+        flush_interval: float = settings.PARSER_STRATEGY_FLUSH_INTERVAL,
+        ttl: int = settings.PARSER_STRATEGY_STATS_TTL,
+        prefix: str = "parser:strategy_wins",
+    ) -> None:
+        self._redis = redis
+        self.flush_interval = flush_interval
+        self.ttl = ttl
+        self.prefix = prefix
+        #O executor de parsing pode chamar de várias threads
+        self._lock = threading.Lock()
+        #Totais conhecidos (locais e do Redis) e incrementos ainda não enviados
+        self._wins: Dict[str, Dict[str, int]] = {}
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self._last_flush = time.monotonic()
+
+    def _client(self):
+        if self._redis is None:
+            self._redis = get_redis_client()
+        return self._redis
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def order(self, key: str, strategies: Sequence[str]) -> List[str]:
+        """ Estratégias ordenadas pelas vitórias na chave; empates mantêm a ordem padrão """
+        wins = self._wins.get(key)
+        if not wins:
+            return list(strategies)
+        return sorted(strategies, key=lambda name: -wins.get(name, 0))
+
+    def wins(self, key: str) -> Dict[str, int]:
+        """ Cópia dos totais conhecidos para a chave """
+        return dict(self._wins.get(key, {}))
+
+    def record_win(self, key: str, strategy: str) -> None:
+        """ Conta a vitória e sincroniza com o Redis quando o intervalo expira """
+        with self._lock:
+            for counters in (self._wins, self._pending):
+                bucket = counters.setdefault(key, {})
+                bucket[strategy] = bucket.get(strategy, 0) + 1
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """ Envia os incrementos pendentes e atualiza os totais com os do Redis """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            keys = list(self._wins)
+        if not keys:
+            return
+
+        try:
+            pipe = self._client().pipeline()
+            for key, counts in pending.items():
+                for strategy, count in counts.items():
+                    pipe.hincrby(self._redis_key(key), strategy, count)
+                pipe.expire(self._redis_key(key), self.ttl)
+            for key in keys:
+                pipe.hgetall(self._redis_key(key))
+            totals = pipe.execute()[-len(keys):]
+        except Exception as exc:
+            logger.warning("strategy_stats_flush_failed", error=str(exc))
+            self._restore(pending)
+            return
+
+        with self._lock:
+            for key, remote in zip(keys, totals):
+                merged = {strategy: int(count) for strategy, count in (remote or {}).items()}
+                #Vitórias registradas durante a sincronização ainda não estão no Redis
+                for strategy, count in self._pending.get(key, {}).items():
+                    merged[strategy] = merged.get(strategy, 0) + count
+                if merged:
+                    self._wins[key] = merged
+
+    def _restore(self, pending: Dict[str, Dict[str, int]]) -> None:
+        """ Devolve incrementos não enviados para a próxima sincronização """
+        with self._lock:
+            for key, counts in pending.items():
+                bucket = self._pending.setdefault(key, {})
+                for strategy, count in counts.items():
+                    bucket[strategy] = bucket.get(strategy, 0) + count
+
+#Contadores compartilhados pelo processo
+strategy_stats = StrategyStats()
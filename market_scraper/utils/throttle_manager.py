@@ -1,5 +1,11 @@
-""" Implementa controle de velocidade e backoff para o scraping """
+""" Implementa controle de velocidade e backoff para o scraping
 
+Os métodos ``wait``/``backoff`` bloqueiam com ``time.sleep`` e atendem
+chamadores síncronos (Celery). No event loop do FastAPI use
+``wait_async``/``backoff_async``, que aguardam com ``asyncio.sleep``.
+"""
+
+import asyncio
 import time
 import random
 import threading
@@ -43,12 +49,14 @@ class ThrottleManager:
         self.min_rate = min_rate
         self.decrease_factor = decrease_factor
 
-    def wait(self, circuit_key: str, identifier: Optional[str] = None):
-        """ Aguarda token bucket + aplica jitter, verifica global rate limiter se configurado """
+    def _check_rate_limit(self, circuit_key: str, identifier: Optional[str]) -> None:
+        """ Verifica o global rate limiter, se configurado """
         if self.rate_limiter and not self.rate_limiter.allow_request(identifier):
             self.circuit_breaker.record_failure(circuit_key)
             raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Rate limit exceeded")
 
+    def _reserve(self) -> float:
+        """ Consome um token e retorna o tempo de espera (bucket + jitter) em segundos """
         with self.lock:
             now = time.monotonic()
             elapsed = now - self.timestamp
@@ -58,33 +66,23 @@ class ThrottleManager:
             self.tokens = min(self.capacity, self.tokens + refill)
             self.timestamp = now
 
-            #Se não houver tokens suficientes, aguarde até gerar 1 token
-            if self.tokens < 1.0:
-                sleep_time = (1.0 - self.tokens) / self.rate
-
-                #Adiciona jitter extra
-                jitter = random.uniform(self.jitter_min, self.jitter_max)
-                metrics.SCRAPER_JITTER_SECONDS.observe(jitter)
-                total_sleep_time = sleep_time + jitter
-                time.sleep(total_sleep_time)
+            #Se não houver tokens suficientes, aguarda até gerar 1 token
+            sleep_time = (1.0 - self.tokens) / self.rate if self.tokens < 1.0 else 0.0
 
-                #Após esperar, consome 1 token
-                self.tokens = 0.0
+            #Saldo negativo reserva a vaga e faz chamadas concorrentes aguardarem em fila
+            self.tokens -= 1.0
 
-            else:
-                #Já há token: consome imediatamente, mas ainda aplica jitter
-                jitter = random.uniform(self.jitter_min, self.jitter_max)
-                metrics.SCRAPER_JITTER_SECONDS.observe(jitter)
-                time.sleep(jitter)
-                self.tokens -= 1.0
+        #Jitter é aplicado mesmo quando já há token disponível
+        jitter = random.uniform(self.jitter_min, self.jitter_max)
+        metrics.SCRAPER_JITTER_SECONDS.observe(jitter)
+        return sleep_time + jitter
 
-    def backoff(self, attempt: int, circuit_key: str):
-        """ Exponential backoff + adaptative rate adjust, chamado quando recebe HTTP 429 """
+    def _backoff_delay(self, attempt: int, circuit_key: str) -> float:
+        """ Reduz a taxa, registra a falha e retorna o atraso exponencial em segundos """
         #Base random para variar o backoff
         base = random.uniform(self.jitter_min, self.jitter_max)
         delay = (2 ** attempt) * base
         metrics.SCRAPER_JITTER_SECONDS.observe(base)
-        time.sleep(delay)
 
         new_rate = max(self.min_rate, self.rate * self.decrease_factor)
         if new_rate < self.rate:
@@ -93,3 +91,22 @@ class ThrottleManager:
 
         #Registra falha no circuit breaker
         self.circuit_breaker.record_failure(circuit_key)
+        return delay
+
+    def wait(self, circuit_key: str, identifier: Optional[str] = None):
+        """ Aguarda token bucket + aplica jitter, verifica global rate limiter se configurado """
+        self._check_rate_limit(circuit_key, identifier)
+        time.sleep(self._reserve())
+
+    async def wait_async(self, circuit_key: str, identifier: Optional[str] = None):
+        """ Versão de ``wait`` para o event loop, sem bloquear outras requisições """
+        self._check_rate_limit(circuit_key, identifier)
+        await asyncio.sleep(self._reserve())
+
+    def backoff(self, attempt: int, circuit_key: str):
+        """ Exponential backoff + adaptative rate adjust, chamado quando recebe HTTP 429 """
+        time.sleep(self._backoff_delay(attempt, circuit_key))
+
+    async def backoff_async(self, attempt: int, circuit_key: str):
+        """ Versão de ``backoff`` para o event loop """
+        await asyncio.sleep(self._backoff_delay(attempt, circuit_key))
@@ -0,0 +1,25 @@
+-- Script Lua para reivindicar itens vencidos de um índice de vencimentos (ZSET)
+-- Seleciona e reserva atomicamente os próximos itens a processar
+
+-- KEYS[1] = Sorted set com os itens (score = instante do vencimento em epoch)
+-- ARGV[1] = Instante atual em epoch (segundos)
+-- ARGV[2] = Quantidade máxima de itens reivindicados
+-- ARGV[3] = Duração da reserva em segundos
+
+-- Os itens são devolvidos em ordem de vencimento e reagendados para
+-- agora + reserva: outro ciclo não os seleciona de novo e, se o chamador
+-- falhar antes de reagendá-los, eles voltam a vencer ao fim da reserva
+
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local lease = tonumber(ARGV[3])
+
+local due = redis.call("ZRANGEBYSCORE", key, "-inf", now, "LIMIT", 0, limit)
+
+local until_ts = now + lease
+for _, member in ipairs(due) do
+    redis.call("ZADD", key, until_ts, member)
+end
+
+return due
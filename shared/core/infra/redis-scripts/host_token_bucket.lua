@@ -0,0 +1,52 @@
+-- Script Lua para o token bucket por host compartilhado entre réplicas do scraper
+-- Reserva atomicamente a próxima vaga de requisição ao host
+
+-- KEYS[1] = Hash do Redis com o estado do bucket (campos tokens e ts)
+-- ARGV[1] = Taxa de refill em tokens por segundo
+-- ARGV[2] = Capacidade máxima do bucket
+-- ARGV[3] = Espera máxima aceita em milissegundos
+-- ARGV[4] = Tempo de expiração da chave em milissegundos
+
+-- O relógio usado é o do próprio Redis (TIME), evitando divergências entre réplicas
+
+-- Retorna a espera em milissegundos até a vaga reservada (0 = imediata)
+-- ou -1 quando a espera ultrapassa o máximo e nenhuma vaga é reservada
+
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local max_wait_ms = tonumber(ARGV[3])
+local ttl_ms = tonumber(ARGV[4])
+
+local now = redis.call("TIME")
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+
+local state = redis.call("HMGET", key, "tokens", "ts")
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+
+-- Bucket inexistente começa cheio
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now_ms
+end
+
+-- Repõe os tokens proporcionalmente ao tempo decorrido
+local elapsed = math.max(0, now_ms - ts)
+tokens = math.min(capacity, tokens + elapsed * rate / 1000)
+
+-- Sem token disponível a vaga fica no futuro (saldo negativo = fila de reservas)
+local wait_ms = 0
+if tokens < 1 then
+    wait_ms = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+if wait_ms > max_wait_ms then
+    return -1
+end
+
+-- Consome o token e persiste o estado; o saldo é gravado como string para manter a fração
+redis.call("HSET", key, "tokens", tostring(tokens - 1), "ts", now_ms)
+redis.call("PEXPIRE", key, ttl_ms)
+
+return wait_ms
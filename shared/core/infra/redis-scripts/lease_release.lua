@@ -0,0 +1,12 @@
+-- Script Lua para liberar um lease apenas se ele ainda pertencer ao dono
+-- Compara e remove numa única operação atômica
+
+-- KEYS[1] = Chave do lease
+-- ARGV[1] = Token gravado pelo dono ao adquirir o lease
+
+-- Retorna 1 se o lease foi removido, 0 se expirou ou pertence a outro dono
+
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
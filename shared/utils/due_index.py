@@ -0,0 +1,125 @@
+""" Índice de vencimentos em um sorted set do Redis
+
+Cada item (ID de produto ou código MLB do item canônico) é um membro do ZSET com score igual ao instante
+(epoch) da próxima coleta. Encontrar os itens vencidos é um
+``ZRANGEBYSCORE`` em O(log n + N), em vez de um ``GET`` por produto, e já
+devolve os itens em ordem de vencimento. ``claim`` seleciona e reserva os
+itens num único script Lua, de modo que dois ciclos concorrentes nunca
+recebem o mesmo item.
+"""
+
+import importlib
+import os
+import time
+from typing import Dict, List, Optional
+
+from redis.exceptions import NoScriptError
+
+from utils.redis_client import get_redis_client
+
+#Tenta carregar o módulo de métricas do serviço atual
+try:
+    metrics = importlib.import_module("alert_app.metrics")
+except ModuleNotFoundError:
+    try:
+        metrics = importlib.import_module("scraper_app.metrics")
+    except ModuleNotFoundError:
+        class _MetricsStub:
+            """ Fallback simples quando métricas não estão disponíveis """
+            def __getattr__(self, name):
+                def _noop(*args, **kwargs):
+                    return None
+                return _noop
+        metrics = _MetricsStub()
+
+
+#Índices usados pelas rechecagens periódicas
+MONITORED_DUE_KEY = "recheck:due:monitored"
+COMPETITOR_DUE_KEY = "recheck:due:competitor"
+CANONICAL_DUE_KEY = "recheck:due:canonical"
+
+def _load_lua_script(redis, reload: bool = False):
+    """ Carrega e cacheia o script Lua de reivindicação """
+    if reload or not hasattr(_load_lua_script, "sha"):
+        lua_path = os.path.join(
+            os.path.dirname(__file__),
+            os.pardir,
+            "core",
+            "infra",
+            "redis-scripts",
+            "due_index_claim.lua",
+        )
+
+        with open(lua_path, "r", encoding="utf-8") as f:
+            lua_source = f.read()
+
+        _load_lua_script.sha = redis.script_load(lua_source)
+    return _load_lua_script.sha
+
+def _decode(value) -> str:
+    return value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else str(value)
+
+class DueIndex:
+    """ Agenda itens por instante de vencimento e reivindica os vencidos
+
+    ``lease`` é por quanto tempo um item reivindicado fica reservado: o
+    chamador deve reagendá-lo (``schedule``) depois de processá-lo; se não o
+    fizer, o item volta a vencer ao fim da reserva.
+    """
+
+    def __init__(self, key: str, lease: float = 900.0, redis=None) -> None:
+        self.key = key
+        self.lease = float(lease)
+        self.redis = redis or get_redis_client()
+        self.kind = key.rsplit(":", 1)[-1]
+        self.lua_sha = _load_lua_script(self.redis)
+
+    def schedule(self, member: str, when: float) -> None:
+        """ Define o vencimento do item (epoch), substituindo o anterior """
+        self.redis.zadd(self.key, {str(member): float(when)})
+
+    def schedule_many(self, due: Dict[str, float], only_new: bool = False) -> int:
+        """ Agenda vários itens de uma vez; com ``only_new`` mantém os já agendados
+
+        Retorna quantos itens foram adicionados ao índice.
+        """
+        if not due:
+            return 0
+        mapping = {str(member): float(when) for member, when in due.items()}
+        return int(self.redis.zadd(self.key, mapping, nx=only_new) or 0)
+
+    def score(self, member: str) -> Optional[float]:
+        """ Vencimento agendado do item ou ``None`` se ele não está no índice """
+        value = self.redis.zscore(self.key, str(member))
+        return float(value) if value is not None else None
+
+    def remove(self, *members: str) -> int:
+        """ Retira itens do índice (ex.: produtos excluídos) """
+        if not members:
+            return 0
+        return int(self.redis.zrem(self.key, *(str(m) for m in members)) or 0)
+
+    def _evalsha(self, *args):
+        """ Executa o script, recarregando-o se o Redis tiver perdido o cache de scripts """
+        try:
+            return self.redis.evalsha(self.lua_sha, 1, self.key, *args)
+        except NoScriptError:
+            self.lua_sha = _load_lua_script(self.redis, reload=True)
+            return self.redis.evalsha(self.lua_sha, 1, self.key, *args)
+
+    def claim(self, limit: int, now: Optional[float] = None, lease: Optional[float] = None) -> List[str]:
+        """ Reivindica até ``limit`` itens vencidos, em ordem de vencimento """
+        if limit <= 0:
+            return []
+        now = time.time() if now is None else now
+        lease = self.lease if lease is None else lease
+        claimed = [_decode(m) for m in self._evalsha(repr(float(now)), int(limit), repr(float(lease)))]
+        metrics.RECHECK_CLAIMED_TOTAL.labels(kind=self.kind).inc(len(claimed))
+        return claimed
+
+    def backlog(self, now: Optional[float] = None) -> int:
+        """ Quantidade de itens vencidos ainda não reivindicados """
+        now = time.time() if now is None else now
+        pending = int(self.redis.zcount(self.key, "-inf", now))
+        metrics.RECHECK_DUE_BACKLOG.labels(kind=self.kind).set(pending)
+        return pending
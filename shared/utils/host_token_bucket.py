@@ -0,0 +1,136 @@
+""" Token bucket por host compartilhado entre as réplicas do scraper
+
+O ``ThrottleManager`` mantém o bucket em memória e só enxerga as requisições
+da própria réplica. Aqui o estado do bucket de cada host fica em um hash do
+Redis e é atualizado por um script Lua, de modo que todas as réplicas
+disputam as mesmas vagas. ``reserve`` não dorme: devolve o instante da vaga
+reservada e o chamador decide como aguardar (``time.sleep`` ou
+``asyncio.sleep``).
+"""
+
+import importlib
+import math
+import os
+import time
+from typing import Optional
+
+from redis.exceptions import NoScriptError
+
+from utils.redis_client import get_redis_client
+
+#Tenta carregar o módulo de métricas do serviço atual
+try:
+    metrics = importlib.import_module("alert_app.metrics")
+except ModuleNotFoundError:
+    try:
+        metrics = importlib.import_module("scraper_app.metrics")
+    except ModuleNotFoundError:
+        class _MetricsStub:
+            """ Fallback simples quando métricas não estão disponíveis """
+            def __getattr__(self, name):
+                def _noop(*args, **kwargs):
+                    return None
+                return _noop
+        metrics = _MetricsStub()
+
+
+def _load_lua_script(redis, reload: bool = False):
+    """ Carrega e cacheia o script Lua do token bucket """
+    if reload or not hasattr(_load_lua_script, "sha"):
+        lua_path = os.path.join(
+            os.path.dirname(__file__),
+            os.pardir,
+            "core",
+            "infra",
+            "redis-scripts",
+            "host_token_bucket.lua",
+        )
+
+        with open(lua_path, "r", encoding="utf-8") as f:
+            lua_source = f.read()
+
+        _load_lua_script.sha = redis.script_load(lua_source)
+    return _load_lua_script.sha
+
+class HostTokenBucket:
+    """ Reserva vagas de requisição por host usando um token bucket no Redis
+
+    A taxa de refill parte de ``rate``, é limitada pelo ``Crawl-delay`` do
+    robots.txt e multiplicada por um fator adaptativo do host, reduzido por
+    ``decrease_factor`` a cada bloqueio (``penalize``). O fator expira após
+    ``penalty_ttl`` segundos sem novas penalidades, devolvendo a taxa original.
+    """
+    def __init__(self, rate: float, capacity: float, max_wait: float = 30.0, min_rate: float = 0.01,
+                 decrease_factor: float = 0.9, penalty_ttl: int = 3600, prefix: str = "throttle:host", redis=None):
+        self.redis = redis or get_redis_client()
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.penalty_ttl = penalty_ttl
+        self.prefix = prefix
+
+        #Carrega o script lua apenas uma vez e guarda o SHA para reuso
+        self.lua_sha = _load_lua_script(self.redis)
+
+    def _bucket_key(self, host: str) -> str:
+        return f"{self.prefix}:{host}:bucket"
+
+    def _factor_key(self, host: str) -> str:
+        return f"{self.prefix}:{host}:factor"
+
+    def get_factor(self, host: str) -> float:
+        """ Fator adaptativo atual do host (``1.0`` sem penalidades) """
+        raw = self.redis.get(self._factor_key(host))
+        try:
+            return float(raw) if raw is not None else 1.0
+        except (TypeError, ValueError):
+            return 1.0
+
+    def penalize(self, host: str) -> float:
+        """ Reduz a taxa do host após um bloqueio e retorna o novo fator """
+        floor = self.min_rate / self.rate if self.rate else 1.0
+        factor = max(floor, self.get_factor(host) * self.decrease_factor)
+        self.redis.set(self._factor_key(host), factor, ex=self.penalty_ttl)
+        metrics.SCRAPER_BACKOFF_FACTOR.set(self.rate * factor)
+        return factor
+
+    def rate_for(self, host: str, crawl_delay: Optional[float] = None) -> float:
+        """ Taxa efetiva (tokens por segundo) usada no refill do bucket do host """
+        rate = self.rate
+        if crawl_delay:
+            rate = min(rate, 1.0 / crawl_delay)
+        return max(self.min_rate, rate * self.get_factor(host))
+
+    def _evalsha(self, *args) -> int:
+        """ Executa o script, recarregando-o se o Redis tiver perdido o cache de scripts """
+        try:
+            return int(self.redis.evalsha(self.lua_sha, 1, *args))
+        except NoScriptError:
+            self.lua_sha = _load_lua_script(self.redis, reload=True)
+            return int(self.redis.evalsha(self.lua_sha, 1, *args))
+
+    def reserve(self, host: str, crawl_delay: Optional[float] = None) -> Optional[float]:
+        """ Reserva a próxima vaga do host e retorna seu instante (``time.time``)
+
+        Retorna ``None`` sem consumir token quando a vaga ficaria além de
+        ``max_wait`` segundos, indicando que o host está saturado.
+        """
+        rate = self.rate_for(host, crawl_delay)
+        #A chave expira depois de reabastecer o bucket e esvaziar a fila de reservas
+        ttl_ms = int(math.ceil((self.capacity / rate + self.max_wait) * 1000))
+        wait_ms = self._evalsha(
+            self._bucket_key(host),
+            rate,
+            self.capacity,
+            int(self.max_wait * 1000),
+            ttl_ms,
+        )
+        if wait_ms < 0:
+            metrics.HOST_BUCKET_REJECTED_TOTAL.labels(url_host=host).inc()
+            return None
+
+        wait = wait_ms / 1000
+        metrics.HOST_BUCKET_WAIT_SECONDS.labels(url_host=host).observe(wait)
+        return time.time() + wait
@@ -4,7 +4,7 @@ import re
 from urllib.parse import urlparse
 
 
-__all__ = ["canonicalize_ml_url", "is_product_url"]
+__all__ = ["canonicalize_ml_url", "extract_mlb_id", "is_product_url"]
 
 from market_scraper.scraper_app.utils.constants import PRODUCT_HOSTS
 
@@ -17,8 +17,8 @@ PRODUCT_HOSTS = {
 
 PRODUCT_RE = re.compile(r"MLB[-_]?(\d+)", re.IGNORECASE)
 
-def canonicalize_ml_url(url: str) -> str | None:
-    """ Retorna a URL canônica do produto do Mercado Livre ou ``None`` """
+def extract_mlb_id(url: str) -> str | None:
+    """ Retorna o código do anúncio (ex.: ``MLB123``) ou ``None`` """
     parsed = urlparse(str(url))
     host = parsed.hostname or ""
     if "mercadolivre.com.br" not in host:
@@ -26,8 +26,14 @@ def canonicalize_ml_url(url: str) -> str | None:
     match = PRODUCT_RE.search(str(url))
     if not match:
         return None
-    product_id = match.group(1)
-    return f"https://produto.mercadolivre.com.br/MLB-{product_id}"
+    return f"MLB{match.group(1)}"
+
+def canonicalize_ml_url(url: str) -> str | None:
+    """ Retorna a URL canônica do produto do Mercado Livre ou ``None`` """
+    mlb_id = extract_mlb_id(url)
+    if not mlb_id:
+        return None
+    return f"https://produto.mercadolivre.com.br/MLB-{mlb_id[3:]}"
 
 def is_product_url(url: str) -> bool:
     """ Verifica se a URL corresponde a uma página de produto do Mercado Livre """
@@ -0,0 +1,40 @@
+""" Liberação atômica de leases (``SET NX``) no Redis
+
+Um ``GET`` seguido de ``DELETE`` não é atômico: se o lease expirar entre as
+duas chamadas e outra réplica o adquirir, o dono antigo apagaria o lease
+alheio. ``release_lease`` compara o token e remove a chave num script Lua.
+"""
+
+import os
+
+from redis.exceptions import NoScriptError
+
+
+def _load_lua_script(redis, reload: bool = False):
+    """ Carrega e cacheia o script Lua de liberação """
+    if reload or not hasattr(_load_lua_script, "sha"):
+        lua_path = os.path.join(
+            os.path.dirname(__file__),
+            os.pardir,
+            "core",
+            "infra",
+            "redis-scripts",
+            "lease_release.lua",
+        )
+
+        with open(lua_path, "r", encoding="utf-8") as f:
+            lua_source = f.read()
+
+        _load_lua_script.sha = redis.script_load(lua_source)
+    return _load_lua_script.sha
+
+def release_lease(redis, key: str, token: str) -> bool:
+    """ Remove ``key`` apenas se o valor ainda for ``token``; retorna se removeu """
+    sha = _load_lua_script(redis)
+    try:
+        released = redis.evalsha(sha, 1, key, token)
+    except NoScriptError:
+        #O Redis perdeu o cache de scripts (restart ou SCRIPT FLUSH)
+        sha = _load_lua_script(redis, reload=True)
+        released = redis.evalsha(sha, 1, key, token)
+    return bool(int(released or 0))
@@ -0,0 +1,109 @@
+""" Event loop persistente por processo, executado em uma thread dedicada
+
+Código síncrono (tasks Celery, canais de notificação) chamava
+``asyncio.run`` a cada envio, criando e destruindo um event loop por
+chamada e impedindo o reaproveitamento de clientes assíncronos (``httpx``,
+``aiosmtplib``...). Aqui um único loop roda por todo o ciclo de vida do
+worker e as coroutines são submetidas a ele com :func:`run_coroutine`.
+
+O loop é iniciado no ``worker_process_init`` do Celery e, fora de um
+worker, na primeira submissão.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Coroutine, Optional
+
+import structlog
+
+
+logger = structlog.get_logger("worker_loop")
+
+class WorkerLoop:
+    """ Mantém um event loop rodando em uma thread daemon do processo """
+
+    def __init__(self, name: str = "worker-loop") -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        """ Indica se o loop deste processo está ativo """
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """ Inicia o loop (uma vez por processo) e o retorna """
+        with self._lock:
+            #Após o fork a thread do processo pai não existe no filho
+            if self.running:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            thread = threading.Thread(target=self._run, args=(loop, ready), name=self.name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            logger.info("worker_loop_started", pid=self._pid)
+            return loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            #Cancela o que restou e fecha geradores assíncronos antes de encerrar
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """ Executa ``coro`` no loop persistente e aguarda o resultado
+
+        Raises:
+            RuntimeError: Quando chamado de dentro do próprio loop, o que
+                travaria a thread
+            TimeoutError: Quando ``timeout`` expira; a coroutine é cancelada
+        """
+        loop = self.start()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("submit chamado de dentro do worker loop; use await")
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """ Encerra o loop e aguarda a thread terminar """
+        with self._lock:
+            if not self.running:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            logger.info("worker_loop_stopped", pid=self._pid)
+            self._loop = self._thread = self._pid = None
+
+#Loop compartilhado pelo processo
+worker_loop = WorkerLoop()
+
+def run_coroutine(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """ Executa ``coro`` no loop persistente do processo a partir de código síncrono """
+    return worker_loop.submit(coro, timeout)